@@ -2,9 +2,12 @@
 
 import os
 import sys
-from typing import List, Optional, Dict
+from typing import List, Optional, Dict, Tuple
 import traceback
 import time
+import asyncio
+import functools
+from concurrent.futures import ThreadPoolExecutor
 from datetime import datetime
 
 # .env 파일 로드
@@ -29,6 +32,9 @@ if _project_root not in sys.path:
 # --- 프로젝트 모듈 및 설정 임포트 ---
 from src.config_loader.settings import SETTINGS
 from src.db.vector_db import PineconeDB
+from src.db.embedding_cache import cached_embeddings, get_embedding_cache
+from src.db.keyword_vectors import KeywordVectorStore, KeywordVectorIndex
+from src.openai_rate_limiter import get_rate_limited_openai_client
 
 # --- 전역 변수 ---
 embedding_model_name: Optional[str] = None
@@ -37,6 +43,7 @@ openai_client: Optional[OpenAI] = None
 mongo_client: Optional[MongoClient] = None
 articles_collection: Optional[any] = None
 user_preferences_collection: Optional[any] = None
+keyword_vector_index: Optional[KeywordVectorIndex] = None
 
 # --- Pydantic 모델 정의 ---
 class RecommendationRequest(BaseModel):
@@ -89,11 +96,16 @@ async def health_check():
     """
     뉴스 추천 API 서비스의 상태를 확인하는 헬스체크 엔드포인트.
     """
-    return {"status": "ok", "timestamp": datetime.now().isoformat()}
+    embedding_cache = get_embedding_cache()
+    return {
+        "status": "ok",
+        "timestamp": datetime.now().isoformat(),
+        "embedding_cache": embedding_cache.stats() if embedding_cache else None,
+    }
 
 # --- 서비스 초기화 함수 ---
 def initialize_recommendation_services():
-    global embedding_model_name, pinecone_manager, openai_client, articles_collection, mongo_client
+    global embedding_model_name, pinecone_manager, openai_client, articles_collection, mongo_client, keyword_vector_index
     print("--- 키워드 기반 추천 서비스 초기화 중 ---")
     try:
         embedding_model_name = SETTINGS.get("SHARED_EMBEDDING_MODEL_NAME", "text-embedding-3-small")
@@ -110,7 +122,7 @@ def initialize_recommendation_services():
     try:
         api_key = SETTINGS.get("OPENAI_API_KEY")
         if not api_key: raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
-        openai_client = OpenAI(api_key=api_key)
+        openai_client = get_rate_limited_openai_client(OpenAI(api_key=api_key), "interactive")
         print(f"✅ OpenAI 클라이언트 설정 완료.")
     except Exception as e:
         raise RuntimeError(f"OpenAI 클라이언트 초기화 실패: {e}")
@@ -130,6 +142,16 @@ def initialize_recommendation_services():
         print(f"✅ 사용자 선호도 컬렉션 초기화 완료.")
     except Exception as e:
         raise RuntimeError(f"MongoDB 연결 실패: {e}")
+
+    keyword_vectors_config = SETTINGS.get("KEYWORD_VECTORS", {})
+    if keyword_vectors_config.get("ENABLED", True):
+        keyword_vectors_collection = mongo_client[db_name][SETTINGS.get("MONGO_KEYWORD_VECTORS_COLLECTION_NAME", "keyword_vectors")]
+        keyword_vector_index = KeywordVectorIndex(KeywordVectorStore(keyword_vectors_collection, embedding_model_name))
+        if keyword_vectors_config.get("PRELOAD_ON_STARTUP", False):
+            try:
+                print(f"✅ 키워드 벡터 {keyword_vector_index.preload()}개를 메모리에 로드했습니다.")
+            except Exception as e:
+                print(f"⚠️ 키워드 벡터 사전 로드 실패 (요청 시 필요한 것만 조회합니다): {e}")
     print("--- 키워드 기반 추천 서비스 초기화 완료 ---")
 
 # --- 핵심 로직 함수 ---
@@ -145,28 +167,51 @@ def extract_keywords_from_query(query_text: str) -> List[str]:
     except Exception as e:
         print(f"LLM 쿼리 키워드 추출 중 오류: {e}"); return []
 
+def _embed_keywords_uncached(keywords: List[str]) -> List[List[float]]:
+    try:
+        response = openai_client.embeddings.create(
+            model=embedding_model_name,
+            input=keywords
+        )
+        embeddings = [[] for _ in keywords]
+        for item in response.data:
+            embeddings[item.index] = item.embedding
+        return embeddings
+    except Exception as e:
+        print(f"키워드 {keywords} 임베딩 중 오류: {e}")
+        return [[] for _ in keywords]
+
 def embed_keywords_individually(keywords: List[str]) -> List[List[float]]:
     if not openai_client or not embedding_model_name or not keywords: return []
-    embeddings = []
-    for keyword in keywords:
-        try:
-            response = openai_client.embeddings.create(
-                model=embedding_model_name,
-                input=keyword
-            )
-            embeddings.append(response.data[0].embedding)
-        except Exception as e:
-            print(f"키워드 '{keyword}' 임베딩 중 오류: {e}")
-            embeddings.append([])
-    return embeddings
+    # 캐시에 없는 키워드만 한 번의 요청으로 임베딩합니다.
+    return cached_embeddings(embedding_model_name, keywords, _embed_keywords_uncached)
 
 def calculate_keyword_similarity(user_embeddings: List[List[float]], article_embeddings: List[List[float]]) -> float:
-    if not user_embeddings or not article_embeddings: return 0.0
+    if len(user_embeddings) == 0 or len(article_embeddings) == 0: return 0.0
     user_embeddings_np, article_embeddings_np = np.array(user_embeddings), np.array(article_embeddings)
     similarity_matrix = np.dot(user_embeddings_np, article_embeddings_np.T)
     max_scores_per_user_kw = np.max(similarity_matrix, axis=1)
     return float(np.mean(max_scores_per_user_kw))
 
+def pack_keyword_embeddings(per_article_embeddings: List, dim: int) -> Tuple[np.ndarray, np.ndarray]:
+    """기사별 키워드 임베딩을 하나의 연속된 float32 행렬과 기사별 시작 오프셋 배열로 묶습니다."""
+    blocks = [np.asarray(embeddings, dtype=np.float32).reshape(-1, dim) for embeddings in per_article_embeddings]
+    lengths = np.fromiter((len(block) for block in blocks), dtype=np.int64, count=len(blocks))
+    offsets = np.zeros(len(blocks), dtype=np.int64)
+    if len(blocks) > 1:
+        np.cumsum(lengths[:-1], out=offsets[1:])
+    return np.concatenate(blocks, axis=0), offsets
+
+def score_articles_vectorized(user_embeddings: List[List[float]], packed_embeddings: np.ndarray, offsets: np.ndarray) -> np.ndarray:
+    """
+    calculate_keyword_similarity를 모든 후보 기사에 한 번에 적용합니다.
+    사용자 키워드 × 전체 기사 키워드 행렬곱 한 번 후, 기사 구간별 최댓값의 사용자 키워드 평균을 점수로 냅니다.
+    """
+    user_matrix = np.asarray(user_embeddings, dtype=np.float32)
+    similarity_matrix = user_matrix @ packed_embeddings.T
+    max_scores_per_user_kw = np.maximum.reduceat(similarity_matrix, offsets, axis=1)
+    return max_scores_per_user_kw.mean(axis=0)
+
 # --- 사용자 개인화 함수들 ---
 
 def get_user_interests(user_id: str) -> List[str]:
@@ -248,52 +293,44 @@ def create_personalized_query(user_id: str, base_query: str, profile_context: st
     
     return personalized_query
 
+# --- 블로킹 호출 오프로드 ---
+# OpenAI / Pinecone / pymongo 클라이언트는 동기 방식이므로 전용 스레드 풀에서 실행해 이벤트 루프를 막지 않습니다.
+_blocking_executor: Optional[ThreadPoolExecutor] = None
+
+async def _run_blocking(func, *args):
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(_blocking_executor, functools.partial(func, *args))
+
 @app.on_event("startup")
 async def startup_event():
+    global _blocking_executor
+    _blocking_executor = ThreadPoolExecutor(
+        max_workers=SETTINGS.get("NEWS_REC_BLOCKING_WORKERS", 32),
+        thread_name_prefix="news-rec-io",
+    )
     try:
-        initialize_recommendation_services(); app.state.services_ready = True
+        await _run_blocking(initialize_recommendation_services); app.state.services_ready = True
     except RuntimeError as e:
         print(f"CRITICAL: 서비스 초기화 실패: {e}"); app.state.services_ready = False
 
 @app.on_event("shutdown")
 async def shutdown_event():
     if mongo_client: mongo_client.close(); print("MongoDB 연결이 닫혔습니다.")
+    if _blocking_executor: _blocking_executor.shutdown(wait=False)
 
-@app.post("/recommendations", response_model=RecommendationResponse)
-async def get_news_recommendations(request: RecommendationRequest):
-    if not app.state.services_ready:
-        raise HTTPException(status_code=503, detail="추천 서비스가 준비되지 않았습니다.")
-
-    # 1. 개인화된 쿼리 생성
-    personalized_query = request.query
-    if request.user_id:
-        personalized_query = create_personalized_query(request.user_id, request.query, request.profile_context)
-        print(f"사용자 {request.user_id}의 개인화된 쿼리: {personalized_query}")
-
-    # 2. 사용자 쿼리에서 키워드 추출 및 개별 임베딩
-    user_keywords = extract_keywords_from_query(personalized_query)
+def _embed_user_keywords(query_text: str) -> Tuple[List[str], List[List[float]]]:
+    """쿼리에서 키워드를 추출하고 개별 임베딩합니다."""
+    user_keywords = extract_keywords_from_query(query_text)
     if not user_keywords:
-        return RecommendationResponse(user_query_keywords=[], recommended_news=[], success=False, error_message="쿼리에서 키워드를 추출할 수 없습니다.")
-    
-    # 3. 사용자 관심사 업데이트 (새로운 키워드 학습)
-    if request.user_id:
-        # 프로필 컨텍스트에서 키워드 추출하여 사용자 관심사에 저장
-        if request.profile_context:
-            profile_keywords = extract_profile_keywords(request.profile_context)
-            if profile_keywords:
-                # 기존 관심사와 프로필 키워드를 결합
-                existing_interests = get_user_interests(request.user_id)
-                combined_interests = list(set(existing_interests + profile_keywords))
-                update_user_interests(request.user_id, combined_interests)
-                print(f"프로필 키워드를 사용자 관심사에 추가: {profile_keywords}")
-        
-        # 쿼리에서 추출한 키워드도 업데이트
-        update_user_interests(request.user_id, user_keywords)
-    
-    user_keyword_embeddings = embed_keywords_individually(user_keywords)
+        return [], []
+    return user_keywords, embed_keywords_individually(user_keywords)
 
+def _retrieve_candidate_articles(query_text: str) -> List[dict]:
+    """전체 쿼리 임베딩으로 Pinecone 후보를 찾고, MongoDB에서 상세 정보와 키워드 벡터를 준비합니다."""
     # 4. Pinecone에서 전체 쿼리 임베딩 기반으로 후보군 1차 필터링
-    query_content_embedding = embed_keywords_individually([personalized_query])[0]
+    query_content_embedding = embed_keywords_individually([query_text])[0]
+    if not query_content_embedding:
+        return []
     candidate_matches = pinecone_manager.query_vector(
         vector=query_content_embedding,
         top_k=500,  # [수정됨] 2차 랭킹을 위해 후보군을 500개로 확보
@@ -304,20 +341,90 @@ async def get_news_recommendations(request: RecommendationRequest):
     # 5. MongoDB에서 후보 기사의 상세 정보 조회
     articles_from_mongo = list(articles_collection.find(
         {"ID": {"$in": candidate_ids}},
-        {"ID": 1, "title": 1, "url": 1, "summary": 1, "published_at": 1, "llm_individual_keyword_embeddings": 1}
+        {"ID": 1, "title": 1, "url": 1, "summary": 1, "published_at": 1,
+         "llm_keyword_vector_ids": 1, "llm_individual_keyword_embeddings": 1}
     ))
 
-    # 6. 각 후보 기사별로 키워드 유사도 점수 계산 (2차 정밀 랭킹)
-    scored_news_items = []
+    # 키워드 ID로 저장된 기사들의 벡터를 한 번의 조회로 메모리 행렬에 준비합니다.
+    if keyword_vector_index is not None:
+        try:
+            keyword_vector_index.ensure({kid for article in articles_from_mongo for kid in article.get("llm_keyword_vector_ids") or []})
+        except Exception as e:
+            print(f"키워드 벡터 사전 조회 중 오류: {e}")
+    return articles_from_mongo
+
+def _update_user_interests_from_request(request: RecommendationRequest, user_keywords: List[str]):
+    """사용자 관심사 업데이트 (새로운 키워드 학습)"""
+    # 프로필 컨텍스트에서 키워드 추출하여 사용자 관심사에 저장
+    if request.profile_context:
+        profile_keywords = extract_profile_keywords(request.profile_context)
+        if profile_keywords:
+            # 기존 관심사와 프로필 키워드를 결합
+            existing_interests = get_user_interests(request.user_id)
+            combined_interests = list(set(existing_interests + profile_keywords))
+            update_user_interests(request.user_id, combined_interests)
+            print(f"프로필 키워드를 사용자 관심사에 추가: {profile_keywords}")
+
+    # 쿼리에서 추출한 키워드도 업데이트
+    update_user_interests(request.user_id, user_keywords)
+
+def _score_candidate_articles(user_keyword_embeddings: List[List[float]], articles_from_mongo: List[dict]) -> List[dict]:
+    """각 후보 기사별로 키워드 유사도 점수 계산 (2차 정밀 랭킹)"""
+    # 실패한(빈) 사용자 키워드 임베딩은 제외하고, 모든 후보를 한 번의 행렬곱으로 점수화합니다.
+    user_keyword_embeddings = [embedding for embedding in user_keyword_embeddings if embedding]
+    dim = len(user_keyword_embeddings[0]) if user_keyword_embeddings else 0
+    scored_articles, article_keyword_blocks = [], []
     for article in articles_from_mongo:
-        article_keyword_embeddings = article.get("llm_individual_keyword_embeddings")
-        if not article_keyword_embeddings: continue
-        similarity_score = calculate_keyword_similarity(user_keyword_embeddings, article_keyword_embeddings)
-        scored_news_items.append({
-            "id": article.get("ID"), "title": article.get("title"), "url": article.get("url"),
-            "summary": article.get("summary"), "published_at": article.get("published_at"),
-            "similarity_score": similarity_score,
-        })
+        keyword_ids = article.get("llm_keyword_vector_ids")
+        if keyword_ids and keyword_vector_index is not None:
+            article_keyword_embeddings = keyword_vector_index.vectors(keyword_ids)
+        else:
+            # 키워드 ID가 없는 이전 문서는 문서에 저장된 벡터를 그대로 사용
+            article_keyword_embeddings = article.get("llm_individual_keyword_embeddings")
+        if article_keyword_embeddings is None or len(article_keyword_embeddings) == 0: continue
+        if dim and len(article_keyword_embeddings[0]) != dim: continue
+        scored_articles.append(article)
+        article_keyword_blocks.append(article_keyword_embeddings)
+
+    scored_news_items = []
+    if scored_articles:
+        if dim:
+            packed_embeddings, offsets = pack_keyword_embeddings(article_keyword_blocks, dim)
+            similarity_scores = score_articles_vectorized(user_keyword_embeddings, packed_embeddings, offsets)
+        else:
+            similarity_scores = np.zeros(len(scored_articles), dtype=np.float32)
+        for article, similarity_score in zip(scored_articles, similarity_scores):
+            scored_news_items.append({
+                "id": article.get("ID"), "title": article.get("title"), "url": article.get("url"),
+                "summary": article.get("summary"), "published_at": article.get("published_at"),
+                "similarity_score": float(similarity_score),
+            })
+    return scored_news_items
+
+@app.post("/recommendations", response_model=RecommendationResponse)
+async def get_news_recommendations(request: RecommendationRequest):
+    if not app.state.services_ready:
+        raise HTTPException(status_code=503, detail="추천 서비스가 준비되지 않았습니다.")
+
+    # 1. 개인화된 쿼리 생성
+    personalized_query = request.query
+    if request.user_id:
+        personalized_query = await _run_blocking(create_personalized_query, request.user_id, request.query, request.profile_context)
+        print(f"사용자 {request.user_id}의 개인화된 쿼리: {personalized_query}")
+
+    # 2~5. 키워드 추출·임베딩과 쿼리 임베딩·후보 조회는 서로 독립적이므로 동시에 실행합니다.
+    (user_keywords, user_keyword_embeddings), articles_from_mongo = await asyncio.gather(
+        _run_blocking(_embed_user_keywords, personalized_query),
+        _run_blocking(_retrieve_candidate_articles, personalized_query),
+    )
+    if not user_keywords:
+        return RecommendationResponse(user_query_keywords=[], recommended_news=[], success=False, error_message="쿼리에서 키워드를 추출할 수 없습니다.")
+
+    # 3. 사용자 관심사 업데이트와 6. 2차 랭킹을 동시에 실행
+    pending = [_run_blocking(_score_candidate_articles, user_keyword_embeddings, articles_from_mongo)]
+    if request.user_id:
+        pending.append(_run_blocking(_update_user_interests_from_request, request, user_keywords))
+    scored_news_items = (await asyncio.gather(*pending))[0]
 
     # 7. 최종 추천 목록 생성
     scored_news_items.sort(key=lambda x: x["similarity_score"], reverse=True)
@@ -29,84 +29,96 @@ from src.config_loader.settings import SETTINGS
 # pipeline_stages 모듈 import (Celery task 등록을 위해)
 # 이 부분은 삭제 - initial_checks.py에서 직접 태스크를 정의하므로 불필요
 
-# 필요한 클라이언트 클래스 임포트 (기존 코드에서 가져옴)
-from pymongo import MongoClient
-import certifi
-from src.db.vector_db import PineconeDB
-from openai import OpenAI
+# 필요한 클라이언트는 리소스 팩토리 안에서 임포트합니다 (beat/수집기 등 워커가 아닌 프로세스는 로드하지 않음).
+from src.worker_resources import WorkerResourceRegistry
 
 print(f"[{datetime.now()}] All top-level imports in celery_app.py have been completed.")
 
-# --- 전역 리소스 초기화 ---
-worker_resources = {}
-initialization_errors = []
+# --- 워커 리소스 (지연 초기화) ---
+# 각 클라이언트는 태스크에서 처음 worker_resources.get(...)을 호출할 때, 그 프로세스 안에서 만들어집니다.
+WORKER_RESOURCES_CONFIG = SETTINGS.get('WORKER_RESOURCES', {})
+worker_resources = WorkerResourceRegistry(
+    health_check_interval=WORKER_RESOURCES_CONFIG.get('HEALTH_CHECK_INTERVAL_SECONDS', 300),
+    retry_after=WORKER_RESOURCES_CONFIG.get('RETRY_AFTER_SECONDS', 30),
+)
+# 현재 초기화에 실패한 리소스의 오류 메시지 (리소스 이름 → 메시지)
+initialization_errors = worker_resources.errors
 
-print(f"[{datetime.now()}] Attempting GLOBAL (module-level) resource initialization.")
 
-try:
-    # MongoDB 초기화
+def _create_mongo_client():
+    from pymongo import MongoClient
+    import certifi
+
     # SETTINGS에서 MONGO_URI를 읽어옵니다.
     mongo_uri = SETTINGS.get('MONGO_URI')
     if not mongo_uri:
         raise ValueError("MONGO_URI not set in config.yaml or environment variables.")
-    
     # SSL/TLS 설정은 MongoDB URI에 포함될 수도 있고, certifi가 사용될 수도 있습니다.
-    # 여기서는 certifi를 사용하여 CA 인증서를 지정하는 일반적인 방법을 보여줍니다.
     mongo_client = MongoClient(mongo_uri, tlsCAFile=certifi.where())
-    # MongoDB 연결 테스트 (필요한 경우)
-    mongo_client.admin.command('ping') 
-    worker_resources['mongo_client'] = mongo_client
-    
-    # MongoDB 컬렉션들 초기화
-    mongo_db_name = SETTINGS.get('MONGO_DB_NAME', 'newsdb')
-    mongo_articles_collection_name = SETTINGS.get('MONGO_ARTICLES_COLLECTION_NAME', 'articles')
-    mongo_blacklist_collection_name = SETTINGS.get('MONGO_BLACKLIST_COLLECTION_NAME', 'Filter3')
-    
-    mongo_db = mongo_client[mongo_db_name]
-    articles_collection = mongo_db[mongo_articles_collection_name]
-    blacklist_collection = mongo_db[mongo_blacklist_collection_name]
-    
-    worker_resources['articles_collection'] = articles_collection
-    worker_resources['blacklist_collection'] = blacklist_collection
-    
-    print(f"[{datetime.now()}] MongoDB client initialized successfully.")
-    print(f"[{datetime.now()}] MongoDB collections initialized: {mongo_articles_collection_name}, {mongo_blacklist_collection_name}")
-
-    # PineconeDB 초기화
-    # SETTINGS에서 Pinecone 설정을 읽어옵니다.
-    pinecone_api_key = SETTINGS.get('PINECONE_API_KEY')
-    pinecone_environment = SETTINGS.get('PINECONE_ENVIRONMENT', 'us-east-1')
-    pinecone_index_name = SETTINGS.get('PINECONE_INDEX_NAME', 'news-embedding-3')
-    
-    if not pinecone_api_key:
-        raise ValueError("PINECONE_API_KEY not set in config.yaml or environment variables.")
+    mongo_client.admin.command('ping')
+    print(f"[{datetime.now()}] MongoDB client initialized successfully (pid {os.getpid()}).")
+    return mongo_client
+
 
+def _create_pinecone_manager():
+    from src.db.vector_db import PineconeDB
+
+    if not SETTINGS.get('PINECONE_API_KEY'):
+        raise ValueError("PINECONE_API_KEY not set in config.yaml or environment variables.")
     pinecone_db = PineconeDB()
-    worker_resources['pinecone_manager'] = pinecone_db
-    print(f"[{datetime.now()}] PineconeDB client initialized successfully.")
+    print(f"[{datetime.now()}] PineconeDB client initialized successfully (pid {os.getpid()}).")
+    return pinecone_db
+
+
+def _create_openai_client():
+    from openai import OpenAI
+    from src.openai_rate_limiter import get_rate_limited_openai_client
 
-    # OpenAI 클라이언트 초기화
-    # SETTINGS에서 OPENAI_API_KEY를 읽어옵니다.
     openai_api_key = SETTINGS.get('OPENAI_API_KEY')
     if not openai_api_key:
         raise ValueError("OPENAI_API_KEY not set in config.yaml or environment variables.")
-    
     openai_client = OpenAI(api_key=openai_api_key)
-    worker_resources['openai_client'] = openai_client
-    print(f"[{datetime.now()}] OpenAI client initialized successfully.")
+    print(f"[{datetime.now()}] OpenAI client initialized successfully (pid {os.getpid()}).")
+    # 파이프라인 호출은 batch 우선순위로 공유 속도 제한기를 거칩니다 (src/openai_rate_limiter.py).
+    return get_rate_limited_openai_client(openai_client, "batch")
 
-    # 다른 API 키들도 SETTINGS에서 가져와서 필요한 곳에 전달하거나 전역으로 설정할 수 있습니다.
-    worker_resources['DART_API_KEY'] = SETTINGS.get('DART_API_KEY')
-    worker_resources['NAVER_CLIENT_ID'] = SETTINGS.get('NAVER_CLIENT_ID')
-    worker_resources['NAVER_CLIENT_SECRET'] = SETTINGS.get('NAVER_CLIENT_SECRET')
-    
-    # 모델명들 추가
-    worker_resources['embedding_model_name'] = SETTINGS.get('SHARED_EMBEDDING_MODEL_NAME', 'text-embedding-3-small')
 
-except Exception as e:
-    initialization_errors.append(f"Global resource initialization failed: {e}\n{traceback.format_exc()}")
-    print(f"[{datetime.now()}] CRITICAL ERROR during global resource initialization: {e}")
-    print(traceback.format_exc()) # 스택 트레이스 출력
+def _mongo_collection(setting_name, default_name):
+    def factory():
+        mongo_db = worker_resources.get('mongo_client')[SETTINGS.get('MONGO_DB_NAME', 'newsdb')]
+        return mongo_db[SETTINGS.get(setting_name, default_name)]
+    return factory
+
+
+# MongoDB: 주기적으로 ping하고, 실패하면 클라이언트와 컬렉션 객체를 다시 만듭니다.
+worker_resources.register('mongo_client', _create_mongo_client,
+                          health_check=lambda client: client.admin.command('ping'),
+                          close=lambda client: client.close())
+worker_resources.register('articles_collection',
+                          _mongo_collection('MONGO_ARTICLES_COLLECTION_NAME', 'articles'),
+                          depends_on=('mongo_client',))
+worker_resources.register('blacklist_collection',
+                          _mongo_collection('MONGO_BLACKLIST_COLLECTION_NAME', 'Filter3'),
+                          depends_on=('mongo_client',))
+worker_resources.register('keyword_vectors_collection',
+                          _mongo_collection('MONGO_KEYWORD_VECTORS_COLLECTION_NAME', 'keyword_vectors'),
+                          depends_on=('mongo_client',))
+
+# Pinecone: 인덱스 통계 조회로 연결 상태를 확인합니다.
+worker_resources.register('pinecone_manager', _create_pinecone_manager,
+                          health_check=lambda manager: manager.get_index().describe_index_stats())
+
+# OpenAI 클라이언트는 요청마다 HTTP 연결 풀을 사용하므로 별도 헬스 체크를 하지 않습니다.
+worker_resources.register('openai_client', _create_openai_client,
+                          close=lambda client: client.close())
+
+# 다른 API 키들도 SETTINGS에서 가져와서 필요한 곳에 전달하거나 전역으로 설정할 수 있습니다.
+worker_resources.register_value('DART_API_KEY', SETTINGS.get('DART_API_KEY'))
+worker_resources.register_value('NAVER_CLIENT_ID', SETTINGS.get('NAVER_CLIENT_ID'))
+worker_resources.register_value('NAVER_CLIENT_SECRET', SETTINGS.get('NAVER_CLIENT_SECRET'))
+
+# 모델명들 추가
+worker_resources.register_value('embedding_model_name', SETTINGS.get('SHARED_EMBEDDING_MODEL_NAME', 'text-embedding-3-small'))
 
 # Celery 앱 인스턴스 생성
 # SETTINGS에서 CELERY_BROKER_URL과 CELERY_RESULT_BACKEND를 가져옵니다.
@@ -114,6 +126,16 @@ app = Celery('aigen_science',
              broker=SETTINGS.get('CELERY_BROKER_URL', 'redis://redis:6379/0'),
              backend=SETTINGS.get('CELERY_RESULT_BACKEND', 'redis://redis:6379/0'))
 
+# 파이프라인 단계별 큐 라우팅과 우선순위
+from src.pipeline_stages.stage_routing import configure_stage_queues
+if configure_stage_queues(app):
+    print(f"[{datetime.now()}] Pipeline stage routes configured: {sorted({r['queue'] for r in app.conf.task_routes.values()})}")
+
+# 파이프라인 메시지 직렬화 (큐별 msgpack+zstd / JSON)
+from src.pipeline_stages.message_serializer import register_pipeline_serializer
+if register_pipeline_serializer(app):
+    print(f"[{datetime.now()}] Pipeline message serializer registered. Accept content: {app.conf.accept_content}")
+
 # Celery Beat 스케줄 설정 (여기가 핵심 변경 사항 중 하나)
 app.conf.beat_schedule = {
     'run-news-collector-every-hour': {
@@ -122,6 +144,24 @@ app.conf.beat_schedule = {
         'args': (), # 태스크에 전달할 인수가 있다면 여기에 튜플로 넣습니다.
         'options': {'queue': 'default'} # 필요에 따라 큐 지정
     },
+    'rebuild-seen-article-filter-daily': {
+        'task': 'src.pipeline_stages.seen_filter.rebuild_seen_filter_task',
+        'schedule': crontab(minute=30, hour=4),
+        'args': (),
+        'options': {'queue': 'default'}
+    },
+    'rebuild-near-duplicate-index-daily': {
+        'task': 'src.pipeline_stages.near_duplicate.rebuild_near_duplicate_index_task',
+        'schedule': crontab(minute=45, hour=4),
+        'args': (),
+        'options': {'queue': 'default'}
+    },
+    'drain-collector-spill-every-5-minutes': {
+        'task': 'src.celery_app.drain_collector_spill_task',
+        'schedule': crontab(minute='*/5'),
+        'args': (),
+        'options': {'queue': 'default'}
+    },
     # 여기에 다른 주기적인 Celery Beat 태스크를 추가할 수 있습니다.
 }
 app.conf.timezone = 'Asia/Seoul' # 시간대 설정 (한국 시간으로 매 시간 0분)
@@ -138,6 +178,8 @@ import src.pipeline_stages.categorization
 import src.pipeline_stages.content_analysis
 import src.pipeline_stages.embedding_generator
 import src.pipeline_stages.finalization
+import src.pipeline_stages.seen_filter
+import src.pipeline_stages.near_duplicate
 # --- Celery 태스크 정의 ---
 
 # 뉴스 수집 태스크 (news_collector.py의 main 함수 호출)
@@ -147,12 +189,7 @@ def collect_news_task():
     주기적으로 뉴스 데이터를 수집하는 Celery 태스크.
     news_collector.py의 main 함수를 호출합니다.
     """
-    if initialization_errors:
-        print(f"[{datetime.now()}] 뉴스 수집 태스크: 전역 리소스 초기화 오류로 인해 실행되지 않습니다.")
-        for error in initialization_errors:
-            print(error)
-        return
-        
+    # 수집기는 MongoDB/Pinecone/OpenAI 클라이언트를 사용하지 않으므로 워커 리소스 상태와 관계없이 실행합니다.
     print(f"[{datetime.now()}] 뉴스 수집 태스크 시작...")
     try:
         # Lazy import로 순환 참조 방지
@@ -166,6 +203,20 @@ def collect_news_task():
         print(f"[{datetime.now()}] ERROR: 뉴스 수집 태스크 오류 발생: {e}")
         print(traceback.format_exc()) # 상세 오류 로그 출력
 
+# 큐 적체로 미뤄 둔 수집 기사 재전송 태스크
+@app.task(ignore_result=True)
+def drain_collector_spill_task():
+    """
+    수집기 유입 제어(COLLECTOR_ADMISSION)로 스필 버퍼에 미뤄 둔 기사를,
+    파이프라인 큐가 LOW_WATERMARK 아래로 내려간 만큼 다시 보냅니다.
+    """
+    try:
+        from src.news_collector import news_collector
+        news_collector.drain_spilled_articles()
+    except Exception as e:
+        print(f"[{datetime.now()}] ERROR: 스필 기사 재전송 중 오류 발생: {e}")
+        print(traceback.format_exc())
+
 # PDF 처리 태스크 (예시)
 @app.task
 def process_pdf_task(file_path):
@@ -174,7 +225,7 @@ def process_pdf_task(file_path):
     """
     if initialization_errors:
         print(f"[{datetime.now()}] PDF 처리 태스크: 전역 리소스 초기화 오류로 인해 실행되지 않습니다.")
-        for error in initialization_errors:
+        for error in initialization_errors.values():
             print(error)
         return
 
@@ -194,11 +245,8 @@ def process_pdf_task(file_path):
 @worker_process_shutdown.connect
 def cleanup_worker_resources(sender=None, **kwargs):
     print(f"[{datetime.now()}] Celery worker shutting down. Cleaning up resources...")
-    if 'mongo_client' in worker_resources and worker_resources['mongo_client']:
-        worker_resources['mongo_client'].close()
-        print(f"[{datetime.now()}] MongoDB client closed.")
-    # PineconeDB는 명시적인 close 메서드가 없을 수 있습니다.
-    # 필요한 다른 리소스 정리 로직을 여기에 추가합니다.
+    # 이 프로세스에서 실제로 만들어진 클라이언트만 닫습니다.
+    worker_resources.close_all()
     print(f"[{datetime.now()}] Resource cleanup complete.")
 
 # --- 유틸리티 함수 (기존 코드에서 가져옴) ---
@@ -40,6 +40,7 @@ MONGO_URI = os.environ.get('MONGO_URI', CONFIG.get('MONGO_URI'))
 MONGO_DB_NAME = os.environ.get('MONGO_DB_NAME', CONFIG.get('MONGO_DB_NAME', 'newsdb'))
 MONGO_ARTICLES_COLLECTION_NAME = os.environ.get('MONGO_ARTICLES_COLLECTION_NAME', CONFIG.get('MONGO_ARTICLES_COLLECTION_NAME', 'articles'))
 MONGO_BLACKLIST_COLLECTION_NAME = os.environ.get('MONGO_BLACKLIST_COLLECTION_NAME', CONFIG.get('MONGO_BLACKLIST_COLLECTION_NAME', 'Filter3'))
+MONGO_KEYWORD_VECTORS_COLLECTION_NAME = os.environ.get('MONGO_KEYWORD_VECTORS_COLLECTION_NAME', CONFIG.get('MONGO_KEYWORD_VECTORS_COLLECTION_NAME', 'keyword_vectors'))
 
 # OpenAI 설정
 OPENAI_API_KEY = os.environ.get('OPENAI_API_KEY', CONFIG.get('OPENAI_API_KEY'))
@@ -67,6 +68,7 @@ NEWS_ARTICLES_API_SERVER_HOST = CONFIG.get('NEWS_ARTICLES_API_SERVER_HOST', '0.0
 NEWS_ARTICLES_API_SERVER_PORT = CONFIG.get('NEWS_ARTICLES_API_SERVER_PORT', 8002)
 NEWS_RECOMMENDATION_API_URL = CONFIG.get('NEWS_RECOMMENDATION_API_URL', 'http://news-recommendation-api:8001')
 NEWS_REC_SERVER_PORT = CONFIG.get('NEWS_REC_SERVER_PORT', 8001)
+NEWS_REC_BLOCKING_WORKERS = CONFIG.get('NEWS_REC_BLOCKING_WORKERS', 32)
 RAG_API_URL = CONFIG.get('RAG_API_URL', 'http://localhost:8010/rag-chat')
 
 # 외부 API 키들
@@ -111,6 +113,206 @@ LLM_CATEGORIZATION = CONFIG.get('LLM_CATEGORIZATION', {
     'MAX_TOTAL_SUB_CATS_PER_ARTICLE': 9
 })
 
+# 뉴스 수집기 동시 요청 설정
+COLLECTOR_FETCH = CONFIG.get('COLLECTOR_FETCH', {
+    'MAX_IN_FLIGHT': 32,
+    'PER_HOST_LIMIT': 4,
+    'TIMEOUT_SECONDS': 15,
+    'CONDITIONAL_GET': True
+})
+
+# 소스별 하이워터마크 설정 (이미 본 항목은 수집기에서 바로 제외)
+COLLECTOR_WATERMARK = CONFIG.get('COLLECTOR_WATERMARK', {
+    'ENABLED': True,
+    'RECENT_ID_RING_SIZE': 500,
+    'GRACE_MINUTES': 60
+})
+
+# 수집기 일괄 초기 검사 설정 (윈도우당 컬렉션별 $in 쿼리 한 번)
+COLLECTOR_BATCH_CHECKS = CONFIG.get('COLLECTOR_BATCH_CHECKS', {
+    'ENABLED': True,
+    'WINDOW_SIZE': 200
+})
+
+# 이미 본 기사 ID Bloom 필터 설정 (initial_checks 중복 조회 생략용)
+SEEN_FILTER = CONFIG.get('SEEN_FILTER', {
+    'ENABLED': True,
+    'SIZE_BITS': 33554432,
+    'NUM_HASHES': 7
+})
+
+# 임베딩 마이크로 배칭 설정 (여러 기사의 텍스트를 한 번의 embeddings.create 호출로 전송)
+EMBEDDING_BATCH = CONFIG.get('EMBEDDING_BATCH', {
+    'ENABLED': True,
+    'MAX_BATCH_INPUTS': 256,
+    'MAX_BATCH_TOKENS': 100000,
+    'MAX_WAIT_MS': 50,
+    'RESULT_TIMEOUT_SECONDS': 60
+})
+
+# 임베딩 캐시 설정 (모델명 + 정규화 텍스트 해시 키, 로컬 LRU + Redis)
+EMBEDDING_CACHE = CONFIG.get('EMBEDDING_CACHE', {
+    'ENABLED': True,
+    'LOCAL_MAX_ITEMS': 20000,
+    'TTL_SECONDS': 2592000,
+    'DTYPE': 'float32'
+})
+
+# 전역 키워드 벡터 사전 설정 (기사에는 키워드 ID만 저장)
+KEYWORD_VECTORS = CONFIG.get('KEYWORD_VECTORS', {
+    'ENABLED': True,
+    'PRELOAD_ON_STARTUP': False
+})
+
+# 파이프라인 단계 결합 설정 (BROKER_STAGES에 없는 단계는 앞 단계 워커에서 바로 실행)
+PIPELINE_FUSION = CONFIG.get('PIPELINE_FUSION', {
+    'ENABLED': True,
+    'BROKER_STAGES': ['content_extraction', 'categorization', 'embedding_generation']
+})
+
+# 단계 간 Claim-check 전달 설정 (브로커 메시지에는 기사 ID와 버전만 전달)
+CLAIM_CHECK = CONFIG.get('CLAIM_CHECK', {
+    'ENABLED': True,
+    'TTL_SECONDS': 86400
+})
+
+# Celery 메시지 직렬화 설정 (큐 이름 → 직렬화 방식, 목록에 없는 큐는 DEFAULT)
+MESSAGE_SERIALIZER = CONFIG.get('MESSAGE_SERIALIZER', {
+    'ENABLED': True,
+    'DEFAULT': 'json',
+    'QUEUES': {
+        'celery': 'msgpack-zstd',
+        'pipeline.intake': 'msgpack-zstd',
+        'pipeline.fetch': 'msgpack-zstd',
+        'pipeline.llm': 'msgpack-zstd',
+        'pipeline.analysis': 'msgpack-zstd',
+        'pipeline.embedding': 'msgpack-zstd',
+        'pipeline.finalize': 'msgpack-zstd'
+    },
+    'ZSTD_LEVEL': 3
+})
+
+# 워커 리소스(MongoDB/Pinecone/OpenAI 클라이언트) 지연 초기화 설정
+WORKER_RESOURCES = CONFIG.get('WORKER_RESOURCES', {
+    'HEALTH_CHECK_INTERVAL_SECONDS': 300,
+    'RETRY_AFTER_SECONDS': 30
+})
+
+# 파이프라인 단계별 큐 설정 (단계 이름 → 큐, 우선순위는 0이 가장 높음)
+PIPELINE_QUEUES = CONFIG.get('PIPELINE_QUEUES', {
+    'ENABLED': True,
+    'QUEUES': {},
+    'PRIORITIES': {},
+    'PREFETCH_MULTIPLIER': 1
+})
+
+# 파이프라인 트레이싱/단계별 지표 설정
+TRACING = CONFIG.get('TRACING', {
+    'ENABLED': True,
+    'KEY_PREFIX': 'pipeline:metrics'
+})
+
+# 수집기 → 파이프라인 유입 제어 설정 (큐 깊이 기반 backpressure)
+COLLECTOR_ADMISSION = CONFIG.get('COLLECTOR_ADMISSION', {
+    'ENABLED': True,
+    'HIGH_WATERMARK': 5000,
+    'LOW_WATERMARK': 2000,
+    'MAX_WAIT_SECONDS': 60,
+    'POLL_SECONDS': 2,
+    'SPILL_MAX_ITEMS': 50000,
+    'DEFER_SOURCES': ['Google News RSS']
+})
+
+# OpenAI 호출 공유 속도 제한 설정 (모델별 RPM/TPM 토큰 버킷, Redis)
+OPENAI_RATE_LIMITS = CONFIG.get('OPENAI_RATE_LIMITS', {
+    'ENABLED': True,
+    'KEY_PREFIX': 'openai_ratelimit',
+    'SAFETY_FACTOR': 0.9,
+    'DEFAULT': {'RPM': 500, 'TPM': 200000},
+    'MODELS': {
+        'gpt-4.1-nano': {'RPM': 500, 'TPM': 200000},
+        'gpt-4.1': {'RPM': 500, 'TPM': 30000},
+        'text-embedding-3-small': {'RPM': 3000, 'TPM': 1000000},
+    },
+    'BATCH_RESERVE_RATIO': 0.2,
+    'MAX_WAIT_SECONDS': {'interactive': 10, 'batch': 120},
+    'MAX_RATE_LIMIT_RETRIES': 3,
+    'DEFAULT_COMPLETION_TOKENS': 512,
+    'LANGCHAIN_ESTIMATED_TOKENS': 2000
+})
+
+# 최종 저장 bulk writer 설정 (MongoDB bulk_write + Pinecone 다중 벡터 upsert)
+FINALIZATION_BULK_WRITE = CONFIG.get('FINALIZATION_BULK_WRITE', {
+    'ENABLED': True,
+    'MAX_BATCH_ARTICLES': 100,
+    'MAX_WAIT_MS': 200,
+    'FLUSH_TIMEOUT_SECONDS': 60,
+    'PINECONE_MAX_BATCH_VECTORS': 100,
+    'PINECONE_MAX_REQUEST_BYTES': 1500000
+})
+
+# 최근 기사 근접 중복 검사 설정 (본문 MinHash-LSH, Redis 인덱스)
+NEAR_DUPLICATE = CONFIG.get('NEAR_DUPLICATE', {
+    'ENABLED': True,
+    'NUM_PERM': 128,
+    'BANDS': 32,
+    'SHINGLE_SIZE': 5,
+    'THRESHOLD': 0.7,
+    'MIN_CHARS': 200,
+    'WINDOW_DAYS': 7,
+    'KEY_PREFIX': 'pipeline:neardup',
+    'SKIP_SOURCES': ['DART']
+})
+
+# 기사 HTML 수집 설정 (본문 추출 단계, 워커 프로세스당 하나의 연결 풀 세션)
+HTML_FETCH = CONFIG.get('HTML_FETCH', {
+    'TIMEOUT_SECONDS': 15,
+    'POOL_CONNECTIONS': 100,
+    'POOL_MAXSIZE': 64,
+    'RETRIES': 1,
+    'CRAWLER_FALLBACK': True
+})
+
+# 기사 HTML 로컬 디스크 캐시 설정 (추출 재처리 시 원본 서버 대신 사용, 태스크 재시도는 새로 받음)
+HTML_CACHE = CONFIG.get('HTML_CACHE', {
+    'ENABLED': True,
+    'DIRECTORY': 'data/html_cache',
+    'MAX_BYTES': 2147483648,
+    'TTL_HOURS': 72,
+    'MAX_ENTRY_BYTES': 5000000,
+    'EVICT_TARGET_RATIO': 0.9,
+    'EVICT_CHECK_SECONDS': 300,
+    'ZSTD_LEVEL': 3
+})
+
+# 호스트별 본문 추출 전략 학습 설정 (성공한 추출기/선택자를 먼저 시도, LLM 의존 호스트 표시)
+EXTRACTION_STRATEGY = CONFIG.get('EXTRACTION_STRATEGY', {
+    'ENABLED': True,
+    'MIN_ATTEMPTS': 5,
+    'MIN_SUCCESS_RATE': 0.8,
+    'LLM_FLAG_RATIO': 0.8,
+    'MAX_HISTORY': 500,
+    'STATS_TTL_DAYS': 30,
+    'CACHE_SECONDS': 300,
+    'KEY_PREFIX': 'pipeline:extraction_strategy'
+})
+
+# LLM 본문 추출 전 HTML 축소 설정 (본문이 아닌 마크업 제거, 글이 가장 빽빽한 영역의 텍스트 블록만 전송)
+HTML_PRUNING = CONFIG.get('HTML_PRUNING', {
+    'ENABLED': True,
+    'MAX_CHARS': 15000,
+    'MIN_CHARS': 200,
+    'BLOCK_PENALTY_CHARS': 25,
+    'CONTEXT_BLOCKS': 3,
+    'KEEP_TEXT_CHARS': 1000
+})
+
+# BeautifulSoup 본문 추출의 lxml 빠른 경로 설정 (lxml을 쓸 수 없거나 실패하면 기존 BeautifulSoup 경로 사용)
+LXML_EXTRACTION = CONFIG.get('LXML_EXTRACTION', {
+    'ENABLED': True,
+    'MIN_TEXT_COVERAGE': 0.5
+})
+
 # 필요한 경우 모든 설정을 한 번에 담는 SETTINGS 딕셔너리 또는 객체 생성
 SETTINGS = {
     'REDIS_HOST': REDIS_HOST,
@@ -121,6 +323,7 @@ SETTINGS = {
     'MONGO_DB_NAME': MONGO_DB_NAME,
     'MONGO_ARTICLES_COLLECTION_NAME': MONGO_ARTICLES_COLLECTION_NAME,
     'MONGO_BLACKLIST_COLLECTION_NAME': MONGO_BLACKLIST_COLLECTION_NAME,
+    'MONGO_KEYWORD_VECTORS_COLLECTION_NAME': MONGO_KEYWORD_VECTORS_COLLECTION_NAME,
     'OPENAI_API_KEY': OPENAI_API_KEY,
     'OPENAI_MODEL_NAME': OPENAI_MODEL_NAME,
     'OPENAI_RAG_MODEL': OPENAI_RAG_MODEL,
@@ -140,6 +343,7 @@ SETTINGS = {
     'NEWS_ARTICLES_API_SERVER_PORT': NEWS_ARTICLES_API_SERVER_PORT,
     'NEWS_RECOMMENDATION_API_URL': NEWS_RECOMMENDATION_API_URL,
     'NEWS_REC_SERVER_PORT': NEWS_REC_SERVER_PORT,
+    'NEWS_REC_BLOCKING_WORKERS': NEWS_REC_BLOCKING_WORKERS,
     'RAG_API_URL': RAG_API_URL,
     'DART_API_KEY': DART_API_KEY,
     'NAVER_CLIENT_ID': NAVER_CLIENT_ID,
@@ -160,6 +364,28 @@ SETTINGS = {
     'RAW_DATA_PATH': RAW_DATA_PATH,
     'REPLACEMENT_CHAR': REPLACEMENT_CHAR,
     'LLM_CATEGORIZATION': LLM_CATEGORIZATION,
+    'COLLECTOR_FETCH': COLLECTOR_FETCH,
+    'COLLECTOR_WATERMARK': COLLECTOR_WATERMARK,
+    'COLLECTOR_BATCH_CHECKS': COLLECTOR_BATCH_CHECKS,
+    'SEEN_FILTER': SEEN_FILTER,
+    'EMBEDDING_BATCH': EMBEDDING_BATCH,
+    'EMBEDDING_CACHE': EMBEDDING_CACHE,
+    'KEYWORD_VECTORS': KEYWORD_VECTORS,
+    'PIPELINE_FUSION': PIPELINE_FUSION,
+    'CLAIM_CHECK': CLAIM_CHECK,
+    'MESSAGE_SERIALIZER': MESSAGE_SERIALIZER,
+    'WORKER_RESOURCES': WORKER_RESOURCES,
+    'PIPELINE_QUEUES': PIPELINE_QUEUES,
+    'TRACING': TRACING,
+    'COLLECTOR_ADMISSION': COLLECTOR_ADMISSION,
+    'OPENAI_RATE_LIMITS': OPENAI_RATE_LIMITS,
+    'FINALIZATION_BULK_WRITE': FINALIZATION_BULK_WRITE,
+    'NEAR_DUPLICATE': NEAR_DUPLICATE,
+    'HTML_FETCH': HTML_FETCH,
+    'HTML_CACHE': HTML_CACHE,
+    'EXTRACTION_STRATEGY': EXTRACTION_STRATEGY,
+    'HTML_PRUNING': HTML_PRUNING,
+    'LXML_EXTRACTION': LXML_EXTRACTION,
 }
 
 print(f"[{datetime.now()}] Settings loaded. MONGO_URI preview: {str(SETTINGS.get('MONGO_URI'))[:30]}...")
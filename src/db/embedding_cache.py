@@ -0,0 +1,206 @@
+# src/db/embedding_cache.py
+"""
+(모델명, 정규화된 텍스트 해시)를 키로 하는 임베딩 캐시
+- 파이프라인(키워드), 뉴스 추천(사용자 키워드), RAG(쿼리), PDF 처리(키워드)가 함께 사용합니다.
+- 프로세스 로컬 LRU 계층 → Redis 계층 순으로 조회하고, 둘 다 없을 때만 임베딩 API를 호출합니다.
+- 벡터는 float32 또는 float16으로 패킹한 바이트로 저장합니다.
+"""
+import hashlib
+import os
+import re
+import struct
+import threading
+import time
+import unicodedata
+from collections import OrderedDict
+from typing import Callable, List, Optional
+
+import redis
+
+from src.config_loader.settings import SETTINGS
+
+EMBEDDING_CACHE_CONFIG = SETTINGS.get("EMBEDDING_CACHE", {})
+
+_WHITESPACE_RE = re.compile(r"\s+")
+_STRUCT_CODES = {"float32": "f", "float16": "e"}
+# Redis 오류 후 이 시간(초) 동안은 로컬 계층만 사용해 요청마다 연결 지연을 겪지 않도록 합니다.
+_REDIS_RETRY_AFTER_SECONDS = 30
+
+
+def normalize_text(text: str) -> str:
+    """유니코드 NFC 정규화 후 공백을 하나로 합칩니다. 대소문자는 의미가 달라질 수 있어 유지합니다."""
+    return _WHITESPACE_RE.sub(" ", unicodedata.normalize("NFC", text)).strip()
+
+
+class EmbeddingCache:
+    """로컬 LRU + Redis 2계층 임베딩 캐시."""
+
+    def __init__(self, local_max_items: int = 20000, ttl_seconds: int = 30 * 24 * 3600,
+                 dtype: str = "float32", redis_prefix: str = "embedding_cache"):
+        if dtype not in _STRUCT_CODES:
+            raise ValueError(f"EmbeddingCache: 지원하지 않는 dtype입니다: {dtype}")
+        self.local_max_items = max(0, int(local_max_items))
+        self.ttl_seconds = int(ttl_seconds) if ttl_seconds else None
+        self.dtype = dtype
+        self.redis_prefix = redis_prefix
+        self._local = OrderedDict()
+        self._lock = threading.Lock()
+        self._client = None
+        self._client_pid = None
+        self._redis_retry_at = 0.0
+        self._stats = {"local_hits": 0, "redis_hits": 0, "misses": 0, "stores": 0, "redis_errors": 0}
+
+    # --- 키 / 직렬화 ---
+    def cache_key(self, model_name: str, text: str) -> str:
+        digest = hashlib.sha256(normalize_text(text).encode("utf-8")).hexdigest()
+        # dtype을 키에 포함해 설정이 바뀌어도 다른 형식의 바이트를 잘못 해석하지 않도록 합니다.
+        return f"{self.redis_prefix}:{model_name}:{self.dtype}:{digest}"
+
+    def pack(self, vector: List[float]) -> bytes:
+        return struct.pack(f"<{len(vector)}{_STRUCT_CODES[self.dtype]}", *vector)
+
+    def unpack(self, data: bytes) -> List[float]:
+        code = _STRUCT_CODES[self.dtype]
+        return list(struct.unpack(f"<{len(data) // struct.calcsize(code)}{code}", data))
+
+    # --- Redis ---
+    def _get_client(self):
+        """Redis 클라이언트를 반환합니다. 최근 오류로 잠시 꺼둔 상태면 None."""
+        with self._lock:
+            if time.monotonic() < self._redis_retry_at:
+                return None
+            if self._client is None or self._client_pid != os.getpid():
+                self._client = redis.Redis(
+                    host=SETTINGS.get("REDIS_HOST"),
+                    port=SETTINGS.get("REDIS_PORT"),
+                    db=SETTINGS.get("REDIS_DB"),
+                    socket_timeout=2,
+                    socket_connect_timeout=2,
+                )
+                self._client_pid = os.getpid()
+            return self._client
+
+    def _on_redis_error(self, action: str, e: Exception):
+        with self._lock:
+            self._stats["redis_errors"] += 1
+            self._redis_retry_at = time.monotonic() + _REDIS_RETRY_AFTER_SECONDS
+        print(f"EmbeddingCache Warning: Redis {action} 실패, {_REDIS_RETRY_AFTER_SECONDS}초 동안 로컬 캐시만 사용합니다: {e}")
+
+    # --- 로컬 LRU ---
+    def _local_get(self, key: str) -> Optional[bytes]:
+        with self._lock:
+            data = self._local.get(key)
+            if data is not None:
+                self._local.move_to_end(key)
+            return data
+
+    def _local_put(self, key: str, data: bytes):
+        if self.local_max_items <= 0:
+            return
+        with self._lock:
+            self._local[key] = data
+            self._local.move_to_end(key)
+            while len(self._local) > self.local_max_items:
+                self._local.popitem(last=False)
+
+    def _count(self, name: str, amount: int = 1):
+        if amount:
+            with self._lock:
+                self._stats[name] += amount
+
+    # --- 조회 / 저장 ---
+    def get_many(self, model_name: str, texts: List[str]) -> List[Optional[List[float]]]:
+        """텍스트마다 캐시된 벡터 또는 None을 반환합니다."""
+        keys = [self.cache_key(model_name, text) for text in texts]
+        found = [self._local_get(key) for key in keys]
+        local_hits = sum(1 for data in found if data is not None)
+
+        redis_hits = 0
+        missing = [i for i, data in enumerate(found) if data is None]
+        client = self._get_client() if missing else None
+        if client is not None:
+            try:
+                values = client.mget([keys[i] for i in missing])
+                for i, data in zip(missing, values):
+                    if data:
+                        found[i] = data
+                        self._local_put(keys[i], data)
+                        redis_hits += 1
+            except Exception as e:
+                self._on_redis_error("조회", e)
+
+        self._count("local_hits", local_hits)
+        self._count("redis_hits", redis_hits)
+        self._count("misses", len(texts) - local_hits - redis_hits)
+        return [self.unpack(data) if data is not None else None for data in found]
+
+    def set_many(self, model_name: str, texts: List[str], vectors: List[List[float]]):
+        """비어 있지 않은 벡터만 두 계층에 저장합니다."""
+        entries = [(self.cache_key(model_name, text), self.pack(vector))
+                   for text, vector in zip(texts, vectors) if vector]
+        if not entries:
+            return
+        for key, data in entries:
+            self._local_put(key, data)
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            for key, data in entries:
+                pipe.set(key, data, ex=self.ttl_seconds)
+            pipe.execute()
+            self._count("stores", len(entries))
+        except Exception as e:
+            self._on_redis_error("저장", e)
+
+    def get_or_embed(self, model_name: str, texts: List[str],
+                     embed_fn: Callable[[List[str]], List[List[float]]]) -> List[List[float]]:
+        """
+        캐시에 없는 텍스트만 embed_fn으로 한 번에 임베딩하고 결과를 저장합니다.
+        embed_fn은 입력과 같은 순서·길이의 벡터 목록을 반환해야 하며, 실패한 항목은 빈 리스트입니다.
+        """
+        cached = self.get_many(model_name, texts)
+        missing_texts = [text for text, vector in zip(texts, cached) if vector is None]
+        if not missing_texts:
+            return cached
+        fresh = embed_fn(missing_texts)
+        self.set_many(model_name, missing_texts, fresh)
+        fresh_iter = iter(fresh)
+        return [vector if vector is not None else next(fresh_iter) for vector in cached]
+
+    def stats(self) -> dict:
+        with self._lock:
+            stats = dict(self._stats)
+            stats["local_items"] = len(self._local)
+        lookups = stats["local_hits"] + stats["redis_hits"] + stats["misses"]
+        stats["hit_rate"] = round((stats["local_hits"] + stats["redis_hits"]) / lookups, 4) if lookups else 0.0
+        return stats
+
+
+_embedding_cache: Optional[EmbeddingCache] = None
+_embedding_cache_lock = threading.Lock()
+
+
+def get_embedding_cache() -> Optional[EmbeddingCache]:
+    """설정에서 활성화된 경우 프로세스당 하나의 캐시 인스턴스를 반환합니다."""
+    global _embedding_cache
+    if not EMBEDDING_CACHE_CONFIG.get("ENABLED", True):
+        return None
+    with _embedding_cache_lock:
+        if _embedding_cache is None:
+            _embedding_cache = EmbeddingCache(
+                local_max_items=EMBEDDING_CACHE_CONFIG.get("LOCAL_MAX_ITEMS", 20000),
+                ttl_seconds=EMBEDDING_CACHE_CONFIG.get("TTL_SECONDS", 30 * 24 * 3600),
+                dtype=EMBEDDING_CACHE_CONFIG.get("DTYPE", "float32"),
+            )
+    return _embedding_cache
+
+
+def cached_embeddings(model_name: str, texts: List[str],
+                      embed_fn: Callable[[List[str]], List[List[float]]]) -> List[List[float]]:
+    """캐시가 꺼져 있으면 embed_fn을 그대로 호출하는 편의 함수."""
+    cache = get_embedding_cache()
+    if cache is None:
+        return embed_fn(texts)
+    return cache.get_or_embed(model_name, texts, embed_fn)
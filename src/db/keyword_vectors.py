@@ -0,0 +1,128 @@
+# src/db/keyword_vectors.py
+"""
+전역 키워드 임베딩 사전 (keyword → ID → vector)
+- 키워드 벡터는 keyword_vectors 컬렉션에 한 번만 저장하고, 기사 문서에는 키워드 ID 목록만 저장합니다.
+- ID는 (모델명, 정규화된 키워드)의 해시이므로 여러 워커가 동시에 등록해도 같은 값이 나옵니다.
+- 추천 서버는 KeywordVectorIndex로 필요한 벡터를 메모리 행렬에 올려 두고 ID를 행으로 변환합니다.
+"""
+import hashlib
+import threading
+from typing import Dict, Iterable, List, Optional
+
+import numpy as np
+from pymongo import UpdateOne
+
+from src.db.embedding_cache import normalize_text
+
+
+class KeywordVectorStore:
+    """keyword_vectors 컬렉션에 대한 등록/조회."""
+
+    def __init__(self, collection, model_name: str):
+        self.collection = collection
+        self.model_name = model_name
+
+    def keyword_id(self, keyword: str) -> str:
+        return hashlib.sha256(f"{self.model_name}\n{normalize_text(keyword)}".encode("utf-8")).hexdigest()[:24]
+
+    def register_many(self, keywords: List[str], vectors: List[List[float]]) -> List[str]:
+        """벡터가 있는 키워드를 사전에 등록하고, 입력 순서대로 그 ID 목록을 반환합니다."""
+        ids = []
+        operations = []
+        for keyword, vector in zip(keywords, vectors):
+            if not keyword or not vector:
+                continue
+            kid = self.keyword_id(keyword)
+            ids.append(kid)
+            operations.append(UpdateOne(
+                {"_id": kid},
+                {"$setOnInsert": {
+                    "keyword": normalize_text(keyword),
+                    "model": self.model_name,
+                    "dim": len(vector),
+                    "vector": np.asarray(vector, dtype="<f4").tobytes(),
+                }},
+                upsert=True,
+            ))
+        if operations:
+            self.collection.bulk_write(operations, ordered=False)
+        return ids
+
+    def fetch_many(self, keyword_ids: Iterable[str]) -> Dict[str, np.ndarray]:
+        keyword_ids = list(keyword_ids)
+        if not keyword_ids:
+            return {}
+        return {
+            doc["_id"]: np.frombuffer(doc["vector"], dtype="<f4")
+            for doc in self.collection.find({"_id": {"$in": keyword_ids}}, {"vector": 1})
+            if doc.get("vector")
+        }
+
+    def iter_all(self, batch_size: int = 5000):
+        for doc in self.collection.find({"model": self.model_name}, {"vector": 1}, batch_size=batch_size):
+            if doc.get("vector"):
+                yield doc["_id"], np.frombuffer(doc["vector"], dtype="<f4")
+
+
+class KeywordVectorIndex:
+    """키워드 ID를 메모리 상주 행렬의 행으로 변환합니다. 처음 보는 ID는 한 번의 $in 조회로 채웁니다."""
+
+    def __init__(self, store: KeywordVectorStore):
+        self.store = store
+        self._rows: Dict[str, int] = {}
+        self._matrix: Optional[np.ndarray] = None
+        self._size = 0
+        self._lock = threading.Lock()
+
+    def __len__(self):
+        return self._size
+
+    def _append(self, items: Dict[str, np.ndarray]):
+        if not items:
+            return
+        dim = len(next(iter(items.values())))
+        if self._matrix is None:
+            self._matrix = np.zeros((max(1024, len(items)), dim), dtype=np.float32)
+        needed = self._size + len(items)
+        if needed > self._matrix.shape[0]:
+            # 용량을 두 배씩 늘려 추가 비용을 상환합니다.
+            grown = np.zeros((max(needed, self._matrix.shape[0] * 2), self._matrix.shape[1]), dtype=np.float32)
+            grown[:self._size] = self._matrix[:self._size]
+            self._matrix = grown
+        for kid, vector in items.items():
+            if kid in self._rows or len(vector) != self._matrix.shape[1]:
+                continue
+            self._matrix[self._size] = vector
+            self._rows[kid] = self._size
+            self._size += 1
+
+    def preload(self) -> int:
+        """현재 모델의 모든 키워드 벡터를 메모리에 올립니다."""
+        loaded = {}
+        for kid, vector in self.store.iter_all():
+            loaded[kid] = vector
+            if len(loaded) >= 5000:
+                with self._lock:
+                    self._append(loaded)
+                loaded = {}
+        with self._lock:
+            self._append(loaded)
+        return self._size
+
+    def ensure(self, keyword_ids: Iterable[str]):
+        """메모리에 없는 ID들을 한 번에 조회해 행렬에 추가합니다."""
+        with self._lock:
+            missing = {kid for kid in keyword_ids if kid not in self._rows}
+        if not missing:
+            return
+        fetched = self.store.fetch_many(missing)
+        with self._lock:
+            self._append(fetched)
+
+    def vectors(self, keyword_ids: List[str]) -> np.ndarray:
+        """ID 목록에 해당하는 벡터 행렬(m × d)을 반환합니다. 알 수 없는 ID는 건너뜁니다."""
+        with self._lock:
+            rows = [self._rows[kid] for kid in keyword_ids if kid in self._rows]
+            if not rows or self._matrix is None:
+                return np.zeros((0, 0), dtype=np.float32)
+            return self._matrix[rows]
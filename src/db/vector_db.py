@@ -117,6 +117,25 @@ class PineconeDB:
             print(f"PineconeDB: 벡터 ID '{vector_id}' 업서트 중 오류 발생: {e}")
             raise
 
+    def upsert_vectors(self, vectors: list) -> int:
+        """
+        (vector_id, vector, metadata) 목록을 한 번의 요청으로 업서트하고 업서트된 개수를 반환합니다.
+        요청 크기 제한(2MB, 1000개)에 맞게 나누는 것은 호출하는 쪽의 책임입니다.
+        """
+        idx = self.get_index()
+        vectors_to_upsert = [(vector_id, vector, metadata or {}) for vector_id, vector, metadata in vectors
+                             if vector_id and vector]
+        if not vectors_to_upsert:
+            return 0
+
+        try:
+            print(f"PineconeDB: 벡터 {len(vectors_to_upsert)}개 일괄 업서트 중...")
+            upsert_response = idx.upsert(vectors=vectors_to_upsert)
+            return getattr(upsert_response, 'upserted_count', 0)
+        except Exception as e:
+            print(f"PineconeDB: 벡터 {len(vectors_to_upsert)}개 일괄 업서트 중 오류 발생: {e}")
+            raise
+
 if __name__ == '__main__':
     print("--- PineconeDB 직접 실행 테스트 ---")
     try:
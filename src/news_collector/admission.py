@@ -0,0 +1,180 @@
+# src/news_collector/admission.py
+"""
+수집기 → 파이프라인 유입 제어 (backpressure)
+- 기사를 보내기 전에 파이프라인 큐에 쌓인 메시지 수(가중치 적용)를 확인합니다.
+- HIGH_WATERMARK 이상이면
+    · DEFER_SOURCES에 있는 우선순위 낮은 소스의 기사는 바로 로컬 스필 파일로 미룹니다.
+    · 나머지 기사는 큐가 줄어들 때까지 MAX_WAIT_SECONDS 동안 기다리고(수집 속도 늦춤), 그래도 넘치면 스필합니다.
+- 스필된 기사는 큐가 LOW_WATERMARK 아래로 내려가면 drain()으로 다시 보냅니다 (수집 시작 시, beat 주기 태스크).
+- 스필 파일은 SPILL_MAX_ITEMS개로 제한해 Redis와 마찬가지로 로컬 디스크 사용량도 한정합니다.
+- 브로커 Redis를 조회할 수 없으면 기존처럼 바로 보냅니다.
+"""
+import fcntl
+import json
+import os
+import threading
+import time
+from contextlib import contextmanager
+from typing import Callable, Dict, List, Optional, Tuple
+
+import redis
+
+from src.pipeline_stages.stage_routing import broker_queue_keys
+
+
+class PipelineAdmission:
+    """큐 깊이 기반 유입 제어와 로컬 스필 버퍼."""
+
+    def __init__(self, broker_url: str, queues: List[str], weights: Dict[str, int],
+                 high_watermark: int, low_watermark: int, max_wait_seconds: float,
+                 poll_seconds: float, spill_path: str, spill_max_items: int, defer_sources: List[str]):
+        self.broker_url = broker_url
+        self.queues = list(queues)
+        self.weights = dict(weights or {})
+        self.high_watermark = int(high_watermark)
+        self.low_watermark = int(low_watermark)
+        self.max_wait_seconds = float(max_wait_seconds)
+        self.poll_seconds = float(poll_seconds)
+        self.spill_path = spill_path
+        self.spill_max_items = int(spill_max_items)
+        self.defer_sources = set(defer_sources or [])
+        self._client = None
+        self._client_pid = None
+        self._lock = threading.Lock()
+        self.stats = {"admitted": 0, "spilled": 0, "dropped": 0, "drained": 0, "waited_seconds": 0.0}
+
+    # --- 큐 깊이 ---
+    def _get_client(self):
+        with self._lock:
+            if self._client is None or self._client_pid != os.getpid():
+                self._client = redis.Redis.from_url(self.broker_url, socket_timeout=2, socket_connect_timeout=2)
+                self._client_pid = os.getpid()
+            return self._client
+
+    def queue_depth(self) -> Optional[int]:
+        """감시 중인 큐의 메시지 수 합계(가중치 적용). 조회에 실패하면 None."""
+        try:
+            pipe = self._get_client().pipeline(transaction=False)
+            layout = []
+            for queue in self.queues:
+                keys = broker_queue_keys(queue)
+                layout.append((queue, len(keys)))
+                for key in keys:
+                    pipe.llen(key)
+            lengths = iter(pipe.execute())
+            return sum(sum(next(lengths) for _ in range(n)) * self.weights.get(queue, 1) for queue, n in layout)
+        except Exception as e:
+            print(f"⚠️ Admission: 브로커 큐 길이 조회 실패, 유입 제어 없이 전송합니다: {e}")
+            return None
+
+    # --- 유입 제어 ---
+    def admit(self, articles: List[dict]) -> Tuple[List[dict], List[dict]]:
+        """
+        (지금 보낼 기사, 스필 파일에 기록한 기사)를 반환합니다.
+        스필 버퍼가 가득 차거나 기록에 실패한 기사는 어느 쪽에도 들어가지 않습니다.
+        """
+        depth = self.queue_depth()
+        if depth is None or depth < self.high_watermark:
+            self.stats["admitted"] += len(articles)
+            return articles, []
+
+        deferred = [a for a in articles if a.get("source") in self.defer_sources]
+        regular = [a for a in articles if a.get("source") not in self.defer_sources]
+        if deferred:
+            print(f"⏸️ Admission: 큐 적체({depth} ≥ {self.high_watermark}), 우선순위 낮은 소스 기사 {len(deferred)}개를 미룹니다.")
+            spilled = self.spill(deferred)
+        else:
+            spilled = []
+        if not regular:
+            return [], spilled
+
+        waited_from = time.monotonic()
+        while depth is not None and depth >= self.high_watermark:
+            if time.monotonic() - waited_from >= self.max_wait_seconds:
+                break
+            time.sleep(self.poll_seconds)
+            depth = self.queue_depth()
+        self.stats["waited_seconds"] += time.monotonic() - waited_from
+
+        if depth is not None and depth >= self.high_watermark:
+            print(f"⏸️ Admission: {self.max_wait_seconds:.0f}초 대기 후에도 큐 적체({depth}), 기사 {len(regular)}개를 미룹니다.")
+            return [], spilled + self.spill(regular)
+        self.stats["admitted"] += len(regular)
+        return regular, spilled
+
+    # --- 스필 파일 ---
+    @contextmanager
+    def _locked_spill(self):
+        os.makedirs(os.path.dirname(self.spill_path), exist_ok=True)
+        with open(f"{self.spill_path}.lock", "w") as lock_file:
+            fcntl.flock(lock_file, fcntl.LOCK_EX)
+            try:
+                yield
+            finally:
+                fcntl.flock(lock_file, fcntl.LOCK_UN)
+
+    def _read_spill(self) -> List[str]:
+        try:
+            with open(self.spill_path, "r", encoding="utf-8") as f:
+                return [line for line in f if line.strip()]
+        except FileNotFoundError:
+            return []
+
+    def _write_spill(self, lines: List[str]):
+        tmp_path = f"{self.spill_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            f.writelines(lines)
+        os.replace(tmp_path, self.spill_path)
+
+    def spill(self, articles: List[dict]) -> List[dict]:
+        """기사를 스필 파일에 덧붙이고, 실제로 기록한 기사 목록을 반환합니다."""
+        try:
+            with self._locked_spill():
+                existing = len(self._read_spill())
+                room = max(0, self.spill_max_items - existing)
+                accepted, dropped = articles[:room], articles[room:]
+                if accepted:
+                    lines = [json.dumps(article, ensure_ascii=False, default=str) + "\n" for article in accepted]
+                    with open(self.spill_path, "a", encoding="utf-8") as f:
+                        f.writelines(lines)
+        except (OSError, TypeError, ValueError) as e:
+            self.stats["dropped"] += len(articles)
+            print(f"❌ Admission: 스필 파일 기록 실패로 기사 {len(articles)}개를 보내지 못했습니다: {e}")
+            return []
+        self.stats["spilled"] += len(accepted)
+        if dropped:
+            self.stats["dropped"] += len(dropped)
+            print(f"❌ Admission: 스필 버퍼가 가득 차({self.spill_max_items}개) 기사 {len(dropped)}개를 버립니다.")
+        return accepted
+
+    def spilled_count(self) -> int:
+        with self._locked_spill():
+            return len(self._read_spill())
+
+    def drain(self, send: Callable[[List[dict]], bool], chunk_size: int) -> int:
+        """큐가 LOW_WATERMARK 아래인 동안 스필된 기사를 chunk_size개씩 send로 보냅니다. send가 실패하면 다시 스필합니다."""
+        drained = 0
+        while True:
+            depth = self.queue_depth()
+            if depth is None or depth >= self.low_watermark:
+                break
+            with self._locked_spill():
+                lines = self._read_spill()
+                if not lines:
+                    break
+                chunk, rest = lines[:chunk_size], lines[chunk_size:]
+                self._write_spill(rest)
+            articles = []
+            for line in chunk:
+                try:
+                    articles.append(json.loads(line))
+                except json.JSONDecodeError as e:
+                    print(f"⚠️ Admission: 손상된 스필 항목을 건너뜁니다: {e}")
+            if articles and not send(articles):
+                self.spill(articles)
+                break
+            drained += len(articles)
+        self.stats["drained"] += drained
+        if drained:
+            print(f"▶️ Admission: 미뤄 둔 기사 {drained}개를 파이프라인으로 보냈습니다.")
+        return drained
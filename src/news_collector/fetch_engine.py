@@ -0,0 +1,111 @@
+# src/news_collector/fetch_engine.py
+"""
+뉴스 소스 동시 수집 엔진
+- 호스트별 동시 요청 제한 (per-host semaphore)
+- 전체 동시 요청 상한 (global in-flight cap): 엔진 단위 세마포어라 여러 수집기가 같은 엔진으로
+  fetch_all을 동시에 호출해도 실제 동시 요청 수는 max_in_flight를 넘지 않습니다.
+- 소스별 타임아웃
+"""
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from urllib.parse import urlparse
+
+import requests
+
+DEFAULT_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36'
+
+
+@dataclass
+class FetchJob:
+    """하나의 소스 요청 정의"""
+    url: str
+    headers: Optional[Dict[str, str]] = None
+    params: Optional[Dict[str, object]] = None
+    timeout: Optional[float] = None
+    tag: Optional[str] = None  # 호출 측에서 결과를 구분하기 위한 임의 태그
+
+
+@dataclass
+class FetchResult:
+    """소스 요청 결과. 실패 시 error에 메시지가 담깁니다."""
+    job: FetchJob
+    status_code: Optional[int] = None
+    content: bytes = b""
+    headers: Dict[str, str] = field(default_factory=dict)
+    error: Optional[str] = None
+    elapsed: float = 0.0
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None and self.status_code is not None and 200 <= self.status_code < 300
+
+
+class SourceFetchEngine:
+    """ThreadPoolExecutor 기반의 제한된 동시 수집기."""
+
+    def __init__(self, max_in_flight: int = 32, per_host_limit: int = 4, timeout: float = 15.0):
+        self.max_in_flight = max(1, int(max_in_flight))
+        self.per_host_limit = max(1, int(per_host_limit))
+        self.timeout = float(timeout)
+        self._in_flight = threading.BoundedSemaphore(self.max_in_flight)
+        self._host_semaphores: Dict[str, threading.BoundedSemaphore] = {}
+        self._host_lock = threading.Lock()
+        self._local = threading.local()
+
+    def _get_host_semaphore(self, url: str) -> threading.BoundedSemaphore:
+        host = urlparse(url).netloc.lower()
+        with self._host_lock:
+            semaphore = self._host_semaphores.get(host)
+            if semaphore is None:
+                semaphore = threading.BoundedSemaphore(self.per_host_limit)
+                self._host_semaphores[host] = semaphore
+            return semaphore
+
+    def _get_session(self) -> requests.Session:
+        # requests.Session은 스레드 간 공유가 안전하지 않으므로 스레드마다 하나씩 유지합니다.
+        session = getattr(self._local, "session", None)
+        if session is None:
+            session = requests.Session()
+            session.headers.update({'User-Agent': DEFAULT_USER_AGENT})
+            self._local.session = session
+        return session
+
+    def _fetch_one(self, job: FetchJob) -> FetchResult:
+        result = FetchResult(job=job)
+        started = time.monotonic()
+        # 호스트 슬롯을 먼저 잡아, 한 호스트를 기다리는 요청이 전체 슬롯을 차지하지 않게 합니다.
+        with self._get_host_semaphore(job.url), self._in_flight:
+            try:
+                response = self._get_session().get(
+                    job.url,
+                    headers=job.headers,
+                    params=job.params,
+                    timeout=job.timeout or self.timeout,
+                    verify=True,
+                )
+                result.status_code = response.status_code
+                result.content = response.content
+                result.headers = dict(response.headers)
+            except requests.exceptions.RequestException as e_req:
+                result.error = f"요청 오류: {e_req}"
+            except Exception as e_general:
+                result.error = f"알 수 없는 오류: {e_general}"
+        result.elapsed = time.monotonic() - started
+        return result
+
+    def fetch_all(self, jobs: List[FetchJob]) -> List[FetchResult]:
+        """모든 요청을 동시에 수행하고, 입력 순서대로 결과를 반환합니다."""
+        if not jobs:
+            return []
+        started = time.monotonic()
+        workers = min(self.max_in_flight, len(jobs))
+        with ThreadPoolExecutor(max_workers=workers, thread_name_prefix="collector-fetch") as executor:
+            results = list(executor.map(self._fetch_one, jobs))
+        failed = sum(1 for r in results if not r.ok)
+        slowest = max((r.elapsed for r in results), default=0.0)
+        print(f"⏱️ 동시 수집 완료: {len(jobs)}개 요청, 실패 {failed}개, "
+              f"총 {time.monotonic() - started:.2f}초 (가장 느린 소스 {slowest:.2f}초)")
+        return results
@@ -5,6 +5,9 @@ import requests
 import html
 import json
 import feedparser
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from typing import Optional
 from datetime import datetime, timedelta
 import re
 from dateutil.parser import parse as date_parse
@@ -21,18 +24,95 @@ if _project_root not in sys.path:
 else:
     print(f"DEBUG (news_collector.py): {_project_root}는 이미 sys.path에 있습니다.")
 
-from src.pipeline_stages.initial_checks import initial_checks_task
+from src.pipeline_stages.initial_checks import initial_checks_task, batch_initial_checks_task
+from src.pipeline_stages.tracing import mark_enqueued
 from src.config_loader.settings import SETTINGS
+from src.news_collector.fetch_engine import FetchJob, SourceFetchEngine
+from src.news_collector.source_state import SourceValidatorCache, SourceWatermarks
+from src.news_collector.admission import PipelineAdmission
+from src.pipeline_stages.stage_routing import stage_queues
 
 # 설정값 가져오기
 DART_API_KEY = SETTINGS.get("DART_API_KEY")
 NAVER_CLIENT_ID = SETTINGS.get("NAVER_CLIENT_ID")
 NAVER_CLIENT_SECRET = SETTINGS.get("NAVER_CLIENT_SECRET")
 RAW_DATA_PATH = SETTINGS.get("RAW_DATA_PATH")
+COLLECTOR_FETCH_CONFIG = SETTINGS.get("COLLECTOR_FETCH", {})
+WATERMARK_CONFIG = SETTINGS.get("COLLECTOR_WATERMARK", {})
+BATCH_CHECKS_CONFIG = SETTINGS.get("COLLECTOR_BATCH_CHECKS", {})
+ADMISSION_CONFIG = SETTINGS.get("COLLECTOR_ADMISSION", {})
 
 redis_client = None
-
-def process_and_store_article(article_data):
+# 여러 수집 스레드에서 동시에 Celery 메시지를 발행하지 않도록 직렬화합니다.
+_dispatch_lock = threading.Lock()
+_state_lock = threading.Lock()
+_validator_cache = None
+_watermarks = None
+_admission = None
+# 일괄 초기 검사 모드에서 윈도우가 찰 때까지 모아 두는 (기사, 워터마크 트래커) 목록 (_dispatch_lock으로 보호)
+_pending_checks = []
+
+def _build_fetch_engine() -> SourceFetchEngine:
+    return SourceFetchEngine(
+        max_in_flight=COLLECTOR_FETCH_CONFIG.get("MAX_IN_FLIGHT", 32),
+        per_host_limit=COLLECTOR_FETCH_CONFIG.get("PER_HOST_LIMIT", 4),
+        timeout=COLLECTOR_FETCH_CONFIG.get("TIMEOUT_SECONDS", 15),
+    )
+
+def _get_validator_cache() -> Optional[SourceValidatorCache]:
+    """조건부 요청이 활성화된 경우 프로세스당 하나의 검증자 캐시를 반환합니다."""
+    global _validator_cache
+    if not COLLECTOR_FETCH_CONFIG.get("CONDITIONAL_GET", True):
+        return None
+    with _state_lock:
+        if _validator_cache is None:
+            _validator_cache = SourceValidatorCache()
+    return _validator_cache
+
+def _get_watermarks() -> Optional[SourceWatermarks]:
+    """워터마크가 활성화된 경우 프로세스당 하나의 워터마크 저장소를 반환합니다."""
+    global _watermarks
+    if not WATERMARK_CONFIG.get("ENABLED", True):
+        return None
+    with _state_lock:
+        if _watermarks is None:
+            _watermarks = SourceWatermarks(
+                ring_size=WATERMARK_CONFIG.get("RECENT_ID_RING_SIZE", 500),
+                grace_minutes=WATERMARK_CONFIG.get("GRACE_MINUTES", 60),
+            )
+    return _watermarks
+
+def _get_admission() -> Optional[PipelineAdmission]:
+    """유입 제어가 활성화된 경우 프로세스당 하나의 인스턴스를 반환합니다."""
+    global _admission
+    if not ADMISSION_CONFIG.get("ENABLED", True):
+        return None
+    with _state_lock:
+        if _admission is None:
+            # 단계별 큐를 쓰지 않으면 모든 단계 태스크가 기본 큐(celery)에 쌓입니다.
+            default_queues = sorted(set(stage_queues().values())) if SETTINGS.get("PIPELINE_QUEUES", {}).get("ENABLED", True) else ["celery"]
+            _admission = PipelineAdmission(
+                broker_url=SETTINGS.get("CELERY_BROKER_URL", "redis://redis:6379/0"),
+                queues=ADMISSION_CONFIG.get("WATCH_QUEUES") or default_queues,
+                weights=ADMISSION_CONFIG.get("QUEUE_WEIGHTS", {"pipeline.intake": BATCH_CHECKS_CONFIG.get("WINDOW_SIZE", 200)}),
+                high_watermark=ADMISSION_CONFIG.get("HIGH_WATERMARK", 5000),
+                low_watermark=ADMISSION_CONFIG.get("LOW_WATERMARK", 2000),
+                max_wait_seconds=ADMISSION_CONFIG.get("MAX_WAIT_SECONDS", 60),
+                poll_seconds=ADMISSION_CONFIG.get("POLL_SECONDS", 2),
+                spill_path=os.path.join(_project_root, "data", "collector_spill", "pending_articles.jsonl"),
+                spill_max_items=ADMISSION_CONFIG.get("SPILL_MAX_ITEMS", 50000),
+                defer_sources=ADMISSION_CONFIG.get("DEFER_SOURCES", []),
+            )
+    return _admission
+
+def _conditional_headers(validator_cache: Optional[SourceValidatorCache], url: str) -> dict:
+    return validator_cache.conditional_headers(url) if validator_cache else {}
+
+def process_and_store_article(article_data, tracker=None):
+    """
+    기사를 파이프라인 전송 대기열에 넣습니다. tracker가 있으면 전송이나 스필 기록에 성공한 뒤에
+    tracker.confirm()으로 처리 항목으로 기록합니다 (일괄 모드에서는 윈도우가 전송될 때).
+    """
     processed_article = {
         "title": article_data.get("title", ""),
         "content": "",
@@ -48,12 +128,90 @@ def process_and_store_article(article_data):
         "checked": {}
     }
     save_to_raw_data_folder(processed_article)
+    if BATCH_CHECKS_CONFIG.get("ENABLED", True):
+        with _dispatch_lock:
+            _pending_checks.append((processed_article, tracker))
+            if len(_pending_checks) >= BATCH_CHECKS_CONFIG.get("WINDOW_SIZE", 200):
+                _dispatch_pending_checks_locked()
+        return processed_article
+    with _dispatch_lock:
+        _admit_and_send_locked([(processed_article, tracker)])
+    return processed_article
+
+def _send_to_pipeline(articles) -> bool:
+    """기사들을 초기 검사 태스크로 전송합니다. _dispatch_lock을 잡은 상태에서 호출합니다."""
+    for article in articles:
+        mark_enqueued(article)
+    if BATCH_CHECKS_CONFIG.get("ENABLED", True):
+        try:
+            batch_initial_checks_task.delay(articles)
+            print(f"🚀 Collector: {len(articles)}개 기사 윈도우를 batch_initial_checks_task로 전송됨.")
+            return True
+        except Exception as e:
+            print(f"⚠️ 경고: Celery 태스크 호출 실패 (batch_initial_checks_task, {len(articles)}개): {e}")
+            return False
     try:
-        initial_checks_task.delay(processed_article)
-        print(f"🚀 Collector: '{processed_article.get('title')[:30]}...' initial_checks_task로 전송됨.")
+        for article in articles:
+            initial_checks_task.delay(article)
+            print(f"🚀 Collector: '{article.get('title', '')[:30]}...' initial_checks_task로 전송됨.")
+        return True
     except Exception as e:
         print(f"⚠️ 경고: Celery 태스크 호출 실패 (initial_checks_task): {e}")
-    return processed_article
+        return False
+
+def _admit_and_send_locked(entries):
+    """
+    파이프라인 큐가 밀려 있으면 기다리거나 스필 버퍼로 미루고, 받아들인 기사만 전송합니다.
+    entries는 (기사, 워터마크 트래커) 목록이고, 전송 또는 스필 기록에 성공한 기사만 트래커에 confirm합니다.
+    """
+    trackers = {id(article): tracker for article, tracker in entries}
+    articles = [article for article, _ in entries]
+    handed_off = []
+    admission = _get_admission()
+    if admission is not None:
+        articles, spilled = admission.admit(articles)
+        handed_off.extend(spilled)
+    if articles and _send_to_pipeline(articles):
+        handed_off.extend(articles)
+    for article in handed_off:
+        tracker = trackers.get(id(article))
+        if tracker is not None:
+            tracker.confirm(article.get("url", ""))
+
+def _dispatch_pending_checks_locked():
+    """모아 둔 윈도우를 batch_initial_checks_task 하나로 전송합니다. _dispatch_lock을 잡은 상태에서 호출합니다."""
+    if not _pending_checks:
+        return
+    window = list(_pending_checks)
+    _pending_checks.clear()
+    _admit_and_send_locked(window)
+
+def flush_pending_checks():
+    """윈도우 크기에 못 미친 채 남아 있는 기사들을 전송합니다. 워터마크 commit 전에 호출합니다."""
+    with _dispatch_lock:
+        _dispatch_pending_checks_locked()
+
+def drain_spilled_articles() -> int:
+    """큐 적체로 미뤄 둔 기사들을 파이프라인 큐가 충분히 줄어든 만큼 다시 보냅니다."""
+    admission = _get_admission()
+    if admission is None:
+        return 0
+    chunk_size = BATCH_CHECKS_CONFIG.get("WINDOW_SIZE", 200) if BATCH_CHECKS_CONFIG.get("ENABLED", True) else 50
+    with _dispatch_lock:
+        return admission.drain(_send_to_pipeline, chunk_size)
+
+def _commit_sources(completed_sources, validator_cache: Optional[SourceValidatorCache]):
+    """
+    남은 윈도우를 전송한 뒤 소스별 워터마크를 저장합니다. 전송하지 못한 항목이 남은 소스는
+    다음 수집에서 304/동일 해시로 건너뛰지 않도록 검증자를 갱신하지 않습니다.
+    """
+    for tracker, result in completed_sources:
+        if tracker:
+            tracker.commit()
+            if tracker.unconfirmed:
+                continue
+        if validator_cache:
+            validator_cache.remember(result)
 
 def save_to_raw_data_folder(article):
     # Raw 데이터 JSON 파일 저장을 비활성화
@@ -81,7 +239,7 @@ def format_published_date(date_str):
         return None
 
 
-def collect_from_api_file(filepath="api_sources.txt"): #
+def collect_from_api_file(filepath="api_sources.txt", engine=None): #
     articles = []
     sources_dir = os.path.join(_project_root, "src", "sources")
     sources_filepath = os.path.join(sources_dir, filepath)
@@ -111,13 +269,16 @@ def collect_from_api_file(filepath="api_sources.txt"): #
 
 
     print("\n🌐 API 수집 시작...")
+    validator_cache = _get_validator_cache()
+    watermarks = _get_watermarks()
+    # 남은 윈도우를 전송한 뒤에 저장할 (트래커, 응답) 목록
+    completed_sources = []
+    jobs = []
     for url in urls:
         if not url.startswith('http'):
             print(f"⚠️ 유효하지 않은 URL 형식 건너뜜: {url}")
             continue
 
-        data = None
-        response = None
         current_headers = None
         is_naver_api = "openapi.naver.com/v1/search/news.json" in url
 
@@ -134,11 +295,20 @@ def collect_from_api_file(filepath="api_sources.txt"): #
         else:
             print(f"❓ api_sources.txt의 알 수 없는 URL 형식 건너김: {url}")
             continue
-        
+        jobs.append(FetchJob(url=url, headers={**(current_headers or {}), **_conditional_headers(validator_cache, url)}))
+
+    for result in (engine or _build_fetch_engine()).fetch_all(jobs):
+        url = result.job.url
+        is_naver_api = "openapi.naver.com/v1/search/news.json" in url
+        if validator_cache and validator_cache.is_unchanged(result):
+            print(f"♻️ 변경 없음 (304 또는 동일 해시), 파싱 건너뜀: {url}")
+            continue
         try:
-            response = requests.get(url, headers=current_headers, timeout=10, verify=True)
-            response.raise_for_status()
-            data = response.json()
+            if result.error:
+                raise requests.exceptions.RequestException(result.error)
+            if not result.ok:
+                raise requests.exceptions.HTTPError(f"HTTP {result.status_code}")
+            data = json.loads(result.content)
 
             items = []
             source_type = "Unknown API"
@@ -158,6 +328,7 @@ def collect_from_api_file(filepath="api_sources.txt"): #
             else:
                 print(f"✅ {source_type} 응답 항목 수: {len(items)}")
 
+            tracker = watermarks.tracker(url) if watermarks else None
             count_added_from_url = 0
             for item in items:
                 if isinstance(item, dict):
@@ -207,12 +378,16 @@ def collect_from_api_file(filepath="api_sources.txt"): #
                     if item_category:
                         article_for_pipeline["category"] = item_category
 
-                    processed_item = process_and_store_article(article_for_pipeline)
+                    if tracker and not tracker.is_new(url_link, published_at):
+                        continue
+
+                    processed_item = process_and_store_article(article_for_pipeline, tracker)
                     articles.append(processed_item)
                     count_added_from_url += 1
                 else:
                     print(f"⚠️ 스킵됨: API 응답 항목이 딕셔너리 형태가 아님 → {item}")
             print(f"✅ 수집 완료: {url} ({count_added_from_url}개 항목 추가)")
+            completed_sources.append((tracker, result))
 
         except requests.exceptions.RequestException as e_req:
             print(f"❌ 요청 오류 ({url}): {e_req}")
@@ -222,11 +397,13 @@ def collect_from_api_file(filepath="api_sources.txt"): #
             print(f"❌ 알 수 없는 오류 발생 ({url}): {e_general}")
 
 
+    flush_pending_checks()
+    _commit_sources(completed_sources, validator_cache)
     print(f"\n✅ API 수집 과정 완료. 총 {len(articles)}개 항목 수집 시도.")
     return articles
 
 
-def collect_from_rss_file(filepath="rss_sources.txt"): #
+def collect_from_rss_file(filepath="rss_sources.txt", engine=None): #
     articles = []
     sources_dir = os.path.join(_project_root, "src", "sources")
     sources_filepath = os.path.join(sources_dir, filepath)
@@ -246,13 +423,22 @@ def collect_from_rss_file(filepath="rss_sources.txt"): #
 
 
     print("\n🌐 RSS 수집 시작...")
-    for url in urls:
-        if not url:
+    validator_cache = _get_validator_cache()
+    watermarks = _get_watermarks()
+    completed_sources = []
+    jobs = [FetchJob(url=url, headers=_conditional_headers(validator_cache, url)) for url in urls if url]
+    for result in (engine or _build_fetch_engine()).fetch_all(jobs):
+        url = result.job.url
+        if validator_cache and validator_cache.is_unchanged(result):
+            print(f"\n♻️ 변경 없음 (304 또는 동일 해시), 파싱 건너뜀: {url}")
             continue
 
         print(f"\n🔎 RSS 피드 파싱 시도: {url}")
         try:
-            feed = feedparser.parse(url)
+            if not result.ok:
+                print(f"❌ RSS 피드 요청 실패로 건너뜀: {url} | {result.error or f'HTTP {result.status_code}'}")
+                continue
+            feed = feedparser.parse(result.content, response_headers=result.headers)
 
             if feed.bozo:
                 print(f"⚠️ 경고: RSS 피드 파싱 중 문제 발생: {url} | {feed.bozo_exception}")
@@ -266,6 +452,7 @@ def collect_from_rss_file(filepath="rss_sources.txt"): #
 
             print(f"✅ 피드 파싱 성공. 항목 수: {len(feed.entries)}")
 
+            tracker = watermarks.tracker(url) if watermarks else None
             feed_articles_count = 0
             for entry in feed.entries:
                 raw_title = entry.get('title', 'No Title Available')
@@ -314,6 +501,8 @@ def collect_from_rss_file(filepath="rss_sources.txt"): #
                 if item_url == 'No URL Available':
                     print(f"⚠️ URL 정보 없는 RSS 항목 건너뜀: {final_title}")
                     continue
+                if tracker and not tracker.is_new(item_url, pub_date):
+                    continue
                 
                 article_for_pipeline = {
                     "title": final_title,
@@ -325,19 +514,22 @@ def collect_from_rss_file(filepath="rss_sources.txt"): #
                 if item_category:
                     article_for_pipeline["category"] = item_category
 
-                processed_item = process_and_store_article(article_for_pipeline)
+                processed_item = process_and_store_article(article_for_pipeline, tracker)
                 articles.append(processed_item)
                 feed_articles_count += 1
             print(f"✅ {source_name} 항목 {feed_articles_count}개 수집 완료 (총 누적 {len(articles)}개)")
+            completed_sources.append((tracker, result))
         except Exception as e_fp:
             print(f"❌ RSS 피드 처리 중 오류 발생 ({url}): {e_fp}")
 
 
+    flush_pending_checks()
+    _commit_sources(completed_sources, validator_cache)
     print(f"\n✅ 전체 RSS 수집 완료. 총 {len(articles)}개 항목 수집 시도.")
     return articles
 
 
-def collect_from_dart_api():
+def collect_from_dart_api(engine=None):
     disclosures = []
     if not DART_API_KEY:
         print("❌ 오류: DART_API_KEY가 설정되지 않았습니다. config.yaml 파일을 확인하세요.")
@@ -356,10 +548,14 @@ def collect_from_dart_api():
     }
 
     print("\n🌐 DART API 수집 시작...")
+    tracker = None
     try:
-        response = requests.get(url, params=params, timeout=10, verify=True)
-        response.raise_for_status()
-        data = response.json()
+        result = (engine or _build_fetch_engine()).fetch_all([FetchJob(url=url, params=params)])[0]
+        if result.error:
+            raise requests.exceptions.RequestException(result.error)
+        if not result.ok:
+            raise requests.exceptions.HTTPError(f"HTTP {result.status_code}")
+        data = json.loads(result.content)
 
         if data.get("status") == "013":
             print("❌ DART API 오류: 인증키가 유효하지 않습니다. DART_API_KEY를 확인하세요.")
@@ -371,6 +567,8 @@ def collect_from_dart_api():
         raw_list = data.get("list", [])
         print(f"✅ DART API 응답 항목 수: {len(raw_list)}개")
 
+        watermarks = _get_watermarks()
+        tracker = watermarks.tracker(url) if watermarks else None
         for entry in raw_list:
             disclosure_summary = f"{entry.get('rcept_dt', '')} 접수된 공시: {entry.get('flr_nm', '제출인 불명')}"
             article_for_pipeline = {
@@ -383,8 +581,10 @@ def collect_from_dart_api():
             if not entry.get('rcept_no'):
                 print(f"⚠️ DART 항목 건너뜀 (rcept_no 없음): {article_for_pipeline['title']}")
                 continue
+            if tracker and not tracker.is_new(article_for_pipeline["url"], entry.get("rcept_dt")):
+                continue
 
-            processed_item = process_and_store_article(article_for_pipeline)
+            processed_item = process_and_store_article(article_for_pipeline, tracker)
             disclosures.append(processed_item)
         print(f"✅ DART API 수집 완료. 총 {len(disclosures)}개 항목 수집 시도.")
     except requests.exceptions.RequestException as e_req:
@@ -394,23 +594,31 @@ def collect_from_dart_api():
     except Exception as e_general:
         print(f"❌ DART API 처리 중 알 수 없는 오류: {e_general}")
 
+    flush_pending_checks()
+    if tracker:
+        tracker.commit()
     return disclosures
 
 
 def collect_all_data():
     all_collected_items = []
-
-    print("\n--- API 데이터 수집 시작 ---")
-    api_data = collect_from_api_file()
-    all_collected_items.extend(api_data)
-
-    print("\n--- RSS 데이터 수집 시작 ---")
-    rss_data = collect_from_rss_file()
-    all_collected_items.extend(rss_data)
-
-    print("\n--- DART 데이터 수집 시작 ---")
-    dart_data = collect_from_dart_api()
-    all_collected_items.extend(dart_data)
+    # 세 수집기가 하나의 엔진을 공유하므로 호스트별/전체 동시 요청 제한이 함께 적용됩니다.
+    engine = _build_fetch_engine()
+
+    # 지난 수집에서 미뤄 둔 기사를 먼저 보내 새 기사보다 앞서 처리되도록 합니다.
+    drain_spilled_articles()
+
+    print("\n--- API / RSS / DART 데이터 동시 수집 시작 ---")
+    with ThreadPoolExecutor(max_workers=3, thread_name_prefix="collector") as executor:
+        api_future = executor.submit(collect_from_api_file, engine=engine)
+        rss_future = executor.submit(collect_from_rss_file, engine=engine)
+        dart_future = executor.submit(collect_from_dart_api, engine=engine)
+
+        for label, future in (("API", api_future), ("RSS", rss_future), ("DART", dart_future)):
+            try:
+                all_collected_items.extend(future.result())
+            except Exception as e:
+                print(f"❌ {label} 데이터 수집 중 오류 발생: {e}")
 
     print(f"\n--- 전체 데이터 수집 완료. 총 {len(all_collected_items)}개 항목 처리 시도 ---")
     return all_collected_items
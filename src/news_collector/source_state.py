@@ -0,0 +1,241 @@
+# src/news_collector/source_state.py
+"""
+소스(피드 URL)별 수집 상태 저장소
+- Redis 해시에 저장하고, Redis를 쓸 수 없으면 로컬 JSON 파일로 대체합니다.
+- 조건부 요청(ETag / Last-Modified)용 검증자와 콘텐츠 해시를 관리합니다.
+- 소스별 하이워터마크(최신 발행 시각 + 최근 항목 ID 링)를 관리합니다.
+"""
+import hashlib
+import json
+import os
+import threading
+from datetime import datetime, timedelta, timezone
+from typing import Dict, Optional
+
+import redis
+from dateutil.parser import parse as date_parse
+
+from src.config_loader.settings import SETTINGS
+
+_current_file_path = os.path.abspath(__file__)
+_project_root = os.path.dirname(os.path.dirname(os.path.dirname(_current_file_path)))
+
+
+class SourceStateStore:
+    """URL → 상태(dict) 매핑을 Redis 해시 또는 로컬 JSON 파일에 보관합니다."""
+
+    def __init__(self, namespace: str, local_filename: Optional[str] = None):
+        self.redis_key = f"collector:{namespace}"
+        self.local_path = os.path.join(
+            _project_root, "data", "collector_state", local_filename or f"{namespace}.json"
+        )
+        self._lock = threading.Lock()
+        self._client = None
+        self._local_cache: Optional[Dict[str, dict]] = None
+        self._use_redis = self._connect_redis()
+
+    def _connect_redis(self) -> bool:
+        try:
+            self._client = redis.Redis(
+                host=SETTINGS.get("REDIS_HOST"),
+                port=SETTINGS.get("REDIS_PORT"),
+                db=SETTINGS.get("REDIS_DB"),
+                decode_responses=True,
+                socket_timeout=5,
+            )
+            self._client.ping()
+            return True
+        except Exception as e:
+            print(f"⚠️ SourceStateStore: Redis 연결 실패, 로컬 파일({self.local_path})을 사용합니다: {e}")
+            self._client = None
+            return False
+
+    def _load_local(self) -> Dict[str, dict]:
+        if self._local_cache is None:
+            try:
+                with open(self.local_path, "r", encoding="utf-8") as f:
+                    self._local_cache = json.load(f)
+            except FileNotFoundError:
+                self._local_cache = {}
+            except Exception as e:
+                print(f"⚠️ SourceStateStore: 로컬 상태 파일 로드 실패, 빈 상태로 시작합니다: {e}")
+                self._local_cache = {}
+        return self._local_cache
+
+    def _flush_local(self):
+        os.makedirs(os.path.dirname(self.local_path), exist_ok=True)
+        tmp_path = f"{self.local_path}.tmp"
+        with open(tmp_path, "w", encoding="utf-8") as f:
+            json.dump(self._local_cache or {}, f, ensure_ascii=False)
+        os.replace(tmp_path, self.local_path)
+
+    def get(self, source_key: str) -> dict:
+        with self._lock:
+            if self._use_redis:
+                try:
+                    raw = self._client.hget(self.redis_key, source_key)
+                    return json.loads(raw) if raw else {}
+                except Exception as e:
+                    print(f"⚠️ SourceStateStore: Redis 조회 실패 ({source_key}): {e}")
+                    return {}
+            return dict(self._load_local().get(source_key, {}))
+
+    def set(self, source_key: str, state: dict):
+        with self._lock:
+            if self._use_redis:
+                try:
+                    self._client.hset(self.redis_key, source_key, json.dumps(state, ensure_ascii=False))
+                    return
+                except Exception as e:
+                    print(f"⚠️ SourceStateStore: Redis 저장 실패 ({source_key}): {e}")
+                    return
+            self._load_local()[source_key] = state
+            try:
+                self._flush_local()
+            except Exception as e:
+                print(f"⚠️ SourceStateStore: 로컬 상태 파일 저장 실패: {e}")
+
+
+class SourceValidatorCache:
+    """피드별 ETag / Last-Modified / 콘텐츠 해시를 이용해 변경 없는 소스를 건너뜁니다."""
+
+    def __init__(self, store: Optional[SourceStateStore] = None):
+        self.store = store or SourceStateStore("source_validators")
+
+    @staticmethod
+    def content_hash(content: bytes) -> str:
+        return hashlib.sha256(content or b"").hexdigest()
+
+    def conditional_headers(self, url: str) -> Dict[str, str]:
+        validators = self.store.get(url)
+        headers = {}
+        if validators.get("etag"):
+            headers["If-None-Match"] = validators["etag"]
+        if validators.get("last_modified"):
+            headers["If-Modified-Since"] = validators["last_modified"]
+        return headers
+
+    def is_unchanged(self, result) -> bool:
+        """304 응답이거나, 본문 해시가 직전 수집과 같으면 True."""
+        if result.status_code == 304:
+            return True
+        if not result.ok:
+            return False
+        previous_hash = self.store.get(result.job.url).get("content_hash")
+        return bool(previous_hash) and previous_hash == self.content_hash(result.content)
+
+    def remember(self, result):
+        """성공적으로 처리한 응답의 검증자를 저장합니다."""
+        if not result.ok:
+            return
+        headers = {k.lower(): v for k, v in (result.headers or {}).items()}
+        self.store.set(result.job.url, {
+            "etag": headers.get("etag"),
+            "last_modified": headers.get("last-modified"),
+            "content_hash": self.content_hash(result.content),
+            "checked_at": datetime.now().isoformat(),
+        })
+
+
+class SourceWatermarkTracker:
+    """
+    한 번의 수집 동안 특정 소스의 하이워터마크를 판정하고 갱신합니다.
+    is_new()를 통과한 항목은 후보로만 두고, 파이프라인 전송이나 스필 기록에 성공해 confirm()된 항목만
+    commit() 때 워터마크와 ID 링에 반영합니다. 전송에 실패한 항목은 다음 수집에서 다시 새 항목으로 판정됩니다.
+    """
+
+    def __init__(self, owner: "SourceWatermarks", source_key: str):
+        self.owner = owner
+        self.source_key = source_key
+        state = owner.store.get(source_key)
+        self.watermark = owner._parse_datetime(state.get("latest_published_at"))
+        self.recent_ids = list(state.get("recent_ids", []))
+        self._recent_id_set = set(self.recent_ids)
+        # 윈도우 전송은 다른 수집 스레드에서 일어날 수 있어 confirm()이 여러 스레드에서 호출됩니다.
+        self._lock = threading.Lock()
+        self._candidates: Dict[str, Optional[datetime]] = {}
+        self._seen_ids = []
+        self._latest = self.watermark
+        self.skipped = 0
+
+    def is_new(self, item_url: str, published_at_raw) -> bool:
+        """워터마크보다 오래되었거나 최근에 본 항목이면 False. 통과한 항목은 confirm() 전까지 기록하지 않습니다."""
+        entry_id = self.owner.entry_id(item_url)
+        published_at = self.owner._parse_datetime(published_at_raw)
+
+        is_new = entry_id not in self._recent_id_set
+        if is_new and published_at and self.watermark:
+            # 늦게 게시된 항목을 놓치지 않도록 유예 구간 안에서는 ID 링으로만 판단합니다.
+            is_new = published_at >= self.watermark - self.owner.grace
+
+        if not is_new:
+            self.skipped += 1
+            return False
+
+        with self._lock:
+            self._candidates[entry_id] = published_at
+        return True
+
+    def confirm(self, item_url: str):
+        """파이프라인 전송 또는 스필 기록에 성공한 항목을 이번 수집의 처리 항목으로 기록합니다."""
+        entry_id = self.owner.entry_id(item_url)
+        with self._lock:
+            if entry_id not in self._candidates:
+                return
+            published_at = self._candidates.pop(entry_id)
+            self._seen_ids.append(entry_id)
+            if published_at and (self._latest is None or published_at > self._latest):
+                self._latest = published_at
+
+    @property
+    def unconfirmed(self) -> int:
+        """통과했지만 아직 전송/스필이 확인되지 않은 항목 수."""
+        with self._lock:
+            return len(self._candidates)
+
+    def commit(self):
+        """confirm()된 항목만 반영해 워터마크를 저장합니다. 남은 윈도우를 전송한 뒤 호출합니다."""
+        if self.skipped:
+            print(f"ℹ️ 워터마크: {self.source_key} 에서 이미 본 항목 {self.skipped}개를 건너뜀.")
+        with self._lock:
+            seen_ids, latest = list(self._seen_ids), self._latest
+            if self._candidates:
+                # 워터마크를 올리면 전송하지 못한 오래된 항목이 다음 수집에서 걸러지므로, ID 링만 갱신합니다.
+                print(f"⚠️ 워터마크: {self.source_key} 에서 전송하지 못한 항목 {len(self._candidates)}개는 다음 수집에서 다시 시도합니다.")
+                latest = self.watermark
+        if not seen_ids and latest == self.watermark:
+            return
+        merged_ids = list(dict.fromkeys(seen_ids + self.recent_ids))[:self.owner.ring_size]
+        self.owner.store.set(self.source_key, {
+            "latest_published_at": latest.isoformat() if latest else None,
+            "recent_ids": merged_ids,
+            "updated_at": datetime.now().isoformat(),
+        })
+
+
+class SourceWatermarks:
+    """소스별 최신 published_at 과 최근 항목 ID 링을 이용해 새 항목만 통과시킵니다."""
+
+    def __init__(self, store: Optional[SourceStateStore] = None, ring_size: int = 500, grace_minutes: int = 60):
+        self.store = store or SourceStateStore("source_watermarks")
+        self.ring_size = max(1, int(ring_size))
+        self.grace = timedelta(minutes=grace_minutes)
+
+    @staticmethod
+    def entry_id(item_url: str) -> str:
+        return hashlib.sha256((item_url or "").encode("utf-8")).hexdigest()[:16]
+
+    @staticmethod
+    def _parse_datetime(value) -> Optional[datetime]:
+        if not value:
+            return None
+        try:
+            parsed = value if isinstance(value, datetime) else date_parse(str(value))
+        except Exception:
+            return None
+        if parsed.tzinfo is None:
+            parsed = parsed.replace(tzinfo=timezone.utc)
+        return parsed
+
+    def tracker(self, source_key: str) -> SourceWatermarkTracker:
+        return SourceWatermarkTracker(self, source_key)
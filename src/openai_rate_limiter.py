@@ -0,0 +1,402 @@
+# src/openai_rate_limiter.py
+"""
+OpenAI 호출 공유 속도 제한기 (Redis 토큰 버킷)
+- 모델마다 분당 요청 수(RPM)와 분당 토큰 수(TPM) 버킷 두 개를 Redis에 두고, 모든 워커/서버가 함께 씁니다.
+  두 버킷 확인과 차감은 Lua 스크립트 하나로 원자적으로 처리합니다.
+- 우선순위 클래스
+    · interactive (추천/RAG/PDF API): 버킷 전체를 쓸 수 있고, 기다리는 동안 waiting 플래그를 세웁니다.
+    · batch (Celery 파이프라인): BATCH_RESERVE_RATIO만큼을 interactive 몫으로 남겨 두고,
+      interactive 호출이 기다리는 중이면 양보합니다.
+- 429를 받으면 retry-after(없으면 지수 백오프)만큼 모델 단위 공유 쿨다운을 걸어, 다른 워커도 같이 멈춥니다.
+  각자 따로 sleep하고 재시도하다 다시 429를 맞는 일을 막습니다.
+- 호출 전에는 추정 토큰 수를 차감하고, 응답의 usage로 실제 사용량과의 차이를 정산합니다.
+- 우선순위별 최대 대기 시간(MAX_WAIT_SECONDS) 안에 한도가 나지 않으면 호출하지 않고 RateLimitTimeout을 던집니다.
+  파이프라인 태스크는 이를 다른 오류처럼 재시도하고, API 서버는 오류 응답으로 돌려줍니다.
+- Redis를 쓸 수 없으면 제한 없이 호출합니다 (429 처리는 로컬 백오프로 동작).
+- get_rate_limited_openai_client(client, priority)로 감싼 클라이언트는 기존처럼
+  client.embeddings.create(...), client.chat.completions.create(...)로 사용합니다.
+"""
+import os
+import random
+import threading
+import time
+from typing import Optional
+
+import redis
+from openai import RateLimitError
+
+from src.config_loader.settings import SETTINGS
+from src.token_counting import estimate_tokens
+
+OPENAI_RATE_LIMIT_CONFIG = SETTINGS.get("OPENAI_RATE_LIMITS", {})
+
+PRIORITIES = ("interactive", "batch")
+# Redis 오류 후 이 시간(초) 동안은 제한 없이 호출합니다.
+_REDIS_RETRY_AFTER_SECONDS = 30
+
+# KEYS: rpm 버킷, tpm 버킷, 쿨다운, interactive 대기 플래그
+# ARGV: now_ms, rpm 용량, tpm 용량, 요청 토큰 수, 남겨 둘 비율, batch 여부
+# 반환: 0이면 통과, 아니면 다시 시도하기까지 기다릴 시간(ms)
+_ACQUIRE_SCRIPT = """
+local now = tonumber(ARGV[1])
+local rpm_cap = tonumber(ARGV[2])
+local tpm_cap = tonumber(ARGV[3])
+local tokens = math.min(tonumber(ARGV[4]), tpm_cap)
+local reserve = 0
+
+local cooldown_until = tonumber(redis.call('GET', KEYS[3]) or '0')
+if cooldown_until > now then
+    return cooldown_until - now
+end
+if ARGV[6] == '1' then
+    if redis.call('EXISTS', KEYS[4]) == 1 then
+        return 250
+    end
+    reserve = tonumber(ARGV[5])
+end
+
+local function refill(key, cap)
+    local state = redis.call('HMGET', key, 'level', 'ts')
+    local level = tonumber(state[1])
+    local ts = tonumber(state[2])
+    if level == nil or ts == nil then
+        return cap
+    end
+    return math.min(cap, level + math.max(0, now - ts) * cap / 60000)
+end
+
+local rpm_level = refill(KEYS[1], rpm_cap)
+local tpm_level = refill(KEYS[2], tpm_cap)
+local need_rpm = 1 + reserve * rpm_cap
+local need_tpm = tokens + reserve * tpm_cap
+local wait = 0
+if rpm_level >= need_rpm and tpm_level >= need_tpm then
+    rpm_level = rpm_level - 1
+    tpm_level = tpm_level - tokens
+else
+    wait = math.max((need_rpm - rpm_level) * 60000 / rpm_cap, (need_tpm - tpm_level) * 60000 / tpm_cap)
+    wait = math.max(1, math.ceil(wait))
+end
+redis.call('HSET', KEYS[1], 'level', rpm_level, 'ts', now)
+redis.call('HSET', KEYS[2], 'level', tpm_level, 'ts', now)
+redis.call('PEXPIRE', KEYS[1], 120000)
+redis.call('PEXPIRE', KEYS[2], 120000)
+return wait
+"""
+
+
+class RateLimitTimeout(RuntimeError):
+    """최대 대기 시간 안에 공유 한도를 얻지 못해 OpenAI 호출을 보내지 않았습니다."""
+
+
+def _now_ms() -> int:
+    return int(time.time() * 1000)
+
+
+class OpenAIRateLimiter:
+    """모델별 RPM/TPM 토큰 버킷을 Redis에 두고 여러 프로세스가 함께 쓰는 속도 제한기."""
+
+    def __init__(self, model_limits: dict, default_limits: dict, safety_factor: float = 0.9,
+                 batch_reserve_ratio: float = 0.2, max_wait_seconds: Optional[dict] = None,
+                 key_prefix: str = "openai_ratelimit"):
+        self.model_limits = dict(model_limits or {})
+        self.default_limits = dict(default_limits or {})
+        self.safety_factor = float(safety_factor)
+        self.batch_reserve_ratio = float(batch_reserve_ratio)
+        self.max_wait_seconds = dict(max_wait_seconds or {})
+        self.key_prefix = key_prefix
+        self._client = None
+        self._client_pid = None
+        self._script = None
+        self._redis_retry_at = 0.0
+        self._lock = threading.Lock()
+        self.stats = {"acquired": 0, "waited_seconds": 0.0, "timeouts": 0, "rate_limited": 0, "redis_errors": 0}
+
+    # --- Redis ---
+    def _get_client(self):
+        with self._lock:
+            if time.monotonic() < self._redis_retry_at:
+                return None
+            if self._client is None or self._client_pid != os.getpid():
+                self._client = redis.Redis(
+                    host=SETTINGS.get("REDIS_HOST"),
+                    port=SETTINGS.get("REDIS_PORT"),
+                    db=SETTINGS.get("REDIS_DB"),
+                    socket_timeout=2,
+                    socket_connect_timeout=2,
+                )
+                self._script = self._client.register_script(_ACQUIRE_SCRIPT)
+                self._client_pid = os.getpid()
+            return self._client
+
+    def _on_redis_error(self, e: Exception):
+        with self._lock:
+            self._redis_retry_at = time.monotonic() + _REDIS_RETRY_AFTER_SECONDS
+            self.stats["redis_errors"] += 1
+        print(f"RateLimiter Warning: Redis 오류, {_REDIS_RETRY_AFTER_SECONDS}초 동안 제한 없이 호출합니다: {e}")
+
+    def _keys(self, model: str) -> list:
+        base = f"{self.key_prefix}:{model}"
+        return [f"{base}:rpm", f"{base}:tpm", f"{base}:cooldown", f"{base}:interactive_waiting"]
+
+    # --- 한도 ---
+    def limits(self, model: str):
+        """(RPM, TPM) 용량. 모델 이름이 정확히 없으면 가장 긴 접두사가 일치하는 항목, 그것도 없으면 DEFAULT를 씁니다."""
+        limits = self.model_limits.get(model)
+        if limits is None:
+            prefixes = [name for name in self.model_limits if model.startswith(name)]
+            limits = self.model_limits[max(prefixes, key=len)] if prefixes else self.default_limits
+        rpm = max(1, int(limits.get("RPM", 500) * self.safety_factor))
+        tpm = max(1, int(limits.get("TPM", 200000) * self.safety_factor))
+        return rpm, tpm
+
+    # --- 획득 / 정산 ---
+    def acquire(self, model: str, tokens: int, priority: str = "batch", max_wait: Optional[float] = None) -> bool:
+        """
+        버킷에서 요청 1개와 tokens를 차감할 때까지 기다립니다. max_wait(기본: 우선순위별 MAX_WAIT_SECONDS)를 넘기면
+        아무것도 차감하지 않고 False를 반환하며, 호출부는 요청을 보내지 않아야 합니다.
+        """
+        is_batch = priority != "interactive"
+        rpm, tpm = self.limits(model)
+        keys = self._keys(model)
+        if max_wait is None:
+            max_wait = float(self.max_wait_seconds.get(priority, 120 if is_batch else 10))
+        started = time.monotonic()
+        while True:
+            client = self._get_client()
+            if client is None:
+                return True
+            try:
+                wait_ms = int(self._script(keys=keys, args=[
+                    _now_ms(), rpm, tpm, max(0, int(tokens)), self.batch_reserve_ratio, "1" if is_batch else "0",
+                ]))
+                if wait_ms > 0 and not is_batch:
+                    client.set(keys[3], 1, px=wait_ms + 1000)
+            except Exception as e:
+                self._on_redis_error(e)
+                return True
+
+            waited = time.monotonic() - started
+            if wait_ms <= 0:
+                self.stats["acquired"] += 1
+                self.stats["waited_seconds"] += waited
+                return True
+            if waited >= max_wait:
+                self.stats["timeouts"] += 1
+                self.stats["waited_seconds"] += waited
+                print(f"RateLimiter Warning: {model} {priority} 호출이 {waited:.1f}초를 기다려도 한도가 남지 않아 보내지 않습니다.")
+                return False
+            # 여러 워커가 같은 순간에 다시 두드리지 않도록 약간의 지터를 더합니다.
+            time.sleep(min(wait_ms / 1000.0, max_wait - waited) + random.uniform(0, 0.05))
+
+    def settle(self, model: str, reserved_tokens: int, used_tokens: Optional[int]):
+        """추정 토큰과 실제 사용량의 차이를 TPM 버킷에 되돌리거나 추가로 차감합니다."""
+        if used_tokens is None:
+            return
+        delta = int(reserved_tokens) - int(used_tokens)
+        if delta == 0:
+            return
+        client = self._get_client()
+        if client is None:
+            return
+        try:
+            # 상한은 다음 acquire의 refill에서 용량으로 잘립니다.
+            client.hincrbyfloat(self._keys(model)[1], "level", delta)
+        except Exception as e:
+            self._on_redis_error(e)
+
+    def release(self, model: str, reserved_tokens: int):
+        """보내지 못했거나 거부된(429) 요청이 acquire에서 차감한 요청 1개와 토큰을 모두 되돌립니다."""
+        client = self._get_client()
+        if client is None:
+            return
+        rpm_key, tpm_key = self._keys(model)[:2]
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.hincrbyfloat(rpm_key, "level", 1)
+            pipe.hincrbyfloat(tpm_key, "level", int(reserved_tokens))
+            pipe.execute()
+        except Exception as e:
+            self._on_redis_error(e)
+
+    def penalize(self, model: str, retry_after_seconds: float):
+        """429 응답 후 모든 프로세스가 retry_after_seconds 동안 이 모델 호출을 멈추도록 쿨다운을 겁니다."""
+        self.stats["rate_limited"] += 1
+        client = self._get_client()
+        if client is None:
+            return
+        until = _now_ms() + int(retry_after_seconds * 1000)
+        try:
+            key = self._keys(model)[2]
+            current = client.get(key)
+            if current is None or int(current) < until:
+                client.set(key, until, px=int(retry_after_seconds * 1000) + 1000)
+        except Exception as e:
+            self._on_redis_error(e)
+
+
+_rate_limiter: Optional[OpenAIRateLimiter] = None
+_rate_limiter_lock = threading.Lock()
+
+
+def get_openai_rate_limiter() -> Optional[OpenAIRateLimiter]:
+    """설정에서 활성화된 경우 프로세스당 하나의 속도 제한기를 반환합니다."""
+    global _rate_limiter
+    if not OPENAI_RATE_LIMIT_CONFIG.get("ENABLED", True):
+        return None
+    with _rate_limiter_lock:
+        if _rate_limiter is None:
+            _rate_limiter = OpenAIRateLimiter(
+                model_limits=OPENAI_RATE_LIMIT_CONFIG.get("MODELS", {}),
+                default_limits=OPENAI_RATE_LIMIT_CONFIG.get("DEFAULT", {}),
+                safety_factor=OPENAI_RATE_LIMIT_CONFIG.get("SAFETY_FACTOR", 0.9),
+                batch_reserve_ratio=OPENAI_RATE_LIMIT_CONFIG.get("BATCH_RESERVE_RATIO", 0.2),
+                max_wait_seconds=OPENAI_RATE_LIMIT_CONFIG.get("MAX_WAIT_SECONDS", {}),
+                key_prefix=OPENAI_RATE_LIMIT_CONFIG.get("KEY_PREFIX", "openai_ratelimit"),
+            )
+    return _rate_limiter
+
+
+# --- 토큰 추정 ---
+def _estimate_text_tokens(text) -> int:
+    if isinstance(text, str):
+        return estimate_tokens(text) if text else 0
+    if isinstance(text, list):
+        return sum(_estimate_text_tokens(item) for item in text)
+    if isinstance(text, dict):
+        return _estimate_text_tokens(text.get("text") or text.get("content") or "")
+    return 0
+
+
+def estimate_request_tokens(kind: str, kwargs: dict) -> int:
+    """요청 토큰 추정치. 채팅은 메시지 토큰 + 최대 응답 토큰(max_tokens)입니다."""
+    if kind == "embeddings":
+        return _estimate_text_tokens(kwargs.get("input"))
+    prompt_tokens = sum(4 + _estimate_text_tokens(m.get("content")) for m in kwargs.get("messages") or [] if isinstance(m, dict))
+    completion_tokens = kwargs.get("max_tokens") or kwargs.get("max_completion_tokens") \
+        or OPENAI_RATE_LIMIT_CONFIG.get("DEFAULT_COMPLETION_TOKENS", 512)
+    return prompt_tokens + int(completion_tokens)
+
+
+def _used_tokens(response) -> Optional[int]:
+    usage = getattr(response, "usage", None)
+    return getattr(usage, "total_tokens", None) if usage is not None else None
+
+
+def _retry_after_seconds(error: RateLimitError, attempt: int) -> float:
+    response = getattr(error, "response", None)
+    headers = getattr(response, "headers", None) or {}
+    for header, scale in (("retry-after-ms", 0.001), ("retry-after", 1.0)):
+        try:
+            value = headers.get(header)
+            if value is not None:
+                return max(0.1, float(value) * scale)
+        except (TypeError, ValueError):
+            continue
+    return min(60.0, 2.0 * (2 ** attempt))
+
+
+def _limited_create(create, kind: str, priority: str, kwargs: dict):
+    limiter = get_openai_rate_limiter()
+    model = kwargs.get("model") or ""
+    tokens = estimate_request_tokens(kind, kwargs) if limiter is not None else 0
+    max_retries = int(OPENAI_RATE_LIMIT_CONFIG.get("MAX_RATE_LIMIT_RETRIES", 3))
+    for attempt in range(max_retries + 1):
+        if limiter is not None and not limiter.acquire(model, tokens, priority):
+            raise RateLimitTimeout(f"{model} {priority} 호출의 공유 한도 대기 시간이 초과되었습니다.")
+        try:
+            response = create(**kwargs)
+        except RateLimitError as e:
+            if attempt >= max_retries:
+                raise
+            wait = _retry_after_seconds(e, attempt)
+            print(f"RateLimiter: {model} 429 응답, 공유 쿨다운 {wait:.1f}초 후 재시도 {attempt + 1}/{max_retries}")
+            if limiter is not None:
+                # OpenAI가 거부한 요청이므로 요청 슬롯과 추정 토큰을 모두 돌려주고, 쿨다운이 끝날 때까지 acquire에서 기다립니다.
+                limiter.release(model, tokens)
+                limiter.penalize(model, wait)
+            else:
+                time.sleep(wait)
+            continue
+        if limiter is not None:
+            limiter.settle(model, tokens, _used_tokens(response))
+        return response
+
+
+class _LimitedEndpoint:
+    def __init__(self, endpoint, kind: str, priority: str):
+        self._endpoint = endpoint
+        self._kind = kind
+        self._priority = priority
+
+    def create(self, **kwargs):
+        return _limited_create(self._endpoint.create, self._kind, self._priority, kwargs)
+
+    def __getattr__(self, name):
+        return getattr(self._endpoint, name)
+
+
+class _LimitedChat:
+    def __init__(self, chat, priority: str):
+        self._chat = chat
+        self.completions = _LimitedEndpoint(chat.completions, "chat", priority)
+
+    def __getattr__(self, name):
+        return getattr(self._chat, name)
+
+
+class RateLimitedOpenAI:
+    """OpenAI 클라이언트를 감싸 embeddings.create / chat.completions.create를 공유 속도 제한 아래에서 호출합니다."""
+
+    def __init__(self, client, priority: str = "batch"):
+        if priority not in PRIORITIES:
+            raise ValueError(f"RateLimitedOpenAI: 알 수 없는 우선순위입니다: {priority}")
+        # SDK 자체 재시도(기본 max_retries=2)는 429를 받으면 각 프로세스가 따로 sleep 후 다시 보내고,
+        # 그 요청은 acquire를 거치지 않아 공유 버킷에도 잡히지 않습니다. 429 재시도는 _limited_create의 공유 쿨다운만 사용합니다.
+        if hasattr(client, "with_options"):
+            client = client.with_options(max_retries=0)
+        self.client = client
+        self.priority = priority
+        self.embeddings = _LimitedEndpoint(client.embeddings, "embeddings", priority)
+        self.chat = _LimitedChat(client.chat, priority)
+
+    def __getattr__(self, name):
+        return getattr(self.client, name)
+
+
+def get_rate_limited_openai_client(client, priority: str = "batch"):
+    """client를 우선순위 클래스와 함께 감쌉니다. 제한기가 꺼져 있어도 429 재시도는 한곳에서 처리합니다."""
+    if client is None or isinstance(client, RateLimitedOpenAI):
+        return client
+    return RateLimitedOpenAI(client, priority)
+
+
+def get_langchain_rate_limiter(model: str, priority: str = "interactive"):
+    """
+    LangChain ChatOpenAI(rate_limiter=...)에 넘길 어댑터. LangChain은 호출 전 토큰 수를 알려 주지 않으므로
+    요청당 LANGCHAIN_ESTIMATED_TOKENS를 차감합니다. 제한기가 꺼져 있거나 langchain_core가 오래된 버전이면 None.
+    """
+    limiter = get_openai_rate_limiter()
+    if limiter is None:
+        return None
+    try:
+        from langchain_core.rate_limiters import BaseRateLimiter
+    except ImportError:
+        return None
+
+    tokens = int(OPENAI_RATE_LIMIT_CONFIG.get("LANGCHAIN_ESTIMATED_TOKENS", 2000))
+
+    class _SharedRateLimiter(BaseRateLimiter):
+        def acquire(self, *, blocking: bool = True) -> bool:
+            # LangChain은 blocking 호출의 반환값을 보지 않으므로, 대기 시간이 초과되면 예외로 호출을 막습니다.
+            if limiter.acquire(model, tokens, priority, max_wait=None if blocking else 0):
+                return True
+            if blocking:
+                raise RateLimitTimeout(f"{model} {priority} 호출의 공유 한도 대기 시간이 초과되었습니다.")
+            return False
+
+        async def aacquire(self, *, blocking: bool = True) -> bool:
+            import asyncio
+            return await asyncio.to_thread(self.acquire, blocking=blocking)
+
+    return _SharedRateLimiter()
@@ -0,0 +1,25 @@
+# src/pipeline_stages/article_docs.py
+"""
+기사 문서 공통 헬퍼
+- 기사 ID 생성과 블랙리스트 문서 준비는 finalization 태스크와 bulk writer(bulk_writer.py)가 함께 씁니다.
+  두 모듈이 서로를 import하지 않도록 의존성이 없는 이 모듈에 둡니다.
+"""
+import hashlib
+import os
+from datetime import datetime
+
+
+def generate_article_id(url: str) -> str:
+    if not url:
+        print("Finalization Task Warning: 빈 URL로 ID 생성 시도. 임의 ID 사용.")
+        return f"empty_url_error_{hashlib.sha256(os.urandom(16)).hexdigest()}"
+    return hashlib.sha256(url.encode('utf-8')).hexdigest()
+
+
+def prepare_blacklist_doc(article_doc: dict, reason_tag: str):
+    article_doc.setdefault("checked", {})["dropped_stage"] = "finalization_celery"
+    article_doc["checked"]["dropped_reason_tag"] = reason_tag
+    article_doc["checked"]["dropped_at"] = datetime.now().isoformat()
+
+    if "ID" not in article_doc or not article_doc["ID"]: # ID가 없는 경우 생성
+         article_doc["ID"] = generate_article_id(article_doc.get("url"))
@@ -0,0 +1,240 @@
+# src/pipeline_stages/bulk_writer.py
+"""
+최종 저장 단계(finalization)의 MongoDB/Pinecone 쓰기를 모아 한 번에 보내는 bulk writer
+- 워커는 eventlet/threads 풀로 실행되므로 같은 프로세스의 finalization 태스크들이 하나의 writer를 공유합니다.
+- MAX_BATCH_ARTICLES개가 모이거나 첫 요청 후 MAX_WAIT_MS가 지나면 flush합니다.
+    · 메인 컬렉션: UpdateOne(upsert) 묶음을 bulk_write 한 번으로
+    · Pinecone: 메인 저장에 성공한 기사의 벡터를 upsert 한 번으로 (요청 크기 제한에 맞춰 나눔)
+    · 블랙리스트: 유사도 중복 + 메인 저장 실패 기사를 bulk_write 한 번으로
+    · Seen 필터: 저장된 ID를 Redis 파이프라인 한 번으로
+- 모든 쓰기는 ID 기준 upsert/$set이므로, 태스크 재시도로 같은 기사를 다시 써도 결과가 같습니다.
+- 태스크는 자기 기사의 결과가 나올 때까지 기다리므로, 기존과 같이 저장이 끝난 뒤에 태스크가 완료됩니다.
+- 태스크가 기다리다 포기하고(FLUSH_TIMEOUT_SECONDS) 기사 단위로 직접 저장하는 경우:
+    · 아직 flush 전이면 항목을 취소해 writer가 건너뜁니다.
+    · flush 중이면 항목을 포기 상태로 표시하고, writer는 메인 저장이 실패해도 블랙리스트로 옮기지 않습니다
+      (직접 저장이 메인에 성공했는데 늦은 flush가 블랙리스트에도 쓰는 것을 막음).
+    · writer가 이미 블랙리스트로 옮기기로 했다면 태스크는 직접 저장하지 않고 그 결과를 따릅니다.
+"""
+import json
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future
+from typing import Dict, List, Optional
+
+from pymongo import UpdateOne
+from pymongo.errors import BulkWriteError
+
+from src.config_loader.settings import SETTINGS
+from src.pipeline_stages.article_docs import prepare_blacklist_doc
+from src.pipeline_stages.seen_filter import mark_articles_seen
+
+BULK_WRITE_CONFIG = SETTINGS.get("FINALIZATION_BULK_WRITE", {})
+
+MAIN_SAVE_FAILED_REASON = "failed_mongodb_main_save_final_celery"
+
+
+class _PendingWrite:
+    __slots__ = ("doc", "blacklist_reason", "pinecone_vector", "result", "future", "lock", "abandoned", "main_save_failed")
+
+    def __init__(self, doc: dict, blacklist_reason: Optional[str], pinecone_vector: Optional[tuple]):
+        self.doc = doc
+        self.blacklist_reason = blacklist_reason
+        self.pinecone_vector = pinecone_vector
+        self.result = {"saved_to_main_db": False, "pinecone_upserted": None, "blacklisted": False}
+        self.future = Future()
+        # 타임아웃 후 태스크(abandoned)와 writer(main_save_failed) 중 누가 기사를 맡을지 정합니다.
+        self.lock = threading.Lock()
+        self.abandoned = False
+        self.main_save_failed = False
+
+
+def _estimate_vector_bytes(vector_entry: tuple) -> int:
+    vector_id, vector, metadata = vector_entry
+    # JSON 직렬화 기준 float 하나에 약 10바이트
+    return len(vector_id) + len(vector) * 10 + len(json.dumps(metadata, ensure_ascii=False, default=str).encode("utf-8"))
+
+
+class FinalizationBulkWriter:
+    """프로세스 안의 여러 finalization 태스크에서 들어온 쓰기를 모아 한 번에 보냅니다."""
+
+    def __init__(self, articles_collection, blacklist_collection, pinecone_manager,
+                 max_batch_articles: int = 100, max_wait_ms: int = 200,
+                 pinecone_max_batch_vectors: int = 100, pinecone_max_request_bytes: int = 1500000):
+        self.articles_collection = articles_collection
+        self.blacklist_collection = blacklist_collection
+        self.pinecone_manager = pinecone_manager
+        self.max_batch_articles = max(1, int(max_batch_articles))
+        self.max_wait = max(0, int(max_wait_ms)) / 1000.0
+        self.pinecone_max_batch_vectors = max(1, int(pinecone_max_batch_vectors))
+        self.pinecone_max_request_bytes = int(pinecone_max_request_bytes)
+        self.stats = {"flushes": 0, "articles": 0, "mongo_requests": 0, "pinecone_requests": 0}
+        self._queue = queue.Queue()
+        self._worker = threading.Thread(target=self._run, name="finalization-bulk-writer", daemon=True)
+        self._worker.start()
+
+    def save(self, doc: dict, blacklist_reason: Optional[str] = None, pinecone_vector: Optional[tuple] = None,
+             timeout: Optional[float] = None) -> dict:
+        """
+        doc을 메인 컬렉션(blacklist_reason이 없을 때) 또는 블랙리스트에 저장하고 결과를 기다립니다.
+        pinecone_vector=(id, vector, metadata)는 메인 저장에 성공한 경우에만 업서트합니다.
+        반환: {"saved_to_main_db", "pinecone_upserted", "blacklisted"}.
+        timeout을 넘기면 writer가 이 기사를 더 이상 블랙리스트로 옮기지 않도록 한 뒤 TimeoutError를 냅니다.
+        """
+        item = _PendingWrite(doc, blacklist_reason, pinecone_vector)
+        self._queue.put(item)
+        try:
+            return item.future.result(timeout=timeout)
+        except TimeoutError:
+            if item.future.cancel():  # 아직 flush 전: writer가 건너뜁니다.
+                raise
+            with item.lock:
+                if not item.main_save_failed:
+                    item.abandoned = True
+                    raise
+            # writer가 메인 저장 실패로 이미 블랙리스트 저장을 맡았으므로 직접 저장하지 않습니다.
+            return {"saved_to_main_db": False, "pinecone_upserted": None, "blacklisted": True}
+
+    # --- 배치 수집 / 전송 ---
+    def _next_batch(self) -> List[_PendingWrite]:
+        batch = [self._queue.get()]
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_articles:
+            remaining = deadline - time.monotonic()
+            try:
+                batch.append(self._queue.get(timeout=remaining) if remaining > 0 else self._queue.get_nowait())
+            except queue.Empty:
+                break
+        return batch
+
+    def _run(self):
+        while True:
+            # 태스크가 기다리다 취소한 항목은 건너뜁니다.
+            batch = [item for item in self._next_batch() if item.future.set_running_or_notify_cancel()]
+            if not batch:
+                continue
+            try:
+                self._flush(batch)
+            except Exception as e:
+                print(f"BulkWriter Error: flush 중 예기치 않은 오류 ({len(batch)}개): {e}")
+            for item in batch:
+                if not item.future.done():
+                    item.future.set_result(item.result)
+
+    def _flush(self, batch: List[_PendingWrite]):
+        # 1) 메인 컬렉션
+        main_items = [item for item in batch if item.blacklist_reason is None]
+        for item, ok in zip(main_items, self._bulk_upsert(self.articles_collection, main_items, "메인 DB")):
+            if ok:
+                item.result["saved_to_main_db"] = True
+            else:
+                with item.lock:
+                    if item.abandoned:  # 태스크가 직접 저장 중이므로 블랙리스트로 옮기지 않습니다.
+                        continue
+                    item.main_save_failed = True
+                item.doc.setdefault("checked", {})["finalization_reason"] = "MONGODB_MAIN_SAVE_FAILED"
+                prepare_blacklist_doc(item.doc, MAIN_SAVE_FAILED_REASON)
+                item.blacklist_reason = MAIN_SAVE_FAILED_REASON
+
+        # 2) Pinecone (메인 저장에 성공한 기사만)
+        vector_items = [item for item in main_items if item.result["saved_to_main_db"] and item.pinecone_vector]
+        self._bulk_upsert_vectors(vector_items)
+
+        # 3) 블랙리스트 (저장 성공 여부와 관계없이 기존과 같이 blacklisted로 보고)
+        blacklist_items = [item for item in batch if item.blacklist_reason is not None]
+        blacklist_ok = self._bulk_upsert(self.blacklist_collection, blacklist_items, "블랙리스트")
+        for item in blacklist_items:
+            item.result["blacklisted"] = True
+
+        # 4) Seen 필터
+        saved_ids = [item.doc.get("ID") for item in main_items if item.result["saved_to_main_db"]]
+        blacklisted_ids = [item.doc.get("ID") for item, ok in zip(blacklist_items, blacklist_ok) if ok]
+        mark_articles_seen(saved_ids + blacklisted_ids)
+
+        self.stats["flushes"] += 1
+        self.stats["articles"] += len(batch)
+        print(f"  BulkWriter: {len(batch)}개 기사 한 번에 저장 (메인 {len(saved_ids)}, "
+              f"블랙리스트 {len(blacklisted_ids)}/{len(blacklist_items)}, Pinecone {len(vector_items)}).")
+
+    def _bulk_upsert(self, collection, items: List[_PendingWrite], label: str) -> List[bool]:
+        """ID 기준 UpdateOne(upsert) 묶음을 bulk_write 한 번으로 보내고 항목별 성공 여부를 반환합니다."""
+        if not items:
+            return []
+        if collection is None:
+            print(f"BulkWriter Error: {label} 컬렉션이 없어 {len(items)}개를 저장할 수 없습니다.")
+            return [False] * len(items)
+        # 같은 배치에 같은 ID가 두 번 들어오면(재시도 등) 마지막 문서만 씁니다.
+        positions: Dict[str, int] = {}
+        docs = []
+        for item in items:
+            article_id = item.doc.get("ID")
+            if article_id in positions:
+                docs[positions[article_id]] = item.doc
+            else:
+                positions[article_id] = len(docs)
+                docs.append(item.doc)
+        try:
+            self.stats["mongo_requests"] += 1
+            collection.bulk_write([UpdateOne({"ID": doc.get("ID")}, {"$set": doc}, upsert=True) for doc in docs],
+                                  ordered=False)
+            failed = set()
+        except BulkWriteError as e:
+            failed = {error.get("index") for error in e.details.get("writeErrors", [])}
+            print(f"BulkWriter Warning: {label} bulk_write 중 {len(failed)}/{len(docs)}개 실패: {e.details.get('writeErrors', [])[:1]}")
+        except Exception as e:
+            print(f"BulkWriter Error: {label} bulk_write 실패 ({len(docs)}개): {e}")
+            failed = set(range(len(docs)))
+        return [positions[item.doc.get("ID")] not in failed for item in items]
+
+    def _bulk_upsert_vectors(self, items: List[_PendingWrite]):
+        """요청 크기/개수 제한에 맞춰 나눈 뒤 청크마다 upsert 한 번씩 보냅니다."""
+        chunk, chunk_bytes = [], 0
+        for item in items:
+            size = _estimate_vector_bytes(item.pinecone_vector)
+            if chunk and (len(chunk) >= self.pinecone_max_batch_vectors
+                          or chunk_bytes + size > self.pinecone_max_request_bytes):
+                self._upsert_vector_chunk(chunk)
+                chunk, chunk_bytes = [], 0
+            chunk.append(item)
+            chunk_bytes += size
+        if chunk:
+            self._upsert_vector_chunk(chunk)
+
+    def _upsert_vector_chunk(self, chunk: List[_PendingWrite]):
+        try:
+            self.stats["pinecone_requests"] += 1
+            upserted = self.pinecone_manager.upsert_vectors([item.pinecone_vector for item in chunk])
+            # 일부만 업서트된 경우 어느 벡터가 빠졌는지 알 수 없으므로 청크 전체를 실패로 봅니다.
+            ok = upserted == len(chunk)
+        except Exception as e:
+            print(f"BulkWriter Error: Pinecone 일괄 업서트 실패 ({len(chunk)}개): {e}")
+            ok = False
+        for item in chunk:
+            item.result["pinecone_upserted"] = ok
+
+
+_writers = {}
+_writers_lock = threading.Lock()
+
+
+def get_finalization_bulk_writer(articles_collection, blacklist_collection,
+                                 pinecone_manager) -> Optional[FinalizationBulkWriter]:
+    """설정에서 활성화된 경우 (프로세스, 리소스)당 하나의 writer를 반환합니다."""
+    if not BULK_WRITE_CONFIG.get("ENABLED", True):
+        return None
+    key = (os.getpid(), id(articles_collection), id(blacklist_collection), id(pinecone_manager))
+    with _writers_lock:
+        writer = _writers.get(key)
+        if writer is None:
+            writer = FinalizationBulkWriter(
+                articles_collection,
+                blacklist_collection,
+                pinecone_manager,
+                max_batch_articles=BULK_WRITE_CONFIG.get("MAX_BATCH_ARTICLES", 100),
+                max_wait_ms=BULK_WRITE_CONFIG.get("MAX_WAIT_MS", 200),
+                pinecone_max_batch_vectors=BULK_WRITE_CONFIG.get("PINECONE_MAX_BATCH_VECTORS", 100),
+                pinecone_max_request_bytes=BULK_WRITE_CONFIG.get("PINECONE_MAX_REQUEST_BYTES", 1500000),
+            )
+            _writers[key] = writer
+    return writer
@@ -14,7 +14,10 @@ if _project_root not in sys.path:
     sys.path.insert(0, _project_root)
 
 from src.config_loader.settings import SETTINGS
+from src.openai_rate_limiter import RateLimitTimeout
 from src.pipeline_stages.content_analysis import content_analysis_task
+from src.pipeline_stages.stage_dispatch import dispatch_stage
+from src.pipeline_stages.tracing import traced_stage
 
 
 def _call_llm_for_list_output(prompt_text: str, openai_client, model_name: str, expected_items: int) -> list:
@@ -39,15 +42,10 @@ def _call_llm_for_list_output(prompt_text: str, openai_client, model_name: str,
             parsed_list = [item.strip() for item in raw_output.strip().split(',') if item.strip()]
             return parsed_list[:expected_items]
             
-        except RateLimitError as e:
-            if attempt < max_retries - 1:
-                wait_time = base_delay * (2 ** attempt)  # 지수 백오프
-                print(f"Rate limit reached, waiting {wait_time} seconds before retry {attempt + 1}/{max_retries}")
-                time.sleep(wait_time)
-                continue
-            else:
-                print(f"Rate limit error after {max_retries} attempts: {e}")
-                return []
+        except (RateLimitError, RateLimitTimeout) as e:
+            # 429 재시도와 한도 대기는 공유 속도 제한기(src/openai_rate_limiter.py)가 이미 모든 워커와 맞춰 수행했습니다.
+            print(f"Rate limit error after shared limiter retries: {e}")
+            return []
                 
         except Exception as e:
             print(f"Categorization LLM call error: {e}")
@@ -82,6 +80,7 @@ def extract_llm_internal_keywords(text_content: str, openai_client) -> list:
 
 
 @shared_task(bind=True, max_retries=2, default_retry_delay=180)
+@traced_stage("categorization", ok_key="categorized")
 def categorization_task(self, article_data: dict):
     """
     Celery Task: 기사 내용에서 핵심 키워드만 추출합니다.
@@ -103,7 +102,7 @@ def categorization_task(self, article_data: dict):
         article_data.setdefault("checked", {})["categorization"] = True
         article_data["checked"]["categorization_reason"] = "SKIPPED_IS_DART"
         save_to_data_folder(article_data, f"{current_stage_name_path}/passed_dart", "passed")
-        content_analysis_task.delay(article_data)
+        dispatch_stage(content_analysis_task, article_data)
         return {"article_id": article_data.get("ID"), "categorized": True, "reason": "DART_SKIPPED"}
 
     openai_client_for_nlp = worker_resources.get('openai_client')
@@ -113,7 +112,7 @@ def categorization_task(self, article_data: dict):
         article_data.setdefault("checked", {})["categorization_reason"] = "NO_OPENAI_CLIENT"
         article_data["checked"]["categorization"] = False
         save_to_data_folder(article_data, f"{current_stage_name_path}/skipped_no_client", "skipped")
-        content_analysis_task.delay(article_data)
+        dispatch_stage(content_analysis_task, article_data)
         return {"article_id": article_data.get("ID"), "categorized": False}
 
     content_to_analyze = (article_data.get("content", "") or (article_data.get("title", "") + " " + article_data.get("summary", ""))).strip()
@@ -143,6 +142,6 @@ def categorization_task(self, article_data: dict):
         save_to_data_folder(article_data, f"{current_stage_name_path}/skipped_or_failed", "skipped")
 
     # 다음 단계인 content_analysis_task로 전달
-    content_analysis_task.delay(article_data)
+    dispatch_stage(content_analysis_task, article_data)
     
     return {"article_id": article_data.get("ID"), "categorized": categorized_successfully}
@@ -0,0 +1,164 @@
+# src/pipeline_stages/claim_check.py
+"""
+파이프라인 단계 간 Claim-check 전달
+- 브로커를 거치는 단계 전환에서 article_data 전체 대신 {ID, version} 참조만 메시지로 보냅니다.
+- 기사 상태는 Redis 해시(pipeline:article:<ID>)에 저장하고, 임베딩 벡터는 JSON 실수 목록이 아닌
+  float32 바이트로 별도 필드에 저장합니다.
+- 저장에 실패하면 기존처럼 article_data 전체를 메시지로 보냅니다.
+"""
+import json
+import os
+import struct
+import threading
+from typing import List, Optional
+
+import redis
+
+from src.config_loader.settings import SETTINGS
+
+CLAIM_CHECK_CONFIG = SETTINGS.get("CLAIM_CHECK", {})
+
+# 단일 벡터 필드와 벡터 목록 필드
+VECTOR_FIELDS = ("embedding",)
+VECTOR_LIST_FIELDS = ("llm_individual_keyword_embeddings",)
+
+
+def _pack_vector(vector: List[float]) -> bytes:
+    return struct.pack(f"<{len(vector)}f", *vector)
+
+
+def _unpack_vector(data: bytes) -> List[float]:
+    return list(struct.unpack(f"<{len(data) // 4}f", data))
+
+
+def is_claim_check(payload) -> bool:
+    return isinstance(payload, dict) and payload.get("_claim_check") is True
+
+
+class ArticleStateStore:
+    """Redis 해시 기반 기사 상태 저장소."""
+
+    def __init__(self, ttl_seconds: int = 86400, key_prefix: str = "pipeline:article"):
+        self.ttl_seconds = int(ttl_seconds)
+        self.key_prefix = key_prefix
+        self._client = None
+        self._client_pid = None
+        self._client_lock = threading.Lock()
+
+    def _get_client(self):
+        with self._client_lock:
+            if self._client is None or self._client_pid != os.getpid():
+                self._client = redis.Redis(
+                    host=SETTINGS.get("REDIS_HOST"),
+                    port=SETTINGS.get("REDIS_PORT"),
+                    db=SETTINGS.get("REDIS_DB"),
+                    socket_timeout=5,
+                )
+                self._client_pid = os.getpid()
+            return self._client
+
+    def _key(self, article_id: str) -> str:
+        return f"{self.key_prefix}:{article_id}"
+
+    def put(self, article_data: dict) -> dict:
+        """기사 상태를 저장하고 메시지로 보낼 참조를 반환합니다."""
+        article_id = article_data["ID"]
+        doc = {k: v for k, v in article_data.items() if k not in VECTOR_FIELDS and k not in VECTOR_LIST_FIELDS}
+        fields = {"doc": json.dumps(doc, ensure_ascii=False, default=str)}
+        vector_shapes = {}
+        for name in VECTOR_FIELDS:
+            vector = article_data.get(name)
+            if name in article_data:
+                fields[f"vec:{name}"] = _pack_vector(vector or [])
+                vector_shapes[name] = "vector"
+        for name in VECTOR_LIST_FIELDS:
+            vectors = article_data.get(name)
+            if name in article_data:
+                dim = len(vectors[0]) if vectors else 0
+                fields[f"vec:{name}"] = b"".join(_pack_vector(v) for v in vectors or [])
+                vector_shapes[name] = dim
+        fields["shapes"] = json.dumps(vector_shapes)
+
+        key = self._key(article_id)
+        client = self._get_client()
+        # 버전 카운터는 상태와 별도 키에 두어, 상태를 통째로 바꿔 써도 버전이 계속 증가하도록 합니다.
+        version = client.incr(f"{key}:version")
+        fields["version"] = version
+        pipe = client.pipeline(transaction=True)
+        pipe.delete(key)
+        pipe.hset(key, mapping=fields)
+        pipe.expire(key, self.ttl_seconds)
+        pipe.expire(f"{key}:version", self.ttl_seconds)
+        pipe.execute()
+        return {"_claim_check": True, "ID": article_id, "version": version, "url": article_data.get("url", "")}
+
+    def get(self, ref: dict) -> dict:
+        key = self._key(ref["ID"])
+        stored = self._get_client().hgetall(key)
+        if not stored:
+            raise LookupError(f"ClaimCheck: 기사 상태를 찾을 수 없습니다 (ID: {ref['ID']}, 만료되었거나 삭제됨).")
+        stored_version = int(stored.get(b"version", 0))
+        if stored_version < int(ref.get("version", 0)):
+            raise LookupError(f"ClaimCheck: 저장된 상태(v{stored_version})가 참조(v{ref.get('version')})보다 오래되었습니다 (ID: {ref['ID']}).")
+        if stored_version > int(ref.get("version", 0)):
+            print(f"ClaimCheck Warning: 참조(v{ref.get('version')})보다 새로운 상태(v{stored_version})를 사용합니다 (ID: {ref['ID']}).")
+
+        article_data = json.loads(stored[b"doc"])
+        for name, shape in json.loads(stored.get(b"shapes", b"{}")).items():
+            data = stored.get(f"vec:{name}".encode(), b"")
+            if shape == "vector":
+                article_data[name] = _unpack_vector(data)
+            else:
+                flat = _unpack_vector(data)
+                article_data[name] = [flat[i:i + shape] for i in range(0, len(flat), shape)] if shape else []
+        return article_data
+
+    def delete(self, article_id: str):
+        key = self._key(article_id)
+        self._get_client().delete(key, f"{key}:version")
+
+
+_state_store: Optional[ArticleStateStore] = None
+_state_store_lock = threading.Lock()
+
+
+def get_article_state_store() -> Optional[ArticleStateStore]:
+    """설정에서 활성화된 경우 프로세스당 하나의 저장소 인스턴스를 반환합니다."""
+    global _state_store
+    if not CLAIM_CHECK_CONFIG.get("ENABLED", True):
+        return None
+    with _state_store_lock:
+        if _state_store is None:
+            _state_store = ArticleStateStore(ttl_seconds=CLAIM_CHECK_CONFIG.get("TTL_SECONDS", 86400))
+    return _state_store
+
+
+def to_message_payload(article_data: dict):
+    """브로커로 보낼 메시지를 만듭니다. Claim-check를 쓸 수 없으면 article_data를 그대로 반환합니다."""
+    store = get_article_state_store()
+    if store is None or not article_data.get("ID"):
+        return article_data
+    try:
+        return store.put(article_data)
+    except Exception as e:
+        print(f"ClaimCheck Warning: 기사 상태 저장 실패, 전체 데이터를 메시지로 전송합니다: {e}")
+        return article_data
+
+
+def resolve_article_payload(payload) -> dict:
+    """태스크 인자가 Claim-check 참조이면 저장된 기사 상태로 바꿉니다."""
+    if not is_claim_check(payload):
+        return payload
+    store = get_article_state_store() or ArticleStateStore()
+    return store.get(payload)
+
+
+def release_article_state(article_id: Optional[str]):
+    """파이프라인이 끝난 기사의 상태를 삭제합니다."""
+    store = get_article_state_store()
+    if store is None or not article_id:
+        return
+    try:
+        store.delete(article_id)
+    except Exception as e:
+        print(f"ClaimCheck Warning: 기사 상태 삭제 실패 (ID: {article_id}): {e}")
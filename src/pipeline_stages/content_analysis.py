@@ -2,6 +2,8 @@
 from celery import shared_task
 from typing import Tuple
 from src.pipeline_stages.embedding_generator import embedding_generation_task # 다음 태스크
+from src.pipeline_stages.stage_dispatch import dispatch_stage
+from src.pipeline_stages.tracing import traced_stage
 
 # --- 기존 필터링 규칙 및 헬퍼 함수 유지 ---
 DROP_WORDS_QUALITY = ["바보", "멍청이", "idiot", "stupid", "광고문의", "스팸입니다"] #
@@ -22,6 +24,7 @@ def _check_quality_drop_url(url: str): #
     return False #
 
 @shared_task(bind=True) # 이 태스크는 외부 I/O가 적어 재시도 필요성 낮을 수 있음
+@traced_stage("content_analysis", ok_key="passed")
 def content_analysis_task(self, article_data: dict):
     task_id_log = f"(Task ID: {self.request.id})" if self.request.id else ""
     print(f"\n📰 Content Analysis Task: 처리 시작 {task_id_log} - {article_data.get('url', 'URL 없음')[:70]}...")
@@ -55,6 +58,6 @@ def content_analysis_task(self, article_data: dict):
     else: #
         print(f"  ✅ Stage 4 (Content Analysis Task): 통과. 기사: {url} {task_id_log}") #
         save_to_data_folder(article_data, f"{current_stage_name_path}/passed", "passed") #
-        embedding_generation_task.delay(article_data)
+        dispatch_stage(embedding_generation_task, article_data)
 
     return {"article_id": article_data.get("ID"), "passed": passed_analysis}
@@ -6,8 +6,6 @@ from bs4 import BeautifulSoup
 from newspaper import Article as NewspaperArticle, Config as NewspaperConfig, ArticleException
 import nltk
 import ssl
-import requests
-from requests.exceptions import SSLError as RequestsSSLError
 from typing import Tuple, Optional, Dict
 import sys
 from celery import shared_task
@@ -26,8 +24,31 @@ else:
     print(f"DEBUG (content_extraction.py): {_project_root}는 이미 sys.path에 있습니다.")
 from src.pipeline_stages.categorization import categorization_task
 from src.pipeline_stages.content_analysis import content_analysis_task
+from src.pipeline_stages.stage_dispatch import dispatch_stage
+from src.pipeline_stages.tracing import traced_stage
+from src.pipeline_stages.near_duplicate import find_near_duplicate
+from src.pipeline_stages.extraction_strategy import extraction_host, get_extraction_strategy_table
+from src.pipeline_stages.lxml_extraction import PAGE_SELECTOR_NAME, extract_content_with_lxml
+from src.pipeline_stages.html_pruning import prune_html_for_llm
+from src.pipeline_stages.html_fetcher import BROWSER_USER_AGENT, CRAWLER_USER_AGENT, fetch_article_page, fetch_page, forget_page
+from src.pipeline_stages.seen_filter import mark_article_seen
 from src.config_loader.settings import SETTINGS
 REPLACEMENT_CHAR = SETTINGS.get("REPLACEMENT_CHAR", '\ufffd')
+LXML_FAST_PATH_ENABLED = SETTINGS.get("LXML_EXTRACTION", {}).get("ENABLED", True)
+LXML_MIN_TEXT_COVERAGE = SETTINGS.get("LXML_EXTRACTION", {}).get("MIN_TEXT_COVERAGE", 0.5)
+
+def _run_cpu_bound(func, *args, **kwargs):
+    """
+    HTML 파싱처럼 CPU를 오래 쓰는 호출을 실행합니다. eventlet 워커(celery_worker_fetch)에서는 네이티브 스레드 풀
+    (eventlet.tpool, 크기는 EVENTLET_THREADPOOL_SIZE)에서 실행해, 파싱하는 동안에도 허브가 다른 기사의 네트워크 대기를
+    계속 처리하게 합니다. 그 밖의 풀에서는 그대로 호출합니다. func 안에서 네트워크 I/O를 하면 안 됩니다.
+    """
+    # eventlet 풀 워커는 시작할 때 eventlet을 임포트하고 monkey patch하므로, 여기서 새로 임포트하지 않습니다.
+    eventlet_patcher = sys.modules.get('eventlet.patcher')
+    if eventlet_patcher is not None and eventlet_patcher.is_monkey_patched('socket'):
+        from eventlet import tpool
+        return tpool.execute(func, *args, **kwargs)
+    return func(*args, **kwargs)
 
 _nltk_punkt_initialized = False
 def initialize_nltk_punkt_once():
@@ -56,17 +77,23 @@ def initialize_nltk_punkt_once():
 
 
 # --- Aigen_science/src/processor/processor.py의 fetch_article_with_newspaper3k 로직 통합 ---
-def fetch_article_with_newspaper3k(url: str, language_code='ko') -> Optional[Dict]:
+def fetch_article_with_newspaper3k(url: str, language_code='ko', html: Optional[str] = None) -> Optional[Dict]:
+    """html이 주어지면 다시 내려받지 않고 그 HTML을 파싱합니다. 없으면 fetch_page(HTML 캐시 사용)로 받습니다."""
     if not url:
         return None
+    if not html:
+        page = fetch_page(url)
+        if page is None:
+            return None
+        html = page.text
     config = NewspaperConfig()
-    config.browser_user_agent = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36'
+    config.browser_user_agent = BROWSER_USER_AGENT
     config.request_timeout = 15
     config.memoize_articles = False
     config.fetch_images = False
     article_parser = NewspaperArticle(url, language=language_code, config=config)
     try:
-        article_parser.download()
+        article_parser.download(input_html=html)
         if article_parser.download_state != 2: # SUCCESS
             return None
         article_parser.parse()
@@ -86,76 +113,61 @@ def fetch_article_with_newspaper3k(url: str, language_code='ko') -> Optional[Dic
 
 # --- Aigen_science/src/processor/processor.py의 fetch_content_with_beautifulsoup 로직 통합 ---
 def fetch_content_with_beautifulsoup(url: str, is_naver_news: bool = False) -> Optional[str]:
-    if not url: return None
-    session = requests.Session()
-    session.headers.update({'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36'})
-    response = None
-    try:
-        response = session.get(url, timeout=10)
-        response.raise_for_status()
-    except RequestsSSLError:
-        try:
-            import urllib3
-            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-            response = session.get(url, timeout=10, verify=False)
-            response.raise_for_status()
-        except Exception:
-            return None
-    except Exception:
-        return None
-
-    if response is None: return None
-
-    html_content_bytes = response.content
-    decoded_html_text = None
-    potential_encodings = ['utf-8']
-    if response.encoding:
-        potential_encodings.append(response.encoding.lower())
-    if response.apparent_encoding:
-        potential_encodings.append(response.apparent_encoding.lower())
-    potential_encodings.extend(['euc-kr', 'cp949', 'iso-8859-1'])
-
-    unique_encodings = []
-    for enc in potential_encodings:
-        if enc and enc not in unique_encodings:
-            unique_encodings.append(enc)
-
-    for enc in unique_encodings:
-        try:
-            decoded_html_text = html_content_bytes.decode(enc)
-            if REPLACEMENT_CHAR not in decoded_html_text:
-                break
-            decoded_html_text = None
-        except UnicodeDecodeError:
-            decoded_html_text = None
-        except Exception:
-            decoded_html_text = None
-
-    if decoded_html_text is None:
-        decoded_html_text = html_content_bytes.decode('utf-8', errors='replace')
-
-
+    page = fetch_page(url)
+    if page is None: return None
+    return extract_content_with_beautifulsoup(page.text, is_naver_news)
+
+# 본문 영역 선택자. 이름은 호스트별 추출 전략 통계("bs:<이름>", extraction_strategy.py)의 키로 쓰입니다.
+NAVER_SELECTORS = [
+    {'name': 'naver_dic_area', 'tag': 'div', 'attrs': {'id': 'dic_area'}},
+    {'name': 'naver_newsct_article', 'tag': 'div', 'attrs': {'class': 'newsct_article _article_body'}},
+    {'name': 'naver_article_dic_area', 'tag': 'article', 'attrs': {'id': 'dic_area'}},
+    {'name': 'naver_section_article_body', 'tag': 'section', 'attrs': {'class': 'article-body'}},]
+GENERAL_SELECTORS = [
+    {'name': 'article', 'tag': 'article', 'attrs': {}},
+    {'name': 'div_content_class', 'tag': 'div', 'attrs': {'class': re.compile(r'article-content|article_body|post-content|entry-content|본문|article_view|articleBody|content|view_content', re.I)}},
+    {'name': 'main', 'tag': 'main', 'attrs': {}},
+    {'name': 'div_content_id', 'tag': 'div', 'attrs': {'id': re.compile(r'article_body|content|articleContent|realContent|viewContent', re.I)}},]
+# lxml_extraction.py의 XPath 선택자와 이름/순서를 맞춥니다.
+_SELECTORS_BY_NAME = {selector['name']: selector for selector in NAVER_SELECTORS + GENERAL_SELECTORS}
+
+def extract_content_with_beautifulsoup(decoded_html_text: str, is_naver_news: bool = False) -> Optional[str]:
+    """이미 내려받아 디코딩한 HTML에서 본문을 추출합니다."""
+    return extract_content_with_selectors(decoded_html_text, is_naver_news)[0]
+
+def extract_content_with_selectors(decoded_html_text: str, is_naver_news: bool = False,
+                                   only_selector: Optional[str] = None) -> Tuple[Optional[str], Optional[str]]:
+    """
+    (본문, 사용한 선택자 이름)을 반환합니다. 선택자가 하나도 맞지 않으면 페이지 전체 텍스트와 PAGE_SELECTOR_NAME.
+    only_selector가 주어지면 그 선택자 하나만 찾아보고, 없으면 페이지 전체로 넘어가지 않고 (None, None)입니다.
+    """
+    if not decoded_html_text: return None, None
+    # lxml + 컴파일된 XPath 빠른 경로 (lxml_extraction.py). 쓸 수 없거나 실패하면 아래 BeautifulSoup 경로로 추출합니다.
+    if LXML_FAST_PATH_ENABLED:
+        fast_result = extract_content_with_lxml(decoded_html_text, is_naver_news, only_selector=only_selector,
+                                                min_coverage=LXML_MIN_TEXT_COVERAGE)
+        if fast_result is not None:
+            return fast_result
     try:
         soup = BeautifulSoup(decoded_html_text, 'html.parser')
-        article_body = None
-        if is_naver_news:
-            naver_selectors = [
-                {'tag': 'div', 'attrs': {'id': 'dic_area'}},
-                {'tag': 'div', 'attrs': {'class': 'newsct_article _article_body'}},
-                {'tag': 'article', 'attrs': {'id': 'dic_area'}},
-                {'tag': 'section', 'attrs': {'class': 'article-body'}},]
-            for selector in naver_selectors:
+        article_body, matched_selector = None, None
+        if only_selector:
+            selector = _SELECTORS_BY_NAME.get(only_selector)
+            article_body = soup.find(selector['tag'], **selector['attrs']) if selector else None
+            if not article_body: return None, None
+            matched_selector = only_selector
+        if not article_body and is_naver_news:
+            for selector in NAVER_SELECTORS:
                 article_body = soup.find(selector['tag'], **selector['attrs'])
-                if article_body: break
+                if article_body:
+                    matched_selector = selector['name']
+                    break
         if not article_body:
-            general_selectors = [
-                {'tag': 'article', 'attrs': {}},
-                {'tag': 'div', 'attrs': {'class': re.compile(r'article-content|article_body|post-content|entry-content|본문|article_view|articleBody|content|view_content', re.I)}},
-                {'tag': 'main', 'attrs': {}},
-                {'tag': 'div', 'attrs': {'id': re.compile(r'article_body|content|articleContent|realContent|viewContent', re.I)}},]
-            for selector in general_selectors:
+            for selector in GENERAL_SELECTORS:
                 article_body = soup.find(selector['tag'], **selector['attrs'])
-                if article_body: break
+                if article_body:
+                    matched_selector = selector['name']
+                    break
 
         text_content = ""
         if article_body:
@@ -177,6 +189,7 @@ def fetch_content_with_beautifulsoup(url: str, is_naver_news: bool = False) -> O
                     else: text_content = article_body.get_text(separator=' ', strip=True)
                 else: text_content = article_body.get_text(separator=' ', strip=True)
         else:
+            matched_selector = PAGE_SELECTOR_NAME
             for tag_to_remove_global in soup.find_all(['script', 'style', 'aside', 'nav', 'footer', 'header', 'form', 'iframe', 'noscript',
                                                     lambda tag: tag.has_attr('class') and any(cls in tag['class'] for cls in ['ad', 'banner', 'popup', 'related', 'share', 'comment', 'social', 'advertisement', 'widget']) or
                                                                 tag.has_attr('id') and any(id_val in tag['id'] for id_val in ['ad', 'banner', 'popup', 'related', 'share', 'comment', 'social', 'advertisement', 'widget'])]):
@@ -185,42 +198,14 @@ def fetch_content_with_beautifulsoup(url: str, is_naver_news: bool = False) -> O
 
         if text_content and REPLACEMENT_CHAR in text_content:
             pass
-        return text_content
+        return text_content, matched_selector
     except Exception as e_parsing:
-        return None
+        return None, None
 
 # --- Aigen_science/src/processor/processor.py의 get_html_for_llm 로직 통합 ---
 def get_html_for_llm(url: str) -> Optional[str]:
-    if not url: return None
-    try:
-        headers = {'User-Agent': 'Googlebot/2.1 (+http://www.google.com/bot.html)'}
-        import urllib3
-        urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
-        response = requests.get(url, headers=headers, timeout=15, verify=False)
-        response.raise_for_status()
-
-        html_content_bytes = response.content
-        decoded_html = None
-        try:
-            decoded_html = html_content_bytes.decode('utf-8')
-            if REPLACEMENT_CHAR in decoded_html: decoded_html = None
-        except UnicodeDecodeError:
-            pass
-
-        if not decoded_html and response.apparent_encoding:
-            try:
-                decoded_html = html_content_bytes.decode(response.apparent_encoding, errors='replace')
-            except UnicodeDecodeError:
-                pass
-
-        if not decoded_html:
-             decoded_html = html_content_bytes.decode('utf-8', errors='replace')
-
-        return decoded_html
-    except requests.exceptions.RequestException as e:
-        return None
-    except Exception as e_general:
-        return None
+    page = fetch_page(url, user_agent=CRAWLER_USER_AGENT)
+    return page.text if page is not None else None
 
 # --- Aigen_science/src/processor/processor.py의 try_llm_content_extraction_from_html 로직 통합 ---
 def try_llm_content_extraction_from_html(url: str, html_content: str, openai_client) -> Optional[str]:
@@ -231,7 +216,16 @@ def try_llm_content_extraction_from_html(url: str, html_content: str, openai_cli
         return None
 
     LLM_EXTRACTION_MODEL = SETTINGS.get("OPENAI_LLM_EXTRACTION_MODEL", "gpt-4.1-nano")
-    html_snippet_for_llm = html_content[:80000]
+    # 스크립트/메뉴 등을 지우고 글이 가장 빽빽한 영역의 텍스트 블록만 보냅니다 (html_pruning.py).
+    # 충분한 텍스트를 찾지 못하면 기존처럼 원본 HTML 앞부분을 보냅니다.
+    pruned_text = prune_html_for_llm(html_content) if SETTINGS.get("HTML_PRUNING", {}).get("ENABLED", True) else None
+    if pruned_text:
+        html_snippet_for_llm = pruned_text
+        input_label = "HTML에서 스크립트, 메뉴 등을 제거하고 텍스트 블록만 남긴 내용 (#: 제목, -: 목록, >: 인용)"
+        print(f"ContentExtraction (LLM Extract): HTML {len(html_content)}자 → 텍스트 블록 {len(pruned_text)}자로 축소. {url}")
+    else:
+        html_snippet_for_llm = html_content[:80000]
+        input_label = "HTML 내용"
     prompt = f"""
     당신은 HTML 문서에서 특정 내용을 **그대로, 단 한 글자도 빠짐없이, 어떠한 요약이나 수정, 재구성도 하지 않고** 추출하는 매우 정밀한 로봇입니다.
     당신의 임무는 주어진 HTML에서 오직 뉴스 기사의 본문 전체를 시작부터 끝까지 문자 그대로 복사하는 것입니다.
@@ -242,9 +236,9 @@ def try_llm_content_extraction_from_html(url: str, html_content: str, openai_cli
     4.  **부가 요소 완벽 제거**: 광고, 메뉴, 사이드바, 관련 기사 링크 목록, 댓글, SNS 공유 버튼, 저작권 고지 등 기사 본문이 아닌 모든 것은 철저히 제거해주세요.
     5.  **형식 유지**: 원본 기사의 문단 구분(줄바꿈)을 최대한 따라서 출력해주세요.
     6.  **출처 정보 포함 (선택 사항, 필요한 경우)**: 만약 기사 본문 바로 뒤에 '출처: [언론사명]' 또는 유사한 형태의 출처 정보가 명확히 있다면, 해당 줄까지 포함하여 추출해주세요. (만약 이 지시가 방해가 된다면 무시해도 좋습니다.)
-    아래 제공된 HTML 내용에서 위 규칙들을 철저히 지켜 뉴스 기사 본문 전체를 추출해주세요.
-    HTML 내용:
-    ```html
+    아래 제공된 내용에서 위 규칙들을 철저히 지켜 뉴스 기사 본문 전체를 추출해주세요.
+    {input_label}:
+    ```
     {html_snippet_for_llm}
     ```
     정제된 기사 본문:
@@ -310,8 +304,22 @@ def _summarize_with_llm(text_content: str, openai_client) -> str:
         print(f"  ContentExtraction (LLM Summary): LLM 요약 생성 중 오류 발생: {e}")
         return "" # 오류 발생 시 빈 문자열 반환
     
+def _save_near_duplicate_to_blacklist(article_data: dict, blacklist_collection_res, reason_tag: str):
+    if blacklist_collection_res is None:
+        print(f"Content Extraction Task Error: 블랙리스트 DB 컬렉션이 없어 근접 중복 기사를 저장할 수 없습니다: {article_data.get('url')}")
+        return
+    try:
+        article_data.setdefault("checked", {})["dropped_stage"] = "content_extraction_celery"
+        article_data["checked"]["dropped_reason_tag"] = reason_tag
+        article_data["checked"]["dropped_at"] = datetime.now().isoformat()
+        blacklist_collection_res.update_one({"ID": article_data.get("ID")}, {"$set": article_data}, upsert=True)
+        mark_article_seen(article_data.get("ID"))
+    except Exception as e:
+        print(f"  Content Extraction Task Error: 블랙리스트 저장 중 오류: {e} for URL {article_data.get('url')}")
+
 # --- content_extraction_task 내에서 LLM 요약 함수 호출 ---
 @shared_task(bind=True, max_retries=2, default_retry_delay=120)
+@traced_stage("content_extraction", ok_key="extracted")
 def content_extraction_task(self, article_data: dict):
     task_id_log = f"(Task ID: {self.request.id})" if self.request.id else ""
     print(f"\n📰 Content Extraction Task: 처리 시작 {task_id_log} - {article_data.get('url', 'URL 없음')[:70]}...")
@@ -342,39 +350,76 @@ def content_extraction_task(self, article_data: dict):
 
     is_naver_news_link = bool(article_url and ("n.news.naver.com/mnews/article" in article_url or "sports.naver.com" in article_url)) # 수정된 코드
 
-    # 콘텐츠 추출 전략 (원본 함수의 로직을 최대한 따름)
-    if is_naver_news_link:
-        content_candidate = fetch_content_with_beautifulsoup(article_url, is_naver_news=True)
+    # 페이지는 한 번만 내려받고, 아래 추출 전략들이 같은 HTML을 차례로 사용합니다 (html_fetcher.py).
+    # 재시도 때는 캐시된 페이지가 일시적인 차단/오류 페이지일 수 있으므로 새로 받습니다.
+    page = fetch_article_page(article_url, refresh=self.request.retries > 0)
+    page_html = page.text if page is not None else None
+
+    # 호스트별로 성공했던 추출기/선택자를 먼저 한 번만 시도합니다 (extraction_strategy.py).
+    extraction_host_name = extraction_host(article_url)
+    strategy_table = get_extraction_strategy_table() if page_html is not None and article_source_tag != "DART" else None
+    preferred_strategy = strategy_table.preferred_strategy(
+        extraction_host_name, favor=None if is_naver_news_link else "newspaper3k") if strategy_table is not None else None
+    strategy_attempts = []
+
+    def _try_beautifulsoup(only_selector: Optional[str] = None) -> Optional[str]:
+        text, selector_name = _run_cpu_bound(extract_content_with_selectors, page_html, is_naver_news_link, only_selector=only_selector)
+        ok = bool(text and len(text.strip()) > 50)
+        strategy_attempts.append((f"bs:{selector_name or only_selector or PAGE_SELECTOR_NAME}", ok))
+        return text if ok else None
+
+    def _try_newspaper3k() -> Optional[Dict]:
+        np_data = _run_cpu_bound(fetch_article_with_newspaper3k, article_url, html=page_html)
+        ok = bool(np_data and np_data.get("content_extracted") and len(np_data["content_extracted"].strip()) > 50)
+        strategy_attempts.append(("newspaper3k", ok))
+        return np_data if ok else None
+
+    if page_html is not None and preferred_strategy:
+        if preferred_strategy == "newspaper3k":
+            extracted_np_data = _try_newspaper3k()
+            if extracted_np_data:
+                content_candidate = extracted_np_data["content_extracted"]
+                if extracted_np_data.get("title_extracted"): extracted_title_candidate = extracted_np_data["title_extracted"]
+                if extracted_np_data.get("publish_date_extracted"): extracted_publish_date_candidate_str = extracted_np_data["publish_date_extracted"]
+        else:
+            content_candidate = _try_beautifulsoup(only_selector=preferred_strategy[len("bs:"):])
+        if content_candidate:
+            content_source_log = f"learned_{preferred_strategy}"
+
+    # 콘텐츠 추출 전략 (원본 함수의 로직을 최대한 따름). 학습된 전략이 실패하면 기본 순서로 나머지를 시도합니다.
+    if page_html is None:
+        content_source_log = "html_fetch_failed"
+    elif content_candidate:
+        pass
+    elif is_naver_news_link:
+        content_candidate = _try_beautifulsoup()
         content_source_log = "beautifulsoup_naver"
-        if not (content_candidate and len(content_candidate.strip()) > 50):
-            extracted_np_data = fetch_article_with_newspaper3k(article_url)
-            if extracted_np_data and extracted_np_data.get("content_extracted") and \
-               len(extracted_np_data["content_extracted"].strip()) > 50:
+        if not content_candidate and preferred_strategy != "newspaper3k":
+            extracted_np_data = _try_newspaper3k()
+            if extracted_np_data:
                 content_candidate = extracted_np_data["content_extracted"]
                 content_source_log = "newspaper3k_after_bs_fail_naver"
                 if extracted_np_data.get("title_extracted"): extracted_title_candidate = extracted_np_data["title_extracted"]
                 if extracted_np_data.get("publish_date_extracted"): extracted_publish_date_candidate_str = extracted_np_data["publish_date_extracted"]
-            else:
-                content_candidate = None
     else: # 일반 URL
-        extracted_np_data = fetch_article_with_newspaper3k(article_url)
-        if extracted_np_data and extracted_np_data.get("content_extracted") and \
-           len(extracted_np_data["content_extracted"].strip()) > 50:
+        extracted_np_data = _try_newspaper3k() if preferred_strategy != "newspaper3k" else None
+        if extracted_np_data:
             content_candidate = extracted_np_data["content_extracted"]
             content_source_log = "newspaper3k_general"
             if extracted_np_data.get("title_extracted"): extracted_title_candidate = extracted_np_data["title_extracted"]
             if extracted_np_data.get("publish_date_extracted"): extracted_publish_date_candidate_str = extracted_np_data["publish_date_extracted"]
         else:
-            content_candidate = fetch_content_with_beautifulsoup(article_url, is_naver_news=False)
+            content_candidate = _try_beautifulsoup()
             content_source_log = "beautifulsoup_general_fallback"
-            if not (content_candidate and len(content_candidate.strip()) > 50):
-                content_candidate = None
 
-    if not (content_candidate and len(content_candidate.strip()) > 50) and article_source_tag != "DART":
-        html_for_llm = get_html_for_llm(article_url)
+    cheap_extraction_failed = not (content_candidate and len(content_candidate.strip()) > 50)
+    if cheap_extraction_failed and article_source_tag != "DART":
+        html_for_llm = page_html
         if html_for_llm and openai_client_for_extraction:
             llm_extracted_content = try_llm_content_extraction_from_html(article_url, html_for_llm, openai_client_for_extraction)
-            if llm_extracted_content and len(llm_extracted_content.strip()) > 50:
+            llm_ok = bool(llm_extracted_content and len(llm_extracted_content.strip()) > 50)
+            strategy_attempts.append(("llm", llm_ok))
+            if llm_ok:
                 content_candidate = llm_extracted_content
                 content_source_log = "llm_extraction_from_html"
         elif not openai_client_for_extraction:
@@ -382,7 +427,12 @@ def content_extraction_task(self, article_data: dict):
         else:
             content_source_log += "_llm_skipped_no_html"
 
+    if strategy_table is not None:
+        strategy_table.record(extraction_host_name, strategy_attempts, llm_needed=cheap_extraction_failed)
+
     final_content_text = content_candidate if content_candidate is not None else ""
+    if cheap_extraction_failed and not final_content_text.strip():
+        forget_page(page)  # 어떤 추출기도 본문을 찾지 못한 페이지는 캐시에 남기지 않습니다.
 
     # 제목 업데이트
     if extracted_title_candidate:
@@ -397,6 +447,20 @@ def content_extraction_task(self, article_data: dict):
     # final_content_text가 확정된 후 요약 생성
     article_data["content"] = final_text_clean(final_content_text)
 
+    # 최근 기사의 근접 중복(전재/재작성)이면 LLM 요약, 키워드 추출, 임베딩을 하지 않고 여기서 드롭합니다.
+    near_duplicate = find_near_duplicate(article_data) if len(article_data["content"].strip()) > 50 else None
+    if near_duplicate:
+        article_data.setdefault("checked", {})["content_source_log"] = content_source_log
+        article_data["checked"]["content_extraction"] = False
+        article_data["checked"]["content_extraction_reason"] = (
+            f"NEAR_DUPLICATE_CONTENT (Jaccard: {near_duplicate['similarity']:.4f} with ID: {near_duplicate['duplicate_of']})")
+        print(f"  ➡️ Stage 2 (Content Extraction Task): 근접 중복 기사로 드롭 (유사 ID: {near_duplicate['duplicate_of']}, "
+              f"Jaccard: {near_duplicate['similarity']:.4f}). 기사: {article_url} {task_id_log}")
+        save_to_data_folder(article_data, f"{current_stage_name_path}/near_duplicate", "dropped")
+        _save_near_duplicate_to_blacklist(article_data, worker_resources.get('blacklist_collection'),
+                                          "near_duplicate_content_local_celery")
+        return {"article_id": article_data.get("ID"), "extracted": False, "near_duplicate_of": near_duplicate["duplicate_of"]}
+
     # **여기서 LLM 요약을 수행합니다.**
     # 추출된 본문이 있고 OpenAI 클라이언트가 있다면 요약 생성
     if article_data["content"] and openai_client_for_extraction:
@@ -441,10 +505,10 @@ def content_extraction_task(self, article_data: dict):
         save_to_data_folder(article_data, f"{current_stage_name_path}/passed", "passed")
         # 다음 태스크 결정 (Categorization 활성화 여부에 따라)
         if SETTINGS.get("LLM_CATEGORIZATION", {}).get("ENABLED", False):
-            categorization_task.delay(article_data)
+            dispatch_stage(categorization_task, article_data)
         else:
             print(f"  ℹ️ Stage 3 (Categorization Task): 비활성화됨. Content Analysis Task로 진행. {task_id_log}")
             article_data["checked"]["categorization"] = "skipped_disabled"
-            content_analysis_task.delay(article_data)
+            dispatch_stage(content_analysis_task, article_data)
 
     return {"article_id": article_data.get("ID"), "extracted": extracted_successfully}
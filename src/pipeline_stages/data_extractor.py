@@ -3,6 +3,8 @@ from langchain_core.pydantic_v1 import BaseModel, Field
 from langchain_openai import ChatOpenAI
 from typing import List, Dict, Any, Optional
 
+from src.openai_rate_limiter import get_langchain_rate_limiter
+
 # --- Pydantic 모델 정의: LLM의 출력 형식을 강제하여 안정적인 JSON 획득 ---
 
 class ChartDataItem(BaseModel):
@@ -30,7 +32,7 @@ def extract_chart_data_and_react_code(question: str, generation_text: str, inten
     LLM이 생성한 텍스트(generation_text)에서 차트용 JSON 데이터와 React 코드를 추출합니다.
     """
     # config.yaml 등에서 모델 정보를 불러오도록 수정 가능
-    llm = ChatOpenAI(model="gpt-4.1-nano", temperature=0) 
+    llm = ChatOpenAI(model="gpt-4.1-nano", temperature=0, rate_limiter=get_langchain_rate_limiter("gpt-4.1-nano", "interactive"))
     structured_llm = llm.with_structured_output(ExtractedContent)
     
     # 사용자의 요청 유형에 따라 프롬프트 분기
@@ -0,0 +1,193 @@
+# src/pipeline_stages/embedding_batcher.py
+"""
+여러 기사의 임베딩 요청을 모아 한 번의 embeddings.create(input=[...]) 호출로 보내는 마이크로 배처
+- 임베딩 워커는 --pool=eventlet으로 실행되므로(docker-compose celery_worker_embedding) 같은 프로세스의 그린 스레드
+  태스크들이 하나의 배처를 공유합니다. 배처의 전송 루프도 (monkey patch된) threading으로 만든 그린 스레드입니다.
+- 짧은 대기 시간(MAX_WAIT_MS) 또는 입력 개수/토큰 상한에 도달하면 요청을 전송합니다.
+- 429 대기는 공유 속도 제한기(src/openai_rate_limiter.py)가 배치 요청 단위로 처리합니다.
+- 결과를 RESULT_TIMEOUT_SECONDS 안에 받지 못하면(전송 루프가 멈춘 경우 등) 대기 중인 항목을 취소하고
+  그 태스크에서 직접 embeddings.create를 호출합니다.
+"""
+import os
+import queue
+import threading
+import time
+from concurrent.futures import Future, TimeoutError as FutureTimeoutError
+from typing import List, Optional
+
+from openai import RateLimitError
+
+from src.config_loader.settings import SETTINGS
+from src.openai_rate_limiter import RateLimitTimeout
+from src.token_counting import estimate_tokens, truncate_to_tokens as _truncate_to_tokens
+
+EMBEDDING_BATCH_CONFIG = SETTINGS.get("EMBEDDING_BATCH", {})
+
+# 임베딩 모델의 입력당 최대 토큰 수 (text-embedding-3-*: 8191)
+MAX_INPUT_TOKENS = 8000
+
+
+def truncate_to_tokens(text: str, max_tokens: int = MAX_INPUT_TOKENS) -> str:
+    """한 입력이 모델 한도를 넘어 배치 전체가 실패하지 않도록 앞부분만 남깁니다."""
+    return _truncate_to_tokens(text, max_tokens)
+
+
+class _PendingText:
+    __slots__ = ("text", "tokens", "future")
+
+    def __init__(self, text: str):
+        self.text = truncate_to_tokens(text)
+        self.tokens = estimate_tokens(self.text)
+        self.future = Future()
+
+
+class EmbeddingBatcher:
+    """프로세스 안의 여러 태스크에서 들어온 텍스트를 모아 한 번에 임베딩합니다."""
+
+    def __init__(self, openai_client, model_name: str, max_batch_inputs: int = 256,
+                 max_batch_tokens: int = 100000, max_wait_ms: int = 50, max_retries: int = 3,
+                 result_timeout_seconds: float = 60):
+        self.openai_client = openai_client
+        self.model_name = model_name
+        self.max_batch_inputs = max(1, int(max_batch_inputs))
+        self.max_batch_tokens = max(MAX_INPUT_TOKENS, int(max_batch_tokens))
+        self.max_wait = max(0, int(max_wait_ms)) / 1000.0
+        self.max_retries = max_retries
+        self.result_timeout = float(result_timeout_seconds)
+        self._queue = queue.Queue()
+        # 상한을 넘겨 다음 배치로 미룬 항목
+        self._carry: Optional[_PendingText] = None
+        self._worker = threading.Thread(target=self._run, name="embedding-batcher", daemon=True)
+        self._worker.start()
+
+    def embed_many(self, texts: List[str], timeout: Optional[float] = None) -> List[list]:
+        """
+        텍스트 목록의 임베딩을 같은 순서로 반환합니다. 비어 있거나 실패한 항목은 빈 리스트입니다.
+        timeout(기본 result_timeout_seconds) 안에 배치 결과를 받지 못한 항목은 직접 호출로 임베딩합니다.
+        """
+        deadline = time.monotonic() + (self.result_timeout if timeout is None else float(timeout))
+        pending = []
+        for text in texts:
+            if not text or not text.strip():
+                pending.append(None)
+                continue
+            item = _PendingText(text)
+            self._queue.put(item)
+            pending.append(item)
+
+        results = []
+        timed_out = []  # (결과 위치, 항목)
+        for item in pending:
+            if item is None:
+                results.append([])
+                continue
+            try:
+                results.append(item.future.result(timeout=max(0.0, deadline - time.monotonic())))
+            except FutureTimeoutError:
+                # 아직 배치에 담기지 않았으면 취소해 두 번 임베딩하지 않습니다.
+                item.future.cancel()
+                timed_out.append((len(results), item))
+                results.append([])
+            except Exception as e:
+                print(f"EmbeddingBatcher Warning: 임베딩 결과 대기 중 오류: {e}")
+                results.append([])
+
+        if timed_out:
+            print(f"EmbeddingBatcher Warning: {len(timed_out)}개 텍스트의 배치 결과를 제시간에 받지 못해 직접 호출합니다.")
+            vectors = self._create_embeddings([item.text for _, item in timed_out])
+            for (position, _), vector in zip(timed_out, vectors):
+                results[position] = vector
+        return results
+
+    def embed(self, text: str, timeout: Optional[float] = None) -> list:
+        return self.embed_many([text], timeout=timeout)[0]
+
+    # --- 배치 수집 / 전송 ---
+    def _take(self, timeout: Optional[float] = None) -> _PendingText:
+        """대기 시간이 지나 호출부가 취소한 항목은 건너뛰고 다음 항목을 꺼냅니다."""
+        while True:
+            if timeout is None:
+                item = self._queue.get()
+            elif timeout > 0:
+                item = self._queue.get(timeout=timeout)
+            else:
+                item = self._queue.get_nowait()
+            if item.future.set_running_or_notify_cancel():
+                return item
+
+    def _next_batch(self) -> List[_PendingText]:
+        first = self._carry if self._carry is not None else self._take()
+        self._carry = None
+        batch = [first]
+        batch_tokens = first.tokens
+        deadline = time.monotonic() + self.max_wait
+        while len(batch) < self.max_batch_inputs:
+            remaining = deadline - time.monotonic()
+            try:
+                item = self._take(timeout=max(0.0, remaining))
+            except queue.Empty:
+                break
+            if batch_tokens + item.tokens > self.max_batch_tokens:
+                self._carry = item
+                break
+            batch.append(item)
+            batch_tokens += item.tokens
+        return batch
+
+    def _run(self):
+        while True:
+            batch = self._next_batch()
+            try:
+                vectors = self._create_embeddings([item.text for item in batch])
+            except Exception as e:
+                print(f"EmbeddingBatcher Error: 배치 처리 중 예기치 않은 오류: {e}")
+                vectors = [[] for _ in batch]
+            for item, vector in zip(batch, vectors):
+                item.future.set_result(vector)
+
+    def _create_embeddings(self, inputs: List[str]) -> List[list]:
+        base_delay = 2
+        for attempt in range(self.max_retries):
+            try:
+                response = self.openai_client.embeddings.create(model=self.model_name, input=inputs)
+                vectors = [[] for _ in inputs]
+                for item in response.data:
+                    vectors[item.index] = item.embedding
+                print(f"  EmbeddingBatcher: {len(inputs)}개 텍스트를 한 번의 요청으로 임베딩.")
+                return vectors
+            except (RateLimitError, RateLimitTimeout) as e:
+                # 429 재시도와 한도 대기는 공유 속도 제한기(src/openai_rate_limiter.py)가 이미 모든 워커와 맞춰 수행했습니다.
+                print(f"Embedding rate limit error after shared limiter retries (batch of {len(inputs)}): {e}")
+                break
+            except Exception as e:
+                print(f"EmbeddingBatcher Error: 배치 임베딩 생성 중 오류 ({len(inputs)}개): {e}")
+                if attempt < self.max_retries - 1:
+                    wait_time = base_delay * (2 ** attempt)
+                    print(f"Embedding error, waiting {wait_time} seconds before retry {attempt + 1}/{self.max_retries}")
+                    time.sleep(wait_time)
+                    continue
+        return [[] for _ in inputs]
+
+
+_batchers = {}
+_batchers_lock = threading.Lock()
+
+
+def get_embedding_batcher(openai_client, model_name: str) -> Optional[EmbeddingBatcher]:
+    """설정에서 활성화된 경우 (프로세스, 클라이언트, 모델)당 하나의 배처를 반환합니다."""
+    if not EMBEDDING_BATCH_CONFIG.get("ENABLED", True) or openai_client is None:
+        return None
+    key = (os.getpid(), id(openai_client), model_name)
+    with _batchers_lock:
+        batcher = _batchers.get(key)
+        if batcher is None:
+            batcher = EmbeddingBatcher(
+                openai_client,
+                model_name,
+                max_batch_inputs=EMBEDDING_BATCH_CONFIG.get("MAX_BATCH_INPUTS", 256),
+                max_batch_tokens=EMBEDDING_BATCH_CONFIG.get("MAX_BATCH_TOKENS", 100000),
+                max_wait_ms=EMBEDDING_BATCH_CONFIG.get("MAX_WAIT_MS", 50),
+                result_timeout_seconds=EMBEDDING_BATCH_CONFIG.get("RESULT_TIMEOUT_SECONDS", 60),
+            )
+            _batchers[key] = batcher
+    return batcher
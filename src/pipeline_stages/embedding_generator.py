@@ -3,6 +3,13 @@
 from celery import shared_task
 from typing import Tuple, List
 from src.pipeline_stages.finalization import finalization_task
+from src.pipeline_stages.stage_dispatch import dispatch_stage
+from src.pipeline_stages.tracing import traced_stage
+from src.pipeline_stages.embedding_batcher import get_embedding_batcher
+from src.db.embedding_cache import get_embedding_cache
+from src.db.keyword_vectors import KeywordVectorStore
+from src.config_loader.settings import SETTINGS
+from src.openai_rate_limiter import RateLimitTimeout
 import time
 from openai import RateLimitError
 
@@ -26,15 +33,10 @@ def _generate_single_embedding(text: str, openai_client, model_name: str) -> lis
             embedding_vector = response.data[0].embedding
             return embedding_vector
             
-        except RateLimitError as e:
-            if attempt < max_retries - 1:
-                wait_time = base_delay * (2 ** attempt)  # 지수 백오프
-                print(f"Embedding rate limit reached, waiting {wait_time} seconds before retry {attempt + 1}/{max_retries}")
-                time.sleep(wait_time)
-                continue
-            else:
-                print(f"Embedding rate limit error after {max_retries} attempts: {e}")
-                return []
+        except (RateLimitError, RateLimitTimeout) as e:
+            # 429 재시도와 한도 대기는 공유 속도 제한기(src/openai_rate_limiter.py)가 이미 모든 워커와 맞춰 수행했습니다.
+            print(f"Embedding rate limit error after shared limiter retries: {e}")
+            return []
                 
         except Exception as e:
             print(f"EmbeddingGenerator Task Error: 텍스트 임베딩 생성 중 오류: {e}")
@@ -50,7 +52,16 @@ def _generate_single_embedding(text: str, openai_client, model_name: str) -> lis
     return []
 
 
+def _embed_texts(texts: List[str], openai_client, model_name: str) -> List[list]:
+    """배처가 켜져 있으면 다른 기사의 텍스트와 묶어 한 번에, 아니면 텍스트마다 임베딩합니다."""
+    batcher = get_embedding_batcher(openai_client, model_name)
+    if batcher is not None:
+        return batcher.embed_many(texts)
+    return [_generate_single_embedding(text, openai_client, model_name) for text in texts]
+
+
 @shared_task(bind=True, max_retries=2, default_retry_delay=60)
+@traced_stage("embedding_generation", ok_key="embedded")
 def embedding_generation_task(self, article_data: dict):
     task_id_log = f"(Task ID: {self.request.id})" if self.request.id else ""
     print(f"\n📰 Embedding Generation Task: 처리 시작 {task_id_log} - {article_data.get('url', 'URL 없음')[:70]}...")
@@ -77,44 +88,66 @@ def embedding_generation_task(self, article_data: dict):
     title_for_embedding = article_data.get("title", "")
     content_for_embedding = article_data.get("content", "")
     text_to_embed = f"{title_for_embedding}\n{content_for_embedding}".strip()
+    keywords = article_data.get("llm_internal_keywords", [])
+
+    # 반복되는 키워드는 공유 임베딩 캐시에서 먼저 찾고, 캐시에 없는 것만 콘텐츠와 함께 임베딩합니다.
+    embedding_cache = get_embedding_cache()
+    keyword_vectors = embedding_cache.get_many(embedding_model_name, keywords) if embedding_cache and keywords else [None] * len(keywords)
+    missing_keywords = [kw for kw, vec in zip(keywords, keyword_vectors) if vec is None]
+    if keywords:
+        print(f"  ✨ Stage 5 (Embedding Generation Task): 키워드 {len(keywords)}개 중 캐시 히트 {len(keywords) - len(missing_keywords)}개.")
 
     embedded = False
     if not text_to_embed:
         article_data["embedding"] = []
         article_data.setdefault("checked", {})["embedding_generation_reason"] = "NO_TEXT_TO_EMBED_CELERY"
-    else:
+
+    # 본문이 비어 있으면 요청에 넣지 않고 캐시에 없는 키워드만 임베딩합니다.
+    texts_to_request = ([text_to_embed] if text_to_embed else []) + missing_keywords
+    fresh_vectors = []
+    if texts_to_request:
         try:
-            embedding_vector = _generate_single_embedding(text_to_embed, openai_client, embedding_model_name)
-            article_data["embedding"] = embedding_vector
-            if embedding_vector:
-                embedded = True
-            else:
-                article_data.setdefault("checked", {})["embedding_generation_reason"] = "EMBEDDING_FAILED_EMPTY_VECTOR_CELERY"
+            fresh_vectors = _embed_texts(texts_to_request, openai_client, embedding_model_name)
         except Exception as e_embed:
-            print(f"Embedding Generation Task Error during _generate_single_embedding (content): {e_embed} {task_id_log}")
+            print(f"Embedding Generation Task Error during _embed_texts: {e_embed} {task_id_log}")
             article_data["embedding"] = []
             article_data.setdefault("checked", {})["embedding_generation_reason"] = f"CONTENT_EMBEDDING_EXCEPTION: {str(e_embed)[:100]}"
             raise self.retry(exc=e_embed)
+    fresh_keyword_vector_list = fresh_vectors[1:] if text_to_embed else fresh_vectors
 
-    # 2. LLM 키워드 임베딩 생성 
-    keywords = article_data.get("llm_internal_keywords", [])
-    individual_keyword_embeddings = [] # 개별 임베딩을 저장할 리스트
+    if embedding_cache:
+        embedding_cache.set_many(embedding_model_name, missing_keywords, fresh_keyword_vector_list)
+    fresh_keyword_vectors = iter(fresh_keyword_vector_list)
+    keyword_vectors = [vec if vec is not None else next(fresh_keyword_vectors) for vec in keyword_vectors]
 
-    if keywords and openai_client:
-        print(f"  ✨ Stage 5 (Embedding Generation Task): LLM 키워드 {len(keywords)}개 개별 임베딩 시작...")
-        for keyword in keywords:
-            try:
-                # 각 키워드를 개별적으로 임베딩
-                kw_embedding_vector = _generate_single_embedding(keyword, openai_client, embedding_model_name)
-                if kw_embedding_vector:
-                    individual_keyword_embeddings.append(kw_embedding_vector)
-            except Exception as e_kw_embed:
-                print(f"  ⚠️ Stage 5 (Embedding Generation Task): 키워드 '{keyword}' 임베딩 중 오류: {e_kw_embed}")
-        
-        # 새로 생성된 개별 키워드 임베딩 리스트를 저장
+    if text_to_embed:
+        embedding_vector = fresh_vectors[0]
+        article_data["embedding"] = embedding_vector
+        if embedding_vector:
+            embedded = True
+        else:
+            article_data.setdefault("checked", {})["embedding_generation_reason"] = "EMBEDDING_FAILED_EMPTY_VECTOR_CELERY"
+
+    # 2. LLM 키워드 임베딩 생성 
+    if keywords:
+        # 실패한(빈) 키워드 벡터는 제외하고 저장
+        individual_keyword_embeddings = [vec for vec in keyword_vectors if vec]
+        for keyword, vec in zip(keywords, keyword_vectors):
+            if not vec:
+                print(f"  ⚠️ Stage 5 (Embedding Generation Task): 키워드 '{keyword}' 임베딩 실패.")
         article_data["llm_individual_keyword_embeddings"] = individual_keyword_embeddings
         # 기존 필드는 제거하거나 비워둠
         article_data["llm_internal_keywords_embedding"] = [] 
+
+        # 전역 키워드 사전에 벡터를 등록하고, 기사에는 키워드 ID만 남깁니다 (실패 시 기존처럼 벡터를 직접 저장).
+        keyword_vectors_collection = worker_resources.get('keyword_vectors_collection')
+        if SETTINGS.get("KEYWORD_VECTORS", {}).get("ENABLED", True) and keyword_vectors_collection is not None and individual_keyword_embeddings:
+            try:
+                keyword_store = KeywordVectorStore(keyword_vectors_collection, embedding_model_name)
+                article_data["llm_keyword_vector_ids"] = keyword_store.register_many(keywords, keyword_vectors)
+                article_data["llm_individual_keyword_embeddings"] = []
+            except Exception as e_kw_store:
+                print(f"  ⚠️ Stage 5 (Embedding Generation Task): 키워드 벡터 사전 등록 실패, 기사에 벡터를 직접 저장합니다: {e_kw_store}")
         
         if individual_keyword_embeddings:
             print(f"  ✅ Stage 5 (Embedding Generation Task): LLM 키워드 개별 임베딩 생성 완료. (성공: {len(individual_keyword_embeddings)}개)")
@@ -131,5 +164,5 @@ def embedding_generation_task(self, article_data: dict):
         print(f"  ✅ Stage 5 (Embedding Generation Task): 콘텐츠 임베딩 성공. 기사: {article_data.get('url')} {task_id_log}")
         save_to_data_folder(article_data, f"{current_stage_name_path}/passed", "passed")
 
-    finalization_task.delay(article_data)
+    dispatch_stage(finalization_task, article_data)
     return {"article_id": article_data.get("ID"), "embedded": embedded}
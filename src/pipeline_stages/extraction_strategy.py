@@ -0,0 +1,219 @@
+# src/pipeline_stages/extraction_strategy.py
+"""
+언론사 호스트별 본문 추출 전략 학습 테이블
+- content_extraction은 기본 순서(네이버: BeautifulSoup → newspaper3k, 그 외: newspaper3k → BeautifulSoup, 마지막으로 LLM)로
+  추출기를 차례로 시도합니다. 이 모듈은 호스트마다 어떤 추출기/선택자가 성공했는지 기록해 두고,
+  충분히 검증된 전략(MIN_ATTEMPTS회 이상, 성공률 MIN_SUCCESS_RATE 이상)이 있으면 그 전략 하나만 먼저 시도하게 합니다.
+- 전략 이름: "bs:<선택자 이름>"(content_extraction의 NAVER_SELECTORS/GENERAL_SELECTORS), "bs:page"(선택자 없이 페이지 전체),
+  "newspaper3k", "llm". 페이지 전체 텍스트와 LLM은 품질/비용 때문에 먼저 시도할 전략으로 고르지 않습니다.
+- 저렴한 추출기가 모두 실패해 LLM 추출까지 가야 했던 비율이 LLM_FLAG_RATIO 이상인 호스트는
+  LLM 의존 호스트 목록(Redis 정렬 집합)에 올려, 선택자를 추가할 대상으로 확인할 수 있게 합니다.
+- 통계는 모든 워커가 Redis 해시(호스트당 하나)로 공유합니다. 기사 수가 MAX_HISTORY를 넘으면 카운터를 절반으로 줄여
+  사이트 개편 후에도 새 결과가 빨리 반영되도록 하고, STATS_TTL_DAYS 동안 기사가 없으면 통계가 만료됩니다.
+- 조회 결과는 프로세스 안에서 CACHE_SECONDS 동안 재사용합니다. Redis를 쓸 수 없으면 기본 순서로 추출합니다.
+"""
+import os
+import threading
+import time
+from typing import Dict, List, Optional, Tuple
+from urllib.parse import urlsplit
+
+import redis
+
+from src.config_loader.settings import SETTINGS
+
+EXTRACTION_STRATEGY_CONFIG = SETTINGS.get("EXTRACTION_STRATEGY", {})
+
+_REDIS_RETRY_AFTER_SECONDS = 30
+_MAX_CACHED_HOSTS = 10000
+
+# 먼저 시도할 전략으로 고르지 않는 전략
+_NOT_PREFERRED = {"bs:page", "llm"}
+
+# KEYS: 호스트 통계 해시
+# ARGV: TTL(초), MAX_HISTORY, LLM 필요 여부(0/1), 이후 (필드, 증가량) 쌍
+# 반환: {기사 수, LLM이 필요했던 기사 수}
+_RECORD_SCRIPT = """
+local articles = redis.call('HINCRBY', KEYS[1], 'articles', 1)
+local llm_needed = redis.call('HINCRBY', KEYS[1], 'llm_needed', tonumber(ARGV[3]))
+for i = 4, #ARGV, 2 do
+  redis.call('HINCRBY', KEYS[1], ARGV[i], tonumber(ARGV[i + 1]))
+end
+if articles > tonumber(ARGV[2]) then
+  local fields = redis.call('HGETALL', KEYS[1])
+  for i = 1, #fields, 2 do
+    redis.call('HSET', KEYS[1], fields[i], math.floor(tonumber(fields[i + 1]) / 2))
+  end
+  articles = math.floor(articles / 2)
+  llm_needed = math.floor(llm_needed / 2)
+end
+redis.call('EXPIRE', KEYS[1], tonumber(ARGV[1]))
+return {articles, llm_needed}
+"""
+
+
+def extraction_host(url: Optional[str]) -> Optional[str]:
+    """통계 키로 쓸 호스트 이름 (소문자, www. 제거)."""
+    if not url:
+        return None
+    host = (urlsplit(url).hostname or "").lower()
+    if host.startswith("www."):
+        host = host[4:]
+    return host or None
+
+
+class ExtractionStrategyTable:
+    """Redis에 저장되는 호스트별 추출 전략 성공률 테이블."""
+
+    def __init__(self, min_attempts: int = 5, min_success_rate: float = 0.8, llm_flag_ratio: float = 0.8,
+                 max_history: int = 500, stats_ttl_days: int = 30, cache_seconds: float = 300,
+                 key_prefix: str = "pipeline:extraction_strategy"):
+        self.min_attempts = int(min_attempts)
+        self.min_success_rate = float(min_success_rate)
+        self.llm_flag_ratio = float(llm_flag_ratio)
+        self.max_history = int(max_history)
+        self.stats_ttl_seconds = int(stats_ttl_days * 24 * 3600)
+        self.cache_seconds = float(cache_seconds)
+        self.key_prefix = key_prefix
+        self.llm_hosts_key = f"{key_prefix}:llm_hosts"
+        self._client = None
+        self._client_pid = None
+        self._script = None
+        self._redis_retry_at = 0.0
+        self._lock = threading.Lock()
+        self._cache: Dict[str, Tuple[float, Dict[str, Tuple[int, int]]]] = {}
+        self.stats = {"preferred": 0, "recorded": 0, "redis_errors": 0}
+
+    # --- Redis ---
+    def _get_client(self):
+        with self._lock:
+            if time.monotonic() < self._redis_retry_at:
+                return None
+            if self._client is None or self._client_pid != os.getpid():
+                self._client = redis.Redis(
+                    host=SETTINGS.get("REDIS_HOST"),
+                    port=SETTINGS.get("REDIS_PORT"),
+                    db=SETTINGS.get("REDIS_DB"),
+                    socket_timeout=2,
+                    socket_connect_timeout=2,
+                )
+                self._script = self._client.register_script(_RECORD_SCRIPT)
+                self._client_pid = os.getpid()
+                self._cache.clear()
+            return self._client
+
+    def _on_redis_error(self, e: Exception):
+        with self._lock:
+            self._redis_retry_at = time.monotonic() + _REDIS_RETRY_AFTER_SECONDS
+            self.stats["redis_errors"] += 1
+        print(f"ExtractionStrategy Warning: Redis 오류, {_REDIS_RETRY_AFTER_SECONDS}초 동안 기본 추출 순서를 사용합니다: {e}")
+
+    def _host_key(self, host: str) -> str:
+        return f"{self.key_prefix}:host:{host}"
+
+    # --- 조회 ---
+    def strategy_stats(self, host: str) -> Dict[str, Tuple[int, int]]:
+        """{전략: (시도 수, 성공 수)}. 프로세스 안에서 CACHE_SECONDS 동안 재사용합니다."""
+        cached = self._cache.get(host)
+        if cached is not None and cached[0] > time.monotonic():
+            return cached[1]
+        client = self._get_client()
+        if client is None:
+            return {}
+        try:
+            raw = client.hgetall(self._host_key(host))
+        except Exception as e:
+            self._on_redis_error(e)
+            return {}
+        attempts, successes = {}, {}
+        for field, value in raw.items():
+            field = field.decode() if isinstance(field, bytes) else field
+            strategy, _, kind = field.rpartition(":")
+            if kind == "n":
+                attempts[strategy] = int(value)
+            elif kind == "ok":
+                successes[strategy] = int(value)
+        result = {strategy: (n, successes.get(strategy, 0)) for strategy, n in attempts.items()}
+        if len(self._cache) >= _MAX_CACHED_HOSTS:
+            self._cache.clear()
+        self._cache[host] = (time.monotonic() + self.cache_seconds, result)
+        return result
+
+    def preferred_strategy(self, host: Optional[str], favor: Optional[str] = None) -> Optional[str]:
+        """
+        이 호스트에서 먼저 한 번만 시도할 전략. 검증된 전략이 없으면 None (기본 순서).
+        favor(기본 순서의 첫 추출기)가 기준을 넘으면 그것을, 아니면 성공률이 가장 높은 전략을 고릅니다.
+        """
+        if not host:
+            return None
+        qualified = {}
+        for strategy, (n, ok) in self.strategy_stats(host).items():
+            if strategy in _NOT_PREFERRED or n < self.min_attempts:
+                continue
+            rate = ok / n
+            if rate >= self.min_success_rate:
+                qualified[strategy] = (rate, n)
+        if not qualified:
+            return None
+        self.stats["preferred"] += 1
+        if favor in qualified:
+            return favor
+        return max(qualified, key=lambda strategy: qualified[strategy])
+
+    # --- 기록 ---
+    def record(self, host: Optional[str], attempts: List[Tuple[str, bool]], llm_needed: bool):
+        """기사 하나에서 시도한 전략들의 결과와, 저렴한 추출기가 모두 실패해 LLM이 필요했는지를 기록합니다."""
+        if not host or not attempts:
+            return
+        client = self._get_client()
+        if client is None:
+            return
+        args = [self.stats_ttl_seconds, self.max_history, 1 if llm_needed else 0]
+        for strategy, ok in attempts:
+            args += [f"{strategy}:n", 1, f"{strategy}:ok", 1 if ok else 0]
+        try:
+            articles, llm_count = self._script(keys=[self._host_key(host)], args=args)
+            articles, llm_count = int(articles), int(llm_count)
+            if articles >= self.min_attempts and llm_count / articles >= self.llm_flag_ratio:
+                if client.zadd(self.llm_hosts_key, {host: round(llm_count / articles, 3)}):
+                    print(f"⚠️ ExtractionStrategy: {host} 기사 {articles}개 중 {llm_count}개가 LLM 추출이 필요했습니다. "
+                          f"선택자 추가가 필요한 호스트로 표시합니다.")
+            elif articles >= self.min_attempts:
+                client.zrem(self.llm_hosts_key, host)
+        except Exception as e:
+            self._on_redis_error(e)
+            return
+        self.stats["recorded"] += 1
+
+    def llm_dependent_hosts(self, limit: int = 100) -> List[Tuple[str, float]]:
+        """LLM 추출 의존 비율이 높은 호스트 목록 [(호스트, 비율)]. 선택자를 추가할 대상을 고를 때 사용합니다."""
+        client = self._get_client()
+        if client is None:
+            return []
+        try:
+            rows = client.zrevrange(self.llm_hosts_key, 0, max(0, limit - 1), withscores=True)
+        except Exception as e:
+            self._on_redis_error(e)
+            return []
+        return [(host.decode() if isinstance(host, bytes) else host, float(score)) for host, score in rows]
+
+
+_strategy_table: Optional[ExtractionStrategyTable] = None
+
+
+def get_extraction_strategy_table() -> Optional[ExtractionStrategyTable]:
+    """설정에서 활성화된 경우 프로세스당 하나의 테이블을 반환합니다."""
+    global _strategy_table
+    if not EXTRACTION_STRATEGY_CONFIG.get("ENABLED", True):
+        return None
+    if _strategy_table is None:
+        _strategy_table = ExtractionStrategyTable(
+            min_attempts=EXTRACTION_STRATEGY_CONFIG.get("MIN_ATTEMPTS", 5),
+            min_success_rate=EXTRACTION_STRATEGY_CONFIG.get("MIN_SUCCESS_RATE", 0.8),
+            llm_flag_ratio=EXTRACTION_STRATEGY_CONFIG.get("LLM_FLAG_RATIO", 0.8),
+            max_history=EXTRACTION_STRATEGY_CONFIG.get("MAX_HISTORY", 500),
+            stats_ttl_days=EXTRACTION_STRATEGY_CONFIG.get("STATS_TTL_DAYS", 30),
+            cache_seconds=EXTRACTION_STRATEGY_CONFIG.get("CACHE_SECONDS", 300),
+            key_prefix=EXTRACTION_STRATEGY_CONFIG.get("KEY_PREFIX", "pipeline:extraction_strategy"),
+        )
+    return _strategy_table
@@ -1,5 +1,4 @@
 # src/pipeline_stages/finalization.py
-import hashlib
 import os
 from datetime import datetime
 from celery import shared_task
@@ -12,31 +11,27 @@ _project_root = os.path.dirname(os.path.dirname(os.path.dirname(_current_file_pa
 if _project_root not in sys.path:
     sys.path.insert(0, _project_root)
 from src.config_loader.settings import SETTINGS
+from src.pipeline_stages.seen_filter import mark_article_seen
+from src.pipeline_stages.claim_check import release_article_state
+from src.pipeline_stages.tracing import traced_stage
+from src.pipeline_stages.bulk_writer import BULK_WRITE_CONFIG, get_finalization_bulk_writer
+from src.pipeline_stages.article_docs import generate_article_id, prepare_blacklist_doc
+from src.pipeline_stages.near_duplicate import register_saved_article
 
 SIMILARITY_THRESHOLD = SETTINGS.get("SIMILARITY_THRESHOLD_CONTENT", 0.91)
 PINECONE_CONTENT_MAX_LENGTH = SETTINGS.get("PINECONE_CONTENT_MAX_LENGTH", 20000)
 
-def generate_article_id(url: str) -> str:
-    if not url:
-        print("Finalization Task Warning: 빈 URL로 ID 생성 시도. 임의 ID 사용.")
-        return f"empty_url_error_{hashlib.sha256(os.urandom(16)).hexdigest()}"
-    return hashlib.sha256(url.encode('utf-8')).hexdigest()
-
 def _save_to_mongodb_blacklist(article_doc: dict, blacklist_collection_res, reason_tag: str):
     if blacklist_collection_res is None:
         print(f"Finalization Task Error: 블랙리스트 DB 컬렉션이 제공되지 않아 저장할 수 없습니다: {article_doc.get('url')}")
         return False
     try:
-        article_doc.setdefault("checked", {})["dropped_stage"] = "finalization_celery"
-        article_doc["checked"]["dropped_reason_tag"] = reason_tag
-        article_doc["checked"]["dropped_at"] = datetime.now().isoformat()
-
-        if "ID" not in article_doc or not article_doc["ID"]: # ID가 없는 경우 생성
-             article_doc["ID"] = generate_article_id(article_doc.get("url"))
+        prepare_blacklist_doc(article_doc, reason_tag)
 
         filter_query = {"ID": article_doc.get("ID")} # ID 필드를 사용하여 쿼리
         update_data = {"$set": article_doc}
         blacklist_collection_res.update_one(filter_query, update_data, upsert=True)
+        mark_article_seen(article_doc.get("ID"))
         print(f"  Finalization Task: 기사 '{article_doc.get('title', '')[:30]}...' 블랙리스트({reason_tag}) 저장 완료 (ID: {article_doc.get('ID')}).")
         return True
     except Exception as e:
@@ -52,6 +47,7 @@ def _save_to_mongodb_main(article_doc: dict, articles_collection_res):
              article_doc["ID"] = generate_article_id(article_doc.get("url"))
 
         articles_collection_res.update_one({"ID": article_doc.get("ID")}, {"$set": article_doc}, upsert=True)
+        mark_article_seen(article_doc.get("ID"))
         print(f"  Finalization Task: 기사 '{article_doc.get('title', '')[:30]}...' 메인 DB 저장 완료 (ID: {article_doc.get('ID')}).")
         return True
     except Exception as e:
@@ -77,6 +73,20 @@ def _upsert_to_pinecone(article_doc: dict, pinecone_manager_res):
         print(f"Finalization Task Info: 임베딩 벡터가 없어 Pinecone 업서트를 건너뜁니다 (ID: {article_id}).")
         return False
 
+    pinecone_metadata = _build_pinecone_metadata(article_doc)
+
+    try:
+        success = pinecone_manager_res.upsert_vector(vector_id=article_id, vector=embedding_vector, metadata=pinecone_metadata)
+        if success:
+            print(f"  Finalization Task: 기사 (ID: {article_id}) Pinecone 업서트 성공.")
+        else:
+            print(f"  Finalization Task Warning: 기사 (ID: {article_id}) Pinecone 업서트 실패 (upsert_vector가 False 반환).")
+        return success
+    except Exception as e:
+        print(f"  Finalization Task Error: Pinecone 업서트 중 오류 (ID: {article_id}): {e}")
+        return False
+
+def _build_pinecone_metadata(article_doc: dict) -> dict:
     pinecone_metadata = {
         "url": article_doc.get("url", ""),
         "title": article_doc.get("title", ""),
@@ -94,20 +104,39 @@ def _upsert_to_pinecone(article_doc: dict, pinecone_manager_res):
             pinecone_metadata[key] = ""
         elif isinstance(value, list) and not value:
              pass
+    return pinecone_metadata
+
+
+def _save_with_bulk_writer(article_doc: dict, is_duplicate: bool, has_embedding: bool,
+                           articles_collection_res, blacklist_collection_res, pinecone_manager_res):
+    """
+    같은 프로세스의 다른 기사와 묶어 저장합니다 (src/pipeline_stages/bulk_writer.py).
+    writer가 꺼져 있거나 결과를 제때 받지 못하면 None을 반환하고, 호출한 쪽이 기사 단위로 저장합니다.
+    타임아웃 시 writer는 이 기사를 블랙리스트로 옮기지 않으므로, 늦게 끝난 flush와 개별 저장이 겹쳐도
+    메인/블랙리스트에 동시에 남지 않습니다 (bulk_writer.py 참고).
+    """
+    writer = get_finalization_bulk_writer(articles_collection_res, blacklist_collection_res, pinecone_manager_res)
+    if writer is None:
+        return None
+
+    blacklist_reason = None
+    pinecone_vector = None
+    if is_duplicate:
+        blacklist_reason = "duplicate_content_similarity_final_celery"
+        prepare_blacklist_doc(article_doc, blacklist_reason)
+    elif has_embedding:
+        pinecone_vector = (article_doc["ID"], article_doc["embedding"], _build_pinecone_metadata(article_doc))
 
     try:
-        success = pinecone_manager_res.upsert_vector(vector_id=article_id, vector=embedding_vector, metadata=pinecone_metadata)
-        if success:
-            print(f"  Finalization Task: 기사 (ID: {article_id}) Pinecone 업서트 성공.")
-        else:
-            print(f"  Finalization Task Warning: 기사 (ID: {article_id}) Pinecone 업서트 실패 (upsert_vector가 False 반환).")
-        return success
+        return writer.save(article_doc, blacklist_reason=blacklist_reason, pinecone_vector=pinecone_vector,
+                           timeout=BULK_WRITE_CONFIG.get("FLUSH_TIMEOUT_SECONDS", 60))
     except Exception as e:
-        print(f"  Finalization Task Error: Pinecone 업서트 중 오류 (ID: {article_id}): {e}")
-        return False
+        print(f"  Finalization Task Warning: bulk writer 결과 대기 실패, 기사 단위로 저장합니다 (ID: {article_doc.get('ID')}): {e}")
+        return None
 
 
 @shared_task(bind=True, max_retries=3, default_retry_delay=300)
+@traced_stage("finalization", ok_key="saved_to_main_db")
 def finalization_task(self, article_data: dict):
     task_id_log = f"(Task ID: {self.request.id})" if self.request.id else ""
     print(f"\n📰 Finalization Task: 처리 시작 {task_id_log} - {article_data.get('url', 'URL 없음')[:70]}...")
@@ -162,8 +191,19 @@ def finalization_task(self, article_data: dict):
 
     saved_to_main_db = False
     blacklisted = False
+    has_embedding = bool(article_embedding and isinstance(article_embedding, list) and len(article_embedding) > 0)
 
-    if is_duplicate_by_similarity:
+    bulk_result = _save_with_bulk_writer(article_data, is_duplicate_by_similarity, has_embedding,
+                                         articles_db_collection, blacklist_db_collection, pinecone_manager_instance)
+    if bulk_result is not None:
+        saved_to_main_db = bulk_result["saved_to_main_db"]
+        blacklisted = bulk_result["blacklisted"]
+        if saved_to_main_db and has_embedding and not bulk_result["pinecone_upserted"]:
+            print(f"  Finalization Task Warning: Pinecone 업서트 실패. MongoDB에는 저장됨. URL: {article_url} (ID: {article_id_hash}) {task_id_log}")
+            article_data.setdefault("checked", {})["finalization_note"] = "PINECONE_UPSERT_FAILED_BUT_MONGO_SAVED"
+        elif saved_to_main_db and not has_embedding:
+            article_data.setdefault("checked", {})["finalization_note"] = "NO_EMBEDDING_FOR_PINECONE"
+    elif is_duplicate_by_similarity:
         _save_to_mongodb_blacklist(article_data, blacklist_db_collection, "duplicate_content_similarity_final_celery")
         blacklisted = True
     else:
@@ -174,7 +214,7 @@ def finalization_task(self, article_data: dict):
             blacklisted = True
         else:
             saved_to_main_db = True
-            if article_embedding and isinstance(article_embedding, list) and len(article_embedding) > 0:
+            if has_embedding:
                 pinecone_upsert_success = _upsert_to_pinecone(article_data, pinecone_manager_instance)
                 if not pinecone_upsert_success:
                     print(f"  Finalization Task Warning: Pinecone 업서트 실패. MongoDB에는 저장됨. URL: {article_url} (ID: {article_id_hash}) {task_id_log}")
@@ -182,6 +222,9 @@ def finalization_task(self, article_data: dict):
             else:
                  article_data.setdefault("checked", {})["finalization_note"] = "NO_EMBEDDING_FOR_PINECONE"
 
+    # 메인 DB에 저장된 기사만 근접 중복 인덱스에 등록합니다 (content_extraction 단계는 조회만 함).
+    if saved_to_main_db:
+        register_saved_article(article_data)
 
     article_data.setdefault("checked", {})["finalization_completed"] = True
     article_data["checked"]["saved_to_main_db"] = saved_to_main_db
@@ -199,6 +242,8 @@ def finalization_task(self, article_data: dict):
         print(f"  ➡️ Stage 6 (Finalization Task): 최종 저장 실패 (블랙리스트 아님). 이유: {reason}. 기사: {article_url} (ID: {article_id_hash}) {task_id_log}")
         save_to_data_folder(article_data, f"{current_stage_name_path}/failed_final_save", "failed")
 
+    # 파이프라인이 끝났으므로 Claim-check 상태를 정리합니다 (중간에 드롭된 기사는 TTL로 만료).
+    release_article_state(article_data.get("ID"))
 
     return {
         "article_id": article_data.get("ID"),
@@ -0,0 +1,261 @@
+# src/pipeline_stages/html_cache.py
+"""
+기사 HTML 로컬 디스크 캐시
+- 선택자를 고친 뒤 추출을 다시 돌리거나 같은 기사를 다시 처리할 때 언론사 서버에서 같은 페이지를
+  다시 받지 않도록 html_fetcher가 받은 원본 바이트를 디스크에 보관합니다.
+  (태스크 재시도는 캐시를 읽지 않고 새로 받아 덮어씁니다. html_fetcher.fetch_page의 refresh 참고)
+- 키는 정규화한 URL(스킴/호스트 소문자, 기본 포트·fragment·utm_* 등 추적 파라미터 제거, 쿼리 정렬)과
+  요청한 User-Agent의 SHA-256이고, 파일은 <DIRECTORY>/<키 앞 2자리>/<키>.html 입니다.
+  언론사는 User-Agent에 따라 다른 페이지(크롤러용 AMP/정적 페이지 등)를 주므로 User-Agent별로 따로 보관합니다.
+- 파일 형식: 코덱 1바이트 + 메타데이터 JSON 길이(4바이트) + 메타데이터 JSON(URL, 최종 URL, 상태 코드, 인코딩, 응답 헤더, 저장 시각)
+  + 압축한 본문. zstandard가 없으면 zlib으로 압축합니다 (message_serializer와 같은 방식).
+- TTL_HOURS가 지난 항목은 읽지 않고 지웁니다. 읽을 때 파일 mtime을 갱신하고, 전체 크기가 MAX_BYTES를 넘으면
+  mtime이 오래된 항목부터 지워 EVICT_TARGET_RATIO까지 줄입니다 (LRU). 여러 워커 프로세스가 같은 디렉터리를 쓰므로
+  쓰기는 임시 파일 + os.replace로, 정리는 디렉터리 잠금 파일(flock)로 한 번에 하나의 프로세스만 합니다.
+- 캐시 오류는 모두 삼키고 원래처럼 원본 서버에서 받습니다.
+"""
+import fcntl
+import hashlib
+import json
+import os
+import struct
+import threading
+import time
+import zlib
+from typing import Optional, Tuple
+from urllib.parse import parse_qsl, urlencode, urlsplit, urlunsplit
+
+from src.config_loader.settings import SETTINGS
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+HTML_CACHE_CONFIG = SETTINGS.get("HTML_CACHE", {})
+
+_project_root = os.path.dirname(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+# 본문 코덱 헤더
+_ZSTD = b"\x01"
+_ZLIB = b"\x02"
+_META_LEN = struct.Struct(">I")
+
+# 캐시 키에서 제거할 추적용 쿼리 파라미터
+_TRACKING_PARAMS = {"fbclid", "gclid", "igshid", "mc_cid", "mc_eid", "cmpid"}
+_DEFAULT_PORTS = {"http": 80, "https": 443}
+
+
+def normalize_url(url: str) -> str:
+    """같은 기사를 가리키는 URL이 같은 키가 되도록 정규화합니다."""
+    parts = urlsplit(url.strip())
+    scheme = parts.scheme.lower()
+    host = (parts.hostname or "").lower()
+    if parts.port and parts.port != _DEFAULT_PORTS.get(scheme):
+        host = f"{host}:{parts.port}"
+    query = sorted((k, v) for k, v in parse_qsl(parts.query, keep_blank_values=True)
+                   if not k.lower().startswith("utm_") and k.lower() not in _TRACKING_PARAMS)
+    return urlunsplit((scheme, host, parts.path or "/", urlencode(query), ""))
+
+
+class HtmlCache:
+    """정규화한 URL을 키로 압축한 HTML과 응답 헤더를 보관하는 디스크 캐시."""
+
+    def __init__(self, directory: str, max_bytes: int, ttl_seconds: float, max_entry_bytes: int = 5000000,
+                 evict_target_ratio: float = 0.9, evict_check_seconds: float = 300, zstd_level: int = 3):
+        self.directory = directory
+        self.max_bytes = int(max_bytes)
+        self.ttl_seconds = float(ttl_seconds)
+        self.max_entry_bytes = int(max_entry_bytes)
+        self.evict_target_bytes = int(self.max_bytes * float(evict_target_ratio))
+        self.evict_check_seconds = float(evict_check_seconds)
+        self.zstd_level = int(zstd_level)
+        # 다른 프로세스가 쓴 양은 모르므로 추정치가 넘치거나 evict_check_seconds가 지나면 디렉터리를 다시 셉니다.
+        self._estimated_bytes = None
+        self._last_evict_check = 0.0
+        self._lock = threading.Lock()
+        self.stats = {"hits": 0, "misses": 0, "expired": 0, "stored": 0, "evicted": 0, "errors": 0}
+        os.makedirs(self.directory, exist_ok=True)
+
+    def _path(self, url: str, user_agent: str = "") -> str:
+        key = hashlib.sha256(f"{normalize_url(url)}\n{user_agent}".encode("utf-8")).hexdigest()
+        return os.path.join(self.directory, key[:2], f"{key}.html")
+
+    # --- 압축 ---
+    def _compress(self, content: bytes) -> bytes:
+        if zstandard is not None:
+            return _ZSTD + zstandard.ZstdCompressor(level=self.zstd_level).compress(content)
+        return _ZLIB + zlib.compress(content, 6)
+
+    @staticmethod
+    def _decompress(codec: bytes, body: bytes) -> bytes:
+        if codec == _ZSTD:
+            if zstandard is None:
+                raise RuntimeError("zstd로 압축된 캐시 항목이지만 zstandard가 설치되어 있지 않습니다.")
+            return zstandard.ZstdDecompressor().decompress(body)
+        if codec == _ZLIB:
+            return zlib.decompress(body)
+        raise ValueError(f"알 수 없는 캐시 코덱입니다: {codec!r}")
+
+    # --- 조회 / 저장 ---
+    def get(self, url: str, user_agent: str = "") -> Optional[Tuple[dict, bytes]]:
+        """(메타데이터, 원본 바이트)를 반환합니다. 없거나 만료되었거나 손상되었으면 None."""
+        path = self._path(url, user_agent)
+        try:
+            with open(path, "rb") as f:
+                data = f.read()
+            codec = data[:1]
+            (meta_len,) = _META_LEN.unpack_from(data, 1)
+            meta_end = 1 + _META_LEN.size + meta_len
+            meta = json.loads(data[1 + _META_LEN.size:meta_end].decode("utf-8"))
+            if time.time() - meta.get("fetched_at", 0) > self.ttl_seconds:
+                self.stats["expired"] += 1
+                self._remove(path)
+                return None
+            content = self._decompress(codec, data[meta_end:])
+        except FileNotFoundError:
+            self.stats["misses"] += 1
+            return None
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"HtmlCache Warning: 손상된 캐시 항목을 지웁니다 ({url}): {e}")
+            self._remove(path)
+            return None
+        try:
+            os.utime(path)  # LRU: 최근 사용 시각
+        except OSError:
+            pass
+        self.stats["hits"] += 1
+        return meta, content
+
+    def put(self, url: str, content: bytes, meta: dict, user_agent: str = "") -> bool:
+        """원본 바이트와 메타데이터를 저장합니다. 너무 크거나 쓰기에 실패하면 False."""
+        if not content or len(content) > self.max_entry_bytes:
+            return False
+        path = self._path(url, user_agent)
+        tmp_path = f"{path}.{os.getpid()}.{threading.get_ident()}.tmp"
+        try:
+            meta_bytes = json.dumps(dict(meta, url=url, fetched_at=time.time()), ensure_ascii=False).encode("utf-8")
+            payload = self._compress(content)
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(tmp_path, "wb") as f:
+                f.write(payload[:1])
+                f.write(_META_LEN.pack(len(meta_bytes)))
+                f.write(meta_bytes)
+                f.write(payload[1:])
+            os.replace(tmp_path, path)
+        except Exception as e:
+            self.stats["errors"] += 1
+            print(f"HtmlCache Warning: 캐시 저장 실패 ({url}): {e}")
+            self._remove(tmp_path)
+            return False
+        self.stats["stored"] += 1
+        self._after_write(1 + _META_LEN.size + len(meta_bytes) + len(payload) - 1)
+        return True
+
+    def delete(self, url: str, user_agent: str = ""):
+        """항목을 지웁니다 (본문 추출에 실패한 차단/동의 페이지 등을 다음 시도 때 다시 받도록)."""
+        self._remove(self._path(url, user_agent))
+
+    @staticmethod
+    def _remove(path: str):
+        try:
+            os.remove(path)
+        except OSError:
+            pass
+
+    # --- 크기 제한 / 만료 정리 ---
+    def _after_write(self, written: int):
+        with self._lock:
+            if self._estimated_bytes is not None:
+                self._estimated_bytes += written
+            due = (self._estimated_bytes is None or self._estimated_bytes > self.max_bytes
+                   or time.monotonic() - self._last_evict_check >= self.evict_check_seconds)
+            if not due:
+                return
+            self._last_evict_check = time.monotonic()
+        self.evict()
+
+    def evict(self) -> int:
+        """만료된 항목과, 전체 크기가 MAX_BYTES를 넘으면 오래 쓰지 않은 항목부터 지웁니다. 지운 개수를 반환합니다."""
+        lock_path = os.path.join(self.directory, ".evict.lock")
+        try:
+            with open(lock_path, "w") as lock_file:
+                try:
+                    fcntl.flock(lock_file, fcntl.LOCK_EX | fcntl.LOCK_NB)
+                except BlockingIOError:
+                    return 0  # 다른 프로세스가 정리 중
+                try:
+                    removed, total = self._evict_locked()
+                finally:
+                    fcntl.flock(lock_file, fcntl.LOCK_UN)
+        except OSError as e:
+            print(f"HtmlCache Warning: 캐시 정리 실패: {e}")
+            return 0
+        with self._lock:
+            self._estimated_bytes = total
+        self.stats["evicted"] += removed
+        if removed:
+            print(f"  HtmlCache: {removed}개 항목 정리 (남은 크기 {total / 1e6:.1f}MB).")
+        return removed
+
+    def _evict_locked(self) -> Tuple[int, int]:
+        now = time.time()
+        entries, total, removed = [], 0, 0
+        for root, _, files in os.walk(self.directory):
+            for name in files:
+                if not name.endswith(".html"):
+                    continue
+                path = os.path.join(root, name)
+                try:
+                    st = os.stat(path)
+                except OSError:
+                    continue
+                # mtime은 마지막 사용 시각이므로, 마지막 사용 후 TTL이 지난 항목은 저장 시각으로도 만료입니다.
+                if now - st.st_mtime > self.ttl_seconds:
+                    self._remove(path)
+                    removed += 1
+                    continue
+                entries.append((st.st_mtime, st.st_size, path))
+                total += st.st_size
+        if total > self.max_bytes:
+            entries.sort()
+            for _, size, path in entries:
+                if total <= self.evict_target_bytes:
+                    break
+                self._remove(path)
+                total -= size
+                removed += 1
+        return removed, total
+
+
+_cache: Optional[HtmlCache] = None
+_cache_pid: Optional[int] = None
+_cache_lock = threading.Lock()
+
+
+def get_html_cache() -> Optional[HtmlCache]:
+    """설정에서 활성화된 경우 프로세스당 하나의 캐시를 반환합니다. 디렉터리를 만들 수 없으면 None."""
+    global _cache, _cache_pid
+    if not HTML_CACHE_CONFIG.get("ENABLED", True):
+        return None
+    with _cache_lock:
+        if _cache_pid != os.getpid():
+            directory = HTML_CACHE_CONFIG.get("DIRECTORY") or os.path.join("data", "html_cache")
+            if not os.path.isabs(directory):
+                directory = os.path.join(_project_root, directory)
+            try:
+                _cache = HtmlCache(
+                    directory,
+                    max_bytes=HTML_CACHE_CONFIG.get("MAX_BYTES", 2 * 1024 ** 3),
+                    ttl_seconds=HTML_CACHE_CONFIG.get("TTL_HOURS", 72) * 3600,
+                    max_entry_bytes=HTML_CACHE_CONFIG.get("MAX_ENTRY_BYTES", 5000000),
+                    evict_target_ratio=HTML_CACHE_CONFIG.get("EVICT_TARGET_RATIO", 0.9),
+                    evict_check_seconds=HTML_CACHE_CONFIG.get("EVICT_CHECK_SECONDS", 300),
+                    zstd_level=HTML_CACHE_CONFIG.get("ZSTD_LEVEL", 3),
+                )
+            except OSError as e:
+                print(f"HtmlCache Warning: 캐시 디렉터리를 만들 수 없어 캐시 없이 동작합니다 ({directory}): {e}")
+                _cache = None
+            _cache_pid = os.getpid()
+        return _cache
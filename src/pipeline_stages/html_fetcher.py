@@ -0,0 +1,195 @@
+# src/pipeline_stages/html_fetcher.py
+"""
+기사 HTML 단일 수집
+- content_extraction의 추출 전략(newspaper3k → BeautifulSoup → LLM)마다 같은 URL을 다시 내려받지 않도록,
+  한 번 받은 원본 바이트(FetchedPage)를 모든 전략에 차례로 넘깁니다.
+- 워커 프로세스당 requests.Session 하나를 공유해 같은 언론사 호스트로의 연결과 TLS 세션을 재사용합니다.
+  urllib3 연결 풀은 스레드/그린렛 간에 안전하고, 세션의 헤더 등 상태는 만든 뒤 바꾸지 않습니다.
+  (요청마다 다른 User-Agent는 headers 인자로만 넘깁니다.)
+- 브라우저 User-Agent로 받지 못한 경우에만 크롤러 User-Agent로 한 번 더 시도합니다 (기존 get_html_for_llm 동작).
+- 받은 페이지는 로컬 디스크 캐시(html_cache.py)에 User-Agent별로 압축해 두고, 추출 재실행 때는 원본 서버 대신 캐시에서 읽습니다.
+  태스크 재시도는 일시적으로 잘못 받은 페이지를 다시 받도록 refresh=True로 캐시를 건너뛰고 새로 받은 페이지로 덮어쓰며,
+  본문 추출에 실패한 페이지는 forget_page로 캐시에서 지웁니다.
+"""
+import os
+import re
+import threading
+from typing import Iterator, Optional
+
+import requests
+from requests.adapters import HTTPAdapter
+from requests.exceptions import SSLError as RequestsSSLError
+from urllib3.util.retry import Retry
+
+from src.config_loader.settings import SETTINGS
+from src.pipeline_stages.html_cache import get_html_cache
+
+HTML_FETCH_CONFIG = SETTINGS.get("HTML_FETCH", {})
+REPLACEMENT_CHAR = SETTINGS.get("REPLACEMENT_CHAR", '\ufffd')
+
+_HEADER_CHARSET_RE = re.compile(r'charset\s*=\s*["\']?([\w.:-]+)', re.I)
+_META_CHARSET_RE = re.compile(rb'<meta[^>]+charset\s*=\s*["\']?\s*([\w.:-]+)', re.I)
+_META_SNIFF_BYTES = 4096
+_SINGLE_BYTE_CHARSETS = {'iso-8859-1', 'latin-1', 'latin1', 'windows-1252', 'cp1252', 'us-ascii', 'ascii'}
+_KOREAN_LEGACY_CHARSETS = {'euc-kr', 'euc_kr', 'ks_c_5601-1987', 'ksc5601', 'x-windows-949', 'windows-949', 'uhc'}
+
+BROWSER_USER_AGENT = 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36'
+CRAWLER_USER_AGENT = 'Googlebot/2.1 (+http://www.google.com/bot.html)'
+
+
+class FetchedPage:
+    """한 번 내려받은 기사 페이지. text는 처음 접근할 때 한 번만 디코딩합니다."""
+
+    def __init__(self, url: str, final_url: str, status_code: int, content: bytes,
+                 declared_encoding: Optional[str], headers: Optional[dict] = None,
+                 response: Optional[requests.Response] = None, from_cache: bool = False,
+                 user_agent: str = BROWSER_USER_AGENT):
+        self.url = url
+        self.user_agent = user_agent
+        self.final_url = final_url
+        self.status_code = status_code
+        self.content = content
+        self.declared_encoding = declared_encoding
+        self.headers = headers or {}
+        self.from_cache = from_cache
+        self._response = response
+        self._text = None
+
+    @classmethod
+    def from_response(cls, url: str, response: requests.Response, user_agent: str = BROWSER_USER_AGENT) -> "FetchedPage":
+        return cls(url, response.url, response.status_code, response.content, response.encoding,
+                   headers=dict(response.headers), response=response, user_agent=user_agent)
+
+    @classmethod
+    def from_cache_entry(cls, url: str, meta: dict, content: bytes, user_agent: str = BROWSER_USER_AGENT) -> "FetchedPage":
+        return cls(url, meta.get("final_url") or url, meta.get("status_code", 200), content,
+                   meta.get("declared_encoding"), headers=meta.get("headers"), from_cache=True, user_agent=user_agent)
+
+    def cache_meta(self) -> dict:
+        return {"final_url": self.final_url, "status_code": self.status_code,
+                "declared_encoding": self.declared_encoding, "headers": self.headers}
+
+    def sniffed_encoding(self) -> Optional[str]:
+        """Content-Type 헤더의 charset, 없으면 문서 앞부분 <meta> charset. 한국어 레거시 인코딩은 상위 집합인 cp949로 읽습니다."""
+        match = _HEADER_CHARSET_RE.search(self.headers.get('Content-Type') or self.headers.get('content-type') or '')
+        charset = match.group(1) if match else None
+        if not charset:
+            match = _META_CHARSET_RE.search(self.content[:_META_SNIFF_BYTES])
+            charset = match.group(1).decode('ascii', errors='ignore') if match else None
+        if not charset:
+            return None
+        charset = charset.strip().lower()
+        if charset in _SINGLE_BYTE_CHARSETS:
+            return None  # 어떤 바이트열도 오류 없이 디코딩되므로 utf-8보다 먼저 시도하지 않습니다.
+        return 'cp949' if charset in _KOREAN_LEGACY_CHARSETS else charset
+
+    def _candidate_encodings(self) -> Iterator[str]:
+        seen = set()
+        # 선언된 charset이 맞으면 디코딩 한 번으로 끝납니다. 틀린 선언이면 기존 순서대로 이어서 시도합니다.
+        for enc in (self.sniffed_encoding(), 'utf-8', self.declared_encoding, None, 'euc-kr', 'cp949', 'iso-8859-1'):
+            if enc is None and self._response is not None:
+                # apparent_encoding은 본문 전체를 검사하므로 앞의 후보가 모두 실패했을 때만 계산합니다.
+                # (캐시에서 읽은 페이지는 응답 객체가 없으므로 건너뛰고 euc-kr/cp949로 넘어갑니다.)
+                enc = self._response.apparent_encoding
+            enc = enc.lower() if enc else None
+            if enc and enc not in seen:
+                seen.add(enc)
+                yield enc
+
+    @property
+    def text(self) -> str:
+        if self._text is None:
+            for enc in self._candidate_encodings():
+                try:
+                    decoded = self.content.decode(enc)
+                except (UnicodeDecodeError, LookupError):
+                    continue
+                if REPLACEMENT_CHAR not in decoded:
+                    self._text = decoded
+                    break
+            if self._text is None:
+                self._text = self.content.decode('utf-8', errors='replace')
+            self._response = None
+        return self._text
+
+
+_session: Optional[requests.Session] = None
+_session_pid: Optional[int] = None
+_session_lock = threading.Lock()
+
+
+def get_http_session() -> requests.Session:
+    """프로세스당 하나의 연결 풀 세션. fork 이후에는 새로 만듭니다."""
+    global _session, _session_pid
+    with _session_lock:
+        if _session is None or _session_pid != os.getpid():
+            session = requests.Session()
+            session.headers.update({'User-Agent': BROWSER_USER_AGENT})
+            retries = Retry(total=HTML_FETCH_CONFIG.get("RETRIES", 1), read=0, backoff_factor=0.5,
+                            status_forcelist=(502, 503, 504), allowed_methods=frozenset(["GET"]))
+            adapter = HTTPAdapter(pool_connections=HTML_FETCH_CONFIG.get("POOL_CONNECTIONS", 100),
+                                  pool_maxsize=HTML_FETCH_CONFIG.get("POOL_MAXSIZE", 64),
+                                  max_retries=retries)
+            session.mount("http://", adapter)
+            session.mount("https://", adapter)
+            _session, _session_pid = session, os.getpid()
+        return _session
+
+
+def _get(url: str, user_agent: Optional[str]) -> Optional[requests.Response]:
+    session = get_http_session()
+    headers = {'User-Agent': user_agent} if user_agent else None
+    timeout = HTML_FETCH_CONFIG.get("TIMEOUT_SECONDS", 15)
+    try:
+        response = session.get(url, headers=headers, timeout=timeout)
+        response.raise_for_status()
+        return response
+    except RequestsSSLError:
+        try:
+            import urllib3
+            urllib3.disable_warnings(urllib3.exceptions.InsecureRequestWarning)
+            response = session.get(url, headers=headers, timeout=timeout, verify=False)
+            response.raise_for_status()
+            return response
+        except Exception:
+            return None
+    except Exception:
+        return None
+
+
+def fetch_page(url: str, user_agent: Optional[str] = None, use_cache: bool = True,
+               refresh: bool = False) -> Optional[FetchedPage]:
+    """
+    URL을 한 번 내려받습니다. 캐시에 있으면 캐시에서 읽고, 새로 받은 페이지는 캐시에 저장합니다. 실패하면 None.
+    refresh=True면 캐시를 읽지 않고 새로 받아 덮어씁니다 (태스크 재시도).
+    """
+    if not url:
+        return None
+    user_agent = user_agent or BROWSER_USER_AGENT
+    cache = get_html_cache() if use_cache else None
+    if cache is not None and not refresh:
+        entry = cache.get(url, user_agent)
+        if entry is not None:
+            return FetchedPage.from_cache_entry(url, *entry, user_agent=user_agent)
+    response = _get(url, user_agent)
+    if response is None:
+        return None
+    page = FetchedPage.from_response(url, response, user_agent=user_agent)
+    if cache is not None:
+        cache.put(url, page.content, page.cache_meta(), user_agent)
+    return page
+
+
+def fetch_article_page(url: str, refresh: bool = False) -> Optional[FetchedPage]:
+    """브라우저 User-Agent로 받고, 실패하면 크롤러 User-Agent로 한 번 더 시도합니다."""
+    page = fetch_page(url, refresh=refresh)
+    if page is None and HTML_FETCH_CONFIG.get("CRAWLER_FALLBACK", True):
+        page = fetch_page(url, user_agent=CRAWLER_USER_AGENT, refresh=refresh)
+    return page
+
+
+def forget_page(page: Optional[FetchedPage]):
+    """본문을 추출하지 못한 페이지(차단/동의 페이지 등)를 캐시에서 지워 다음 시도 때 다시 받게 합니다."""
+    cache = get_html_cache() if page is not None else None
+    if cache is not None:
+        cache.delete(page.url, page.user_agent)
@@ -0,0 +1,171 @@
+# src/pipeline_stages/html_pruning.py
+"""
+LLM 본문 추출 전 HTML 축소
+- try_llm_content_extraction_from_html은 원래 원본 HTML 앞 80,000자를 그대로 보냈습니다. 대부분이 스크립트/스타일/메뉴/속성이라
+  토큰과 지연이 크고, 본문이 80,000자 뒤에 있으면 잘려 나갔습니다.
+- 여기서는 본문이 아닌 요소(script, style, nav, footer, 광고/댓글/공유 class·id 등)를 지우고, DOM을 문서 순서의 텍스트 블록
+  목록으로 펼칩니다. 제목(#), 목록(-), 인용(>) 정도의 구조 표시만 남깁니다.
+- 광고/댓글 등의 class·id를 가진 요소라도 링크가 아닌 텍스트가 KEEP_TEXT_CHARS 이상이면 본문 컨테이너일 수 있어 남깁니다.
+- 블록마다 (링크가 아닌 글자 수 - BLOCK_PENALTY_CHARS) 점수를 매기고, 합이 최대인 연속 구간(가장 글이 빽빽한 영역)을
+  본문 후보로 고릅니다. 긴 문단은 양수, 메뉴/버튼/관련 기사 링크처럼 짧거나 링크뿐인 블록은 음수라
+  기사 중간의 짧은 캡션은 구간 안에 남고 주변 잡음은 빠집니다. 구간 바로 앞의 제목 블록은 CONTEXT_BLOCKS개까지 붙입니다.
+- 결과가 MIN_CHARS보다 짧으면(본문이 스크립트 안에 있는 페이지 등) None을 반환하고, 호출부는 기존처럼 원본 HTML을 보냅니다.
+"""
+from typing import List, Optional, Tuple
+
+from bs4 import BeautifulSoup, Comment, NavigableString
+
+from src.config_loader.settings import SETTINGS
+
+HTML_PRUNING_CONFIG = SETTINGS.get("HTML_PRUNING", {})
+
+# 내용과 함께 통째로 지우는 태그
+_DROP_TAGS = ['script', 'style', 'noscript', 'template', 'iframe', 'svg', 'canvas', 'video', 'audio', 'object', 'embed',
+              'nav', 'footer', 'header', 'aside', 'form', 'button', 'select', 'input', 'textarea', 'link', 'meta']
+# class/id에 이 단어가 들어간 요소는 본문이 아닌 것으로 봅니다 (content_extraction의 제거 목록과 같은 기준).
+_DROP_HINTS = ('ad', 'banner', 'popup', 'related', 'share', 'comment', 'social', 'advertisement', 'widget',
+               'kst_link', 'link_news', 'journalistcard', 'ifr_recomm', 'gnb', 'lnb', 'breadcrumb', 'menu')
+# 자기 텍스트를 별도 블록으로 끊는 태그
+_BLOCK_TAGS = {'p', 'div', 'section', 'article', 'main', 'li', 'ul', 'ol', 'dl', 'dt', 'dd', 'table', 'tr', 'td', 'th',
+               'blockquote', 'pre', 'h1', 'h2', 'h3', 'h4', 'h5', 'h6', 'figure', 'figcaption', 'body', 'html'}
+_HEADING_TAGS = {'h1', 'h2', 'h3', 'h4', 'h5', 'h6'}
+
+
+class _Block:
+    __slots__ = ("text", "link_chars", "prefix")
+
+    def __init__(self, text: str, link_chars: int, prefix: str):
+        self.text = text
+        self.link_chars = link_chars
+        self.prefix = prefix
+
+    def score(self, penalty: int) -> int:
+        return len(self.text) - self.link_chars - penalty
+
+    def render(self) -> str:
+        return f"{self.prefix}{self.text}"
+
+
+def _is_boilerplate(tag) -> bool:
+    attrs = getattr(tag, 'attrs', None)
+    if not attrs:
+        return False
+    names = attrs.get('class') or []
+    if isinstance(names, str):
+        names = names.split()
+    values = [name.lower() for name in names]
+    if attrs.get('id'):
+        values.append(str(attrs['id']).lower())
+    return any(hint in value.replace('-', '_').split('_') for value in values for hint in _DROP_HINTS)
+
+
+def _is_text_heavy(tag, min_chars: int) -> bool:
+    """링크가 아닌 텍스트가 min_chars 이상인 요소 (class 이름만 보고 본문 컨테이너를 지우지 않도록)."""
+    text_chars = len(tag.get_text(strip=True))
+    if text_chars < min_chars:
+        return False
+    link_chars = sum(len(a.get_text(strip=True)) for a in tag.find_all('a'))
+    return text_chars - link_chars >= min_chars
+
+
+class _BlockCollector:
+    """DOM을 문서 순서대로 훑으며 블록 단위로 텍스트를 모읍니다."""
+
+    def __init__(self):
+        self.blocks: List[_Block] = []
+        self._parts: List[str] = []
+        self._link_chars = 0
+        self._prefix = ""
+
+    def flush(self):
+        text = " ".join(" ".join(self._parts).split())
+        if text:
+            self.blocks.append(_Block(text, min(self._link_chars, len(text)), self._prefix))
+        self._parts, self._link_chars = [], 0
+
+    def walk(self, node, in_link: bool = False):
+        for child in node.children:
+            if isinstance(child, Comment):
+                continue
+            if isinstance(child, NavigableString):
+                text = str(child)
+                if text.strip():
+                    self._parts.append(text)
+                    if in_link:
+                        self._link_chars += len(text.strip())
+                continue
+            name = child.name
+            if name == 'br':
+                self.flush()
+            elif name in _BLOCK_TAGS:
+                self.flush()
+                outer_prefix = self._prefix
+                if name in _HEADING_TAGS:
+                    self._prefix = "#" * int(name[1]) + " "
+                elif name == 'li':
+                    self._prefix = "- "
+                elif name == 'blockquote':
+                    self._prefix = "> "
+                self.walk(child, in_link)
+                self.flush()
+                self._prefix = outer_prefix
+            else:
+                self.walk(child, in_link or name == 'a')
+
+
+def _densest_window(blocks: List[_Block], penalty: int) -> Tuple[int, int]:
+    """점수 합이 최대인 연속 구간 [start, end). 양수 블록이 없으면 (0, 0)."""
+    best_sum, best = 0, (0, 0)
+    running, start = 0, 0
+    for i, block in enumerate(blocks):
+        if running <= 0:
+            running, start = 0, i
+        running += block.score(penalty)
+        if running > best_sum:
+            best_sum, best = running, (start, i + 1)
+    return best
+
+
+def prune_html_for_llm(html: str, max_chars: Optional[int] = None) -> Optional[str]:
+    """LLM에 보낼 본문 후보 텍스트 블록. 충분한 텍스트를 찾지 못하면 None."""
+    if not html:
+        return None
+    max_chars = int(max_chars or HTML_PRUNING_CONFIG.get("MAX_CHARS", 15000))
+    penalty = int(HTML_PRUNING_CONFIG.get("BLOCK_PENALTY_CHARS", 25))
+    context_blocks = int(HTML_PRUNING_CONFIG.get("CONTEXT_BLOCKS", 3))
+    try:
+        soup = BeautifulSoup(html, 'html.parser')
+        for tag in soup.find_all(_DROP_TAGS):
+            tag.decompose()
+        keep_chars = int(HTML_PRUNING_CONFIG.get("KEEP_TEXT_CHARS", 1000))
+        for tag in soup.find_all(_is_boilerplate):
+            if not getattr(tag, 'decomposed', False) and not _is_text_heavy(tag, keep_chars):
+                tag.decompose()
+        collector = _BlockCollector()
+        collector.walk(soup.body or soup)
+        collector.flush()
+    except Exception as e:
+        print(f"HtmlPruning Warning: HTML 축소 실패, 원본 HTML을 사용합니다: {e}")
+        return None
+
+    blocks = collector.blocks
+    start, end = _densest_window(blocks, penalty)
+    if end <= start:
+        return None
+    # 구간 바로 앞의 제목 블록(기사 제목/부제)은 구조 힌트로 함께 보냅니다.
+    context_start = start
+    while context_start > 0 and start - context_start < context_blocks and blocks[context_start - 1].prefix.startswith("#"):
+        context_start -= 1
+
+    lines, total = [], 0
+    for block in blocks[context_start:end]:
+        line = block.render()
+        if total + len(line) > max_chars:
+            lines.append(line[:max(0, max_chars - total)])
+            break
+        lines.append(line)
+        total += len(line) + 1
+    pruned = "\n".join(lines).strip()
+    if len(pruned) < int(HTML_PRUNING_CONFIG.get("MIN_CHARS", 200)):
+        return None
+    return pruned
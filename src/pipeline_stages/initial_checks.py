@@ -5,8 +5,11 @@ from datetime import datetime, timedelta, timezone # 'timedelta', 'timezone' 추
 import dateutil.parser  # 'dateutil.parser' 추가
 from celery import shared_task
 from src.pipeline_stages.content_extraction import content_extraction_task
-from src.pipeline_stages.finalization import generate_article_id
+from src.pipeline_stages.stage_dispatch import dispatch_stage
+from src.pipeline_stages.tracing import traced_stage, traced_batch_stage
+from src.pipeline_stages.article_docs import generate_article_id
 from src.pipeline_stages.content_analysis import content_analysis_task
+from src.pipeline_stages.seen_filter import get_seen_filter, ensure_seen_filter_ready, mark_article_seen
 from src.config_loader.settings import SETTINGS
 
 HARDCODED_DROP_URLS = ["google.com/search", "example.org/ads", "m.skyedaily.com", "www.hinews.co.kr", "badsite.com"]
@@ -27,6 +30,7 @@ def _save_to_blacklist(article_data: dict, blacklist_db_collection, drop_reason_
         filter_query = {"ID": article_data.get("ID")}
         update_data = {"$set": article_data}
         blacklist_db_collection.update_one(filter_query, update_data, upsert=True)
+        mark_article_seen(article_data.get("ID"))
         print(f"  InitialChecks Task: 기사 '{article_data.get('title', '')[:30]}...' 블랙리스트({drop_reason_tag}) 저장 완료.")
     except Exception as e:
         print(f"  InitialChecks Task Error: 블랙리스트 저장 중 오류: {e} for URL {article_data.get('url')}")
@@ -67,36 +71,10 @@ def save_to_data_folder(article_data, stage_name_path, status_prefix="processed"
         print(f"  ❌ Celery Pipeline Log 저장 실패: {e}")
         return None
 
-@shared_task(
-    name="src.pipeline_stages.initial_checks.initial_checks_task",
-    bind=True, max_retries=3, default_retry_delay=60
-)
-def initial_checks_task(self, article_data: dict):
-    """Celery task for initial article checks."""
-    task_id_log = f"(Task ID: {self.request.id})" if self.request.id else ""
-    print(f"\n📰 Initial Checks Task: 새 기사 처리 시작 {task_id_log} - {article_data.get('url', 'URL 없음')[:70]}...")
-    current_stage_name_path = "stage1_initial_checks_celery"
-
-    # 필요할 때만 가져오기
-    import src.celery_app
-    worker_resources = src.celery_app.worker_resources
-    save_to_data_folder = src.celery_app.save_to_data_folder
-
-    articles_collection = worker_resources.get('articles_collection')
-    blacklist_collection = worker_resources.get('blacklist_collection')
-
-    if articles_collection is None or blacklist_collection is None:
-        error_msg = f"DB 컬렉션 초기화 안됨. articles_collection is None: {articles_collection is None}, blacklist_collection is None: {blacklist_collection is None}"
-        print(f"❌ Initial Checks Task CRITICAL: {error_msg} {task_id_log}")
-        save_to_data_folder(article_data, f"{current_stage_name_path}/error_db_init", "error")
-        raise Exception(f"Initial Checks DB Uninitialized: {error_msg}")
-
-    if "ID" not in article_data or not article_data["ID"]:
-        article_data["ID"] = generate_article_id(article_data.get("url"))
-
+def _run_static_checks(article_data: dict):
+    """DB 조회 없이 판단 가능한 검사(URL, 하드코딩 드롭 사이트, 발행 시간)를 수행합니다."""
     passed_initial = True
     article_url = article_data.get("url")
-    article_title = article_data.get("title", "제목 없음")
     reasons_for_failure = []
 
     # 1. URL 유효성 검사
@@ -136,12 +114,86 @@ def initial_checks_task(self, article_data: dict):
             reasons_for_failure.append(error_msg)
             passed_initial = False
 
-    # 4. DB 중복 검사
+    return passed_initial, reasons_for_failure
+
+def _seen_filter_lookup(article_id: str):
+    """Bloom 필터 조회 결과(False: 확실한 미스, True: 가능한 히트, None: 사용 불가)를 반환합니다."""
+    seen_filter = get_seen_filter()
+    if seen_filter is None or not article_id:
+        return None
+    filter_result = seen_filter.might_contain(article_id)
+    if filter_result is None and ensure_seen_filter_ready(seen_filter):
+        filter_result = seen_filter.might_contain(article_id)
+    return filter_result
+
+def _seen_filter_lookup_many(article_ids: list) -> list:
+    """_seen_filter_lookup의 일괄 버전. 윈도우의 모든 ID를 한 번의 Redis 왕복으로 조회합니다."""
+    seen_filter = get_seen_filter()
+    if seen_filter is None or not article_ids:
+        return [None] * len(article_ids)
+    filter_results = seen_filter.contains_many(article_ids)
+    if all(result is None for result in filter_results) and ensure_seen_filter_ready(seen_filter):
+        filter_results = seen_filter.contains_many(article_ids)
+    return filter_results
+
+def _finish_initial_checks(article_data: dict, passed_initial: bool, reasons_for_failure: list,
+                           blacklist_collection, save_to_data_folder, current_stage_name_path: str, task_id_log: str = ""):
+    """검사 결과를 기록하고, 실패 시 블랙리스트에 저장하거나 통과 시 다음 단계로 전송합니다."""
+    article_url = article_data.get("url")
+    article_data.setdefault("checked", {})["initial_checks"] = passed_initial
+    if not passed_initial:
+        reason_str = ", ".join(reasons_for_failure) if reasons_for_failure else "Unknown reason at initial_checks"
+        article_data["checked"]["initial_checks_reason"] = reason_str
+        print(f"  ➡️ Stage 1 (Initial Checks Task): 실패/드롭됨. 이유: {reason_str}. 기사: {article_url} {task_id_log}")
+        save_to_data_folder(article_data, f"{current_stage_name_path}/dropped", "dropped")
+        _save_to_blacklist(article_data, blacklist_collection, reason_str)
+    else:
+        print(f"  ✅ Stage 1 (Initial Checks Task): 통과. 기사: {article_url} {task_id_log}")
+        save_to_data_folder(article_data, f"{current_stage_name_path}/passed", "passed")
+
+        dispatch_stage(content_extraction_task, article_data)
+        print(f"  🚀 Stage 1 (Initial Checks Task): Content Extraction Task로 전송. {task_id_log}")
+
+@shared_task(
+    name="src.pipeline_stages.initial_checks.initial_checks_task",
+    bind=True, max_retries=3, default_retry_delay=60
+)
+@traced_stage("initial_checks", ok_key="passed")
+def initial_checks_task(self, article_data: dict):
+    """Celery task for initial article checks."""
+    task_id_log = f"(Task ID: {self.request.id})" if self.request.id else ""
+    print(f"\n📰 Initial Checks Task: 새 기사 처리 시작 {task_id_log} - {article_data.get('url', 'URL 없음')[:70]}...")
+    current_stage_name_path = "stage1_initial_checks_celery"
+
+    # 필요할 때만 가져오기
+    import src.celery_app
+    worker_resources = src.celery_app.worker_resources
+    save_to_data_folder = src.celery_app.save_to_data_folder
+
+    articles_collection = worker_resources.get('articles_collection')
+    blacklist_collection = worker_resources.get('blacklist_collection')
+
+    if articles_collection is None or blacklist_collection is None:
+        error_msg = f"DB 컬렉션 초기화 안됨. articles_collection is None: {articles_collection is None}, blacklist_collection is None: {blacklist_collection is None}"
+        print(f"❌ Initial Checks Task CRITICAL: {error_msg} {task_id_log}")
+        save_to_data_folder(article_data, f"{current_stage_name_path}/error_db_init", "error")
+        raise Exception(f"Initial Checks DB Uninitialized: {error_msg}")
+
+    if "ID" not in article_data or not article_data["ID"]:
+        article_data["ID"] = generate_article_id(article_data.get("url"))
+
+    passed_initial, reasons_for_failure = _run_static_checks(article_data)
+
+    # 4. DB 중복 검사 (Bloom 필터가 확실한 미스를 알려주면 MongoDB 조회 생략)
     if passed_initial:
-        if articles_collection is not None and blacklist_collection is not None:
+        query_value = article_data.get("ID")
+        filter_result = _seen_filter_lookup(query_value)
+
+        if filter_result is False:
+            print(f"  InitialChecks Task: Bloom 필터 미스 - MongoDB 중복 조회 생략. {task_id_log}")
+        elif articles_collection is not None and blacklist_collection is not None:
             try:
                 query_field = "ID"
-                query_value = article_data.get("ID")
 
                 if query_value and articles_collection.count_documents({query_field: query_value}, limit=1) > 0:
                     reasons_for_failure.append("ARTICLES_DB_DUPLICATE_ID")
@@ -158,19 +210,91 @@ def initial_checks_task(self, article_data: dict):
             print(f"InitialChecks Task Warning: DB 컬렉션이 None이어서 중복 검사를 건너뜜. {task_id_log}")
             reasons_for_failure.append("DB_COLLECTION_IS_NONE_SKIPPING_DUPLICATE_CHECK")
 
-    # 최종 결과 처리
-    article_data.setdefault("checked", {})["initial_checks"] = passed_initial
-    if not passed_initial:
-        reason_str = ", ".join(reasons_for_failure) if reasons_for_failure else "Unknown reason at initial_checks"
-        article_data["checked"]["initial_checks_reason"] = reason_str
-        print(f"  ➡️ Stage 1 (Initial Checks Task): 실패/드롭됨. 이유: {reason_str}. 기사: {article_url} {task_id_log}")
-        save_to_data_folder(article_data, f"{current_stage_name_path}/dropped", "dropped")
-        _save_to_blacklist(article_data, blacklist_collection, reason_str)
-    else:
-        print(f"  ✅ Stage 1 (Initial Checks Task): 통과. 기사: {article_url} {task_id_log}")
-        save_to_data_folder(article_data, f"{current_stage_name_path}/passed", "passed")
-
-        content_extraction_task.delay(article_data)
-        print(f"  🚀 Stage 1 (Initial Checks Task): Content Extraction Task로 전송. {task_id_log}")
+    _finish_initial_checks(article_data, passed_initial, reasons_for_failure, blacklist_collection,
+                           save_to_data_folder, current_stage_name_path, task_id_log)
 
     return {"article_id": article_data.get("ID"), "passed": passed_initial, "reason": article_data.get("checked", {}).get("initial_checks_reason","")}
+
+def _find_existing_ids(collection, article_ids: list) -> set:
+    """한 번의 $in 쿼리로 컬렉션에 이미 존재하는 ID 집합을 조회합니다."""
+    if collection is None or not article_ids:
+        return set()
+    return {doc["ID"] for doc in collection.find({"ID": {"$in": article_ids}}, {"ID": 1, "_id": 0}) if doc.get("ID")}
+
+@shared_task(
+    name="src.pipeline_stages.initial_checks.batch_initial_checks_task",
+    bind=True, max_retries=3, default_retry_delay=60
+)
+@traced_batch_stage("batch_initial_checks")
+def batch_initial_checks_task(self, articles: list):
+    """
+    수집기 윈도우 단위의 초기 검사 Celery 태스크.
+    기사마다 컬렉션별 count_documents를 호출하는 대신, 윈도우 전체를 컬렉션당 한 번의 $in 쿼리로 검사하고
+    통과한 기사만 Content Extraction Task로 전송합니다.
+    """
+    task_id_log = f"(Task ID: {self.request.id})" if self.request.id else ""
+    print(f"\n📰 Batch Initial Checks Task: {len(articles)}개 기사 윈도우 처리 시작 {task_id_log}")
+    current_stage_name_path = "stage1_initial_checks_celery"
+
+    import src.celery_app
+    worker_resources = src.celery_app.worker_resources
+    save_to_data_folder = src.celery_app.save_to_data_folder
+
+    articles_collection = worker_resources.get('articles_collection')
+    blacklist_collection = worker_resources.get('blacklist_collection')
+
+    if articles_collection is None or blacklist_collection is None:
+        error_msg = f"DB 컬렉션 초기화 안됨. articles_collection is None: {articles_collection is None}, blacklist_collection is None: {blacklist_collection is None}"
+        print(f"❌ Batch Initial Checks Task CRITICAL: {error_msg} {task_id_log}")
+        raise Exception(f"Initial Checks DB Uninitialized: {error_msg}")
+
+    results = []
+    pending = []  # (article_data, reasons_for_failure)
+    window_ids = set()
+    for article_data in articles:
+        if "ID" not in article_data or not article_data["ID"]:
+            article_data["ID"] = generate_article_id(article_data.get("url"))
+        # 같은 윈도우 안에서 중복된 ID는 첫 번째 항목만 처리합니다 (블랙리스트에 남기지 않음).
+        if article_data["ID"] in window_ids:
+            print(f"  Batch InitialChecks Task: 윈도우 내 중복 ID 건너뜀: {article_data.get('url')} {task_id_log}")
+            continue
+        window_ids.add(article_data["ID"])
+        passed_initial, reasons_for_failure = _run_static_checks(article_data)
+        if passed_initial:
+            pending.append((article_data, reasons_for_failure))
+        else:
+            results.append((article_data, passed_initial, reasons_for_failure))
+
+    # Bloom 필터가 확실한 미스라고 답한 ID는 $in 쿼리에서도 제외합니다.
+    pending_ids = [article_data["ID"] for article_data, _ in pending]
+    lookup_ids = [article_id for article_id, filter_result in zip(pending_ids, _seen_filter_lookup_many(pending_ids))
+                  if filter_result is not False]
+    try:
+        existing_in_articles = _find_existing_ids(articles_collection, lookup_ids)
+        remaining_ids = [article_id for article_id in lookup_ids if article_id not in existing_in_articles]
+        existing_in_blacklist = _find_existing_ids(blacklist_collection, remaining_ids)
+    except Exception as e:
+        print(f"Batch InitialChecks Task Warning: MongoDB 일괄 중복 확인 중 오류: {e} {task_id_log}")
+        raise self.retry(exc=e, countdown=int(self.request.retries * 60), max_retries=2)
+    print(f"  Batch InitialChecks Task: {len(pending)}개 후보 중 {len(lookup_ids)}개 ID만 MongoDB $in 조회 "
+          f"(articles 중복 {len(existing_in_articles)}, blacklist 중복 {len(existing_in_blacklist)}). {task_id_log}")
+
+    for article_data, reasons_for_failure in pending:
+        article_id = article_data["ID"]
+        passed_initial = True
+        if article_id in existing_in_articles:
+            reasons_for_failure.append("ARTICLES_DB_DUPLICATE_ID")
+            passed_initial = False
+        elif article_id in existing_in_blacklist:
+            reasons_for_failure.append("BLACKLIST_DB_DUPLICATE_ID")
+            passed_initial = False
+        results.append((article_data, passed_initial, reasons_for_failure))
+
+    passed_count = 0
+    for article_data, passed_initial, reasons_for_failure in results:
+        _finish_initial_checks(article_data, passed_initial, reasons_for_failure, blacklist_collection,
+                               save_to_data_folder, current_stage_name_path, task_id_log)
+        passed_count += int(passed_initial)
+
+    print(f"  ✅ Batch Initial Checks Task: {len(articles)}개 중 {passed_count}개 통과. {task_id_log}")
+    return {"total": len(articles), "passed": passed_count}
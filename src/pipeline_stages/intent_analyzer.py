@@ -1,6 +1,7 @@
 from langchain_core.prompts import ChatPromptTemplate
 from langchain_openai import ChatOpenAI
 from config_loader.settings import SETTINGS
+from src.openai_rate_limiter import get_langchain_rate_limiter
 
 def analyze_intent(question: str, llm=None) -> dict:
     prompt = ChatPromptTemplate.from_template(
@@ -8,7 +9,8 @@ def analyze_intent(question: str, llm=None) -> dict:
     )
     model_name = SETTINGS.get('OPENAI_KEYWORD_MODEL', 'gpt-4.1-nano')
     openai_api_key = SETTINGS.get('OPENAI_API_KEY')
-    chain = prompt | (llm or ChatOpenAI(model_name=model_name, openai_api_key=openai_api_key))
+    chain = prompt | (llm or ChatOpenAI(model_name=model_name, openai_api_key=openai_api_key,
+                                        rate_limiter=get_langchain_rate_limiter(model_name, "interactive")))
     result = chain.invoke({"question": question}).content.strip().lower()
     if "react" in result:
         intent = "react"
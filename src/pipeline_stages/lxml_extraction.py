@@ -0,0 +1,174 @@
+# src/pipeline_stages/lxml_extraction.py
+"""
+lxml 기반 본문 추출 빠른 경로
+- content_extraction.extract_content_with_selectors(BeautifulSoup + html.parser)와 같은 선택자, 같은 제거 규칙,
+  같은 텍스트 조립 방식을 C 파서(lxml)와 미리 컴파일한 XPath로 수행합니다.
+    · 선택자: NAVER_SELECTORS/GENERAL_SELECTORS와 이름·순서가 같은 XPath (호스트별 전략 통계 "bs:<이름>"를 그대로 공유)
+    · 광고/배너 등 제거: 태그마다 파이썬 lambda를 부르던 find_all 대신 XPath 한 번으로 대상을 모아 drop_tree
+      (class는 토큰 일치, id는 부분 문자열 일치로 기존 규칙과 같습니다)
+- 입력은 FetchedPage.text처럼 이미 한 번 디코딩한 문자열이고, UTF-8 바이트로 넘겨 lxml이 다시 추측하지 않게 합니다.
+- lxml이 없거나 파싱 중 오류가 나면 None을 반환하고, 호출부는 기존 BeautifulSoup 경로로 추출합니다.
+- 잘못 중첩된 마크업은 파서마다 다르게 고칩니다. 예를 들어 <p>본문<div>사진 설명</div> 이어지는 본문</p>에서
+  lxml은 <div> 앞에서 <p>를 닫아 "이어지는 본문"이 문단 밖으로 빠지지만, html.parser는 모두 <p> 안에 둡니다.
+  그래서 lxml이 태그 불일치를 고친 문서(파서 오류 로그의 ERR_TAG_NAME_MISMATCH)에서 추출한 본문이 본문 영역 전체 텍스트의
+  min_coverage 비율보다 짧으면 None을 반환해 BeautifulSoup 경로로 다시 추출합니다.
+  (네이버 dic_area처럼 문단 밖 텍스트가 원래 많은 페이지는 마크업이 올바르면 그대로 빠른 경로를 씁니다.)
+"""
+import threading
+from typing import Optional, Tuple
+
+try:
+    from lxml import etree
+    from lxml import html as lxml_html
+except ImportError:
+    etree = None
+    lxml_html = None
+
+PAGE_SELECTOR_NAME = 'page'
+
+_REGEX_NS = {'re': 'http://exslt.org/regular-expressions'}
+
+
+def _has_class(name: str) -> str:
+    return f"contains(concat(' ', normalize-space(@class), ' '), ' {name} ')"
+
+
+# content_extraction.NAVER_SELECTORS / GENERAL_SELECTORS와 이름과 순서를 맞춥니다.
+_NAVER_SELECTOR_XPATHS = [
+    ('naver_dic_area', "//div[@id='dic_area']"),
+    ('naver_newsct_article', "//div[@class='newsct_article _article_body']"),
+    ('naver_article_dic_area', "//article[@id='dic_area']"),
+    ('naver_section_article_body', f"//section[{_has_class('article-body')}]"),
+]
+_GENERAL_SELECTOR_XPATHS = [
+    ('article', "//article"),
+    ('div_content_class', "//div[re:test(@class, 'article-content|article_body|post-content|entry-content|본문|article_view|articleBody|content|view_content', 'i')]"),
+    ('main', "//main"),
+    ('div_content_id', "//div[re:test(@id, 'article_body|content|articleContent|realContent|viewContent', 'i')]"),
+]
+
+# 본문 영역 안에서 지우는 요소 (content_extraction의 article_body.find_all 제거 목록)
+_BODY_DROP_TAGS = ['script', 'style', 'aside', 'nav', 'footer', 'form', 'iframe', 'noscript', 'figure', 'figcaption', 'header']
+_BODY_DROP_CLASSES = ['ad', 'banner', 'popup', 'related', 'share', 'comment', 'social', 'advertisement', 'widget',
+                      'kst_link', 'link_news', 'journalistcard_card_article']
+_BODY_DROP_IDS = ['ad', 'banner', 'popup', 'related', 'share', 'comment', 'social', 'advertisement', 'widget', 'ifr_recomm']
+# 선택자가 하나도 맞지 않아 페이지 전체를 쓸 때 지우는 요소
+_PAGE_DROP_TAGS = ['script', 'style', 'aside', 'nav', 'footer', 'header', 'form', 'iframe', 'noscript']
+_PAGE_DROP_CLASSES = ['ad', 'banner', 'popup', 'related', 'share', 'comment', 'social', 'advertisement', 'widget']
+_PAGE_DROP_IDS = _PAGE_DROP_CLASSES
+
+
+def _drop_rule(tags, classes, ids) -> str:
+    conditions = [f"self::{tag}" for tag in tags]
+    conditions += [_has_class(name) for name in classes]
+    conditions += [f"contains(@id, '{name}')" for name in ids]
+    return f".//*[{' or '.join(conditions)}]"
+
+
+if etree is not None:
+    _NAVER_SELECTORS = [(name, etree.XPath(xpath, namespaces=_REGEX_NS)) for name, xpath in _NAVER_SELECTOR_XPATHS]
+    _GENERAL_SELECTORS = [(name, etree.XPath(xpath, namespaces=_REGEX_NS)) for name, xpath in _GENERAL_SELECTOR_XPATHS]
+    _SELECTORS_BY_NAME = dict(_NAVER_SELECTORS + _GENERAL_SELECTORS)
+    _BODY_DROP_XPATH = etree.XPath(_drop_rule(_BODY_DROP_TAGS, _BODY_DROP_CLASSES, _BODY_DROP_IDS))
+    _PAGE_DROP_XPATH = etree.XPath(_drop_rule(_PAGE_DROP_TAGS, _PAGE_DROP_CLASSES, _PAGE_DROP_IDS))
+    _CHILD_BLOCKS_XPATH = etree.XPath("./div | ./p | ./span")
+
+# lxml 파서 객체는 스레드 간에 공유하지 않습니다.
+_local = threading.local()
+
+
+def is_available() -> bool:
+    return etree is not None
+
+
+def _parser():
+    parser = getattr(_local, 'parser', None)
+    if parser is None:
+        parser = lxml_html.HTMLParser(encoding='utf-8', remove_comments=True, remove_pis=True)
+        _local.parser = parser
+    return parser
+
+
+def _texts(element):
+    for text in element.itertext():
+        text = text.strip()
+        if text:
+            yield text
+
+
+def _get_text(element, separator: str = '') -> str:
+    """BeautifulSoup get_text(separator, strip=True)와 같은 결과."""
+    return separator.join(_texts(element))
+
+
+def _drop(elements):
+    for element in elements:
+        if element.getparent() is not None:
+            element.drop_tree()  # 뒤따르는 텍스트(tail)는 부모에 남깁니다 (BeautifulSoup decompose와 같음).
+
+
+def _first_match(root, selectors) -> Tuple[Optional[object], Optional[str]]:
+    for name, xpath in selectors:
+        matches = xpath(root)
+        if matches:
+            return matches[0], name
+    return None, None
+
+
+def _visible_length(text: str) -> int:
+    return sum(len(piece) for piece in text.split())
+
+
+def extract_content_with_lxml(decoded_html_text: str, is_naver_news: bool = False,
+                              only_selector: Optional[str] = None,
+                              min_coverage: float = 0.5) -> Optional[Tuple[Optional[str], Optional[str]]]:
+    """
+    extract_content_with_selectors와 같은 (본문, 사용한 선택자 이름)을 반환합니다.
+    lxml을 쓸 수 없거나, 파싱에 실패하거나, 본문이 본문 영역 텍스트의 min_coverage보다 짧으면
+    None (호출부가 BeautifulSoup 경로로 넘어갑니다). 본문 길이 비교는 lxml이 잘못 중첩된 태그를 고친 문서에만 합니다.
+    """
+    if etree is None:
+        return None
+    if not decoded_html_text:
+        return None, None
+    try:
+        parser = _parser()
+        root = lxml_html.document_fromstring(decoded_html_text.encode('utf-8', errors='replace'), parser=parser)
+        repaired = any(entry.type == etree.ErrorTypes.ERR_TAG_NAME_MISMATCH for entry in parser.error_log)
+        article_body, matched_selector = None, None
+        if only_selector:
+            xpath = _SELECTORS_BY_NAME.get(only_selector)
+            matches = xpath(root) if xpath is not None else []
+            if not matches:
+                return None, None
+            article_body, matched_selector = matches[0], only_selector
+        if article_body is None and is_naver_news:
+            article_body, matched_selector = _first_match(root, _NAVER_SELECTORS)
+        if article_body is None:
+            article_body, matched_selector = _first_match(root, _GENERAL_SELECTORS)
+
+        if article_body is not None:
+            _drop(_BODY_DROP_XPATH(article_body))
+            if is_naver_news:
+                div_texts = [_get_text(child, '\n') for child in _CHILD_BLOCKS_XPATH(article_body)
+                             if len(_get_text(child)) > 10]
+                text_content = "\n".join(div_texts) if div_texts else _get_text(article_body, '\n')
+            else:
+                paragraphs = list(article_body.iter('p'))
+                extracted_paragraphs = [text for text in (_get_text(p) for p in paragraphs) if len(text) > 20]
+                if extracted_paragraphs:
+                    text_content = "\n".join(extracted_paragraphs)
+                else:
+                    text_content = _get_text(article_body, ' ')
+            if repaired:
+                body_length = _visible_length(_get_text(article_body, ' '))
+                if body_length and _visible_length(text_content) < body_length * min_coverage:
+                    return None
+        else:
+            matched_selector = PAGE_SELECTOR_NAME
+            _drop(_PAGE_DROP_XPATH(root))
+            text_content = _get_text(root, ' ')
+        return text_content, matched_selector
+    except Exception as e:
+        print(f"LxmlExtraction Warning: lxml 추출 실패, BeautifulSoup 경로를 사용합니다: {e}")
+        return None
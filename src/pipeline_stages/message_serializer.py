@@ -0,0 +1,190 @@
+# src/pipeline_stages/message_serializer.py
+"""
+파이프라인 메시지용 바이너리 직렬화 (msgpack + zstd)
+- 기본 JSON 직렬화는 임베딩 벡터의 실수를 십진수 문자열로 적기 때문에 1536차원 벡터 하나가 30KB를 넘습니다.
+- 임베딩 필드와 numpy 배열은 float32 바이트로 패킹하고, 나머지는 msgpack으로 인코딩한 뒤 zstd로 압축합니다.
+- 큐마다 직렬화 방식을 다르게 지정할 수 있으며(MESSAGE_SERIALIZER.QUEUES), 태스크 어노테이션으로 적용되므로
+  .delay()/.retry() 호출부는 바꿀 필요가 없습니다.
+- msgpack이 설치되어 있지 않으면 등록하지 않고 JSON을 그대로 사용합니다. zstandard가 없으면 zlib으로 압축합니다.
+"""
+import struct
+import zlib
+from datetime import date, datetime
+
+from src.config_loader.settings import SETTINGS
+from src.pipeline_stages.claim_check import VECTOR_FIELDS, VECTOR_LIST_FIELDS  # 벡터 필드 정의를 claim_check와 공유
+
+try:
+    import msgpack
+except ImportError:
+    msgpack = None
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+try:
+    import numpy as np
+except ImportError:
+    np = None
+
+MESSAGE_SERIALIZER_CONFIG = SETTINGS.get("MESSAGE_SERIALIZER", {})
+
+SERIALIZER_NAME = "msgpack-zstd"
+CONTENT_TYPE = "application/x-pipeline-msgpack-zstd"
+
+# msgpack 확장 타입 코드
+_EXT_VECTOR = 1       # float32 벡터
+_EXT_VECTOR_LIST = 2  # 같은 차원의 float32 벡터 목록 (차원 4바이트 + 데이터)
+_EXT_NDARRAY = 3      # 임의의 numpy 배열 (헤더 길이 2바이트 + "dtype|shape" + 데이터)
+
+# 압축 헤더 1바이트
+_RAW = b"\x00"
+_ZSTD = b"\x01"
+_ZLIB = b"\x02"
+
+# 이보다 작은 메시지는 압축하지 않습니다 (claim-check 참조처럼 작은 메시지는 압축 이득이 없음).
+_MIN_COMPRESS_BYTES = 512
+
+
+def _is_float_vector(value) -> bool:
+    return isinstance(value, list) and bool(value) and all(isinstance(x, float) for x in value)
+
+
+def _pack_floats(vector) -> bytes:
+    return struct.pack(f"<{len(vector)}f", *vector)
+
+
+def _unpack_floats(data: bytes) -> list:
+    return list(struct.unpack(f"<{len(data) // 4}f", data))
+
+
+def _prepare(obj):
+    """벡터 필드를 확장 타입으로 바꿉니다. 형식이 맞지 않는 값은 그대로 둡니다."""
+    if isinstance(obj, dict):
+        prepared = {}
+        for key, value in obj.items():
+            if key in VECTOR_FIELDS and _is_float_vector(value):
+                prepared[key] = msgpack.ExtType(_EXT_VECTOR, _pack_floats(value))
+            elif (key in VECTOR_LIST_FIELDS and isinstance(value, list) and value
+                  and all(_is_float_vector(v) and len(v) == len(value[0]) for v in value)):
+                data = struct.pack("<I", len(value[0])) + b"".join(_pack_floats(v) for v in value)
+                prepared[key] = msgpack.ExtType(_EXT_VECTOR_LIST, data)
+            else:
+                prepared[key] = _prepare(value)
+        return prepared
+    if isinstance(obj, (list, tuple)):
+        return [_prepare(v) for v in obj]
+    return obj
+
+
+def _default(obj):
+    if np is not None and isinstance(obj, np.ndarray):
+        array = obj.astype("<f4") if obj.dtype.kind == "f" else obj
+        header = f"{array.dtype.str}|{','.join(str(n) for n in array.shape)}".encode()
+        return msgpack.ExtType(_EXT_NDARRAY, struct.pack("<H", len(header)) + header + array.tobytes())
+    if np is not None and isinstance(obj, np.generic):
+        return obj.item()
+    if isinstance(obj, (datetime, date)):
+        return obj.isoformat()
+    if isinstance(obj, (set, frozenset)):
+        return list(obj)
+    raise TypeError(f"MessageSerializer: 직렬화할 수 없는 타입입니다: {type(obj)!r}")
+
+
+def _ext_hook(code, data):
+    if code == _EXT_VECTOR:
+        return _unpack_floats(data)
+    if code == _EXT_VECTOR_LIST:
+        dim = struct.unpack("<I", data[:4])[0]
+        flat = _unpack_floats(data[4:])
+        return [flat[i:i + dim] for i in range(0, len(flat), dim)] if dim else []
+    if code == _EXT_NDARRAY:
+        header_len = struct.unpack("<H", data[:2])[0]
+        dtype, shape = data[2:2 + header_len].decode().split("|")
+        shape = tuple(int(n) for n in shape.split(",") if n)
+        # 태스크 코드는 JSON과 같은 파이썬 리스트를 기대하므로 리스트로 돌려줍니다.
+        return np.frombuffer(data[2 + header_len:], dtype=dtype).reshape(shape).tolist()
+    return msgpack.ExtType(code, data)
+
+
+def dumps(obj) -> bytes:
+    packed = msgpack.packb(_prepare(obj), default=_default, use_bin_type=True)
+    if len(packed) < _MIN_COMPRESS_BYTES:
+        return _RAW + packed
+    if zstandard is not None:
+        level = MESSAGE_SERIALIZER_CONFIG.get("ZSTD_LEVEL", 3)
+        return _ZSTD + zstandard.ZstdCompressor(level=level).compress(packed)
+    return _ZLIB + zlib.compress(packed, 6)
+
+
+def loads(data: bytes):
+    if isinstance(data, str):
+        data = data.encode("latin-1")
+    header, body = data[:1], data[1:]
+    if header == _ZSTD:
+        if zstandard is None:
+            raise RuntimeError("MessageSerializer: zstd로 압축된 메시지이지만 zstandard가 설치되어 있지 않습니다.")
+        body = zstandard.ZstdDecompressor().decompress(body)
+    elif header == _ZLIB:
+        body = zlib.decompress(body)
+    elif header != _RAW:
+        raise ValueError(f"MessageSerializer: 알 수 없는 메시지 헤더입니다: {header!r}")
+    return msgpack.unpackb(body, ext_hook=_ext_hook, raw=False, strict_map_key=False)
+
+
+def is_available() -> bool:
+    return msgpack is not None
+
+
+class QueueSerializerAnnotation:
+    """태스크가 라우팅되는 큐에 따라 직렬화 방식을 지정하는 Celery 태스크 어노테이션."""
+
+    def __init__(self, app):
+        self.app = app
+
+    def _queue_for(self, task) -> str:
+        routes = self.app.conf.task_routes
+        if isinstance(routes, dict):
+            route = routes.get(task.name)
+            if isinstance(route, dict) and route.get("queue"):
+                return route["queue"]
+        return getattr(task, "queue", None) or self.app.conf.task_default_queue
+
+    def annotate(self, task):
+        queues = MESSAGE_SERIALIZER_CONFIG.get("QUEUES", {}) or {}
+        serializer = queues.get(self._queue_for(task), MESSAGE_SERIALIZER_CONFIG.get("DEFAULT", "json"))
+        if serializer == SERIALIZER_NAME and not is_available():
+            serializer = "json"
+        return {"serializer": serializer}
+
+    def annotate_any(self):
+        return None
+
+
+def register_pipeline_serializer(app) -> bool:
+    """kombu에 직렬화 방식을 등록하고 Celery 앱에 큐별 어노테이션을 설정합니다."""
+    if not MESSAGE_SERIALIZER_CONFIG.get("ENABLED", True):
+        return False
+    if not is_available():
+        print("MessageSerializer Warning: msgpack이 설치되어 있지 않아 JSON 직렬화를 계속 사용합니다.")
+        return False
+
+    from kombu.serialization import register
+    register(SERIALIZER_NAME, dumps, loads, content_type=CONTENT_TYPE, content_encoding="binary")
+
+    # 배포 중에는 JSON 메시지와 섞여 들어올 수 있으므로 둘 다 받습니다.
+    accept_content = list(app.conf.accept_content or ["json"])
+    if SERIALIZER_NAME not in accept_content:
+        accept_content.append(SERIALIZER_NAME)
+    app.conf.accept_content = accept_content
+
+    annotations = app.conf.task_annotations
+    if annotations is None:
+        annotations = ()
+    elif not isinstance(annotations, (list, tuple)):
+        annotations = (annotations,)
+    # Celery는 처음으로 일치한 어노테이션을 사용하므로, 태스크별로 직접 지정한 설정이 우선하도록 맨 뒤에 둡니다.
+    app.conf.task_annotations = tuple(annotations) + (QueueSerializerAnnotation(app),)
+    return True
@@ -0,0 +1,267 @@
+# src/pipeline_stages/near_duplicate.py
+"""
+최근 기사 본문에 대한 MinHash-LSH 근접 중복 인덱스
+- 본문 추출 직후(LLM 요약/키워드 추출/임베딩 전에) 통신사 전재, 제목만 바꾼 재작성 기사를 걸러냅니다.
+  finalization의 Pinecone 유사도 조회는 오래된 기사와 의미적 중복을 잡는 마지막 단계로 그대로 둡니다.
+- 본문(final_text_clean 결과)의 문자 SHINGLE_SIZE-gram 집합으로 NUM_PERM개 MinHash 서명을 만들고,
+  BANDS개 밴드로 나눠 Redis 집합(버킷)에 기사 ID를 넣습니다. 같은 버킷을 공유한 후보만 서명을 비교해
+  추정 Jaccard 유사도가 THRESHOLD 이상이면 중복으로 봅니다.
+- 모든 워커가 Redis 인덱스를 공유하고, 키는 WINDOW_DAYS 동안 유지됩니다.
+  Redis가 비워지면 rebuild_near_duplicate_index_task가 articles 컬렉션의 최근 기사로 다시 채웁니다.
+- 본문 추출 단계에서는 조회만 하고, 기사는 finalization에서 메인 DB 저장에 성공한 뒤에 등록합니다.
+  그래서 인덱스의 후보는 모두 실제로 저장된 기사이며, 먼저 들어온 사본이 뒤 단계에서 실패해도
+  나중 사본이 존재하지 않는 원본의 중복으로 드롭되지 않습니다.
+  동시에 처리되는 사본끼리는 서로를 찾지 못하므로 둘 다 통과할 수 있고, finalization의 Pinecone 유사도 조회가 잡습니다.
+"""
+import hashlib
+import os
+import struct
+import time
+import zlib
+from datetime import datetime, timedelta
+from typing import List, Optional, Tuple
+
+import numpy as np
+import redis
+from celery import shared_task
+
+from src.config_loader.settings import SETTINGS
+
+NEAR_DUPLICATE_CONFIG = SETTINGS.get("NEAR_DUPLICATE", {})
+
+# MinHash 해시 함수 (a*x + b) mod P. P는 2^32보다 작은 가장 큰 소수라 결과가 uint32에 들어갑니다.
+_MERSENNE_LIKE_PRIME = np.uint64(4294967291)
+_MAX_CONTENT_CHARS = 20000
+# 서명 값 앞에 붙는 등록 시각(ms)
+_HEADER = struct.Struct("<Q")
+
+
+class NearDuplicateIndex:
+    """Redis에 저장되는 MinHash-LSH 인덱스."""
+
+    def __init__(self, num_perm: int = 128, bands: int = 32, shingle_size: int = 5, threshold: float = 0.7,
+                 min_chars: int = 200, window_days: int = 7, key_prefix: str = "pipeline:neardup"):
+        if num_perm % bands:
+            raise ValueError(f"NearDuplicateIndex: NUM_PERM({num_perm})은 BANDS({bands})의 배수여야 합니다.")
+        self.num_perm = int(num_perm)
+        self.bands = int(bands)
+        self.rows = self.num_perm // self.bands
+        self.shingle_size = int(shingle_size)
+        self.threshold = float(threshold)
+        self.min_chars = int(min_chars)
+        self.ttl_seconds = int(window_days * 24 * 3600)
+        self.window_days = window_days
+        self.key_prefix = key_prefix
+        self.ready_key = f"{key_prefix}:ready"
+        self.lock_key = f"{key_prefix}:rebuild_lock"
+        # 워커마다 같은 해시 함수를 쓰도록 고정 시드를 사용합니다.
+        rng = np.random.RandomState(20240601)
+        self._a = rng.randint(1, 2 ** 32 - 1, size=(self.num_perm, 1), dtype=np.uint64)
+        self._b = rng.randint(0, 2 ** 32 - 1, size=(self.num_perm, 1), dtype=np.uint64)
+        self._client = None
+        self._client_pid = None
+
+    def _get_client(self):
+        if self._client is None or self._client_pid != os.getpid():
+            self._client = redis.Redis(
+                host=SETTINGS.get("REDIS_HOST"),
+                port=SETTINGS.get("REDIS_PORT"),
+                db=SETTINGS.get("REDIS_DB"),
+                socket_timeout=2,
+                socket_connect_timeout=2,
+            )
+            self._client_pid = os.getpid()
+        return self._client
+
+    # --- 서명 ---
+    def signature(self, text: str) -> Optional[np.ndarray]:
+        """본문의 MinHash 서명(uint32 NUM_PERM개). 비교하기에 너무 짧으면 None."""
+        text = " ".join((text or "").split())[:_MAX_CONTENT_CHARS]
+        if len(text) < self.min_chars:
+            return None
+        n = self.shingle_size
+        shingles = {zlib.crc32(text[i:i + n].encode("utf-8")) for i in range(len(text) - n + 1)}
+        hashes = np.fromiter(shingles, dtype=np.uint64, count=len(shingles))
+        permuted = (self._a * hashes + self._b) % _MERSENNE_LIKE_PRIME
+        return permuted.min(axis=1).astype(np.uint32)
+
+    def similarity(self, sig_a: np.ndarray, sig_b: np.ndarray) -> float:
+        """두 서명의 추정 Jaccard 유사도."""
+        return float(np.count_nonzero(sig_a == sig_b)) / self.num_perm
+
+    # --- Redis 키 ---
+    def _sig_key(self, article_id: str) -> str:
+        return f"{self.key_prefix}:sig:{article_id}"
+
+    def _band_keys(self, sig: np.ndarray) -> List[str]:
+        keys = []
+        for band in range(self.bands):
+            chunk = sig[band * self.rows:(band + 1) * self.rows].tobytes()
+            keys.append(f"{self.key_prefix}:band:{band}:{hashlib.blake2b(chunk, digest_size=8).hexdigest()}")
+        return keys
+
+    def _decode(self, raw: bytes) -> Tuple[int, np.ndarray]:
+        (added_at,) = _HEADER.unpack_from(raw)
+        return added_at, np.frombuffer(raw, dtype=np.uint32, offset=_HEADER.size)
+
+    def _add_to_pipe(self, pipe, article_id: str, sig: np.ndarray, band_keys: List[str], added_at_ms: int):
+        # 재시도로 같은 기사가 다시 들어와도 처음 등록 시각을 유지합니다.
+        pipe.set(self._sig_key(article_id), _HEADER.pack(added_at_ms) + sig.tobytes(), nx=True, ex=self.ttl_seconds)
+        for key in band_keys:
+            pipe.sadd(key, article_id)
+            pipe.expire(key, self.ttl_seconds)
+
+    # --- 조회 / 등록 ---
+    def find(self, article_id: str, text: str) -> Optional[dict]:
+        """
+        등록된(저장된) 기사 중 근접 중복이 있으면 {"duplicate_of", "similarity"}를 반환합니다. 인덱스에 쓰지 않습니다.
+        본문이 짧으면 None (중복 아님으로 진행).
+        """
+        sig = self.signature(text)
+        if sig is None or not article_id:
+            return None
+        client = self._get_client()
+
+        pipe = client.pipeline(transaction=False)
+        for key in self._band_keys(sig):
+            pipe.smembers(key)
+        members = pipe.execute()
+
+        candidates = set()
+        for bucket in members:
+            candidates.update(m.decode() if isinstance(m, bytes) else m for m in bucket)
+        candidates.discard(article_id)
+        if not candidates:
+            return None
+
+        candidates = sorted(candidates)
+        best = None
+        for candidate_id, raw in zip(candidates, client.mget([self._sig_key(c) for c in candidates])):
+            if raw is None:
+                continue
+            _, candidate_sig = self._decode(raw)
+            score = self.similarity(sig, candidate_sig)
+            if score >= self.threshold and (best is None or score > best["similarity"]):
+                best = {"duplicate_of": candidate_id, "similarity": round(score, 4)}
+        return best
+
+    def add(self, article_id: str, text: str) -> bool:
+        """저장된 기사를 인덱스에 등록합니다. 본문이 짧아 서명이 없으면 False."""
+        sig = self.signature(text)
+        if sig is None or not article_id:
+            return False
+        pipe = self._get_client().pipeline(transaction=False)
+        self._add_to_pipe(pipe, article_id, sig, self._band_keys(sig), int(time.time() * 1000))
+        pipe.execute()
+        return True
+
+    # --- 재구축 ---
+    def is_ready(self) -> bool:
+        try:
+            return bool(self._get_client().exists(self.ready_key))
+        except Exception:
+            return False
+
+    def rebuild_from_collection(self, articles_collection) -> int:
+        """articles 컬렉션에서 WINDOW_DAYS 이내에 저장된 기사로 인덱스를 채웁니다."""
+        from bson import ObjectId
+
+        client = self._get_client()
+        if not client.set(self.lock_key, os.getpid(), nx=True, ex=3600):
+            print("NearDuplicate Info: 다른 워커가 이미 인덱스를 재구축 중입니다.")
+            return 0
+        try:
+            started = time.monotonic()
+            cutoff = ObjectId.from_datetime(datetime.utcnow() - timedelta(days=self.window_days))
+            cursor = articles_collection.find({"_id": {"$gte": cutoff}, "content": {"$exists": True}},
+                                              {"ID": 1, "content": 1}, batch_size=500)
+            count = 0
+            pipe = client.pipeline(transaction=False)
+            for doc in cursor:
+                sig = self.signature(doc.get("content") or "")
+                if sig is None or not doc.get("ID"):
+                    continue
+                added_at_ms = int(doc["_id"].generation_time.timestamp() * 1000)
+                self._add_to_pipe(pipe, doc["ID"], sig, self._band_keys(sig), added_at_ms)
+                count += 1
+                if count % 500 == 0:
+                    pipe.execute()
+            pipe.set(self.ready_key, int(time.time()))
+            pipe.execute()
+            print(f"✅ NearDuplicate: 최근 {self.window_days}일 기사 {count}개로 인덱스 재구축 완료 ({time.monotonic() - started:.1f}초).")
+            return count
+        finally:
+            client.delete(self.lock_key)
+
+
+_near_duplicate_index: Optional[NearDuplicateIndex] = None
+_rebuild_requested = False
+
+
+def get_near_duplicate_index() -> Optional[NearDuplicateIndex]:
+    """설정에서 활성화된 경우 프로세스당 하나의 인덱스 인스턴스를 반환합니다."""
+    global _near_duplicate_index
+    if not NEAR_DUPLICATE_CONFIG.get("ENABLED", True):
+        return None
+    if _near_duplicate_index is None:
+        _near_duplicate_index = NearDuplicateIndex(
+            num_perm=NEAR_DUPLICATE_CONFIG.get("NUM_PERM", 128),
+            bands=NEAR_DUPLICATE_CONFIG.get("BANDS", 32),
+            shingle_size=NEAR_DUPLICATE_CONFIG.get("SHINGLE_SIZE", 5),
+            threshold=NEAR_DUPLICATE_CONFIG.get("THRESHOLD", 0.7),
+            min_chars=NEAR_DUPLICATE_CONFIG.get("MIN_CHARS", 200),
+            window_days=NEAR_DUPLICATE_CONFIG.get("WINDOW_DAYS", 7),
+            key_prefix=NEAR_DUPLICATE_CONFIG.get("KEY_PREFIX", "pipeline:neardup"),
+        )
+    return _near_duplicate_index
+
+
+def find_near_duplicate(article_data: dict) -> Optional[dict]:
+    """
+    본문 추출 직후 호출합니다. 근접 중복이면 {"duplicate_of", "similarity"}, 아니면 None.
+    인덱스가 비어 있으면 재구축 태스크를 프로세스당 한 번 요청합니다.
+    """
+    global _rebuild_requested
+    index = get_near_duplicate_index()
+    if index is None or article_data.get("source") in NEAR_DUPLICATE_CONFIG.get("SKIP_SOURCES", ["DART"]):
+        return None
+    if not _rebuild_requested and not index.is_ready():
+        _rebuild_requested = True
+        try:
+            rebuild_near_duplicate_index_task.delay()
+            print("NearDuplicate Info: 인덱스가 준비되지 않아 재구축 태스크를 요청했습니다.")
+        except Exception as e:
+            print(f"NearDuplicate Warning: 재구축 태스크 요청 실패: {e}")
+    try:
+        return index.find(article_data.get("ID"), article_data.get("content") or "")
+    except Exception as e:
+        print(f"NearDuplicate Warning: 근접 중복 검사 실패, 중복 아님으로 진행합니다: {e}")
+        return None
+
+
+def register_saved_article(article_data: dict) -> bool:
+    """finalization에서 메인 DB 저장에 성공한 뒤 호출해, 이후 사본을 걸러낼 수 있도록 인덱스에 등록합니다."""
+    index = get_near_duplicate_index()
+    if index is None or article_data.get("source") in NEAR_DUPLICATE_CONFIG.get("SKIP_SOURCES", ["DART"]):
+        return False
+    try:
+        return index.add(article_data.get("ID"), article_data.get("content") or "")
+    except Exception as e:
+        print(f"NearDuplicate Warning: 근접 중복 인덱스 등록 실패 (ID: {article_data.get('ID')}): {e}")
+        return False
+
+
+@shared_task(name="src.pipeline_stages.near_duplicate.rebuild_near_duplicate_index_task", ignore_result=True)
+def rebuild_near_duplicate_index_task():
+    """articles 컬렉션의 최근 기사로 근접 중복 인덱스를 재구축하는 Celery 태스크."""
+    index = get_near_duplicate_index()
+    if index is None:
+        print("NearDuplicate Info: 인덱스가 비활성화되어 재구축을 건너뜁니다.")
+        return 0
+
+    import src.celery_app
+    articles_collection = src.celery_app.worker_resources.get('articles_collection')
+    if articles_collection is None:
+        print("NearDuplicate Warning: articles 컬렉션이 없어 재구축을 건너뜁니다.")
+        return 0
+    return index.rebuild_from_collection(articles_collection)
@@ -0,0 +1,291 @@
+# src/pipeline_stages/seen_filter.py
+"""
+이미 본 기사 ID(generate_article_id 해시)에 대한 공유 Bloom 필터
+- Redis 비트맵에 저장되어 모든 워커가 공유합니다.
+- 로컬 스냅샷 파일을 함께 유지해 Redis 장애/초기화 시 비트를 미리 채워 둡니다. 스냅샷 이후에 저장된 ID가 빠져 있으므로
+  스냅샷 복구만으로는 준비 상태로 표시하지 않고, 컬렉션 재구축이 끝날 때까지 모든 조회를 정확한 검사로 보냅니다.
+- 확실한 미스(definite-miss)면 MongoDB 중복 조회를 생략하고,
+  가능한 히트(possible-hit)면 기존의 정확한 중복 검사로 넘어갑니다.
+"""
+import os
+import threading
+import time
+from typing import Iterable, List, Optional, Tuple
+
+import redis
+from celery import shared_task
+
+from src.config_loader.settings import SETTINGS
+
+_current_file_path = os.path.abspath(__file__)
+_project_root = os.path.dirname(os.path.dirname(os.path.dirname(_current_file_path)))
+
+SEEN_FILTER_CONFIG = SETTINGS.get("SEEN_FILTER", {})
+
+
+class SeenArticleFilter:
+    """Redis 비트맵 기반 Bloom 필터."""
+
+    def __init__(self, size_bits: int = 2 ** 25, num_hashes: int = 7,
+                 redis_key: str = "pipeline:seen_articles:bloom", snapshot_path: Optional[str] = None):
+        self.size_bits = int(size_bits)
+        self.num_hashes = int(num_hashes)
+        self.redis_key = redis_key
+        self.ready_key = f"{redis_key}:ready"
+        self.lock_key = f"{redis_key}:rebuild_lock"
+        self.snapshot_path = snapshot_path or os.path.join(_project_root, "data", "seen_filter", "seen_articles.bloom")
+        self._client = None
+        self._client_pid = None
+        self._client_lock = threading.Lock()
+
+    # --- 해시 ---
+    def _offsets(self, article_id: str) -> List[int]:
+        """SHA-256 16진수 ID에서 double hashing으로 k개의 비트 위치를 만듭니다."""
+        if not article_id or len(article_id) < 32:
+            return []
+        try:
+            h1 = int(article_id[:16], 16)
+            h2 = int(article_id[16:32], 16) | 1
+        except ValueError:
+            return []
+        return [(h1 + i * h2) % self.size_bits for i in range(self.num_hashes)]
+
+    # --- Redis ---
+    def _get_client(self):
+        with self._client_lock:
+            # fork 이후에는 부모 프로세스의 소켓을 공유하지 않도록 새로 연결합니다.
+            if self._client is None or self._client_pid != os.getpid():
+                self._client = redis.Redis(
+                    host=SETTINGS.get("REDIS_HOST"),
+                    port=SETTINGS.get("REDIS_PORT"),
+                    db=SETTINGS.get("REDIS_DB"),
+                    socket_timeout=5,
+                )
+                self._client_pid = os.getpid()
+            return self._client
+
+    def is_ready(self) -> bool:
+        """필터가 한 번이라도 컬렉션으로부터 구축되었는지 여부."""
+        try:
+            return bool(self._get_client().exists(self.ready_key))
+        except Exception as e:
+            print(f"SeenFilter Warning: Redis 상태 확인 실패: {e}")
+            return False
+
+    def might_contain(self, article_id: str) -> Optional[bool]:
+        """
+        False: 확실히 처음 보는 ID (Mongo 조회 생략 가능)
+        True: 이미 봤을 수 있는 ID (정확한 검사 필요)
+        None: 필터를 사용할 수 없음 (정확한 검사 필요)
+        """
+        offsets = self._offsets(article_id)
+        if not offsets:
+            return None
+        try:
+            # 준비 여부 확인과 비트 조회를 한 번의 왕복으로 처리합니다.
+            pipe = self._get_client().pipeline(transaction=False)
+            pipe.exists(self.ready_key)
+            for offset in offsets:
+                pipe.getbit(self.redis_key, offset)
+            ready, *bits = pipe.execute()
+            if not ready:
+                return None
+            return all(bits)
+        except Exception as e:
+            print(f"SeenFilter Warning: Redis 조회 실패, 정확한 검사로 대체합니다: {e}")
+            return None
+
+    def contains_many(self, article_ids: List[str]) -> List[Optional[bool]]:
+        """might_contain의 일괄 버전. 준비 여부와 모든 ID의 비트를 한 번의 파이프라인으로 조회합니다."""
+        offsets_per_id = [self._offsets(article_id) for article_id in article_ids]
+        if not any(offsets_per_id):
+            return [None] * len(article_ids)
+        try:
+            pipe = self._get_client().pipeline(transaction=False)
+            pipe.exists(self.ready_key)
+            for offsets in offsets_per_id:
+                for offset in offsets:
+                    pipe.getbit(self.redis_key, offset)
+            ready, *bits = pipe.execute()
+        except Exception as e:
+            print(f"SeenFilter Warning: Redis 일괄 조회 실패, 정확한 검사로 대체합니다: {e}")
+            return [None] * len(article_ids)
+        if not ready:
+            return [None] * len(article_ids)
+        results, position = [], 0
+        for offsets in offsets_per_id:
+            if not offsets:
+                results.append(None)
+                continue
+            results.append(all(bits[position:position + len(offsets)]))
+            position += len(offsets)
+        return results
+
+    def add(self, article_id: str) -> bool:
+        return self.add_many([article_id])
+
+    def add_many(self, article_ids: Iterable[str]) -> bool:
+        """여러 ID를 한 번의 파이프라인으로 추가합니다."""
+        offsets = [offset for article_id in article_ids for offset in self._offsets(article_id)]
+        if not offsets:
+            return False
+        try:
+            pipe = self._get_client().pipeline(transaction=False)
+            for offset in offsets:
+                pipe.setbit(self.redis_key, offset, 1)
+            pipe.execute()
+            return True
+        except Exception as e:
+            print(f"SeenFilter Warning: 필터에 ID 추가 실패 ({len(offsets) // max(1, self.num_hashes)}개): {e}")
+            return False
+
+    # --- 구축 / 스냅샷 ---
+    def _build_bitmap(self, article_ids: Iterable[str]) -> Tuple[bytearray, int]:
+        bitmap = bytearray((self.size_bits + 7) // 8)
+        count = 0
+        for article_id in article_ids:
+            for offset in self._offsets(article_id):
+                # Redis SETBIT과 같은 비트 순서(바이트 내 MSB 우선)를 사용합니다.
+                bitmap[offset >> 3] |= 0x80 >> (offset & 7)
+            count += 1
+        return bitmap, count
+
+    def _publish_bitmap(self, bitmap: bytes, mark_ready: bool = True):
+        client = self._get_client()
+        # 구축 중 add()로 들어온 비트를 잃지 않도록 임시 키에 쓴 뒤 OR 병합합니다.
+        tmp_key = f"{self.redis_key}:tmp"
+        pipe = client.pipeline(transaction=True)
+        pipe.set(tmp_key, bytes(bitmap))
+        pipe.bitop("OR", self.redis_key, self.redis_key, tmp_key)
+        pipe.delete(tmp_key)
+        if mark_ready:
+            pipe.set(self.ready_key, int(time.time()))
+        pipe.execute()
+
+    def rebuild_from_collections(self, articles_collection, blacklist_collection) -> int:
+        """articles / blacklist 컬렉션의 모든 ID로 필터를 다시 구축합니다."""
+        client = self._get_client()
+        if not client.set(self.lock_key, os.getpid(), nx=True, ex=1800):
+            print("SeenFilter Info: 다른 워커가 이미 필터를 재구축 중입니다.")
+            return 0
+        try:
+            def _iter_ids():
+                for collection in (articles_collection, blacklist_collection):
+                    if collection is None:
+                        continue
+                    for doc in collection.find({"ID": {"$exists": True}}, {"ID": 1, "_id": 0}, batch_size=5000):
+                        if doc.get("ID"):
+                            yield doc["ID"]
+
+            started = time.monotonic()
+            bitmap, count = self._build_bitmap(_iter_ids())
+            self._publish_bitmap(bitmap)
+            self.save_snapshot(bitmap)
+            print(f"✅ SeenFilter: {count}개 ID로 필터 재구축 완료 ({time.monotonic() - started:.1f}초).")
+            return count
+        finally:
+            client.delete(self.lock_key)
+
+    def save_snapshot(self, bitmap: Optional[bytes] = None) -> bool:
+        try:
+            if bitmap is None:
+                bitmap = self._get_client().get(self.redis_key) or b""
+            os.makedirs(os.path.dirname(self.snapshot_path), exist_ok=True)
+            tmp_path = f"{self.snapshot_path}.tmp"
+            with open(tmp_path, "wb") as f:
+                f.write(bytes(bitmap))
+            os.replace(tmp_path, self.snapshot_path)
+            return True
+        except Exception as e:
+            print(f"SeenFilter Warning: 로컬 스냅샷 저장 실패: {e}")
+            return False
+
+    def restore_from_snapshot(self) -> bool:
+        """
+        Redis 키가 사라진 경우 로컬 스냅샷의 비트를 필터에 병합합니다.
+        스냅샷 이후에 저장된 ID는 없으므로 준비 상태로 표시하지 않습니다 (재구축이 끝나야 확실한 미스를 신뢰합니다).
+        """
+        try:
+            with open(self.snapshot_path, "rb") as f:
+                bitmap = f.read()
+        except FileNotFoundError:
+            return False
+        except Exception as e:
+            print(f"SeenFilter Warning: 로컬 스냅샷 로드 실패: {e}")
+            return False
+        if len(bitmap) != (self.size_bits + 7) // 8:
+            print("SeenFilter Warning: 스냅샷 크기가 현재 설정과 달라 복구를 건너뜁니다.")
+            return False
+        self._publish_bitmap(bitmap, mark_ready=False)
+        print(f"✅ SeenFilter: 로컬 스냅샷({self.snapshot_path})에서 비트 복구 완료 (재구축 전까지 정확한 검사 사용).")
+        return True
+
+
+_seen_filter: Optional[SeenArticleFilter] = None
+_rebuild_requested = False
+
+
+def get_seen_filter() -> Optional[SeenArticleFilter]:
+    """설정에서 활성화된 경우 프로세스당 하나의 필터 인스턴스를 반환합니다."""
+    global _seen_filter
+    if not SEEN_FILTER_CONFIG.get("ENABLED", True):
+        return None
+    if _seen_filter is None:
+        _seen_filter = SeenArticleFilter(
+            size_bits=SEEN_FILTER_CONFIG.get("SIZE_BITS", 2 ** 25),
+            num_hashes=SEEN_FILTER_CONFIG.get("NUM_HASHES", 7),
+        )
+    return _seen_filter
+
+
+def mark_article_seen(article_id: Optional[str]):
+    """기사 ID가 articles 또는 blacklist 컬렉션에 저장될 때 호출합니다."""
+    seen_filter = get_seen_filter()
+    if seen_filter is not None and article_id:
+        seen_filter.add(article_id)
+
+
+def mark_articles_seen(article_ids: Iterable[Optional[str]]):
+    """mark_article_seen의 일괄 버전 (최종 저장 bulk writer용)."""
+    seen_filter = get_seen_filter()
+    article_ids = [article_id for article_id in article_ids if article_id]
+    if seen_filter is not None and article_ids:
+        seen_filter.add_many(article_ids)
+
+
+def ensure_seen_filter_ready(seen_filter: SeenArticleFilter) -> bool:
+    """
+    필터가 준비되었으면 True. 준비되지 않았으면 스냅샷 비트를 병합하고 재구축 태스크를 프로세스당 한 번만 요청한 뒤 False를
+    반환합니다. 스냅샷에는 최근 ID가 없으므로 재구축이 끝나기 전의 조회 결과는 "알 수 없음"으로 취급합니다.
+    """
+    global _rebuild_requested
+    if seen_filter.is_ready():
+        return True
+    if not _rebuild_requested:
+        _rebuild_requested = True
+        try:
+            seen_filter.restore_from_snapshot()
+        except Exception as e:
+            print(f"SeenFilter Warning: 스냅샷 복구 중 오류: {e}")
+        try:
+            rebuild_seen_filter_task.delay()
+            print("SeenFilter Info: 필터가 준비되지 않아 재구축 태스크를 요청했습니다.")
+        except Exception as e:
+            print(f"SeenFilter Warning: 재구축 태스크 요청 실패: {e}")
+    return False
+
+
+@shared_task(name="src.pipeline_stages.seen_filter.rebuild_seen_filter_task", ignore_result=True)
+def rebuild_seen_filter_task():
+    """articles / blacklist 컬렉션에서 Bloom 필터를 재구축하는 Celery 태스크."""
+    seen_filter = get_seen_filter()
+    if seen_filter is None:
+        print("SeenFilter Info: 필터가 비활성화되어 재구축을 건너뜁니다.")
+        return 0
+
+    import src.celery_app
+    worker_resources = src.celery_app.worker_resources
+    return seen_filter.rebuild_from_collections(
+        worker_resources.get('articles_collection'),
+        worker_resources.get('blacklist_collection'),
+    )
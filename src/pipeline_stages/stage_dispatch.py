@@ -0,0 +1,55 @@
+# src/pipeline_stages/stage_dispatch.py
+"""
+파이프라인 단계 간 전달 (Stage fusion)
+- PIPELINE_FUSION.BROKER_STAGES에 있는 단계만 브로커(.delay)를 거쳐 실행합니다.
+- 나머지 단계는 현재 워커 안에서 바로 실행해 직렬화/브로커 왕복을 생략합니다.
+- task.apply()는 self.retry()를 countdown 없이 그 자리에서 다시 실행하므로 쓰지 않고, eager 요청 컨텍스트에서
+  task.run()을 호출합니다. 결합 실행 중 self.retry()가 요청되면 그 재시도는 countdown을 지켜 브로커로 보내고
+  (이후 재시도/최종 실패는 일반 태스크와 같이 처리), 그 밖의 예외는 앞 단계 태스크로 그대로 전파합니다.
+"""
+import uuid
+
+from celery.exceptions import Retry
+
+from src.config_loader.settings import SETTINGS
+from src.pipeline_stages.claim_check import to_message_payload
+from src.pipeline_stages.tracing import mark_enqueued
+
+PIPELINE_FUSION_CONFIG = SETTINGS.get("PIPELINE_FUSION", {})
+# 외부 I/O가 큰 단계(HTML 수집, LLM 호출, 임베딩 API)만 브로커를 거치고,
+# 로컬 검사(content_analysis)와 벡터를 그대로 넘겨받는 finalization은 앞 단계 워커에서 이어서 실행합니다.
+DEFAULT_BROKER_STAGES = ["content_extraction", "categorization", "embedding_generation"]
+
+
+def stage_name(task) -> str:
+    """'src.pipeline_stages.content_analysis.content_analysis_task' → 'content_analysis'"""
+    name = task.name.rsplit(".", 1)[-1]
+    return name[:-len("_task")] if name.endswith("_task") else name
+
+
+def crosses_broker(task) -> bool:
+    if not PIPELINE_FUSION_CONFIG.get("ENABLED", True):
+        return True
+    return stage_name(task) in PIPELINE_FUSION_CONFIG.get("BROKER_STAGES", DEFAULT_BROKER_STAGES)
+
+
+def dispatch_stage(task, article_data: dict):
+    """다음 단계 태스크를 브로커로 보내거나 현재 워커에서 이어서 실행합니다."""
+    mark_enqueued(article_data)
+    if crosses_broker(task):
+        # 브로커 메시지에는 Claim-check 참조만 담고, 기사 상태는 Redis에 저장합니다.
+        return task.delay(to_message_payload(article_data))
+
+    print(f"  🔗 Stage Fusion: '{stage_name(task)}' 단계를 현재 워커에서 바로 실행합니다.")
+    task.push_request(id=str(uuid.uuid4()), task=task.name, args=(article_data,), kwargs={}, retries=0,
+                      is_eager=True, called_directly=False, delivery_info={"is_eager": True})
+    try:
+        return task.run(article_data)
+    except Retry as retry:
+        print(f"  🔁 Stage Fusion: '{stage_name(task)}' 단계가 재시도를 요청해 {retry.when}초 뒤 브로커로 실행합니다: {retry.exc!r}")
+        return task.apply_async(args=(to_message_payload(article_data),), countdown=retry.when, retries=1)
+    except Exception as e:
+        print(f"  ❌ Stage Fusion: '{stage_name(task)}' 단계 실행 실패: {e!r}")
+        raise
+    finally:
+        task.pop_request()
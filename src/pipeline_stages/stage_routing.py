@@ -0,0 +1,105 @@
+# src/pipeline_stages/stage_routing.py
+"""
+파이프라인 단계별 큐 라우팅
+- 단계마다 전용 큐를 두어, 느린 HTML 수집/LLM 추출이 쌓여도 빠른 단계(content_analysis, finalization)가 밀리지 않게 합니다.
+- 큐마다 맞는 풀로 워커를 띄웁니다 (docker/docker-compose.yml 참고).
+    pipeline.intake, pipeline.fetch, pipeline.llm, pipeline.embedding → eventlet (네트워크 대기 위주)
+    pipeline.finalize → eventlet (여러 기사의 저장을 bulk writer로 묶음, bulk_writer.py 참고)
+    pipeline.analysis → prefork (CPU 파싱/검사)
+- 단계 우선순위는 finalization에 가까울수록 높습니다 (Redis 브로커: 0이 가장 높음).
+  한 워커가 여러 큐를 소비할 때는 -Q에 적은 순서대로 먼저 가져가므로(queue_order_strategy=priority),
+  끝나가는 기사가 새로 수집된 기사보다 먼저 처리됩니다.
+- PIPELINE_FUSION으로 앞 단계 워커에서 바로 실행되는 단계는 큐를 거치지 않으므로, 해당 큐는 fusion을 끈 경우에만 쓰입니다.
+"""
+from src.config_loader.settings import SETTINGS
+
+PIPELINE_QUEUES_CONFIG = SETTINGS.get("PIPELINE_QUEUES", {})
+
+# 단계 이름 → Celery 태스크 이름
+STAGE_TASK_NAMES = {
+    "initial_checks": "src.pipeline_stages.initial_checks.initial_checks_task",
+    "batch_initial_checks": "src.pipeline_stages.initial_checks.batch_initial_checks_task",
+    "content_extraction": "src.pipeline_stages.content_extraction.content_extraction_task",
+    "categorization": "src.pipeline_stages.categorization.categorization_task",
+    "content_analysis": "src.pipeline_stages.content_analysis.content_analysis_task",
+    "embedding_generation": "src.pipeline_stages.embedding_generator.embedding_generation_task",
+    "finalization": "src.pipeline_stages.finalization.finalization_task",
+}
+
+DEFAULT_STAGE_QUEUES = {
+    "initial_checks": "pipeline.intake",
+    "batch_initial_checks": "pipeline.intake",
+    "content_extraction": "pipeline.fetch",
+    "categorization": "pipeline.llm",
+    "content_analysis": "pipeline.analysis",
+    "embedding_generation": "pipeline.embedding",
+    "finalization": "pipeline.finalize",
+}
+
+# Redis 브로커의 우선순위 단계와 큐 이름 구분자. 우선순위 n(>0) 메시지는 "<큐>:<n>" 리스트에 쌓입니다.
+PRIORITY_STEPS = list(range(10))
+PRIORITY_SEP = ":"
+
+DEFAULT_STAGE_PRIORITIES = {
+    "initial_checks": 9,
+    "batch_initial_checks": 9,
+    "content_extraction": 7,
+    "categorization": 5,
+    "content_analysis": 3,
+    "embedding_generation": 2,
+    "finalization": 0,
+}
+
+
+def stage_queues() -> dict:
+    queues = dict(DEFAULT_STAGE_QUEUES)
+    queues.update(PIPELINE_QUEUES_CONFIG.get("QUEUES") or {})
+    return queues
+
+
+def stage_priorities() -> dict:
+    priorities = dict(DEFAULT_STAGE_PRIORITIES)
+    priorities.update(PIPELINE_QUEUES_CONFIG.get("PRIORITIES") or {})
+    return priorities
+
+
+def broker_queue_keys(queue: str) -> list:
+    """큐 하나에 해당하는 Redis 리스트 키들 (우선순위별 하위 리스트 포함)."""
+    return [queue if step == 0 else f"{queue}{PRIORITY_SEP}{step}" for step in PRIORITY_STEPS]
+
+
+def build_task_routes() -> dict:
+    """태스크 이름 → {'queue', 'priority'} 라우팅 표를 만듭니다."""
+    queues = stage_queues()
+    priorities = stage_priorities()
+    routes = {}
+    for stage, task_name in STAGE_TASK_NAMES.items():
+        route = {"queue": queues[stage]}
+        if stage in priorities:
+            route["priority"] = int(priorities[stage])
+        routes[task_name] = route
+    return routes
+
+
+def configure_stage_queues(app) -> bool:
+    """Celery 앱에 단계별 라우팅과 브로커 우선순위 설정을 적용합니다."""
+    if not PIPELINE_QUEUES_CONFIG.get("ENABLED", True):
+        return False
+
+    existing_routes = app.conf.task_routes
+    if existing_routes and not isinstance(existing_routes, dict):
+        print("StageRouting Warning: task_routes가 dict가 아니어서 단계별 라우팅을 적용하지 않습니다.")
+        return False
+    routes = dict(existing_routes or {})
+    routes.update(build_task_routes())
+    app.conf.task_routes = routes
+
+    # Redis 브로커의 메시지 우선순위 (0~9, 0이 가장 높음)와 -Q 순서 기반 큐 소비
+    transport_options = dict(app.conf.broker_transport_options or {})
+    transport_options.setdefault("priority_steps", PRIORITY_STEPS)
+    transport_options.setdefault("sep", PRIORITY_SEP)
+    transport_options.setdefault("queue_order_strategy", "priority")
+    app.conf.broker_transport_options = transport_options
+    # 긴 태스크를 미리 여러 개 가져가 다른 워커가 놀지 않도록, 한 번에 하나씩만 가져갑니다.
+    app.conf.worker_prefetch_multiplier = PIPELINE_QUEUES_CONFIG.get("PREFETCH_MULTIPLIER", 1)
+    return True
@@ -0,0 +1,275 @@
+# src/pipeline_stages/tracing.py
+"""
+파이프라인 기사 단위 트레이싱과 단계별 지표
+- 단계 태스크를 @traced_stage로 감싸면 기사마다 article_data["checked"]["trace"]에 단계별 시작/종료 시각,
+  큐 대기 시간, 결과(passed/failed/retry/error)가 남습니다. 드롭된 기사는 블랙리스트 문서에서 어디서 빠졌는지 확인할 수 있습니다.
+- 큐 대기 시간은 dispatch_stage/수집기가 전송 직전에 남긴 enqueued_at과 태스크 시작 시각의 차이입니다.
+- 단계별 지연/대기 히스토그램과 결과 카운터는 여러 워커가 함께 쓰도록 Redis 해시(pipeline:metrics:<stage>)에 누적합니다.
+  utils/pipeline_metrics.py로 Prometheus 텍스트 형식이나 JSON 리포트로 내보냅니다.
+"""
+import functools
+import os
+import socket
+import threading
+import time
+from typing import Optional
+
+import redis
+from celery.exceptions import Retry
+
+from src.config_loader.settings import SETTINGS
+from src.pipeline_stages.claim_check import resolve_article_payload
+
+TRACING_CONFIG = SETTINGS.get("TRACING", {})
+
+# 히스토그램 버킷 상한(초). 마지막 +Inf 버킷은 항상 포함됩니다.
+LATENCY_BUCKETS = (0.05, 0.1, 0.25, 0.5, 1, 2.5, 5, 10, 30, 60, 120, 300, 600)
+OUTCOMES = ("passed", "failed", "retry", "error")
+# Redis 오류 후 이 시간(초) 동안은 지표 기록을 건너뜁니다.
+_REDIS_RETRY_AFTER_SECONDS = 30
+
+
+def _bucket_label(seconds: float) -> str:
+    for upper in LATENCY_BUCKETS:
+        if seconds <= upper:
+            return str(upper)
+    return "+Inf"
+
+
+class StageMetrics:
+    """단계별 지연/대기 히스토그램과 결과 카운터를 Redis에 누적합니다."""
+
+    def __init__(self, key_prefix: str = "pipeline:metrics"):
+        self.key_prefix = key_prefix
+        self._client = None
+        self._client_pid = None
+        self._redis_retry_at = 0.0
+        self._lock = threading.Lock()
+
+    def _get_client(self):
+        with self._lock:
+            if time.monotonic() < self._redis_retry_at:
+                return None
+            if self._client is None or self._client_pid != os.getpid():
+                self._client = redis.Redis(
+                    host=SETTINGS.get("REDIS_HOST"),
+                    port=SETTINGS.get("REDIS_PORT"),
+                    db=SETTINGS.get("REDIS_DB"),
+                    socket_timeout=2,
+                    socket_connect_timeout=2,
+                )
+                self._client_pid = os.getpid()
+            return self._client
+
+    def _on_redis_error(self, e: Exception):
+        with self._lock:
+            self._redis_retry_at = time.monotonic() + _REDIS_RETRY_AFTER_SECONDS
+        print(f"Tracing Warning: 지표 기록 실패, {_REDIS_RETRY_AFTER_SECONDS}초 동안 건너뜁니다: {e}")
+
+    def key(self, stage: str) -> str:
+        return f"{self.key_prefix}:{stage}"
+
+    def record(self, stage: str, latency: float, queue_wait: Optional[float], outcome: str):
+        client = self._get_client()
+        if client is None:
+            return
+        key = self.key(stage)
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.sadd(f"{self.key_prefix}:stages", stage)
+            pipe.hincrby(key, f"latency_bucket:{_bucket_label(latency)}", 1)
+            pipe.hincrbyfloat(key, "latency_sum", latency)
+            pipe.hincrby(key, "latency_count", 1)
+            if queue_wait is not None:
+                pipe.hincrby(key, f"wait_bucket:{_bucket_label(queue_wait)}", 1)
+                pipe.hincrbyfloat(key, "wait_sum", queue_wait)
+                pipe.hincrby(key, "wait_count", 1)
+            pipe.hincrby(key, f"outcome:{outcome}", 1)
+            pipe.execute()
+        except Exception as e:
+            self._on_redis_error(e)
+
+    def record_outcome(self, stage: str, outcome: str, count: int):
+        """지연 시간 없이 결과 카운터만 올립니다 (배치 태스크의 기사별 결과)."""
+        client = self._get_client()
+        if client is None or count <= 0:
+            return
+        try:
+            pipe = client.pipeline(transaction=False)
+            pipe.sadd(f"{self.key_prefix}:stages", stage)
+            pipe.hincrby(self.key(stage), f"outcome:{outcome}", count)
+            pipe.execute()
+        except Exception as e:
+            self._on_redis_error(e)
+
+    def snapshot(self) -> dict:
+        """{stage: {"latency": {...}, "queue_wait": {...}, "outcomes": {...}}} 형태로 누적 지표를 읽습니다."""
+        client = self._get_client()
+        if client is None:
+            return {}
+        report = {}
+        for raw_stage in sorted(client.smembers(f"{self.key_prefix}:stages")):
+            stage = raw_stage.decode() if isinstance(raw_stage, bytes) else raw_stage
+            fields = {k.decode(): v.decode() for k, v in client.hgetall(self.key(stage)).items()}
+            report[stage] = {
+                "latency": _histogram(fields, "latency"),
+                "queue_wait": _histogram(fields, "wait"),
+                "outcomes": {name: int(fields.get(f"outcome:{name}", 0)) for name in OUTCOMES},
+            }
+        return report
+
+    def reset(self):
+        client = self._get_client()
+        if client is None:
+            return
+        stages = client.smembers(f"{self.key_prefix}:stages")
+        keys = [self.key(s.decode() if isinstance(s, bytes) else s) for s in stages]
+        client.delete(f"{self.key_prefix}:stages", *keys)
+
+
+def _histogram(fields: dict, prefix: str) -> dict:
+    """버킷별 개수를 누적(cumulative) 히스토그램으로 바꾸고 평균을 계산합니다."""
+    buckets = {}
+    running = 0
+    for upper in [str(b) for b in LATENCY_BUCKETS] + ["+Inf"]:
+        running += int(fields.get(f"{prefix}_bucket:{upper}", 0))
+        buckets[upper] = running
+    count = int(fields.get(f"{prefix}_count", 0))
+    total = float(fields.get(f"{prefix}_sum", 0.0))
+    return {"buckets": buckets, "count": count, "sum": round(total, 6),
+            "mean": round(total / count, 6) if count else 0.0}
+
+
+_stage_metrics: Optional[StageMetrics] = None
+_stage_metrics_lock = threading.Lock()
+
+
+def get_stage_metrics() -> Optional[StageMetrics]:
+    """설정에서 활성화된 경우 프로세스당 하나의 지표 인스턴스를 반환합니다."""
+    global _stage_metrics
+    if not TRACING_CONFIG.get("ENABLED", True):
+        return None
+    with _stage_metrics_lock:
+        if _stage_metrics is None:
+            _stage_metrics = StageMetrics(key_prefix=TRACING_CONFIG.get("KEY_PREFIX", "pipeline:metrics"))
+    return _stage_metrics
+
+
+# --- 기사 트레이스 ---
+# Stage fusion으로 한 단계 안에서 다음 단계가 이어서 실행되면, 바깥 단계의 지연 시간에서 안쪽 단계 시간을 뺍니다.
+_nesting = threading.local()
+
+
+def _push_stage():
+    stack = getattr(_nesting, "stack", None)
+    if stack is None:
+        stack = _nesting.stack = []
+    stack.append(0.0)
+
+
+def _pop_stage(total: float) -> float:
+    """현재 단계를 스택에서 꺼내고, 안쪽 단계 시간을 뺀 자기 시간을 반환합니다."""
+    stack = _nesting.stack
+    nested = stack.pop()
+    if stack:
+        stack[-1] += total
+    return max(0.0, total - nested)
+
+
+def _trace(article_data: dict) -> dict:
+    checked = article_data.setdefault("checked", {})
+    trace = checked.get("trace")
+    if not isinstance(trace, dict):
+        trace = checked["trace"] = {"stages": []}
+    return trace
+
+
+def mark_enqueued(article_data: dict):
+    """다음 단계로 보내기 직전에 호출해 큐 대기 시간의 기준 시각을 남깁니다."""
+    if TRACING_CONFIG.get("ENABLED", True) and isinstance(article_data, dict):
+        _trace(article_data)["enqueued_at"] = time.time()
+
+
+def _queue_wait(article_data: dict, started_at: float) -> Optional[float]:
+    enqueued_at = _trace(article_data).pop("enqueued_at", None)
+    if enqueued_at is None:
+        return None
+    return max(0.0, started_at - enqueued_at)
+
+
+def _outcome_from_result(result, ok_key: Optional[str]) -> str:
+    if ok_key and isinstance(result, dict) and ok_key in result:
+        return "passed" if result[ok_key] else "failed"
+    return "passed"
+
+
+def traced_stage(stage: str, ok_key: Optional[str] = None):
+    """
+    단계 태스크 데코레이터. @shared_task 아래에 둡니다.
+    - Claim-check 참조를 기사 상태로 바꾼 뒤 태스크를 호출합니다.
+    - 반환 dict의 ok_key 값으로 passed/failed를 정하고, Retry는 retry, 그 밖의 예외는 error로 기록합니다.
+    """
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, payload, *args, **kwargs):
+            article_data = resolve_article_payload(payload)
+            if not TRACING_CONFIG.get("ENABLED", True):
+                return func(self, article_data, *args, **kwargs)
+
+            started_at = time.time()
+            queue_wait = _queue_wait(article_data, started_at)
+            entry = {"stage": stage, "start": started_at, "queue_wait": queue_wait,
+                     "worker": f"{socket.gethostname()}:{os.getpid()}"}
+            _trace(article_data)["stages"].append(entry)
+
+            outcome = "error"
+            _push_stage()
+            try:
+                result = func(self, article_data, *args, **kwargs)
+                outcome = _outcome_from_result(result, ok_key)
+                return result
+            except Retry:
+                outcome = "retry"
+                raise
+            finally:
+                entry["end"] = time.time()
+                entry["duration"] = _pop_stage(entry["end"] - started_at)
+                entry["outcome"] = outcome
+                metrics = get_stage_metrics()
+                if metrics is not None:
+                    metrics.record(stage, entry["duration"], queue_wait, outcome)
+        return wrapper
+    return decorator
+
+
+def traced_batch_stage(stage: str):
+    """기사 목록을 받는 배치 태스크용 데코레이터. 배치 단위 지연과 기사별 통과/탈락 수를 기록합니다."""
+    def decorator(func):
+        @functools.wraps(func)
+        def wrapper(self, articles, *args, **kwargs):
+            if not TRACING_CONFIG.get("ENABLED", True):
+                return func(self, articles, *args, **kwargs)
+
+            started_at = time.time()
+            waits = [_queue_wait(a, started_at) for a in articles if isinstance(a, dict)]
+            waits = [w for w in waits if w is not None]
+            outcome = "error"
+            result = None
+            _push_stage()
+            try:
+                result = func(self, articles, *args, **kwargs)
+                outcome = "passed"
+                return result
+            except Retry:
+                outcome = "retry"
+                raise
+            finally:
+                duration = _pop_stage(time.time() - started_at)
+                metrics = get_stage_metrics()
+                if metrics is not None:
+                    metrics.record(stage, duration, max(waits) if waits else None, outcome)
+                    if isinstance(result, dict) and "total" in result and "passed" in result:
+                        metrics.record_outcome(f"{stage}:articles", "passed", result["passed"])
+                        metrics.record_outcome(f"{stage}:articles", "failed", result["total"] - result["passed"])
+        return wrapper
+    return decorator
@@ -5,6 +5,7 @@ from langchain_core.messages import BaseMessage, HumanMessage
 from langchain_openai import ChatOpenAI
 from src.config_loader.settings import SETTINGS
 from src.db.vector_db import PineconeDB
+from src.openai_rate_limiter import get_langchain_rate_limiter
 from ..services.web_search import perform_web_search
 from ..services.advanced_retrieval import AdvancedRetrieval
 from transformers import pipeline, AutoTokenizer, AutoModelForCausalLM, AutoModelForSequenceClassification
@@ -22,7 +23,8 @@ try:
     llm = ChatOpenAI(
         model_name=rag_model,
         temperature=0,
-        openai_api_key=SETTINGS['OPENAI_API_KEY']
+        openai_api_key=SETTINGS['OPENAI_API_KEY'],
+        rate_limiter=get_langchain_rate_limiter(rag_model, "interactive")
     )
 
     # Advanced Retrieval 인스턴스
@@ -15,6 +15,8 @@ import re
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 from ..config_loader.settings import SETTINGS
 from ..db.vector_db import PineconeDB
+from ..db.embedding_cache import cached_embeddings
+from ..openai_rate_limiter import get_rate_limited_openai_client
 
 class AdvancedRetrieval:
     """고급 검색 시스템"""
@@ -91,14 +93,18 @@ class AdvancedRetrieval:
             
             # OpenAI 임베딩 생성
             from openai import OpenAI
-            openai_client = OpenAI(api_key=SETTINGS['OPENAI_API_KEY'])
+            openai_client = get_rate_limited_openai_client(OpenAI(api_key=SETTINGS['OPENAI_API_KEY']), "interactive")
             
             print(f"임베딩 모델: {self.embedding_model_name}")
-            response = openai_client.embeddings.create(
-                model=self.embedding_model_name,
-                input=query
-            )
-            query_vector = response.data[0].embedding
+
+            def _embed_query(texts: List[str]) -> List[List[float]]:
+                response = openai_client.embeddings.create(
+                    model=self.embedding_model_name,
+                    input=texts
+                )
+                return [item.embedding for item in response.data]
+
+            query_vector = cached_embeddings(self.embedding_model_name, [query], _embed_query)[0]
             print(f"쿼리 임베딩 생성 완료 - 벡터 크기: {len(query_vector)}")
             
             # Pinecone에서 검색
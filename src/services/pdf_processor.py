@@ -19,6 +19,8 @@ if _project_root not in sys.path:
 
 from ..config_loader.settings import SETTINGS
 from ..db.vector_db import PineconeDB
+from ..db.embedding_cache import cached_embeddings
+from ..openai_rate_limiter import get_rate_limited_openai_client
 from pymongo import MongoClient
 import certifi
 from openai import OpenAI
@@ -47,7 +49,7 @@ class PDFProcessor:
             api_key = SETTINGS.get("OPENAI_API_KEY")
             if not api_key:
                 raise ValueError("OPENAI_API_KEY가 설정되지 않았습니다.")
-            self.openai_client = OpenAI(api_key=api_key)
+            self.openai_client = get_rate_limited_openai_client(OpenAI(api_key=api_key), "interactive")
             print("✅ OpenAI 클라이언트 초기화 성공")
             
             # Pinecone DB 초기화
@@ -218,12 +220,15 @@ JSON 형태로만 응답해주세요.
             if not keywords:
                 return []
             
-            response = self.openai_client.embeddings.create(
-                model=self.embedding_model_name,
-                input=keywords
-            )
-            
-            embeddings = [item.embedding for item in response.data]
+            def _embed_keywords(texts: List[str]) -> List[List[float]]:
+                response = self.openai_client.embeddings.create(
+                    model=self.embedding_model_name,
+                    input=texts
+                )
+                return [item.embedding for item in response.data]
+
+            # 캐시에 없는 키워드만 임베딩 API로 요청합니다.
+            embeddings = cached_embeddings(self.embedding_model_name, keywords, _embed_keywords)
             print(f"✅ 키워드 임베딩 생성 완료 - {len(embeddings)}개 키워드")
             return embeddings
             
@@ -0,0 +1,30 @@
+# src/token_counting.py
+"""
+OpenAI 요청 토큰 수 추정
+- 임베딩 배처(입력 자르기, 배치 토큰 상한)와 공유 속도 제한기(TPM 버킷 차감)가 함께 씁니다.
+  API 서버도 속도 제한기를 쓰므로, 파이프라인 모듈에 두지 않고 의존성이 없는 이 모듈에 둡니다.
+- tiktoken(cl100k_base)이 있으면 정확히 세고, 없으면 UTF-8 바이트 수의 절반으로 보수적으로 추정합니다.
+"""
+try:
+    import tiktoken
+    _encoding = tiktoken.get_encoding("cl100k_base")
+except Exception:
+    _encoding = None
+
+
+def estimate_tokens(text: str) -> int:
+    """tiktoken이 있으면 정확히 세고, 없으면 UTF-8 바이트 수의 절반으로 보수적으로 추정합니다."""
+    if _encoding is not None:
+        return len(_encoding.encode(text, disallowed_special=()))
+    return max(1, len(text.encode("utf-8")) // 2)
+
+
+def truncate_to_tokens(text: str, max_tokens: int) -> str:
+    """텍스트를 앞에서부터 max_tokens 토큰까지만 남깁니다."""
+    if _encoding is not None:
+        tokens = _encoding.encode(text, disallowed_special=())
+        return text if len(tokens) <= max_tokens else _encoding.decode(tokens[:max_tokens])
+    estimated = estimate_tokens(text)
+    if estimated <= max_tokens:
+        return text
+    return text[:int(len(text) * max_tokens / estimated)]
@@ -0,0 +1,202 @@
+# src/worker_resources.py
+"""
+워커 리소스 레지스트리 (지연 초기화)
+- MongoDB/Pinecone/OpenAI 클라이언트를 모듈 임포트 시점이 아니라 처음 사용할 때 만듭니다.
+  beat, 수집기, 추천 서버처럼 src.celery_app을 임포트만 하는 프로세스는 연결을 열지 않습니다.
+- 클라이언트는 프로세스마다 따로 만듭니다. fork 이후 pid가 바뀌면 부모의 소켓을 공유하지 않도록 새로 만듭니다.
+- 헬스 체크가 있는 리소스는 HEALTH_CHECK_INTERVAL_SECONDS마다 확인하고, 실패하면 (의존하는 리소스까지) 다시 만듭니다.
+- 생성에 실패하면 오류를 기록하고 RETRY_AFTER_SECONDS 동안은 기본값을 반환해 요청마다 연결을 재시도하지 않습니다.
+- 생성과 헬스 체크는 리소스별 잠금 안에서, 레지스트리 전체 잠금 밖에서 실행합니다.
+- 기존 코드와 같이 worker_resources.get('articles_collection') 형태로 사용합니다.
+"""
+import os
+import threading
+import time
+import traceback
+from datetime import datetime
+from typing import Callable, Dict, Iterable, Optional
+
+
+class _Resource:
+    def __init__(self, factory: Callable, health_check: Optional[Callable], close: Optional[Callable],
+                 depends_on: Iterable[str]):
+        self.factory = factory
+        self.health_check = health_check
+        self.close = close
+        self.depends_on = tuple(depends_on)
+
+
+class WorkerResourceRegistry:
+    """이름으로 등록한 리소스를 프로세스별로 지연 생성하는 레지스트리."""
+
+    def __init__(self, health_check_interval: float = 300, retry_after: float = 30):
+        self.health_check_interval = health_check_interval
+        self.retry_after = retry_after
+        # 현재 초기화에 실패한 상태인 리소스 이름 → 오류 메시지 (다시 만들어지면 제거)
+        self.errors = {}
+        self._resources: Dict[str, _Resource] = {}
+        self._values = {}
+        self._checked_at = {}
+        self._failed_at = {}
+        self._pid = os.getpid()
+        # _lock은 사전 갱신에만 짧게 잡고, 생성/헬스 체크(네트워크 호출)는 리소스별 잠금 안에서만 수행합니다.
+        # 그래서 Mongo 연결이 느려도 이미 만들어진 다른 리소스 조회는 막히지 않습니다.
+        self._lock = threading.RLock()
+        self._resource_locks: Dict[str, threading.Lock] = {}
+
+    # --- 등록 ---
+    def register(self, name: str, factory: Callable, health_check: Optional[Callable] = None,
+                 close: Optional[Callable] = None, depends_on: Iterable[str] = ()):
+        """factory()는 리소스를 만들고, health_check(value)는 이상이 있으면 예외를 던집니다."""
+        with self._lock:
+            self._resources[name] = _Resource(factory, health_check, close, depends_on)
+            self._resource_locks.setdefault(name, threading.Lock())
+            dropped = self._pop(name)
+        self._close(name, *dropped)
+
+    def register_value(self, name: str, value):
+        """설정값처럼 연결이 필요 없는 값을 등록합니다."""
+        self.register(name, lambda: value)
+
+    # --- 조회 ---
+    def get(self, name: str, default=None):
+        with self._lock:
+            self._check_pid()
+            resource = self._resources.get(name)
+            resource_lock = self._resource_locks.get(name)
+        if resource is None:
+            return default
+        for dependency in resource.depends_on:
+            # 의존 리소스가 다시 만들어지면 _invalidate가 이 리소스도 함께 버립니다.
+            if self.get(dependency) is None:
+                return default
+
+        with self._lock:
+            built = name in self._values
+            value = self._values.get(name)
+            health_check_due = built and self._health_check_due(name, resource)
+        if built and not health_check_due:
+            return value
+        if built:
+            # 다른 스레드가 이미 헬스 체크 중이면 기다리지 않고 현재 값을 씁니다.
+            if not resource_lock.acquire(blocking=False):
+                return value
+            try:
+                self._run_health_check(name, resource, value)
+            finally:
+                resource_lock.release()
+
+        with resource_lock:
+            with self._lock:
+                if name in self._values:
+                    return self._values[name]
+            if not self._build(name, resource):
+                return default
+            with self._lock:
+                return self._values.get(name, default)
+
+    def __getitem__(self, name: str):
+        value = self.get(name)
+        if value is None:
+            raise KeyError(name)
+        return value
+
+    def __contains__(self, name: str) -> bool:
+        """등록 여부만 확인합니다 (리소스를 만들지 않습니다). 값이 필요하면 get()을 사용합니다."""
+        with self._lock:
+            return name in self._resources
+
+    def is_initialized(self, name: str) -> bool:
+        with self._lock:
+            return name in self._values and self._pid == os.getpid()
+
+    # --- 내부 ---
+    def _check_pid(self):
+        pid = os.getpid()
+        if pid != self._pid:
+            # fork된 자식 프로세스: 부모가 만든 클라이언트는 닫지 않고 버립니다 (소켓은 부모 소유).
+            self._values.clear()
+            self._checked_at.clear()
+            self._failed_at.clear()
+            self.errors.clear()
+            # 부모의 다른 스레드가 잡고 있던 잠금이 복사되었을 수 있으므로 새로 만듭니다.
+            self._resource_locks = {name: threading.Lock() for name in self._resources}
+            self._pid = pid
+
+    def _build(self, name: str, resource: _Resource) -> bool:
+        """리소스별 잠금을 잡은 상태에서 호출합니다. factory()는 _lock 밖에서 실행합니다."""
+        with self._lock:
+            failed_at = self._failed_at.get(name)
+        if failed_at is not None and time.monotonic() - failed_at < self.retry_after:
+            return False
+        try:
+            value = resource.factory()
+        except Exception as e:
+            with self._lock:
+                self._failed_at[name] = time.monotonic()
+                self.errors[name] = f"[{datetime.now()}] '{name}' 초기화 실패: {e}\n{traceback.format_exc()}"
+            print(f"[{datetime.now()}] WorkerResources: '{name}' 초기화 실패 ({self.retry_after}초 후 재시도): {e}")
+            return False
+        with self._lock:
+            self._values[name] = value
+            self._checked_at[name] = time.monotonic()
+            self._failed_at.pop(name, None)
+            self.errors.pop(name, None)
+        return True
+
+    def _health_check_due(self, name: str, resource: _Resource) -> bool:
+        if resource.health_check is None:
+            return False
+        return time.monotonic() - self._checked_at.get(name, 0) >= self.health_check_interval
+
+    def _run_health_check(self, name: str, resource: _Resource, value):
+        """리소스별 잠금을 잡은 상태에서 호출합니다. health_check()는 _lock 밖에서 실행합니다."""
+        with self._lock:
+            if self._values.get(name) is not value or not self._health_check_due(name, resource):
+                return
+        try:
+            resource.health_check(value)
+        except Exception as e:
+            print(f"[{datetime.now()}] WorkerResources: '{name}' 헬스 체크 실패, 다시 연결합니다: {e}")
+            self._invalidate(name)
+            return
+        with self._lock:
+            self._checked_at[name] = time.monotonic()
+
+    def _invalidate(self, name: str):
+        """리소스와 그에 의존하는 리소스를 닫고 버립니다."""
+        with self._lock:
+            dropped = []
+            pending = [name]
+            while pending:
+                current = pending.pop()
+                for other, resource in self._resources.items():
+                    if current in resource.depends_on and other in self._values:
+                        pending.append(other)
+                dropped.append((current, *self._pop(current)))
+        for dropped_name, value, resource in dropped:
+            self._close(dropped_name, value, resource)
+
+    def _pop(self, name: str):
+        """_lock을 잡은 상태에서 값을 사전에서 빼고 (값, 리소스)를 반환합니다. 닫기는 _close로 잠금 밖에서 합니다."""
+        value = self._values.pop(name, None)
+        self._checked_at.pop(name, None)
+        return value, self._resources.get(name)
+
+    @staticmethod
+    def _close(name: str, value, resource: Optional[_Resource]):
+        if value is not None and resource is not None and resource.close is not None:
+            try:
+                resource.close(value)
+            except Exception as e:
+                print(f"[{datetime.now()}] WorkerResources: '{name}' 정리 중 오류: {e}")
+
+    def close_all(self):
+        """이 프로세스에서 만든 리소스를 모두 닫습니다."""
+        with self._lock:
+            if self._pid != os.getpid():
+                self._check_pid()
+                return
+            dropped = [(name, *self._pop(name)) for name in list(self._values)]
+        for name, value, resource in dropped:
+            self._close(name, value, resource)
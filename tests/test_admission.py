@@ -0,0 +1,109 @@
+"""
+수집기 → 파이프라인 유입 제어(PipelineAdmission: 큐 깊이, 미루기, 스필 버퍼, drain) 테스트
+"""
+import json
+import os
+
+import fakeredis
+
+from src.news_collector.admission import PipelineAdmission
+from src.pipeline_stages.stage_routing import broker_queue_keys
+
+
+def _admission(tmp_path, depths=(), **kwargs):
+    options = dict(
+        broker_url="redis://localhost:6379/0", queues=["pipeline.intake", "pipeline.llm"],
+        weights={"pipeline.llm": 3}, high_watermark=10, low_watermark=5, max_wait_seconds=0,
+        poll_seconds=0, spill_path=str(tmp_path / "spill" / "spill.jsonl"), spill_max_items=100,
+        defer_sources=["slow"],
+    )
+    options.update(kwargs)
+    admission = PipelineAdmission(**options)
+    if depths:
+        # 호출할 때마다 다음 깊이를 돌려주고, 마지막 값은 계속 유지합니다.
+        remaining = list(depths)
+        admission.queue_depth = lambda: remaining.pop(0) if len(remaining) > 1 else remaining[0]
+    return admission
+
+
+def _articles(n, source="feed"):
+    return [{"url": f"https://a.example.com/{source}/{i}", "source": source} for i in range(n)]
+
+
+def test_queue_depth_sums_priority_lists_with_weights(tmp_path):
+    admission = _admission(tmp_path)
+    client = fakeredis.FakeRedis()
+    admission._client = client
+    admission._client_pid = os.getpid()
+    intake_keys = broker_queue_keys("pipeline.intake")
+    client.rpush(intake_keys[0], "m1", "m2")
+    client.rpush(intake_keys[-1], "m3")
+    client.rpush(broker_queue_keys("pipeline.llm")[0], "m4")
+    assert admission.queue_depth() == 3 + 1 * 3
+
+
+def test_below_high_watermark_admits_everything(tmp_path):
+    admission = _admission(tmp_path, depths=[9])
+    articles = _articles(2) + _articles(1, source="slow")
+    assert admission.admit(articles) == (articles, [])
+    assert admission.stats["admitted"] == 3
+
+
+def test_unknown_depth_admits_everything(tmp_path):
+    admission = _admission(tmp_path, depths=[None])
+    articles = _articles(2, source="slow")
+    assert admission.admit(articles) == (articles, [])
+    assert admission.spilled_count() == 0
+
+
+def test_backlog_defers_low_priority_sources_and_waits_for_the_rest(tmp_path):
+    admission = _admission(tmp_path, depths=[50, 50, 4], max_wait_seconds=60)
+    regular, deferred = _articles(2), _articles(2, source="slow")
+    admitted, spilled = admission.admit(regular + deferred)
+    assert admitted == regular
+    assert spilled == deferred
+    assert admission.spilled_count() == 2
+
+
+def test_backlog_after_max_wait_spills_everything(tmp_path):
+    admission = _admission(tmp_path, depths=[50])
+    regular, deferred = _articles(2), _articles(1, source="slow")
+    admitted, spilled = admission.admit(regular + deferred)
+    assert admitted == []
+    assert spilled == deferred + regular
+    assert admission.stats["spilled"] == 3 and admission.stats["admitted"] == 0
+
+
+def test_spill_buffer_is_capped(tmp_path):
+    admission = _admission(tmp_path, spill_max_items=3)
+    articles = _articles(5)
+    assert admission.spill(articles[:2]) == articles[:2]
+    assert admission.spill(articles[2:]) == articles[2:3]
+    assert admission.spilled_count() == 3
+    assert admission.stats["dropped"] == 2
+
+
+def test_drain_sends_chunks_while_below_low_watermark(tmp_path):
+    admission = _admission(tmp_path, depths=[0, 0, 7])
+    articles = _articles(5)
+    admission.spill(articles)
+    sent = []
+    assert admission.drain(lambda chunk: sent.append(chunk) or True, chunk_size=2) == 4
+    assert sent == [articles[:2], articles[2:4]]
+    # 세 번째 조회에서 큐가 LOW_WATERMARK 이상이라 나머지는 남겨 둡니다.
+    assert admission.spilled_count() == 1
+
+
+def test_drain_respills_on_send_failure_and_skips_corrupt_lines(tmp_path):
+    admission = _admission(tmp_path, depths=[0])
+    articles = _articles(2)
+    admission.spill(articles)
+    with open(admission.spill_path, "a", encoding="utf-8") as f:
+        f.write("{not json\n")
+    assert admission.drain(lambda chunk: False, chunk_size=10) == 0
+    with open(admission.spill_path, encoding="utf-8") as f:
+        assert [json.loads(line) for line in f] == articles
+
+    sent = []
+    assert admission.drain(lambda chunk: sent.extend(chunk) or True, chunk_size=10) == 2
+    assert sent == articles and admission.spilled_count() == 0
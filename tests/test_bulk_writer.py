@@ -0,0 +1,117 @@
+"""
+FinalizationBulkWriter 일괄 저장 / 실패 매핑 / 타임아웃 처리 테스트
+"""
+import threading
+
+import pytest
+from pymongo.errors import BulkWriteError
+
+from src.pipeline_stages import bulk_writer
+from src.pipeline_stages.bulk_writer import MAIN_SAVE_FAILED_REASON, FinalizationBulkWriter
+
+
+class _Collection:
+    def __init__(self, failed_indexes=(), gate=None):
+        self.failed_indexes = set(failed_indexes)
+        self.gate = gate
+        self.requests = []
+
+    def bulk_write(self, operations, ordered=True):
+        if self.gate is not None:
+            self.gate.wait(5)
+        self.requests.append([op._filter["ID"] for op in operations])
+        if self.failed_indexes:
+            raise BulkWriteError({"writeErrors": [{"index": index, "errmsg": "fail"} for index in self.failed_indexes]})
+
+
+class _Pinecone:
+    def __init__(self, upserted=None):
+        self.upserted = upserted
+        self.requests = []
+
+    def upsert_vectors(self, vectors):
+        self.requests.append([vector[0] for vector in vectors])
+        return len(vectors) if self.upserted is None else self.upserted
+
+
+@pytest.fixture(autouse=True)
+def _no_seen_filter(monkeypatch):
+    seen = []
+    monkeypatch.setattr(bulk_writer, "mark_articles_seen", seen.extend)
+    return seen
+
+
+def _writer(articles, blacklist, pinecone=None, max_wait_ms=100):
+    return FinalizationBulkWriter(articles, blacklist, pinecone or _Pinecone(), max_batch_articles=3, max_wait_ms=max_wait_ms)
+
+
+def _save_concurrently(writer, docs, **kwargs):
+    results = {}
+    threads = [threading.Thread(target=lambda d=doc: results.__setitem__(d["ID"], writer.save(d, timeout=5, **kwargs)))
+               for doc in docs]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    return results
+
+
+def test_bulk_write_error_indexes_map_to_articles(_no_seen_filter):
+    articles, blacklist = _Collection(failed_indexes=[1]), _Collection()
+    writer = _writer(articles, blacklist)
+    docs = [{"ID": "a"}, {"ID": "b"}, {"ID": "c"}]
+    results = _save_concurrently(writer, docs)
+
+    assert len(articles.requests) == 1
+    failed_id = articles.requests[0][1]
+    for article_id, result in results.items():
+        assert result["saved_to_main_db"] is (article_id != failed_id)
+        assert result["blacklisted"] is (article_id == failed_id)
+    # 메인 저장에 실패한 기사만 블랙리스트 문서로 준비되어 저장됩니다.
+    assert blacklist.requests == [[failed_id]]
+    failed_doc = next(doc for doc in docs if doc["ID"] == failed_id)
+    assert failed_doc["checked"]["dropped_reason_tag"] == MAIN_SAVE_FAILED_REASON
+    assert sorted(_no_seen_filter) == ["a", "b", "c"]
+
+
+def test_duplicate_ids_in_one_batch_are_written_once():
+    articles = _Collection()
+    writer = _writer(articles, _Collection())
+    results = _save_concurrently(writer, [{"ID": "same", "v": 1}, {"ID": "same", "v": 2}, {"ID": "other"}])
+    assert sorted(articles.requests[0]) == ["other", "same"]
+    assert results["same"]["saved_to_main_db"] is True
+
+
+def test_partial_pinecone_upsert_marks_chunk_failed():
+    pinecone = _Pinecone(upserted=1)
+    writer = _writer(_Collection(), _Collection(), pinecone)
+    result = writer.save({"ID": "a"}, pinecone_vector=("a", [0.1, 0.2], {}), timeout=5)
+    assert result["saved_to_main_db"] is True
+    assert result["pinecone_upserted"] is True
+
+    # 벡터 2개짜리 청크에서 1개만 업서트되면 청크 전체가 실패입니다.
+    results = _save_concurrently(writer, [{"ID": "b"}, {"ID": "c"}], pinecone_vector=("x", [0.1], {}))
+    assert all(result["pinecone_upserted"] is False for result in results.values())
+
+
+def test_item_cancelled_before_flush_is_skipped():
+    articles = _Collection()
+    writer = _writer(articles, _Collection(), max_wait_ms=1000)
+    with pytest.raises(TimeoutError):
+        writer.save({"ID": "late"}, timeout=0.05)
+    writer.save({"ID": "next"}, timeout=5)
+    assert articles.requests == [["next"]]
+
+
+def test_abandoned_item_is_not_blacklisted_after_late_main_failure():
+    gate = threading.Event()
+    articles, blacklist = _Collection(failed_indexes=[0], gate=gate), _Collection()
+    writer = _writer(articles, blacklist, max_wait_ms=0)
+    doc = {"ID": "slow"}
+    with pytest.raises(TimeoutError):
+        writer.save(doc, timeout=0.2)
+    # 태스크는 이제 직접 저장합니다. 늦게 끝난 flush는 메인 저장에 실패해도 블랙리스트에 쓰지 않습니다.
+    gate.set()
+    assert writer.save({"ID": "dup"}, blacklist_reason="duplicate", timeout=5)["blacklisted"] is True
+    assert blacklist.requests == [["dup"]]
+    assert "dropped_reason_tag" not in doc.get("checked", {})
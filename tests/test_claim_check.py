@@ -0,0 +1,70 @@
+"""
+Claim-check 기사 상태 저장/복원(Redis 해시, float32 벡터 필드) 테스트
+"""
+import os
+
+import fakeredis
+import pytest
+
+from src.pipeline_stages import claim_check
+from src.pipeline_stages.claim_check import ArticleStateStore
+
+
+@pytest.fixture
+def store(monkeypatch):
+    store = ArticleStateStore(ttl_seconds=60)
+    store._client = fakeredis.FakeRedis()
+    store._client_pid = os.getpid()
+    monkeypatch.setattr(claim_check, "get_article_state_store", lambda: store)
+    return store
+
+
+def _article():
+    return {
+        "ID": "abc", "url": "https://e.example.com/1", "title": "제목", "checked": {"initial": True},
+        "embedding": [0.5, -0.25, 1.0],
+        "llm_individual_keyword_embeddings": [[0.5, 0.5], [-1.0, 0.25]],
+    }
+
+
+def test_round_trip_restores_document_and_vectors(store):
+    ref = claim_check.to_message_payload(_article())
+    assert ref == {"_claim_check": True, "ID": "abc", "version": 1, "url": "https://e.example.com/1"}
+    assert claim_check.resolve_article_payload(ref) == _article()
+    # 벡터는 JSON이 아닌 float32 바이트로 따로 저장됩니다.
+    assert len(store._client.hget("pipeline:article:abc", "vec:embedding")) == 3 * 4
+
+
+def test_empty_vectors_round_trip(store):
+    article = dict(_article(), embedding=[], llm_individual_keyword_embeddings=[])
+    assert claim_check.resolve_article_payload(store.put(article)) == article
+
+
+def test_stale_state_is_rejected_and_newer_state_is_used(store):
+    first = store.put(_article())
+    second = store.put(dict(_article(), title="수정된 제목"))
+    assert second["version"] == first["version"] + 1
+    assert store.get(first)["title"] == "수정된 제목"
+    with pytest.raises(LookupError):
+        store.get(dict(second, version=second["version"] + 1))
+
+
+def test_release_and_missing_state(store):
+    ref = store.put(_article())
+    claim_check.release_article_state("abc")
+    with pytest.raises(LookupError):
+        store.get(ref)
+
+
+def test_plain_payloads_pass_through(store, monkeypatch):
+    plain = {"url": "https://e.example.com/no-id"}
+    assert claim_check.to_message_payload(plain) is plain
+    assert claim_check.resolve_article_payload(plain) is plain
+
+    # 저장에 실패하면 전체 데이터를 그대로 보냅니다.
+    def _broken_put(article_data):
+        raise ConnectionError("down")
+
+    monkeypatch.setattr(store, "put", _broken_put)
+    article = _article()
+    assert claim_check.to_message_payload(article) is article
@@ -0,0 +1,65 @@
+"""
+EmbeddingBatcher 마이크로 배칭 / 결과 대기 시간 초과 테스트
+"""
+import threading
+from types import SimpleNamespace
+
+from src.pipeline_stages.embedding_batcher import EmbeddingBatcher
+
+
+class _FakeEmbeddings:
+    def __init__(self, block_first_call: bool = False):
+        self.calls = []
+        self.release = threading.Event()
+        self.block_first_call = block_first_call
+
+    def create(self, model, input):
+        self.calls.append(list(input))
+        if self.block_first_call and len(self.calls) == 1:
+            self.release.wait(5)
+        data = [SimpleNamespace(index=i, embedding=[float(len(text))]) for i, text in enumerate(input)]
+        return SimpleNamespace(data=data)
+
+
+def _batcher(embeddings, **kwargs):
+    return EmbeddingBatcher(SimpleNamespace(embeddings=embeddings), "test-model", **kwargs)
+
+
+def test_concurrent_texts_share_one_request():
+    embeddings = _FakeEmbeddings()
+    batcher = _batcher(embeddings, max_wait_ms=200)
+    results = {}
+
+    def _embed(text):
+        results[text] = batcher.embed(text)
+
+    threads = [threading.Thread(target=_embed, args=("x" * n,)) for n in range(1, 6)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert results == {"x" * n: [float(n)] for n in range(1, 6)}
+    assert len(embeddings.calls) == 1
+
+
+def test_empty_texts_are_not_sent():
+    embeddings = _FakeEmbeddings()
+    batcher = _batcher(embeddings, max_wait_ms=0)
+    assert batcher.embed_many(["", "abc", "  "]) == [[], [3.0], []]
+    assert embeddings.calls == [["abc"]]
+
+
+def test_result_timeout_falls_back_to_direct_call():
+    embeddings = _FakeEmbeddings(block_first_call=True)
+    batcher = _batcher(embeddings, max_wait_ms=0, result_timeout_seconds=0.2)
+    stalled = threading.Thread(target=batcher.embed, args=("first",))
+    stalled.start()
+    while not embeddings.calls:
+        pass
+    # 전송 루프가 멈춘 동안 들어온 텍스트는 제한 시간 뒤 직접 호출로 임베딩됩니다.
+    assert batcher.embed_many(["ab", "abcd"]) == [[2.0], [4.0]]
+    assert ["ab", "abcd"] in embeddings.calls
+    embeddings.release.set()
+    stalled.join()
+    # 취소된 항목은 전송 루프가 다시 보내지 않습니다.
+    assert sum(call.count("ab") for call in embeddings.calls) == 1
@@ -0,0 +1,108 @@
+"""
+(모델명, 정규화 텍스트 해시) 키 임베딩 캐시(로컬 LRU + Redis 2계층) 테스트
+"""
+import os
+
+import fakeredis
+import pytest
+import redis
+
+from src.db import embedding_cache
+from src.db.embedding_cache import EmbeddingCache, normalize_text
+
+
+def _cache(**kwargs):
+    cache = EmbeddingCache(**kwargs)
+    cache._client = fakeredis.FakeRedis()
+    cache._client_pid = os.getpid()
+    return cache
+
+
+class _Embedder:
+    def __init__(self):
+        self.calls = []
+
+    def __call__(self, texts):
+        self.calls.append(list(texts))
+        return [[float(len(text)), 0.5] if text != "실패" else [] for text in texts]
+
+
+def test_normalized_texts_share_a_key():
+    cache = _cache()
+    assert normalize_text("  금리\n인하 ") == "금리 인하"
+    assert cache.cache_key("m", "금리  인하") == cache.cache_key("m", " 금리 인하")
+    assert cache.cache_key("m", "Rate") != cache.cache_key("m", "rate")
+    assert cache.cache_key("m", "금리") != cache.cache_key("other", "금리")
+
+
+def test_only_missing_texts_are_embedded():
+    cache = _cache()
+    embed = _Embedder()
+    assert cache.get_or_embed("m", ["가", "나나"], embed) == [[1.0, 0.5], [2.0, 0.5]]
+    assert cache.get_or_embed("m", ["나나", "다다다", "가"], embed) == [[2.0, 0.5], [3.0, 0.5], [1.0, 0.5]]
+    assert embed.calls == [["가", "나나"], ["다다다"]]
+    stats = cache.stats()
+    assert stats["local_hits"] == 2 and stats["misses"] == 3 and stats["hit_rate"] == 0.4
+
+
+def test_failed_vectors_are_not_cached():
+    cache = _cache()
+    embed = _Embedder()
+    assert cache.get_or_embed("m", ["실패"], embed) == [[]]
+    cache.get_or_embed("m", ["실패"], embed)
+    assert len(embed.calls) == 2
+
+
+def test_redis_tier_is_shared_between_processes():
+    first = _cache(ttl_seconds=60)
+    first.set_many("m", ["금리"], [[0.25, -1.0]])
+    key = first.cache_key("m", "금리")
+    assert 0 < first._client.ttl(key) <= 60
+
+    second = EmbeddingCache()
+    second._client = first._client
+    second._client_pid = os.getpid()
+    assert second.get_many("m", ["금리", "물가"]) == [[0.25, -1.0], None]
+    assert second.stats()["redis_hits"] == 1
+    assert key in second._local
+
+
+def test_local_lru_evicts_oldest():
+    cache = EmbeddingCache(local_max_items=2)
+    cache._redis_retry_at = float("inf")  # Redis 없이 로컬 계층만 사용
+    cache.set_many("m", ["a", "b"], [[1.0], [2.0]])
+    cache.get_many("m", ["a"])
+    cache.set_many("m", ["c"], [[3.0]])
+    assert cache.get_many("m", ["a", "b", "c"]) == [[1.0], None, [3.0]]
+
+
+def test_float16_packing_halves_size():
+    half, single = EmbeddingCache(dtype="float16"), EmbeddingCache(dtype="float32")
+    assert len(half.pack([0.5] * 8)) * 2 == len(single.pack([0.5] * 8))
+    assert half.unpack(half.pack([0.5, -2.0])) == [0.5, -2.0]
+    assert half.cache_key("m", "x") != single.cache_key("m", "x")
+    with pytest.raises(ValueError):
+        EmbeddingCache(dtype="float64")
+
+
+def test_redis_errors_fall_back_to_local_tier(monkeypatch):
+    cache = _cache()
+
+    def _broken(*args, **kwargs):
+        raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(cache._client, "mget", _broken)
+    embed = _Embedder()
+    assert cache.get_or_embed("m", ["가"], embed) == [[1.0, 0.5]]
+    assert cache.stats()["redis_errors"] == 1
+    # 재시도 대기 중에는 Redis에 저장하지 않지만 로컬 계층에서는 찾습니다.
+    assert cache.stats()["stores"] == 0
+    assert cache.get_or_embed("m", ["가"], embed) == [[1.0, 0.5]]
+    assert len(embed.calls) == 1
+
+
+def test_cached_embeddings_without_cache(monkeypatch):
+    monkeypatch.setattr(embedding_cache, "get_embedding_cache", lambda: None)
+    embed = _Embedder()
+    assert embedding_cache.cached_embeddings("m", ["가"], embed) == [[1.0, 0.5]]
+    assert embed.calls == [["가"]]
@@ -0,0 +1,80 @@
+"""
+embedding_generation_task 임베딩 요청 구성과 공유 한도 대기 초과(RateLimitTimeout) 처리 테스트
+"""
+import sys
+import time
+from types import SimpleNamespace
+
+import pytest
+
+import src
+from src.openai_rate_limiter import RateLimitTimeout
+from src.pipeline_stages import categorization, embedding_generator
+
+
+class _Resources:
+    def __init__(self, values):
+        self.values = values
+
+    def get(self, name, default=None):
+        return self.values.get(name, default)
+
+
+def _run(monkeypatch, article):
+    celery_module = sys.modules["src.celery_app"]
+    monkeypatch.setattr(src, "celery_app", celery_module)
+    monkeypatch.setattr(celery_module, "worker_resources", _Resources({"openai_client": object(), "embedding_model_name": "m"}))
+    monkeypatch.setattr(celery_module, "save_to_data_folder", lambda *args, **kwargs: None)
+    monkeypatch.setattr(embedding_generator, "get_embedding_cache", lambda: None)
+    monkeypatch.setattr(embedding_generator, "dispatch_stage", lambda *args, **kwargs: None)
+    requests = []
+
+    def _fake_embed(texts, client, model_name):
+        requests.append(list(texts))
+        return [[float(len(text))] for text in texts]
+
+    monkeypatch.setattr(embedding_generator, "_embed_texts", _fake_embed)
+    embedding_generator.embedding_generation_task.run(article)
+    return requests
+
+
+def test_empty_text_is_not_sent(monkeypatch):
+    article = {"url": "https://a.example.com/1", "title": "", "content": "", "llm_internal_keywords": ["ab", "abc"]}
+    requests = _run(monkeypatch, article)
+    assert requests == [["ab", "abc"]]
+    assert article["embedding"] == []
+    assert article["checked"]["embedding_generation_reason"] == "NO_TEXT_TO_EMBED_CELERY"
+    assert article["checked"]["embedding_generation"] is False
+
+
+def test_empty_text_without_keywords_makes_no_request(monkeypatch):
+    article = {"url": "https://a.example.com/2", "title": "", "content": "", "llm_internal_keywords": []}
+    assert _run(monkeypatch, article) == []
+    assert article["checked"]["embedding_generation_reason"] == "NO_TEXT_TO_EMBED_CELERY"
+
+
+def test_text_and_keywords_share_one_request(monkeypatch):
+    article = {"url": "https://a.example.com/3", "title": "t", "content": "body", "llm_internal_keywords": ["kw"]}
+    requests = _run(monkeypatch, article)
+    assert requests == [["t\nbody", "kw"]]
+    assert article["embedding"] == [6.0]
+    assert article["checked"]["embedding_generation"] is True
+
+
+class _TimedOutClient:
+    def __init__(self):
+        self.calls = 0
+        self.embeddings = self
+        self.chat = SimpleNamespace(completions=self)
+
+    def create(self, **kwargs):
+        self.calls += 1
+        raise RateLimitTimeout("no budget")
+
+
+def test_rate_limit_timeout_is_not_retried(monkeypatch):
+    monkeypatch.setattr(time, "sleep", lambda seconds: pytest.fail("한도 대기 초과 후 다시 시도하면 안 됩니다."))
+    client = _TimedOutClient()
+    assert embedding_generator._generate_single_embedding("금리", client, "m") == []
+    assert categorization._call_llm_for_list_output("금리", client, "m", 5) == []
+    assert client.calls == 2
@@ -0,0 +1,75 @@
+"""
+호스트별 본문 추출 전략 학습 테이블(Redis 통계 / 선호 전략 / LLM 의존 호스트) 테스트
+"""
+import os
+
+import fakeredis
+import redis
+
+from src.pipeline_stages import extraction_strategy
+from src.pipeline_stages.extraction_strategy import ExtractionStrategyTable, extraction_host
+
+
+def _table(**kwargs):
+    table = ExtractionStrategyTable(cache_seconds=0, **kwargs)
+    table._client = fakeredis.FakeRedis()
+    table._client_pid = os.getpid()
+    table._script = table._client.register_script(extraction_strategy._RECORD_SCRIPT)
+    return table
+
+
+def _record(table, host, attempts, llm_needed=False, times=1):
+    for _ in range(times):
+        table.record(host, attempts, llm_needed=llm_needed)
+
+
+def test_extraction_host_normalizes():
+    assert extraction_host("https://WWW.News.Example.com/a/1") == "news.example.com"
+    assert extraction_host("") is None
+    assert extraction_host("not a url") is None
+
+
+def test_no_preference_until_enough_attempts():
+    table = _table(min_attempts=5)
+    _record(table, "a.com", [("bs:article", True)], times=4)
+    assert table.preferred_strategy("a.com") is None
+    _record(table, "a.com", [("bs:article", True)])
+    assert table.preferred_strategy("a.com") == "bs:article"
+    assert table.strategy_stats("a.com") == {"bs:article": (5, 5)}
+
+
+def test_prefers_favor_then_best_rate_and_never_page_or_llm():
+    table = _table(min_attempts=2, min_success_rate=0.5)
+    _record(table, "b.com", [("newspaper3k", False), ("bs:main", True)], times=3)
+    _record(table, "b.com", [("newspaper3k", True), ("bs:page", True), ("llm", True)], times=3)
+    # newspaper3k 3/6, bs:main 3/3 → 둘 다 기준을 넘으면 기본 순서의 첫 추출기(favor)를 고릅니다.
+    assert table.preferred_strategy("b.com", favor="newspaper3k") == "newspaper3k"
+    assert table.preferred_strategy("b.com") == "bs:main"
+
+
+def test_llm_dependent_hosts_are_flagged_and_cleared():
+    table = _table(min_attempts=3, llm_flag_ratio=0.8)
+    _record(table, "c.com", [("newspaper3k", False), ("llm", True)], llm_needed=True, times=3)
+    assert table.llm_dependent_hosts() == [("c.com", 1.0)]
+    _record(table, "c.com", [("newspaper3k", True)], times=3)
+    assert table.llm_dependent_hosts() == []
+
+
+def test_history_is_halved_past_max_history():
+    table = _table(max_history=4)
+    _record(table, "d.com", [("bs:article", True)], times=5)
+    assert table.strategy_stats("d.com") == {"bs:article": (2, 2)}
+
+
+def test_redis_errors_fall_back_to_default_order(monkeypatch):
+    table = _table()
+
+    def _broken(*args, **kwargs):
+        raise redis.ConnectionError("down")
+
+    monkeypatch.setattr(table._client, "hgetall", _broken)
+    assert table.preferred_strategy("e.com") is None
+    assert table.stats["redis_errors"] == 1
+    # 재시도 대기 중에는 Redis를 다시 부르지 않습니다.
+    table.record("e.com", [("bs:article", True)], llm_needed=False)
+    assert table.stats["recorded"] == 0
@@ -0,0 +1,81 @@
+"""
+SourceFetchEngine 동시성 상한 테스트
+"""
+import threading
+import time
+
+from src.news_collector.fetch_engine import FetchJob, SourceFetchEngine
+
+
+class _FakeResponse:
+    status_code = 200
+    content = b"ok"
+    headers = {}
+
+
+class _CountingSession:
+    """동시에 진행 중인 요청 수(전체/호스트별)의 최댓값을 기록하는 가짜 세션"""
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.active = 0
+        self.max_active = 0
+        self.active_by_host = {}
+        self.max_by_host = {}
+
+    def get(self, url, **kwargs):
+        host = url.split("/")[2]
+        with self.lock:
+            self.active += 1
+            self.active_by_host[host] = self.active_by_host.get(host, 0) + 1
+            self.max_active = max(self.max_active, self.active)
+            self.max_by_host[host] = max(self.max_by_host.get(host, 0), self.active_by_host[host])
+        time.sleep(0.02)
+        with self.lock:
+            self.active -= 1
+            self.active_by_host[host] -= 1
+        return _FakeResponse()
+
+
+def _engine(max_in_flight, per_host_limit):
+    engine = SourceFetchEngine(max_in_flight=max_in_flight, per_host_limit=per_host_limit)
+    session = _CountingSession()
+    engine._get_session = lambda: session
+    return engine, session
+
+
+def test_global_cap_is_shared_across_concurrent_fetch_all_calls():
+    """여러 수집기가 같은 엔진으로 fetch_all을 동시에 호출해도 전체 동시 요청은 max_in_flight 이하"""
+    engine, session = _engine(max_in_flight=4, per_host_limit=10)
+    jobs = [FetchJob(url=f"https://host{i % 8}.example.com/{i}") for i in range(24)]
+    results = []
+    threads = [threading.Thread(target=lambda: results.extend(engine.fetch_all(jobs))) for _ in range(3)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(results) == 72
+    assert all(result.ok for result in results)
+    assert session.max_active <= 4
+
+
+def test_per_host_limit():
+    engine, session = _engine(max_in_flight=16, per_host_limit=2)
+    results = engine.fetch_all([FetchJob(url=f"https://same.example.com/{i}") for i in range(10)])
+    assert [r.job.url for r in results] == [f"https://same.example.com/{i}" for i in range(10)]
+    assert session.max_by_host["same.example.com"] <= 2
+
+
+def test_request_error_is_reported_not_raised():
+    import requests
+
+    engine, _ = _engine(max_in_flight=2, per_host_limit=2)
+
+    class _FailingSession:
+        def get(self, url, **kwargs):
+            raise requests.exceptions.ConnectionError("down")
+
+    engine._get_session = lambda: _FailingSession()
+    result = engine.fetch_all([FetchJob(url="https://down.example.com/")])[0]
+    assert not result.ok
+    assert "down" in result.error
@@ -0,0 +1,92 @@
+"""
+기사 HTML 디스크 캐시(URL 정규화, User-Agent별 키, 만료/정리)와 fetch_page 캐시 사용 테스트
+"""
+import os
+import time
+
+import pytest
+
+from src.pipeline_stages import html_fetcher
+from src.pipeline_stages.html_cache import HtmlCache, normalize_url
+from src.pipeline_stages.html_fetcher import BROWSER_USER_AGENT, CRAWLER_USER_AGENT
+
+
+@pytest.fixture
+def cache(tmp_path):
+    return HtmlCache(str(tmp_path / "html_cache"), max_bytes=10 ** 6, ttl_seconds=3600)
+
+
+def test_normalize_url_drops_tracking_and_default_port():
+    assert normalize_url("HTTPS://News.Example.com:443/a/1?utm_source=x&b=2&a=1&fbclid=z#top") == \
+        "https://news.example.com/a/1?a=1&b=2"
+    assert normalize_url("http://example.com") == "http://example.com/"
+    assert normalize_url("http://example.com:8080/p?x=") == "http://example.com:8080/p?x="
+    # 기사 식별 파라미터는 남깁니다.
+    assert normalize_url("https://n.news.naver.com/mnews/article/001/0001?sid=101") != \
+        normalize_url("https://n.news.naver.com/mnews/article/001/0001?sid=102")
+
+
+def test_round_trip_and_user_agent_separation(cache):
+    url = "https://news.example.com/a/1?utm_medium=rss"
+    assert cache.put(url, "<html>브라우저</html>".encode("utf-8"), {"status_code": 200}, BROWSER_USER_AGENT)
+    meta, content = cache.get("https://news.example.com/a/1", BROWSER_USER_AGENT)
+    assert content.decode("utf-8") == "<html>브라우저</html>"
+    assert meta["status_code"] == 200
+    # 크롤러 User-Agent로 받은 페이지와는 섞이지 않습니다.
+    assert cache.get(url, CRAWLER_USER_AGENT) is None
+    cache.delete(url, BROWSER_USER_AGENT)
+    assert cache.get(url, BROWSER_USER_AGENT) is None
+
+
+def test_expired_entries_are_dropped(cache):
+    cache.put("https://e.example.com/1", b"<html>old</html>", {})
+    cache.ttl_seconds = 0
+    time.sleep(0.01)
+    assert cache.get("https://e.example.com/1") is None
+    assert cache.stats["expired"] == 1
+
+
+def test_evict_removes_least_recently_used(tmp_path):
+    cache = HtmlCache(str(tmp_path / "c"), max_bytes=3000, ttl_seconds=3600, evict_check_seconds=3600)
+    page = os.urandom(1200)  # 압축되지 않는 본문
+    for i in range(2):
+        cache.put(f"https://e.example.com/{i}", page, {})
+    old = time.time() - 100
+    os.utime(cache._path("https://e.example.com/0"), (old, old))
+    # 추정 크기가 MAX_BYTES를 넘으면 저장하면서 정리합니다.
+    cache.put("https://e.example.com/2", page, {})
+    assert cache.stats["evicted"] >= 1
+    assert cache.get("https://e.example.com/0") is None
+    assert cache.get("https://e.example.com/2") is not None
+
+
+class _Response:
+    def __init__(self, body):
+        self.url = "https://e.example.com/final"
+        self.status_code = 200
+        self.content = body
+        self.encoding = "utf-8"
+        self.headers = {"Content-Type": "text/html; charset=utf-8"}
+
+
+def test_fetch_page_uses_cache_and_refreshes_on_retry(cache, monkeypatch):
+    monkeypatch.setattr(html_fetcher, "get_html_cache", lambda: cache)
+    requests = []
+
+    def _get(url, user_agent):
+        requests.append(user_agent)
+        return _Response(f"<html>{len(requests)}</html>".encode())
+
+    monkeypatch.setattr(html_fetcher, "_get", _get)
+    url = "https://e.example.com/article"
+    assert html_fetcher.fetch_page(url).text == "<html>1</html>"
+    cached = html_fetcher.fetch_page(url)
+    assert cached.from_cache and cached.text == "<html>1</html>"
+    assert html_fetcher.fetch_page(url, user_agent=CRAWLER_USER_AGENT).text == "<html>2</html>"
+    # 재시도는 캐시를 건너뛰고 새로 받은 페이지로 덮어씁니다.
+    assert html_fetcher.fetch_page(url, refresh=True).text == "<html>3</html>"
+    assert html_fetcher.fetch_page(url).text == "<html>3</html>"
+    assert requests == [BROWSER_USER_AGENT, CRAWLER_USER_AGENT, BROWSER_USER_AGENT]
+
+    html_fetcher.forget_page(cached)
+    assert html_fetcher.fetch_page(url).text == "<html>4</html>"
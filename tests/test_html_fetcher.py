@@ -0,0 +1,66 @@
+"""
+기사 HTML 단일 수집(FetchedPage 디코딩, 크롤러 User-Agent 재시도, 프로세스별 세션) 테스트
+"""
+from src.pipeline_stages import html_fetcher
+from src.pipeline_stages.html_fetcher import BROWSER_USER_AGENT, CRAWLER_USER_AGENT, FetchedPage
+
+KOREAN = "<html><body>기준금리 인하</body></html>"
+
+
+def _page(content, headers=None, declared_encoding=None):
+    return FetchedPage("https://e.example.com/1", "https://e.example.com/1", 200, content,
+                       declared_encoding, headers=headers)
+
+
+def test_declared_korean_legacy_charset_is_read_as_cp949():
+    page = _page(KOREAN.encode("cp949"), headers={"Content-Type": "text/html; charset=EUC-KR"})
+    assert page.sniffed_encoding() == "cp949"
+    assert page.text == KOREAN
+
+
+def test_meta_charset_and_wrong_declarations():
+    meta = f'<meta charset="euc-kr">{KOREAN}'
+    assert _page(meta.encode("cp949")).text == meta
+    # iso-8859-1 선언은 믿지 않고 utf-8부터 시도합니다.
+    latin = _page(KOREAN.encode("utf-8"), headers={"content-type": "text/html; charset=ISO-8859-1"},
+                  declared_encoding="ISO-8859-1")
+    assert latin.sniffed_encoding() is None
+    assert latin.text == KOREAN
+    # 선언이 틀려도 다음 후보로 디코딩합니다.
+    assert _page(KOREAN.encode("cp949"), headers={"Content-Type": "text/html; charset=utf-8"}).text == KOREAN
+
+
+def test_crawler_user_agent_is_tried_only_after_browser_fails(monkeypatch):
+    blocked = {BROWSER_USER_AGENT}
+    calls = []
+
+    def _fetch_page(url, user_agent=None, refresh=False):
+        user_agent = user_agent or BROWSER_USER_AGENT
+        calls.append((user_agent, refresh))
+        return None if user_agent in blocked else _page(b"<html>ok</html>")
+
+    monkeypatch.setattr(html_fetcher, "fetch_page", _fetch_page)
+    assert html_fetcher.fetch_article_page("https://e.example.com/1", refresh=True).text == "<html>ok</html>"
+    assert calls == [(BROWSER_USER_AGENT, True), (CRAWLER_USER_AGENT, True)]
+
+    blocked.clear()
+    calls.clear()
+    html_fetcher.fetch_article_page("https://e.example.com/1")
+    assert calls == [(BROWSER_USER_AGENT, False)]
+
+
+def test_session_is_shared_per_process(monkeypatch):
+    monkeypatch.setattr(html_fetcher, "_session", None)
+    session = html_fetcher.get_http_session()
+    assert html_fetcher.get_http_session() is session
+    assert session.headers["User-Agent"] == BROWSER_USER_AGENT
+    # fork 이후에는 부모의 연결 풀을 물려받지 않고 새로 만듭니다.
+    monkeypatch.setattr(html_fetcher, "_session_pid", -1)
+    assert html_fetcher.get_http_session() is not session
+
+
+def test_fetch_failure_returns_none(monkeypatch):
+    monkeypatch.setattr(html_fetcher, "get_html_cache", lambda: None)
+    monkeypatch.setattr(html_fetcher, "_get", lambda url, user_agent: None)
+    assert html_fetcher.fetch_page("https://e.example.com/1") is None
+    assert html_fetcher.fetch_page("") is None
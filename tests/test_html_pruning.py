@@ -0,0 +1,66 @@
+"""
+LLM 본문 추출 전 HTML 축소(prune_html_for_llm) 테스트
+"""
+from src.pipeline_stages.html_pruning import _Block, _densest_window, prune_html_for_llm
+
+BODY = [
+    "한국은행 금융통화위원회는 11일 기준금리를 연 3.50%에서 3.25%로 0.25%포인트 인하했다고 밝혔다. 2021년 8월 이후 처음이다.",
+    "이번 인하는 물가 상승률이 목표 수준에 근접한 가운데 내수 부진과 수출 둔화 우려가 커진 데 따른 것으로 풀이된다.",
+    "금통위는 향후 물가와 성장, 금융안정 여건을 면밀히 점검하면서 추가 인하 시기와 속도를 결정하겠다고 설명했다.",
+]
+
+PAGE = f"""<html><head><title>t</title><script>var tracking = "{'x' * 5000}";</script><style>body{{}}</style></head>
+<body>
+<header><ul class="gnb"><li><a href="/">홈</a></li><li><a href="/economy">경제</a></li></ul></header>
+<div class="menu"><a href="/a">정치</a> <a href="/b">사회</a> <a href="/c">국제</a></div>
+<div id="content">
+  <h1>한은, 기준금리 0.25%p 인하</h1>
+  <div class="article_view">
+    <p>{BODY[0]}</p>
+    <figure><figcaption>이창용 총재</figcaption></figure>
+    <p>{BODY[1]}</p>
+    <p>{BODY[2]}</p>
+  </div>
+  <div class="related_news"><ul><li><a href="/r1">관련 기사 하나</a></li><li><a href="/r2">관련 기사 둘</a></li></ul></div>
+  <div class="comment_area">댓글 0개</div>
+</div>
+<ul><li><a href="/p1">많이 본 뉴스 1</a></li><li><a href="/p2">많이 본 뉴스 2</a></li><li><a href="/p3">많이 본 뉴스 3</a></li></ul>
+<footer>Copyright</footer>
+</body></html>"""
+
+
+def test_keeps_title_and_body_and_drops_boilerplate():
+    pruned = prune_html_for_llm(PAGE)
+    lines = pruned.splitlines()
+    assert lines[0] == "# 한은, 기준금리 0.25%p 인하"
+    for paragraph in BODY:
+        assert paragraph in lines
+    for noise in ("tracking", "정치", "관련 기사", "댓글", "많이 본 뉴스", "Copyright"):
+        assert noise not in pruned
+    assert len(pruned) < len(PAGE) / 10
+
+
+def test_text_heavy_container_with_boilerplate_class_is_kept():
+    # class에 comment가 들어 있어도 본문만큼 글이 많은 컨테이너는 지우지 않습니다.
+    long_body = " ".join(BODY * 6)
+    html = f"<html><body><div class='comment_body_wrap'><p>{long_body}</p></div></body></html>"
+    pruned = prune_html_for_llm(html)
+    assert pruned is not None and BODY[0] in pruned
+
+
+def test_short_or_script_only_pages_return_none():
+    assert prune_html_for_llm("") is None
+    assert prune_html_for_llm("<html><body><script>window.__DATA__ = {}</script><p>짧은 글</p></body></html>") is None
+
+
+def test_max_chars_truncates_output():
+    pruned = prune_html_for_llm(PAGE, max_chars=210)
+    assert pruned is not None and len(pruned) <= 210
+
+
+def test_densest_window_skips_short_link_blocks():
+    blocks = [_Block("메뉴", 2, ""), _Block("가" * 100, 0, ""), _Block("짧은 캡션", 0, ""),
+              _Block("나" * 80, 0, ""), _Block("관련 기사 링크", 8, "- ")]
+    # 본문 사이의 짧은 캡션은 구간에 남고, 양 끝의 메뉴/링크는 빠집니다.
+    assert _densest_window(blocks, penalty=25) == (1, 4)
+    assert _densest_window([_Block("a", 1, "")], penalty=25) == (0, 0)
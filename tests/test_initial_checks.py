@@ -0,0 +1,124 @@
+"""
+수집기 윈도우 단위 초기 검사(batch_initial_checks_task: 윈도우 내 중복, Bloom 미스, 컬렉션당 $in 한 번) 테스트
+"""
+import sys
+from datetime import datetime, timezone
+
+import pytest
+
+import src
+from src.news_collector import news_collector
+from src.pipeline_stages import initial_checks, tracing
+
+
+class _Resources:
+    def __init__(self, values):
+        self.values = values
+
+    def get(self, name, default=None):
+        return self.values.get(name, default)
+
+
+class _Collection:
+    def __init__(self, existing_ids=()):
+        self.existing_ids = set(existing_ids)
+        self.queries = []
+        self.upserts = []
+
+    def find(self, query, projection=None):
+        self.queries.append(list(query["ID"]["$in"]))
+        return [{"ID": article_id} for article_id in query["ID"]["$in"] if article_id in self.existing_ids]
+
+    def count_documents(self, query, limit=0):
+        raise AssertionError("일괄 검사에서는 기사별 count_documents를 호출하지 않습니다.")
+
+    def update_one(self, query, update, upsert=False):
+        self.upserts.append(query["ID"])
+
+
+class _SeenFilter:
+    def __init__(self, misses):
+        self.misses = set(misses)
+
+    def contains_many(self, article_ids):
+        return [article_id not in self.misses for article_id in article_ids]
+
+
+@pytest.fixture
+def pipeline(monkeypatch):
+    articles, blacklist = _Collection(), _Collection()
+    celery_module = sys.modules["src.celery_app"]
+    monkeypatch.setattr(src, "celery_app", celery_module)
+    monkeypatch.setattr(celery_module, "worker_resources",
+                        _Resources({"articles_collection": articles, "blacklist_collection": blacklist}))
+    monkeypatch.setattr(celery_module, "save_to_data_folder", lambda *args, **kwargs: None)
+    monkeypatch.setattr(tracing, "get_stage_metrics", lambda: None)
+    monkeypatch.setattr(initial_checks, "get_seen_filter", lambda: None)
+    monkeypatch.setattr(initial_checks, "mark_article_seen", lambda article_id: None)
+    dispatched = []
+    monkeypatch.setattr(initial_checks, "dispatch_stage", lambda task, article: dispatched.append(article["ID"]))
+    return articles, blacklist, dispatched
+
+
+def _article(n):
+    return {"url": f"https://news.example.com/{n}", "title": f"기사 {n}",
+            "published_at": datetime.now(timezone.utc).isoformat()}
+
+
+def test_window_uses_one_in_query_per_collection(pipeline):
+    articles_collection, blacklist, dispatched = pipeline
+    window = [_article(i) for i in range(4)]
+    ids = [initial_checks.generate_article_id(article["url"]) for article in window]
+    articles_collection.existing_ids = {ids[1]}
+    blacklist.existing_ids = {ids[2]}
+
+    result = initial_checks.batch_initial_checks_task.run(window)
+    assert result == {"total": 4, "passed": 2}
+    assert articles_collection.queries == [ids]
+    # articles에서 찾은 ID는 blacklist 조회에서 뺍니다.
+    assert blacklist.queries == [[ids[0], ids[2], ids[3]]]
+    assert dispatched == [ids[0], ids[3]]
+    assert blacklist.upserts == [ids[1], ids[2]]
+    assert window[1]["checked"]["initial_checks_reason"] == "ARTICLES_DB_DUPLICATE_ID"
+    assert window[2]["checked"]["initial_checks_reason"] == "BLACKLIST_DB_DUPLICATE_ID"
+
+
+def test_repeated_ids_and_static_failures_skip_the_lookup(pipeline):
+    articles_collection, blacklist, dispatched = pipeline
+    window = [_article(1), _article(1), {"url": "ftp://bad", "title": "x"}]
+    result = initial_checks.batch_initial_checks_task.run(window)
+    assert result == {"total": 3, "passed": 1}
+    assert articles_collection.queries == [[window[0]["ID"]]]
+    # 윈도우 안의 중복은 블랙리스트에 남기지 않고, 정적 검사 실패만 기록합니다.
+    assert blacklist.upserts == [window[2]["ID"]]
+    assert dispatched == [window[0]["ID"]]
+
+
+def test_bloom_definite_misses_are_not_queried(pipeline, monkeypatch):
+    articles_collection, blacklist, dispatched = pipeline
+    window = [_article(i) for i in range(3)]
+    ids = [initial_checks.generate_article_id(article["url"]) for article in window]
+    monkeypatch.setattr(initial_checks, "get_seen_filter", lambda: _SeenFilter(misses=ids[:2]))
+    initial_checks.batch_initial_checks_task.run(window)
+    assert articles_collection.queries == [ids[2:]]
+    assert dispatched == ids
+
+    articles_collection.queries.clear()
+    monkeypatch.setattr(initial_checks, "get_seen_filter", lambda: _SeenFilter(misses=ids))
+    initial_checks.batch_initial_checks_task.run([_article(i) for i in range(3)])
+    assert articles_collection.queries == []
+
+
+def test_collector_sends_full_windows_and_flushes_the_rest(monkeypatch):
+    monkeypatch.setattr(news_collector, "BATCH_CHECKS_CONFIG", {"ENABLED": True, "WINDOW_SIZE": 2})
+    monkeypatch.setattr(news_collector, "_pending_checks", [])
+    windows = []
+    monkeypatch.setattr(news_collector, "_admit_and_send_locked",
+                        lambda entries: windows.append([article["url"] for article, _ in entries]))
+    for i in range(3):
+        news_collector.process_and_store_article({"url": f"https://news.example.com/{i}", "published_at": None})
+    assert windows == [["https://news.example.com/0", "https://news.example.com/1"]]
+    news_collector.flush_pending_checks()
+    assert windows[1:] == [["https://news.example.com/2"]]
+    news_collector.flush_pending_checks()
+    assert len(windows) == 2
@@ -0,0 +1,72 @@
+"""
+전역 키워드 임베딩 사전(KeywordVectorStore)과 메모리 행렬 인덱스(KeywordVectorIndex) 테스트
+"""
+import numpy as np
+
+from src.db.keyword_vectors import KeywordVectorIndex, KeywordVectorStore
+
+
+class _Collection:
+    """keyword_vectors 컬렉션에서 쓰는 upsert($setOnInsert)와 find만 흉내 냅니다."""
+
+    def __init__(self):
+        self.docs = {}
+        self.finds = []
+
+    def bulk_write(self, operations, ordered=True):
+        for op in operations:
+            kid = op._filter["_id"]
+            if kid not in self.docs:
+                self.docs[kid] = dict(op._doc["$setOnInsert"], _id=kid)
+
+    def find(self, query, projection=None, batch_size=None):
+        self.finds.append(query)
+        if "_id" in query:
+            ids = query["_id"]["$in"]
+            return [doc for kid, doc in self.docs.items() if kid in ids]
+        return [doc for doc in self.docs.values() if doc["model"] == query["model"]]
+
+
+def test_keyword_ids_are_deterministic_per_model():
+    store = KeywordVectorStore(_Collection(), "model-a")
+    assert store.keyword_id("금리  인하") == store.keyword_id(" 금리 인하")
+    assert len(store.keyword_id("금리")) == 24
+    assert store.keyword_id("금리") != KeywordVectorStore(_Collection(), "model-b").keyword_id("금리")
+
+
+def test_register_keeps_first_vector_and_skips_empty():
+    collection = _Collection()
+    store = KeywordVectorStore(collection, "model-a")
+    ids = store.register_many(["금리", "", "물가", "환율"], [[1.0, 0.0], [2.0, 2.0], [0.0, 1.0], []])
+    assert ids == [store.keyword_id("금리"), store.keyword_id("물가")]
+    # 다른 워커가 같은 키워드를 다시 등록해도 처음 저장한 벡터가 유지됩니다.
+    assert store.register_many(["금리"], [[9.0, 9.0]]) == ids[:1]
+    fetched = store.fetch_many(ids + ["unknown"])
+    assert set(fetched) == set(ids)
+    assert fetched[ids[0]].tolist() == [1.0, 0.0]
+    assert collection.docs[ids[1]]["dim"] == 2
+
+
+def test_index_fetches_only_unknown_ids_once():
+    collection = _Collection()
+    store = KeywordVectorStore(collection, "model-a")
+    ids = store.register_many(["금리", "물가", "환율"], [[1.0, 0.0], [0.0, 1.0], [0.5, 0.5]])
+    index = KeywordVectorIndex(store)
+    index.ensure(ids[:2])
+    index.ensure(ids)
+    index.ensure(ids)
+    assert [set(query["_id"]["$in"]) for query in collection.finds] == [set(ids[:2]), {ids[2]}]
+    assert len(index) == 3
+    np.testing.assert_array_equal(index.vectors([ids[2], "unknown", ids[0]]), [[0.5, 0.5], [1.0, 0.0]])
+    assert index.vectors(["unknown"]).shape == (0, 0)
+
+
+def test_preload_grows_matrix_and_skips_other_dimensions():
+    store = KeywordVectorStore(_Collection(), "model-a")
+    keywords = [f"키워드{i}" for i in range(1500)]
+    ids = store.register_many(keywords, [[float(i), 1.0] for i in range(1500)])
+    store.register_many(["다른 차원"], [[1.0, 2.0, 3.0]])
+    index = KeywordVectorIndex(store)
+    assert index.preload() == 1500
+    assert index._matrix.shape[0] >= 1500
+    np.testing.assert_array_equal(index.vectors([ids[1499]]), [[1499.0, 1.0]])
@@ -0,0 +1,93 @@
+"""
+lxml 빠른 경로와 BeautifulSoup 경로의 본문 추출 결과 비교 테스트 (언론사 페이지 형태의 HTML)
+"""
+import pytest
+
+from src.pipeline_stages import content_extraction
+from src.pipeline_stages.lxml_extraction import extract_content_with_lxml
+
+PUBLISHER_PAGE = """<!DOCTYPE html>
+<html lang="ko"><head><meta charset="utf-8"><title>기준금리 인하 | 경제신문</title>
+<script>var ga = 1;</script><style>.x{color:red}</style></head>
+<body>
+<header><nav><a href="/">홈</a><a href="/economy">경제</a></nav></header>
+<div id="container">
+  <article class="news-article">
+    <h1>한은, 기준금리 0.25%p 인하… 연 3.25%</h1>
+    <div class="byline">홍길동 기자 입력 2024.10.11 10:02</div>
+    <figure><img src="/photo.jpg"><figcaption>이창용 한국은행 총재가 발언하고 있다.</figcaption></figure>
+    <p>한국은행 금융통화위원회는 11일 기준금리를 연 3.50%에서 3.25%로 0.25%포인트 인하했다.</p>
+    <div class="ad">광고 영역입니다</div>
+    <p>이번 인하는 물가 상승률이 목표 수준에 근접한 가운데 내수 부진 우려가 커진 데 따른 것이다.</p>
+    <p>금통위는 향후 물가와 성장, 금융안정 여건을 면밀히 점검하겠다고 밝혔다.</p>
+    <div class="related"><a href="/1">관련 기사 제목</a></div>
+    <p>짧은 문단</p>
+  </article>
+  <aside>많이 본 뉴스</aside>
+</div>
+<footer>Copyright 경제신문. All rights reserved.</footer>
+</body></html>"""
+
+# 문단 안에 사진 블록(<div>)을 넣는 CMS의 잘못 중첩된 마크업
+MISNESTED_PAGE = """<html><head><meta charset="utf-8"></head><body>
+<article>
+  <p>정부는 17일 반도체 산업 지원을 위해 총 26조원 규모의 종합 지원 프로그램을 발표했다.
+  <div class="ab_photo"><img src="/chip.jpg"><span class="caption">반도체 생산 라인 모습</span></div>
+  지원 프로그램에는 정책 금융 17조원과 연구개발 예산 확대, 산업단지 인프라 구축이 포함됐다.
+  업계는 이번 대책이 설비 투자 부담을 덜어 줄 것으로 기대하면서도 세제 혜택 확대가 필요하다고 밝혔다.</p>
+  <p>산업통상자원부는 세부 시행 계획을 다음 달까지 마련해 관계 부처와 협의할 예정이다.</p>
+</article>
+</body></html>"""
+
+NAVER_PAGE = """<html><head><meta charset="utf-8"></head><body>
+<div id="ct"><div id="dic_area" class="go_trans _article_content">
+  <span class="end_photo_org"><img src="/a.jpg"></span>
+  서울 아파트 매매가격이 7주 연속 상승세를 이어갔다.<br><br>
+  한국부동산원에 따르면 이번 주 서울 아파트값은 0.12% 올랐다.<br>
+  <div class="kst_link">기사 제보 및 보도자료</div>
+  <div>전문가들은 금리 인하 기대감이 매수 심리를 자극하고 있다고 분석했다.</div>
+</div></div>
+</body></html>"""
+
+
+def _bs4_only(html, is_naver_news=False, monkeypatch=None):
+    monkeypatch.setattr(content_extraction, "LXML_FAST_PATH_ENABLED", False)
+    try:
+        return content_extraction.extract_content_with_selectors(html, is_naver_news)
+    finally:
+        monkeypatch.setattr(content_extraction, "LXML_FAST_PATH_ENABLED", True)
+
+
+@pytest.mark.parametrize("html, is_naver_news", [(PUBLISHER_PAGE, False), (NAVER_PAGE, True)])
+def test_lxml_matches_beautifulsoup_on_well_formed_pages(html, is_naver_news, monkeypatch):
+    fast = extract_content_with_lxml(html, is_naver_news)
+    assert fast is not None
+    assert fast == _bs4_only(html, is_naver_news, monkeypatch)
+
+
+def test_publisher_page_keeps_paragraphs_and_drops_boilerplate():
+    text, selector = extract_content_with_lxml(PUBLISHER_PAGE)
+    assert selector == "article"
+    assert text.splitlines() == [
+        "한국은행 금융통화위원회는 11일 기준금리를 연 3.50%에서 3.25%로 0.25%포인트 인하했다.",
+        "이번 인하는 물가 상승률이 목표 수준에 근접한 가운데 내수 부진 우려가 커진 데 따른 것이다.",
+        "금통위는 향후 물가와 성장, 금융안정 여건을 면밀히 점검하겠다고 밝혔다.",
+    ]
+
+
+def test_misnested_paragraph_falls_back_to_beautifulsoup(monkeypatch):
+    # lxml은 <div> 앞에서 <p>를 닫아 뒤의 두 문장이 문단 밖으로 빠지므로 빠른 경로를 쓰지 않습니다.
+    assert extract_content_with_lxml(MISNESTED_PAGE) is None
+    text, selector = content_extraction.extract_content_with_selectors(MISNESTED_PAGE)
+    assert (text, selector) == _bs4_only(MISNESTED_PAGE, monkeypatch=monkeypatch)
+    assert "세제 혜택 확대가 필요하다고 밝혔다." in text
+    assert "산업통상자원부는" in text
+
+
+def test_only_selector_without_match_returns_nothing():
+    assert extract_content_with_lxml(PUBLISHER_PAGE, only_selector="naver_dic_area") == (None, None)
+
+
+def test_well_formed_page_with_loose_text_keeps_fast_path():
+    # 네이버 본문은 문단 밖 텍스트가 대부분이지만 마크업이 올바르므로 빠른 경로를 그대로 씁니다.
+    assert extract_content_with_lxml(NAVER_PAGE, True, min_coverage=0.9) is not None
@@ -0,0 +1,74 @@
+"""
+파이프라인 메시지 직렬화(msgpack + zstd, float32 벡터 패킹)와 큐별 어노테이션 테스트
+"""
+import json
+from datetime import datetime
+
+import numpy as np
+import pytest
+from celery import Celery
+
+from src.pipeline_stages import message_serializer
+from src.pipeline_stages.message_serializer import QueueSerializerAnnotation, dumps, loads
+
+
+def _article(dim=1536):
+    return {
+        "ID": "abc",
+        "title": "한국어 제목",
+        "checked": {"initial": True, "score": 0.5},
+        "embedding": [0.25] * dim,
+        "llm_individual_keyword_embeddings": [[0.5] * 8, [-0.5] * 8],
+        "llm_internal_keywords": ["금리", "물가"],
+    }
+
+
+def test_round_trip_keeps_values_and_packs_vectors():
+    article = _article()
+    data = dumps(article)
+    assert loads(data) == article
+    # float32로 패킹하고 압축하므로 JSON보다 훨씬 작습니다.
+    assert len(data) < len(json.dumps(article)) / 4
+
+
+def test_small_messages_are_not_compressed():
+    data = dumps({"_claim_check": True, "ID": "abc", "version": 3})
+    assert data[:1] == message_serializer._RAW
+    assert loads(data) == {"_claim_check": True, "ID": "abc", "version": 3}
+
+
+def test_irregular_vectors_are_left_as_is():
+    article = {"embedding": [1, 2, 3], "llm_individual_keyword_embeddings": [[0.5, 0.5], [0.5]]}
+    assert loads(dumps(article)) == article
+
+
+def test_numpy_and_datetime_values():
+    now = datetime(2024, 10, 11, 9, 30)
+    decoded = loads(dumps({"matrix": np.arange(6, dtype=np.float64).reshape(2, 3), "n": np.int64(7), "at": now}))
+    assert decoded == {"matrix": [[0.0, 1.0, 2.0], [3.0, 4.0, 5.0]], "n": 7, "at": now.isoformat()}
+
+
+def test_zlib_fallback_and_unknown_header(monkeypatch):
+    monkeypatch.setattr(message_serializer, "zstandard", None)
+    data = dumps(_article(dim=256))
+    assert data[:1] == message_serializer._ZLIB
+    assert loads(data) == _article(dim=256)
+    with pytest.raises(ValueError):
+        loads(b"\x09garbage")
+
+
+def test_annotation_picks_serializer_by_queue(monkeypatch):
+    app = Celery("test_message_serializer")
+    app.conf.task_routes = {"tasks.embed": {"queue": "pipeline.embedding"}}
+    monkeypatch.setattr(message_serializer, "MESSAGE_SERIALIZER_CONFIG",
+                        {"DEFAULT": "json", "QUEUES": {"pipeline.embedding": "msgpack-zstd"}})
+
+    class _Task:
+        def __init__(self, name):
+            self.name = name
+
+    annotation = QueueSerializerAnnotation(app)
+    assert annotation.annotate(_Task("tasks.embed")) == {"serializer": "msgpack-zstd"}
+    assert annotation.annotate(_Task("tasks.other")) == {"serializer": "json"}
+    monkeypatch.setattr(message_serializer, "msgpack", None)
+    assert annotation.annotate(_Task("tasks.embed")) == {"serializer": "json"}
@@ -0,0 +1,70 @@
+"""
+MinHash-LSH 근접 중복 인덱스(서명/유사도, 조회와 등록 분리) 테스트
+"""
+import fakeredis
+
+from src.pipeline_stages import near_duplicate
+from src.pipeline_stages.near_duplicate import NearDuplicateIndex
+
+ARTICLE = (
+    "한국은행 금융통화위원회는 17일 기준금리를 연 3.50%에서 3.25%로 0.25%포인트 인하했다. "
+    "이번 인하는 물가 상승률이 목표 수준에 근접한 가운데 내수 부진과 수출 둔화 우려가 커진 데 따른 것이다. "
+    "금통위는 통화정책방향 의결문에서 향후 물가와 성장, 금융안정 여건을 면밀히 점검하면서 "
+    "추가 인하 시기와 속도를 결정하겠다고 밝혔다. 시장에서는 연내 한 차례 추가 인하 가능성이 거론된다."
+)
+REWRITE = ARTICLE.replace("17일", "이날").replace("밝혔다.", "설명했다.") + " (서울=연합뉴스)"
+UNRELATED = (
+    "프로야구 정규시즌 마지막 경기에서 홈팀이 연장 접전 끝에 승리하며 가을야구 진출을 확정했다. "
+    "선발 투수는 7이닝 동안 삼진 9개를 잡아내며 1실점으로 호투했고, 4번 타자는 결승 홈런을 때렸다. "
+    "감독은 경기 후 선수들이 끝까지 포기하지 않았다며 팬들에게 감사 인사를 전했다. 포스트시즌은 다음 주 시작된다."
+)
+
+
+def _index():
+    index = NearDuplicateIndex(min_chars=100)
+    index._client = fakeredis.FakeRedis()
+    index._get_client = lambda: index._client
+    return index
+
+
+def test_signature_is_deterministic_and_skips_short_text():
+    index = NearDuplicateIndex(min_chars=100)
+    assert index.signature("짧은 글") is None
+    sig = index.signature(ARTICLE)
+    assert sig.shape == (128,)
+    # 공백 차이는 무시하고, 다른 인스턴스(워커)도 같은 서명을 만듭니다.
+    assert (NearDuplicateIndex(min_chars=100).signature("  ".join(ARTICLE.split(" "))) == sig).all()
+
+
+def test_similarity_separates_rewrites_from_unrelated_articles():
+    index = NearDuplicateIndex(min_chars=100)
+    sig = index.signature(ARTICLE)
+    assert index.similarity(sig, sig) == 1.0
+    assert index.similarity(sig, index.signature(REWRITE)) >= index.threshold
+    assert index.similarity(sig, index.signature(UNRELATED)) < 0.2
+
+
+def test_find_does_not_register():
+    index = _index()
+    assert index.find("a1", ARTICLE) is None
+    assert index._client.dbsize() == 0
+    # 첫 사본이 저장되지 않았으므로 다음 사본도 중복이 아닙니다.
+    assert index.find("a2", REWRITE) is None
+
+
+def test_saved_article_catches_later_copies():
+    index = _index()
+    assert index.add("a1", ARTICLE) is True
+    match = index.find("a2", REWRITE)
+    assert match["duplicate_of"] == "a1"
+    assert match["similarity"] >= index.threshold
+    assert index.find("a1", ARTICLE) is None
+    assert index.find("a3", UNRELATED) is None
+
+
+def test_register_saved_article_skips_configured_sources(monkeypatch):
+    index = _index()
+    monkeypatch.setattr(near_duplicate, "get_near_duplicate_index", lambda: index)
+    assert near_duplicate.register_saved_article({"ID": "d1", "source": "DART", "content": ARTICLE}) is False
+    assert near_duplicate.register_saved_article({"ID": "n1", "source": "NAVER", "content": ARTICLE}) is True
+    assert index.find("n2", REWRITE)["duplicate_of"] == "n1"
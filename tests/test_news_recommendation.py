@@ -0,0 +1,86 @@
+"""
+추천 2차 랭킹 행렬곱 점수화와 /recommendations 블로킹 호출 오프로드 테스트
+"""
+import asyncio
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import numpy as np
+import pytest
+
+from src.app import news_recommendation as rec
+
+
+def _unit(rng, n, dim):
+    vectors = rng.normal(size=(n, dim))
+    return (vectors / np.linalg.norm(vectors, axis=1, keepdims=True)).tolist()
+
+
+def test_vectorized_scores_match_per_article_similarity():
+    rng = np.random.default_rng(7)
+    user = _unit(rng, 3, 16)
+    articles = [_unit(rng, n, 16) for n in (1, 4, 2, 7)]
+    packed, offsets = rec.pack_keyword_embeddings(articles, 16)
+    assert packed.dtype == np.float32 and packed.shape == (14, 16)
+    assert offsets.tolist() == [0, 1, 5, 7]
+    expected = [rec.calculate_keyword_similarity(user, article) for article in articles]
+    np.testing.assert_allclose(rec.score_articles_vectorized(user, packed, offsets), expected, rtol=1e-5)
+
+
+def test_scoring_skips_unusable_articles(monkeypatch):
+    index = {"k1": [1.0, 0.0], "k2": [0.0, 1.0]}
+
+    class _Index:
+        def vectors(self, keyword_ids):
+            return np.asarray([index[kid] for kid in keyword_ids if kid in index], dtype=np.float32)
+
+    monkeypatch.setattr(rec, "keyword_vector_index", _Index())
+    articles = [
+        {"ID": "ids", "llm_keyword_vector_ids": ["k1", "k2"]},
+        {"ID": "legacy", "llm_individual_keyword_embeddings": [[0.6, 0.8]]},
+        {"ID": "empty", "llm_individual_keyword_embeddings": []},
+        {"ID": "unknown-ids", "llm_keyword_vector_ids": ["k9"]},
+        {"ID": "other-dim", "llm_individual_keyword_embeddings": [[1.0, 0.0, 0.0]]},
+    ]
+    # 임베딩에 실패한(빈) 사용자 키워드는 점수에서 빠집니다.
+    scored = rec._score_candidate_articles([[1.0, 0.0], []], articles)
+    assert {item["id"]: item["similarity_score"] for item in scored} == pytest.approx({"ids": 1.0, "legacy": 0.6})
+
+
+def test_blocking_steps_run_in_pool_and_concurrently(monkeypatch):
+    loop_threads = []
+    step_threads = {}
+    # 키워드 임베딩과 후보 조회가 동시에 실행되지 않으면 Barrier에서 시간 초과로 실패합니다.
+    barrier = threading.Barrier(2, timeout=5)
+
+    def _embed(query_text):
+        step_threads["embed"] = threading.get_ident()
+        barrier.wait()
+        return ["금리"], [[1.0, 0.0]]
+
+    def _retrieve(query_text):
+        step_threads["retrieve"] = threading.get_ident()
+        barrier.wait()
+        return [{"ID": "a1", "title": "기사", "llm_individual_keyword_embeddings": [[1.0, 0.0]]}]
+
+    def _update(request, user_keywords):
+        step_threads["update"] = threading.get_ident()
+
+    monkeypatch.setattr(rec, "_embed_user_keywords", _embed)
+    monkeypatch.setattr(rec, "_retrieve_candidate_articles", _retrieve)
+    monkeypatch.setattr(rec, "_update_user_interests_from_request", _update)
+    monkeypatch.setattr(rec, "create_personalized_query", lambda user_id, query, profile_context: query)
+    monkeypatch.setattr(rec, "keyword_vector_index", None)
+    monkeypatch.setattr(rec.app.state, "services_ready", True, raising=False)
+
+    async def _request():
+        loop_threads.append(threading.get_ident())
+        return await rec.get_news_recommendations(rec.RecommendationRequest(user_id="u1", query="금리 전망"))
+
+    with ThreadPoolExecutor(max_workers=4) as executor:
+        monkeypatch.setattr(rec, "_blocking_executor", executor)
+        response = asyncio.run(_request())
+
+    assert response.success and [item.id for item in response.recommended_news] == ["a1"]
+    assert set(step_threads) == {"embed", "retrieve", "update"}
+    assert loop_threads[0] not in step_threads.values()
@@ -0,0 +1,156 @@
+"""
+공유 OpenAI 속도 제한기(Redis 토큰 버킷 Lua 스크립트) 테스트
+"""
+from types import SimpleNamespace
+
+import fakeredis
+import pytest
+
+from src import openai_rate_limiter
+from src.openai_rate_limiter import OpenAIRateLimiter, RateLimitTimeout
+from src.token_counting import estimate_tokens, truncate_to_tokens
+
+
+def _limiter(rpm=10, tpm=1000, reserve=0.0, max_wait=None):
+    limiter = OpenAIRateLimiter(
+        model_limits={"gpt-test": {"RPM": rpm, "TPM": tpm}}, default_limits={"RPM": 1, "TPM": 1},
+        safety_factor=1.0, batch_reserve_ratio=reserve,
+        max_wait_seconds=max_wait if max_wait is not None else {"batch": 0, "interactive": 0},
+    )
+    client = fakeredis.FakeRedis()
+    limiter._get_client = lambda: client
+    limiter._script = client.register_script(openai_rate_limiter._ACQUIRE_SCRIPT)
+    return limiter, client
+
+
+class _Clock:
+    def __init__(self, start_ms=1_000_000):
+        self.now = start_ms
+
+    def __call__(self):
+        return self.now
+
+
+@pytest.fixture
+def clock(monkeypatch):
+    clock = _Clock()
+    monkeypatch.setattr(openai_rate_limiter, "_now_ms", clock)
+    return clock
+
+
+def test_limits_use_longest_prefix_and_safety_factor():
+    limiter = OpenAIRateLimiter(model_limits={"gpt-4": {"RPM": 100, "TPM": 1000}, "gpt-4.1": {"RPM": 50, "TPM": 500}},
+                                default_limits={"RPM": 7, "TPM": 70}, safety_factor=0.5)
+    assert limiter.limits("gpt-4.1-nano") == (25, 250)
+    assert limiter.limits("gpt-4o") == (50, 500)
+    assert limiter.limits("other") == (3, 35)
+
+
+def test_request_bucket_empties_and_refills(clock):
+    limiter, _ = _limiter(rpm=3, tpm=10000)
+    assert [limiter.acquire("gpt-test", 1) for _ in range(4)] == [True, True, True, False]
+    clock.now += 20_000  # 분당 3개 → 20초에 1개 충전
+    assert limiter.acquire("gpt-test", 1) is True
+    assert limiter.acquire("gpt-test", 1) is False
+
+
+def test_token_bucket_and_settle(clock):
+    limiter, client = _limiter(rpm=100, tpm=1000)
+    assert limiter.acquire("gpt-test", 900) is True
+    assert limiter.acquire("gpt-test", 200) is False
+    # 실제로는 300 토큰만 썼다면 차이 600을 돌려줍니다.
+    limiter.settle("gpt-test", 900, 300)
+    assert limiter.acquire("gpt-test", 200) is True
+    assert float(client.hget(limiter._keys("gpt-test")[1], "level")) == pytest.approx(500)
+
+
+def test_batch_leaves_reserve_for_interactive(clock):
+    limiter, _ = _limiter(rpm=10, tpm=100000, reserve=0.5)
+    granted = 0
+    while limiter.acquire("gpt-test", 1, "batch"):
+        granted += 1
+    assert granted == 5
+    assert limiter.acquire("gpt-test", 1, "interactive") is True
+
+
+def test_batch_yields_while_interactive_waits(clock):
+    limiter, client = _limiter(rpm=10, tpm=100000)
+    client.set(limiter._keys("gpt-test")[3], 1)
+    assert limiter.acquire("gpt-test", 1, "batch") is False
+    assert limiter.acquire("gpt-test", 1, "interactive") is True
+
+
+def test_cooldown_blocks_all_callers(clock):
+    limiter, _ = _limiter()
+    limiter.penalize("gpt-test", 5)
+    assert limiter.acquire("gpt-test", 1, "interactive") is False
+    clock.now += 6000
+    assert limiter.acquire("gpt-test", 1, "interactive") is True
+
+
+def test_timed_out_call_is_not_sent(clock, monkeypatch):
+    limiter, _ = _limiter(rpm=1, tpm=100000)
+    monkeypatch.setattr(openai_rate_limiter, "get_openai_rate_limiter", lambda: limiter)
+    sent = []
+
+    def _create(**kwargs):
+        sent.append(kwargs)
+        return SimpleNamespace(usage=None)
+
+    openai_rate_limiter._limited_create(_create, "chat", "batch", {"model": "gpt-test", "messages": []})
+    with pytest.raises(RateLimitTimeout):
+        openai_rate_limiter._limited_create(_create, "chat", "batch", {"model": "gpt-test", "messages": []})
+    assert len(sent) == 1
+
+
+def test_langchain_adapter_respects_timeout(clock, monkeypatch):
+    limiter, _ = _limiter(rpm=1, tpm=100000)
+    monkeypatch.setattr(openai_rate_limiter, "get_openai_rate_limiter", lambda: limiter)
+    adapter = openai_rate_limiter.get_langchain_rate_limiter("gpt-test", "interactive")
+    assert adapter.acquire() is True
+    assert adapter.acquire(blocking=False) is False
+    with pytest.raises(RateLimitTimeout):
+        adapter.acquire()
+
+
+def test_token_estimate_and_truncation_are_consistent():
+    text = "한국어 기사 본문 " * 500
+    assert estimate_tokens(text) > 100
+    truncated = truncate_to_tokens(text, 100)
+    assert estimate_tokens(truncated) <= 100
+    assert text.startswith(truncated)
+    assert truncate_to_tokens("짧은 글", 100) == "짧은 글"
+
+
+def test_wrapped_client_disables_sdk_retries():
+    from openai import OpenAI
+
+    wrapped = openai_rate_limiter.get_rate_limited_openai_client(OpenAI(api_key="sk-test"), "batch")
+    # 429 재시도는 공유 쿨다운 한 곳에서만 처리합니다.
+    assert wrapped.client.max_retries == 0
+    assert openai_rate_limiter.get_rate_limited_openai_client(wrapped) is wrapped
+
+
+def test_rejected_request_returns_request_slot_and_tokens(clock, monkeypatch):
+    limiter, client = _limiter(rpm=2, tpm=1000)
+    monkeypatch.setattr(openai_rate_limiter, "get_openai_rate_limiter", lambda: limiter)
+    rpm_key, tpm_key = limiter._keys("gpt-test")[:2]
+    calls = []
+
+    def _create(**kwargs):
+        calls.append(kwargs)
+        if len(calls) == 1:
+            response = SimpleNamespace(status_code=429, headers={"retry-after": "1"}, request=None)
+            raise openai_rate_limiter.RateLimitError("slow down", response=response, body=None)
+        return SimpleNamespace(usage=SimpleNamespace(total_tokens=100))
+
+    def _sleep(seconds):
+        clock.now += int(seconds * 1000)
+
+    monkeypatch.setattr(openai_rate_limiter.time, "sleep", _sleep)
+    limiter.max_wait_seconds = {"batch": 5}
+    openai_rate_limiter._limited_create(_create, "embeddings", "batch", {"model": "gpt-test", "input": "금리"})
+    assert len(calls) == 2
+    # 거부된 첫 요청은 RPM 슬롯을 쓰지 않으므로, 성공한 요청 하나만 차감됩니다.
+    assert float(client.hget(rpm_key, "level")) == pytest.approx(1, abs=0.1)
+    assert float(client.hget(tpm_key, "level")) == pytest.approx(900, abs=50)
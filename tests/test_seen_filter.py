@@ -0,0 +1,69 @@
+"""
+SeenArticleFilter(Redis Bloom 필터) 테스트
+"""
+import hashlib
+
+import fakeredis
+
+from src.pipeline_stages import seen_filter as seen_filter_module
+from src.pipeline_stages.seen_filter import SeenArticleFilter
+
+
+def _id(value: str) -> str:
+    return hashlib.sha256(value.encode("utf-8")).hexdigest()
+
+
+def _filter(tmp_path, server=None):
+    seen_filter = SeenArticleFilter(size_bits=2 ** 16, num_hashes=5, snapshot_path=str(tmp_path / "seen.bloom"))
+    client = fakeredis.FakeRedis(server=server or fakeredis.FakeServer())
+    seen_filter._get_client = lambda: client
+    return seen_filter, client
+
+
+class _FakeCollection:
+    def __init__(self, ids):
+        self.ids = ids
+
+    def find(self, *args, **kwargs):
+        return [{"ID": article_id} for article_id in self.ids]
+
+
+def test_not_ready_filter_is_unknown(tmp_path):
+    seen_filter, _ = _filter(tmp_path)
+    seen_filter.add(_id("a"))
+    assert seen_filter.might_contain(_id("a")) is None
+
+
+def test_rebuild_then_lookup(tmp_path):
+    seen_filter, _ = _filter(tmp_path)
+    assert seen_filter.rebuild_from_collections(_FakeCollection([_id("a")]), _FakeCollection([_id("b")])) == 2
+    assert seen_filter.might_contain(_id("a")) is True
+    assert seen_filter.might_contain(_id("b")) is True
+    assert seen_filter.might_contain(_id("c")) is False
+
+
+def test_snapshot_restore_does_not_mark_ready(tmp_path, monkeypatch):
+    seen_filter, client = _filter(tmp_path)
+    seen_filter.rebuild_from_collections(_FakeCollection([_id("a")]), None)
+    client.flushall()  # Redis 초기화
+
+    requested = []
+    monkeypatch.setattr(seen_filter_module, "_rebuild_requested", False)
+    monkeypatch.setattr(seen_filter_module.rebuild_seen_filter_task, "delay", lambda: requested.append(True))
+    assert seen_filter_module.ensure_seen_filter_ready(seen_filter) is False
+    assert requested == [True]
+    # 스냅샷 비트는 복구되었지만, 스냅샷 이후의 ID가 빠져 있을 수 있어 여전히 "알 수 없음"입니다.
+    assert client.exists(seen_filter.redis_key)
+    assert not seen_filter.is_ready()
+    assert seen_filter.might_contain(_id("recent")) is None
+
+
+def test_contains_many_matches_might_contain(tmp_path):
+    seen_filter, client = _filter(tmp_path)
+    seen_filter.rebuild_from_collections(_FakeCollection([_id("a"), _id("b")]), None)
+    ids = [_id("a"), _id("x"), "not-a-hash", _id("b"), _id("y")]
+    assert seen_filter.contains_many(ids) == [seen_filter.might_contain(article_id) for article_id in ids]
+    assert seen_filter.contains_many(ids) == [True, False, None, True, False]
+
+    client.delete(seen_filter.ready_key)
+    assert seen_filter.contains_many(ids) == [None] * len(ids)
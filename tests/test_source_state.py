@@ -0,0 +1,143 @@
+"""
+SourceValidatorCache(조건부 요청) / SourceWatermarkTracker / 수집기 전달 확인 테스트
+"""
+from src.news_collector import news_collector
+from src.news_collector.admission import PipelineAdmission
+from src.news_collector.fetch_engine import FetchJob, FetchResult
+from src.news_collector.source_state import SourceValidatorCache, SourceWatermarks
+
+
+class _MemoryStore:
+    def __init__(self):
+        self.data = {}
+
+    def get(self, source_key):
+        return dict(self.data.get(source_key, {}))
+
+    def set(self, source_key, state):
+        self.data[source_key] = state
+
+
+def _watermarks():
+    return SourceWatermarks(store=_MemoryStore(), ring_size=10, grace_minutes=60)
+
+
+def test_only_confirmed_items_are_committed():
+    watermarks = _watermarks()
+    tracker = watermarks.tracker("feed")
+    assert tracker.is_new("https://a.example.com/1", "2024-01-01T10:00:00Z")
+    assert tracker.is_new("https://a.example.com/2", "2024-01-01T11:00:00Z")
+    tracker.confirm("https://a.example.com/1")
+    tracker.commit()
+
+    state = watermarks.store.get("feed")
+    assert state["recent_ids"] == [watermarks.entry_id("https://a.example.com/1")]
+    # 전송하지 못한 항목이 남았으므로 워터마크는 올리지 않습니다.
+    assert state["latest_published_at"] is None
+
+    retry = watermarks.tracker("feed")
+    assert not retry.is_new("https://a.example.com/1", "2024-01-01T10:00:00Z")
+    assert retry.is_new("https://a.example.com/2", "2024-01-01T11:00:00Z")
+
+
+def test_watermark_advances_when_everything_is_confirmed():
+    watermarks = _watermarks()
+    tracker = watermarks.tracker("feed")
+    for i, hour in enumerate((9, 12, 10)):
+        url = f"https://a.example.com/{i}"
+        assert tracker.is_new(url, f"2024-01-01T{hour:02d}:00:00Z")
+        tracker.confirm(url)
+    tracker.commit()
+    assert watermarks.store.get("feed")["latest_published_at"].startswith("2024-01-01T12:00:00")
+
+    later = watermarks.tracker("feed")
+    assert not later.is_new("https://a.example.com/old", "2024-01-01T08:00:00Z")
+    assert later.is_new("https://a.example.com/late", "2024-01-01T11:30:00Z")  # 유예 구간 안
+    assert later.skipped == 1
+
+
+def test_unconfirmed_run_writes_nothing():
+    watermarks = _watermarks()
+    tracker = watermarks.tracker("feed")
+    assert tracker.is_new("https://a.example.com/1", "2024-01-01T10:00:00Z")
+    tracker.commit()
+    assert watermarks.store.get("feed") == {}
+    assert tracker.unconfirmed == 1
+
+
+def _admission(tmp_path, spill_max_items, depth):
+    admission = PipelineAdmission(
+        broker_url="redis://localhost:6379/0", queues=["pipeline.intake"], weights={},
+        high_watermark=10, low_watermark=5, max_wait_seconds=0, poll_seconds=0,
+        spill_path=str(tmp_path / "spill.jsonl"), spill_max_items=spill_max_items, defer_sources=[],
+    )
+    admission.queue_depth = lambda: depth
+    return admission
+
+
+def test_admit_reports_only_spilled_articles(tmp_path):
+    admission = _admission(tmp_path, spill_max_items=2, depth=100)
+    articles = [{"url": f"https://a.example.com/{i}"} for i in range(3)]
+    admitted, spilled = admission.admit(articles)
+    assert admitted == []
+    assert spilled == articles[:2]
+    assert admission.stats["dropped"] == 1
+    assert admission.spilled_count() == 2
+
+
+def test_collector_confirms_after_send_or_spill(tmp_path, monkeypatch):
+    watermarks = _watermarks()
+    tracker = watermarks.tracker("feed")
+    entries = []
+    for i in range(3):
+        url = f"https://a.example.com/{i}"
+        assert tracker.is_new(url, None)
+        entries.append(({"url": url}, tracker))
+
+    monkeypatch.setattr(news_collector, "_get_admission", lambda: _admission(tmp_path, spill_max_items=1, depth=100))
+    news_collector._admit_and_send_locked(entries)
+    assert tracker.unconfirmed == 2  # 스필 1개만 기록됨
+
+    sent = []
+    monkeypatch.setattr(news_collector, "_get_admission", lambda: None)
+    monkeypatch.setattr(news_collector, "_send_to_pipeline", lambda articles: False)
+    news_collector._admit_and_send_locked(entries[1:2])
+    assert tracker.unconfirmed == 2  # 전송 실패
+
+    monkeypatch.setattr(news_collector, "_send_to_pipeline", lambda articles: sent.extend(articles) or True)
+    news_collector._admit_and_send_locked(entries[1:])
+    assert tracker.unconfirmed == 0
+    assert [a["url"] for a in sent] == ["https://a.example.com/1", "https://a.example.com/2"]
+
+
+def _result(status_code, content=b"", headers=None, error=None):
+    return FetchResult(job=FetchJob(url="https://feed.example.com/rss"), status_code=status_code,
+                       content=content, headers=headers or {}, error=error)
+
+
+def test_validators_become_conditional_headers():
+    cache = SourceValidatorCache(store=_MemoryStore())
+    assert cache.conditional_headers("https://feed.example.com/rss") == {}
+    cache.remember(_result(200, b"<rss/>", {"ETag": '"v1"', "Last-Modified": "Mon, 01 Jan 2024 10:00:00 GMT"}))
+    assert cache.conditional_headers("https://feed.example.com/rss") == {
+        "If-None-Match": '"v1"', "If-Modified-Since": "Mon, 01 Jan 2024 10:00:00 GMT",
+    }
+
+
+def test_not_modified_or_same_body_is_unchanged():
+    cache = SourceValidatorCache(store=_MemoryStore())
+    assert cache.is_unchanged(_result(304))
+    assert not cache.is_unchanged(_result(200, b"<rss>1</rss>"))
+    # 검증자를 주지 않는 서버도 본문 해시가 같으면 건너뜁니다.
+    cache.remember(_result(200, b"<rss>1</rss>"))
+    assert cache.is_unchanged(_result(200, b"<rss>1</rss>"))
+    assert not cache.is_unchanged(_result(200, b"<rss>2</rss>"))
+
+
+def test_failed_responses_are_not_remembered():
+    cache = SourceValidatorCache(store=_MemoryStore())
+    cache.remember(_result(200, b"<rss>1</rss>", {"ETag": '"v1"'}))
+    cache.remember(_result(500, b"error", {"ETag": '"broken"'}))
+    assert not cache.is_unchanged(_result(500, b"error"))
+    assert not cache.is_unchanged(_result(None, error="timeout"))
+    assert cache.conditional_headers("https://feed.example.com/rss") == {"If-None-Match": '"v1"'}
@@ -0,0 +1,55 @@
+"""
+dispatch_stage 결합 실행(stage fusion) 재시도/실패 처리 테스트
+"""
+import pytest
+from celery import Celery
+
+from src.pipeline_stages import stage_dispatch
+
+app = Celery("test_stage_dispatch")
+calls = []
+
+
+@app.task(bind=True, max_retries=2, default_retry_delay=60)
+def flaky_stage_task(self, article_data):
+    calls.append(self.request.retries)
+    raise self.retry(exc=RuntimeError("temporary"), countdown=30)
+
+
+@app.task(bind=True)
+def broken_stage_task(self, article_data):
+    raise ValueError("bad article")
+
+
+@app.task(bind=True)
+def ok_stage_task(self, article_data):
+    article_data["done"] = True
+    return {"ok": True}
+
+
+@pytest.fixture(autouse=True)
+def _fused(monkeypatch):
+    calls.clear()
+    monkeypatch.setattr(stage_dispatch, "crosses_broker", lambda task: False)
+    monkeypatch.setattr(stage_dispatch, "to_message_payload", lambda article_data: {"ref": article_data["ID"]})
+
+
+def test_retry_is_sent_through_broker_with_countdown(monkeypatch):
+    sent = []
+    monkeypatch.setattr(flaky_stage_task, "apply_async", lambda **kwargs: sent.append(kwargs) or "async-result")
+    assert stage_dispatch.dispatch_stage(flaky_stage_task, {"ID": "a1"}) == "async-result"
+    # 결합 실행에서는 한 번만 실행하고, 재시도는 countdown을 지켜 브로커로 보냅니다.
+    assert calls == [0]
+    assert sent == [{"args": ({"ref": "a1"},), "countdown": 30, "retries": 1}]
+
+
+def test_failure_is_propagated():
+    with pytest.raises(ValueError):
+        stage_dispatch.dispatch_stage(broken_stage_task, {"ID": "a2"})
+    assert not broken_stage_task.request_stack.stack
+
+
+def test_success_returns_task_result():
+    article = {"ID": "a3"}
+    assert stage_dispatch.dispatch_stage(ok_stage_task, article) == {"ok": True}
+    assert article["done"] is True
@@ -0,0 +1,51 @@
+"""
+단계별 큐 라우팅과 docker-compose 워커 -Q 순서 테스트
+"""
+import os
+import re
+
+import yaml
+
+from src.pipeline_stages import content_extraction
+from src.pipeline_stages.stage_routing import (
+    DEFAULT_STAGE_PRIORITIES, DEFAULT_STAGE_QUEUES, STAGE_TASK_NAMES, broker_queue_keys, build_task_routes,
+)
+
+_COMPOSE_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))), "docker", "docker-compose.yml")
+
+
+def _queue_priority(queue: str) -> int:
+    """큐에 들어가는 단계 중 가장 높은 우선순위 (숫자가 작을수록 높음)."""
+    return min(DEFAULT_STAGE_PRIORITIES[stage] for stage, q in DEFAULT_STAGE_QUEUES.items() if q == queue)
+
+
+def test_routes_cover_every_stage():
+    routes = build_task_routes()
+    assert set(routes) == set(STAGE_TASK_NAMES.values())
+    assert routes[STAGE_TASK_NAMES["finalization"]] == {"queue": "pipeline.finalize", "priority": 0}
+
+
+def test_broker_queue_keys_include_priority_lists():
+    keys = broker_queue_keys("pipeline.fetch")
+    assert keys[0] == "pipeline.fetch"
+    assert keys[1:] == [f"pipeline.fetch:{step}" for step in range(1, 10)]
+
+
+def test_compose_workers_list_queues_in_priority_order():
+    """queue_order_strategy=priority에서는 -Q 순서대로 소비하므로, 파이프라인 뒤쪽 단계의 큐가 먼저 와야 합니다."""
+    with open(_COMPOSE_PATH, encoding="utf-8") as f:
+        services = yaml.safe_load(f)["services"]
+    checked = 0
+    for name, service in services.items():
+        match = re.search(r"-Q (\S+)", str(service.get("command", "")))
+        if not match:
+            continue
+        queues = [q for q in match.group(1).split(",") if q.startswith("pipeline.")]
+        priorities = [_queue_priority(q) for q in queues]
+        assert priorities == sorted(priorities), f"{name}: {queues}"
+        checked += len(queues) > 1
+    assert checked >= 2
+
+
+def test_cpu_bound_calls_run_inline_outside_eventlet():
+    assert content_extraction._run_cpu_bound(lambda a, b=0: a + b, 1, b=2) == 3
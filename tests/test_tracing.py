@@ -0,0 +1,101 @@
+"""
+기사 단위 트레이스(traced_stage)와 Redis 단계 지표(StageMetrics) 테스트
+"""
+import os
+import time
+
+import fakeredis
+import pytest
+from celery.exceptions import Retry
+
+from src.pipeline_stages import tracing
+from src.pipeline_stages.tracing import StageMetrics, mark_enqueued, traced_batch_stage, traced_stage
+
+
+@pytest.fixture
+def metrics(monkeypatch):
+    metrics = StageMetrics(key_prefix="test:metrics")
+    metrics._client = fakeredis.FakeRedis()
+    metrics._client_pid = os.getpid()
+    monkeypatch.setattr(tracing, "get_stage_metrics", lambda: metrics)
+    return metrics
+
+
+@traced_stage("extract", ok_key="extracted")
+def _extract(self, article_data, ok=True):
+    return {"extracted": ok}
+
+
+@traced_stage("flaky")
+def _flaky(self, article_data, exc):
+    raise exc
+
+
+def test_trace_records_stage_outcome_and_queue_wait(metrics):
+    article = {"ID": "a1"}
+    mark_enqueued(article)
+    article["checked"]["trace"]["enqueued_at"] -= 2.0
+    _extract(None, article)
+    _extract(None, article, ok=False)
+
+    first, second = article["checked"]["trace"]["stages"]
+    assert first["stage"] == "extract" and first["outcome"] == "passed"
+    assert 2.0 <= first["queue_wait"] < 3.0
+    assert second["outcome"] == "failed" and second["queue_wait"] is None
+    assert "enqueued_at" not in article["checked"]["trace"]
+
+    report = metrics.snapshot()["extract"]
+    assert report["outcomes"] == {"passed": 1, "failed": 1, "retry": 0, "error": 0}
+    assert report["latency"]["count"] == 2
+    assert report["queue_wait"]["buckets"]["2.5"] == 1
+    assert report["queue_wait"]["buckets"]["+Inf"] == 1
+
+
+def test_retry_and_error_outcomes(metrics):
+    with pytest.raises(Retry):
+        _flaky(None, {"ID": "a2"}, Retry("again"))
+    with pytest.raises(ValueError):
+        _flaky(None, {"ID": "a3"}, ValueError("bad"))
+    assert metrics.snapshot()["flaky"]["outcomes"] == {"passed": 0, "failed": 0, "retry": 1, "error": 1}
+
+
+def test_fused_inner_stage_time_is_not_counted_twice(metrics):
+    @traced_stage("inner")
+    def _inner(self, article_data):
+        time.sleep(0.2)
+
+    @traced_stage("outer")
+    def _outer(self, article_data):
+        time.sleep(0.05)
+        _inner(None, article_data)
+
+    article = {"ID": "a4"}
+    _outer(None, article)
+    durations = {entry["stage"]: entry["duration"] for entry in article["checked"]["trace"]["stages"]}
+    assert durations["inner"] >= 0.2
+    assert durations["outer"] < 0.15
+
+
+def test_batch_stage_counts_articles(metrics):
+    @traced_batch_stage("initial_checks_batch")
+    def _batch(self, articles):
+        return {"total": len(articles), "passed": 2}
+
+    _batch(None, [{"ID": str(i)} for i in range(5)])
+    report = metrics.snapshot()
+    assert report["initial_checks_batch"]["outcomes"]["passed"] == 1
+    assert report["initial_checks_batch:articles"]["outcomes"]["passed"] == 2
+    assert report["initial_checks_batch:articles"]["outcomes"]["failed"] == 3
+
+
+def test_histogram_is_cumulative():
+    fields = {"latency_bucket:0.1": "2", "latency_bucket:1": "1", "latency_bucket:+Inf": "1",
+              "latency_count": "4", "latency_sum": "1000.5"}
+    histogram = tracing._histogram(fields, "latency")
+    assert histogram["buckets"]["0.05"] == 0
+    assert histogram["buckets"]["0.1"] == 2
+    assert histogram["buckets"]["600"] == 3
+    assert histogram["buckets"]["+Inf"] == 4
+    assert histogram["mean"] == pytest.approx(250.125)
+    assert tracing._bucket_label(0.07) == "0.1"
+    assert tracing._bucket_label(1000) == "+Inf"
@@ -0,0 +1,99 @@
+"""
+WorkerResourceRegistry 지연 생성 / 잠금 범위 테스트
+"""
+import threading
+import time
+
+from src.worker_resources import WorkerResourceRegistry
+
+
+def test_slow_factory_does_not_block_other_resources():
+    registry = WorkerResourceRegistry()
+    started, release = threading.Event(), threading.Event()
+
+    def _slow_factory():
+        started.set()
+        release.wait(5)
+        return "slow"
+
+    registry.register("slow", _slow_factory)
+    registry.register_value("fast", "fast")
+    assert registry.get("fast") == "fast"
+
+    thread = threading.Thread(target=registry.get, args=("slow",))
+    thread.start()
+    assert started.wait(5)
+    began = time.monotonic()
+    assert registry.get("fast") == "fast"
+    assert time.monotonic() - began < 1
+    release.set()
+    thread.join()
+    assert registry.get("slow") == "slow"
+
+
+def test_concurrent_gets_build_once():
+    registry = WorkerResourceRegistry()
+    builds = []
+
+    def _factory():
+        builds.append(1)
+        time.sleep(0.05)
+        return object()
+
+    registry.register("client", _factory)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(registry.get("client"))) for _ in range(8)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+    assert len(builds) == 1
+    assert len({id(result) for result in results}) == 1
+
+
+def test_contains_does_not_build():
+    registry = WorkerResourceRegistry()
+    builds = []
+    registry.register("client", lambda: builds.append(1) or "value")
+    assert "client" in registry
+    assert "missing" not in registry
+    assert builds == []
+    assert not registry.is_initialized("client")
+
+
+def test_failed_health_check_rebuilds_dependents():
+    registry = WorkerResourceRegistry(health_check_interval=0)
+    closed = []
+    healthy = {"ok": True}
+
+    def _check(value):
+        if not healthy["ok"]:
+            raise ConnectionError("gone")
+
+    counter = iter(range(100))
+    registry.register("mongo", lambda: f"mongo-{next(counter)}", health_check=_check, close=closed.append)
+    registry.register("articles", lambda: f"articles-of-{registry.get('mongo')}", depends_on=["mongo"])
+    assert registry.get("articles") == "articles-of-mongo-0"
+
+    healthy["ok"] = False
+    # 헬스 체크 실패: mongo와 그에 의존하는 articles를 닫고 버린 뒤 mongo를 새로 만듭니다.
+    registry.get("mongo")
+    assert closed == ["mongo-0"]
+    assert not registry.is_initialized("articles")
+    healthy["ok"] = True
+    assert registry.get("articles") == "articles-of-mongo-1"
+
+
+def test_factory_failure_backs_off():
+    registry = WorkerResourceRegistry(retry_after=60)
+    attempts = []
+
+    def _factory():
+        attempts.append(1)
+        raise RuntimeError("down")
+
+    registry.register("client", _factory)
+    assert registry.get("client", "default") == "default"
+    assert registry.get("client", "default") == "default"
+    assert len(attempts) == 1
+    assert "client" in registry.errors
@@ -0,0 +1,127 @@
+#!/usr/bin/env python3
+"""
+파이프라인 메시지 직렬화 벤치마크 (JSON vs msgpack+zstd)
+- 각 단계로 전달되는 실제와 비슷한 article_data를 만들어 메시지 크기와 인코딩/디코딩 시간을 비교합니다.
+- Celery 프로토콜 2 본문 형식 (args, kwargs, embed)으로 감싸서 측정합니다.
+- claim-check 참조 메시지(브로커를 거치는 단계의 기본 형태)도 함께 측정합니다.
+"""
+
+import os
+import sys
+import json
+import random
+import argparse
+import time
+
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from src.pipeline_stages import message_serializer
+
+EMBEDDING_DIM = 1536
+KEYWORD_COUNT = 10
+
+
+def _vector(rng: random.Random):
+    return [rng.uniform(-0.08, 0.08) for _ in range(EMBEDDING_DIM)]
+
+
+def build_stage_payloads(seed: int = 0) -> dict:
+    """단계별 입력 article_data 예시를 만듭니다."""
+    rng = random.Random(seed)
+    # 같은 문장을 반복하면 압축률이 비현실적으로 높아지므로, 어절을 무작위로 섞어 약 4,000자의 본문을 만듭니다.
+    words = ("국내 연구진이 차세대 전고체 배터리의 수명을 두 배로 늘리는 전해질 소재를 개발했다 연구팀은 황화물계 "
+             "고체 전해질의 계면 안정성을 높이는 코팅 기술을 적용해 충방전 500회 이후에도 초기 용량의 90% 이상을 "
+             "유지했다고 밝혔다 이번 성과는 국제 학술지에 게재됐으며 상용화를 위한 후속 연구와 양산 공정 검증이 "
+             "진행될 예정이다 업계는 전기차 주행거리와 안전성을 동시에 높일 수 있을 것으로 기대하고 있다").split()
+    content = " ".join(rng.choice(words) for _ in range(900))
+    collected = {
+        "ID": "a3f1c9e07b2d4e58a9c1d2e3f4a5b6c7",
+        "title": "전고체 배터리 수명 두 배로… 국내 연구진 새 전해질 소재 개발",
+        "content": "",
+        "url": "https://www.example-news.co.kr/news/articleView.html?idxno=123456",
+        "published_at": "2025-06-01T09:30:00+09:00",
+        "summary": "국내 연구진이 차세대 전고체 배터리의 수명을 두 배로 늘리는 전해질 소재를 개발했다.",
+        "embedding": [],
+        "source": "Example News",
+        "llm_internal_keywords": [],
+        "checked": {"initial_checks": True},
+    }
+    extracted = dict(collected, content=content,
+                     checked=dict(collected["checked"], content_extraction=True, content_source_log=["newspaper3k"]))
+    categorized = dict(extracted,
+                       llm_info_type_categories=["연구성과"],
+                       llm_topic_main_categories=["에너지"],
+                       llm_topic_sub_categories=["배터리"],
+                       checked=dict(extracted["checked"], categorization=True))
+    analyzed = dict(categorized, checked=dict(categorized["checked"], content_analysis=True))
+    keywords = ["전고체 배터리", "고체 전해질", "황화물계", "계면 안정성", "코팅 기술",
+                "배터리 수명", "이차전지", "에너지 밀도", "국내 연구진", "소재 개발"][:KEYWORD_COUNT]
+    embedded = dict(analyzed,
+                    llm_internal_keywords=keywords,
+                    embedding=_vector(rng),
+                    llm_internal_keywords_embedding=_vector(rng),
+                    llm_individual_keyword_embeddings=[_vector(rng) for _ in keywords])
+    return {
+        "initial_checks": collected,
+        "content_extraction": collected,
+        "categorization": extracted,
+        "content_analysis": categorized,
+        "embedding_generation": analyzed,
+        "finalization": embedded,
+        "claim_check_ref": {"_claim_check": True, "ID": collected["ID"], "version": 3, "url": collected["url"]},
+    }
+
+
+def _json_dumps(obj) -> bytes:
+    # kombu의 JSON 직렬화와 같은 설정 (ensure_ascii 기본값, 구분자 공백 포함)
+    return json.dumps(obj).encode("utf-8")
+
+
+def _json_loads(data: bytes):
+    return json.loads(data)
+
+
+def _time_it(fn, arg, repeat: int) -> float:
+    start = time.perf_counter()
+    for _ in range(repeat):
+        fn(arg)
+    return (time.perf_counter() - start) / repeat * 1000
+
+
+def run(repeat: int = 200) -> list:
+    rows = []
+    for stage, article_data in build_stage_payloads().items():
+        body = [[article_data], {}, {"callbacks": None, "errbacks": None, "chain": None, "chord": None}]
+        json_bytes = _json_dumps(body)
+        packed = message_serializer.dumps(body)
+        rows.append({
+            "stage": stage,
+            "json_bytes": len(json_bytes),
+            "packed_bytes": len(packed),
+            "json_encode_ms": _time_it(_json_dumps, body, repeat),
+            "json_decode_ms": _time_it(_json_loads, json_bytes, repeat),
+            "packed_encode_ms": _time_it(message_serializer.dumps, body, repeat),
+            "packed_decode_ms": _time_it(message_serializer.loads, packed, repeat),
+        })
+    return rows
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="파이프라인 메시지 직렬화 방식(JSON, msgpack+zstd)을 비교합니다.")
+    parser.add_argument("--repeat", type=int, default=200, help="측정 반복 횟수")
+    args = parser.parse_args()
+
+    if not message_serializer.is_available():
+        print("❌ msgpack이 설치되어 있지 않습니다: pip install msgpack zstandard")
+        sys.exit(1)
+    compression = "zstd" if message_serializer.zstandard is not None else "zlib (zstandard 미설치)"
+    print(f"압축: {compression}, 반복: {args.repeat}회\n")
+    print(f"{'단계':<22}{'JSON(B)':>10}{'msgpack(B)':>12}{'비율':>8}"
+          f"{'JSON enc/dec(ms)':>20}{'msgpack enc/dec(ms)':>22}")
+    for row in run(args.repeat):
+        ratio = row["packed_bytes"] / row["json_bytes"]
+        print(f"{row['stage']:<22}{row['json_bytes']:>10}{row['packed_bytes']:>12}{ratio:>8.2f}"
+              f"{row['json_encode_ms']:>11.3f}/{row['json_decode_ms']:<8.3f}"
+              f"{row['packed_encode_ms']:>13.3f}/{row['packed_decode_ms']:<8.3f}")
@@ -0,0 +1,66 @@
+#!/usr/bin/env python3
+"""
+기사 문서에 직접 저장된 llm_individual_keyword_embeddings를 전역 키워드 벡터 사전으로 옮기는 스크립트
+- 벡터는 keyword_vectors 컬렉션에 한 번만 등록하고, 기사에는 llm_keyword_vector_ids만 남깁니다.
+- 키워드 수와 벡터 수가 다른 문서(일부 키워드 임베딩 실패)는 어떤 벡터가 어떤 키워드인지 알 수 없어 건너뜁니다.
+"""
+
+import os
+import sys
+import argparse
+
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+import certifi
+from pymongo import MongoClient
+
+from src.config_loader.settings import SETTINGS
+from src.db.keyword_vectors import KeywordVectorStore
+
+
+def migrate(dry_run: bool = False, batch_size: int = 500) -> dict:
+    mongo_client = MongoClient(SETTINGS.get("MONGO_URI"), tlsCAFile=certifi.where())
+    db = mongo_client[SETTINGS.get("MONGO_DB_NAME", "newsdb")]
+    articles_collection = db[SETTINGS.get("MONGO_ARTICLES_COLLECTION_NAME", "articles")]
+    keyword_store = KeywordVectorStore(
+        db[SETTINGS.get("MONGO_KEYWORD_VECTORS_COLLECTION_NAME", "keyword_vectors")],
+        SETTINGS.get("SHARED_EMBEDDING_MODEL_NAME", "text-embedding-3-small"),
+    )
+
+    counts = {"migrated": 0, "skipped_mismatch": 0}
+    query = {
+        "llm_individual_keyword_embeddings.0": {"$exists": True},
+        "llm_keyword_vector_ids": {"$exists": False},
+    }
+    cursor = articles_collection.find(query, {"ID": 1, "llm_internal_keywords": 1, "llm_individual_keyword_embeddings": 1}, batch_size=batch_size)
+    try:
+        for article in cursor:
+            keywords = article.get("llm_internal_keywords") or []
+            vectors = article.get("llm_individual_keyword_embeddings") or []
+            if len(keywords) != len(vectors):
+                counts["skipped_mismatch"] += 1
+                continue
+            if not dry_run:
+                keyword_ids = keyword_store.register_many(keywords, vectors)
+                articles_collection.update_one(
+                    {"_id": article["_id"]},
+                    {"$set": {"llm_keyword_vector_ids": keyword_ids}, "$unset": {"llm_individual_keyword_embeddings": ""}},
+                )
+            counts["migrated"] += 1
+            if counts["migrated"] % 1000 == 0:
+                print(f"  진행 중: {counts['migrated']}개 기사 처리")
+    finally:
+        mongo_client.close()
+    return counts
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="기사별 키워드 벡터를 전역 키워드 벡터 사전으로 이전합니다.")
+    parser.add_argument("--dry-run", action="store_true", help="DB를 수정하지 않고 대상 문서 수만 셉니다.")
+    args = parser.parse_args()
+
+    result = migrate(dry_run=args.dry_run)
+    print(f"✅ 완료: 이전 {result['migrated']}개, 키워드/벡터 개수 불일치로 건너뜀 {result['skipped_mismatch']}개"
+          f"{' (dry-run)' if args.dry_run else ''}")
@@ -0,0 +1,115 @@
+#!/usr/bin/env python3
+"""
+파이프라인 단계별 지표 내보내기
+- 워커들이 Redis에 누적한 단계별 지연/큐 대기 히스토그램과 결과 카운터를 읽습니다.
+- JSON 리포트(기본) 또는 Prometheus 텍스트 형식으로 출력하고, --serve로 /metrics 엔드포인트를 띄울 수 있습니다.
+- JSON 리포트의 bottleneck은 평균 처리 시간 × 처리 건수가 가장 큰 단계, 즉 워커 시간을 가장 많이 쓰는 단계입니다.
+
+사용 예:
+    python utils/pipeline_metrics.py                       # JSON 리포트 출력
+    python utils/pipeline_metrics.py --output report.json  # 파일로 저장
+    python utils/pipeline_metrics.py --format prometheus
+    python utils/pipeline_metrics.py --serve 9108          # Prometheus 스크레이프용
+"""
+
+import os
+import sys
+import json
+import argparse
+from datetime import datetime
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+
+_project_root = os.path.dirname(os.path.dirname(os.path.abspath(__file__)))
+if _project_root not in sys.path:
+    sys.path.insert(0, _project_root)
+
+from src.pipeline_stages.tracing import StageMetrics, get_stage_metrics
+
+
+def build_report(metrics: StageMetrics) -> dict:
+    stages = metrics.snapshot()
+    busiest = max(
+        (s for s in stages if stages[s]["latency"]["count"]),
+        key=lambda s: stages[s]["latency"]["sum"],
+        default=None,
+    )
+    return {"generated_at": datetime.now().isoformat(), "bottleneck": busiest, "stages": stages}
+
+
+def render_prometheus(metrics: StageMetrics) -> str:
+    lines = []
+    stages = metrics.snapshot()
+    for name, kind, help_text in (
+        ("pipeline_stage_duration_seconds", "latency", "단계 태스크 처리 시간 (fusion으로 이어 실행된 단계 제외)"),
+        ("pipeline_stage_queue_wait_seconds", "queue_wait", "전송부터 단계 시작까지 큐 대기 시간"),
+    ):
+        lines.append(f"# HELP {name} {help_text}")
+        lines.append(f"# TYPE {name} histogram")
+        for stage, data in stages.items():
+            histogram = data[kind]
+            if not histogram["count"]:
+                continue
+            for upper, count in histogram["buckets"].items():
+                lines.append(f'{name}_bucket{{stage="{stage}",le="{upper}"}} {count}')
+            lines.append(f'{name}_sum{{stage="{stage}"}} {histogram["sum"]}')
+            lines.append(f'{name}_count{{stage="{stage}"}} {histogram["count"]}')
+    lines.append("# HELP pipeline_stage_outcomes_total 단계별 결과 (passed/failed/retry/error)")
+    lines.append("# TYPE pipeline_stage_outcomes_total counter")
+    for stage, data in stages.items():
+        for outcome, count in data["outcomes"].items():
+            lines.append(f'pipeline_stage_outcomes_total{{stage="{stage}",outcome="{outcome}"}} {count}')
+    return "\n".join(lines) + "\n"
+
+
+def serve(metrics: StageMetrics, port: int):
+    class MetricsHandler(BaseHTTPRequestHandler):
+        def do_GET(self):
+            if self.path.split("?")[0] == "/metrics":
+                body, content_type = render_prometheus(metrics).encode("utf-8"), "text/plain; version=0.0.4; charset=utf-8"
+            elif self.path.split("?")[0] == "/report":
+                body, content_type = json.dumps(build_report(metrics), ensure_ascii=False).encode("utf-8"), "application/json"
+            else:
+                self.send_error(404)
+                return
+            self.send_response(200)
+            self.send_header("Content-Type", content_type)
+            self.send_header("Content-Length", str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, format, *args):
+            pass
+
+    print(f"📈 파이프라인 지표 서버: http://0.0.0.0:{port}/metrics (JSON: /report)")
+    ThreadingHTTPServer(("0.0.0.0", port), MetricsHandler).serve_forever()
+
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="파이프라인 단계별 지연/큐 대기/결과 지표를 내보냅니다.")
+    parser.add_argument("--format", choices=["json", "prometheus"], default="json", help="출력 형식")
+    parser.add_argument("--output", help="결과를 저장할 파일 경로 (없으면 표준 출력)")
+    parser.add_argument("--serve", type=int, metavar="PORT", help="/metrics, /report를 제공하는 HTTP 서버 실행")
+    parser.add_argument("--reset", action="store_true", help="누적된 지표를 모두 삭제합니다.")
+    args = parser.parse_args()
+
+    stage_metrics = get_stage_metrics()
+    if stage_metrics is None:
+        print("❌ TRACING.ENABLED가 false입니다.")
+        sys.exit(1)
+
+    if args.reset:
+        stage_metrics.reset()
+        print("✅ 파이프라인 지표를 초기화했습니다.")
+    elif args.serve:
+        serve(stage_metrics, args.serve)
+    else:
+        if args.format == "prometheus":
+            output = render_prometheus(stage_metrics)
+        else:
+            output = json.dumps(build_report(stage_metrics), ensure_ascii=False, indent=2)
+        if args.output:
+            with open(args.output, "w", encoding="utf-8") as f:
+                f.write(output)
+            print(f"✅ 저장 완료: {args.output}")
+        else:
+            print(output)